@@ -23,5 +23,14 @@ OPTS = {"openstack": [
     cfg.IntOpt("cleanup_threads",
                default=20,
                deprecated_group="cleanup",
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.IntOpt("cleanup_list_page_size",
+               default=1000,
+               help="Number of resources to fetch per request while "
+                    "listing resources for cleanup"),
+    cfg.IntOpt("cleanup_parallel_managers",
+               default=4,
+               help="Max number of resource managers which perform cleanup "
+                    "simultaneously. Resource managers start only after "
+                    "managers they depend on finish")
 ]}
@@ -0,0 +1,33 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import cfg
+
+OPTS = {"openstack": [
+    cfg.IntOpt("context_resource_management_workers",
+               default=20,
+               help="The default number of threads used by contexts to "
+                    "create resources for different tenants in parallel"),
+    cfg.BoolOpt("resource_discovery_cache",
+                default=True,
+                help="Share listings of images, flavors and volume types "
+                     "between validators, resource types and contexts of "
+                     "the same task instead of listing resources for each "
+                     "lookup by name"),
+    cfg.FloatOpt("capability_cache_ttl",
+                 default=600.0, min=0,
+                 help="Time (in seconds) for which capabilities of the cloud "
+                      "(Neutron extensions, external networks, services of "
+                      "the catalog, max API microversions) are shared "
+                      "between iterations of the same task. Set 0 to "
+                      "disable the cache")
+]}
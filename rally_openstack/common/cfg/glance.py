@@ -48,5 +48,26 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Interval between checks when waiting for image "
-                      "creation.")
+                      "creation."),
+    cfg.BoolOpt("image_cache_enabled",
+                default=False,
+                help="Keep images downloaded by URL in the local cache to "
+                     "reuse them for next uploads."),
+    cfg.StrOpt("image_cache_dir",
+               default="~/.rally/openstack/image_cache",
+               help="Directory to store cached images in."),
+    cfg.IntOpt("image_cache_size",
+               default=10240,
+               help="Max total size of cached images in MiB. Least "
+                    "recently used images are removed when it is exceeded."),
+    cfg.IntOpt("image_download_buffer_size",
+               default=4096,
+               min=64,
+               help="Size of the buffer in KiB to stream downloaded images "
+                    "to the disk with."),
+    cfg.IntOpt("image_download_segments",
+               default=1,
+               min=1,
+               help="Number of parallel HTTP range requests to download an "
+                    "image by URL with, if the server supports ranges.")
 ]}
@@ -108,5 +108,10 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Time interval (in sec) between checks when waiting for "
-                      "a stack to scale up or down.")
+                      "a stack to scale up or down."),
+    cfg.BoolOpt("heat_stack_wait_by_events",
+                default=True,
+                help="Wait for stacks to be created, updated or deleted by "
+                     "new events of the stack instead of polling the stack "
+                     "itself. Times of resources are reported by type.")
 ]}
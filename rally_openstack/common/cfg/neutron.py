@@ -36,4 +36,8 @@ OPTS = {"openstack": [
                     "Linux bridge agent",
                 ],
                 help="Neutron L2 agent types to find hosts to bind"),
+    cfg.IntOpt("neutron_bulk_create_batch_size",
+               default=100, min=1,
+               help="Max number of Neutron networks, subnets or ports "
+                    "created by one bulk request"),
 ]}
@@ -55,6 +55,18 @@ OPTS = {"openstack": [
                  default=2.0,
                  deprecated_group="benchmark",
                  help="Server boot poll interval"),
+    cfg.IntOpt("nova_server_boot_concurrency",
+               default=1,
+               min=1,
+               help="Number of parallel API calls to send boot requests of "
+                    "multiple servers with"),
+    cfg.IntOpt("nova_server_boot_batch_size",
+               default=0,
+               min=0,
+               help="Max number of servers to request by one boot API call. "
+                    "Bigger requests of multiple servers are split into "
+                    "several calls which are sent in parallel. 0 means no "
+                    "limit"),
     # "delete": (2, 300, 2)
     cfg.FloatOpt("nova_server_delete_prepoll_delay",
                  default=2.0,
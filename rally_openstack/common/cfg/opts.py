@@ -14,6 +14,7 @@
 #    under the License.
 
 from rally_openstack.common.cfg import cinder
+from rally_openstack.common.cfg import context
 from rally_openstack.common.cfg import glance
 from rally_openstack.common.cfg import heat
 from rally_openstack.common.cfg import ironic
@@ -51,7 +52,7 @@ def list_opts():
                    vm.OPTS, glance.OPTS, watcher.OPTS, tempest.OPTS,
                    keystone_roles.OPTS, keystone_users.OPTS, cleanup.OPTS,
                    senlin.OPTS, neutron.OPTS, octavia.OPTS,
-                   osprofilerchart.OPTS):
+                   osprofilerchart.OPTS, context.OPTS):
         for category, opt in l_opts.items():
             opts.setdefault(category, [])
             opts[category].extend(opt)
@@ -22,5 +22,25 @@ OPTS = {
             "openstack_client_http_timeout",
             default=180.0,
             help="HTTP timeout for any of OpenStack service in seconds")
+    ],
+    "openstack": [
+        cfg.BoolOpt(
+            "keystone_session_reuse",
+            default=True,
+            help="Share keystone sessions and tokens of the same credential "
+                 "between scenario iterations instead of authenticating "
+                 "for each iteration"),
+        cfg.IntOpt(
+            "keystone_token_refresh_margin",
+            default=300,
+            help="Refresh shared keystone token if it expires in less "
+                 "than specified number of seconds"),
+        cfg.IntOpt(
+            "keystone_auth_workers",
+            default=20,
+            min=1,
+            help="The number of concurrent threads to authenticate existing "
+                 "users with while checking health of an environment or "
+                 "setting up the users context")
     ]
 }
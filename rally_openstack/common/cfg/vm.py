@@ -23,5 +23,21 @@ OPTS = {"openstack": [
     cfg.FloatOpt("vm_ping_timeout",
                  default=120.0,
                  deprecated_group="benchmark",
-                 help="Time to wait for a VM to become pingable")
+                 help="Time to wait for a VM to become pingable"),
+    cfg.IntOpt("vm_ping_tcp_port",
+               default=22,
+               min=1,
+               max=65535,
+               help="TCP port to check VMs reachability with if ICMP "
+                    "sockets are not permitted to the Rally process."),
+    cfg.IntOpt("vm_ssh_pool_size",
+               default=64,
+               min=0,
+               help="Max number of SSH connections to VMs kept open to "
+                    "reuse them between iterations. 0 disables the pool."),
+    cfg.IntOpt("vm_ssh_keepalive_interval",
+               default=30,
+               min=0,
+               help="Interval in seconds between keepalive packets of "
+                    "pooled SSH connections. 0 disables keepalive.")
 ]}
@@ -0,0 +1,115 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Parallel authentication of many existing OpenStack users."""
+
+from concurrent import futures
+import threading
+
+from rally.common import cfg
+from rally.common import logging
+
+from rally_openstack.common import osclients
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+class VerifiedAuthRefs(object):
+    """Process-wide registry of auth refs of verified credentials.
+
+    `rally task start` checks health of the environment right before setting
+    up contexts of the task, so the users context can take identifiers of
+    existing users from auth refs issued by the check instead of
+    authenticating every user once again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._auth_refs = {}
+
+    @staticmethod
+    def _make_key(credential):
+        # raw dicts of platform data miss fields which OpenStackCredential
+        # objects fill with None or False
+        return tuple(value or None for value in
+                     osclients.KeystoneSessionPool.make_key(credential))
+
+    def add(self, credential, auth_ref):
+        with self._lock:
+            self._auth_refs[self._make_key(credential)] = auth_ref
+
+    def get(self, credential):
+        """Return an auth ref of the credential if it is still valid."""
+        with self._lock:
+            auth_ref = self._auth_refs.get(self._make_key(credential))
+        margin = CONF.openstack.keystone_token_refresh_margin
+        if auth_ref is not None and auth_ref.will_expire_soon(margin):
+            return None
+        return auth_ref
+
+    def clear(self):
+        with self._lock:
+            self._auth_refs = {}
+
+
+VERIFIED_AUTH_REFS = VerifiedAuthRefs()
+
+
+def _authenticate(credential, admin):
+    clients = osclients.Clients(credential)
+    if admin:
+        clients.verified_keystone()
+    auth_ref = clients.keystone.auth_ref
+    VERIFIED_AUTH_REFS.add(credential, auth_ref)
+    return auth_ref
+
+
+def authenticate(credentials, admin=False, workers=None, reuse=False):
+    """Authenticate credentials by a bounded pool of threads.
+
+    :param credentials: list of credentials (dicts or OpenStackCredential
+        objects) to authenticate
+    :param admin: whether credentials should have admin role
+    :param workers: max number of parallel authentications. Defaults to
+        `openstack.keystone_auth_workers` option
+    :param reuse: whether to take still valid auth refs of credentials
+        verified earlier instead of authenticating them again
+    :returns: list of (auth ref, error) pairs in the order of credentials,
+        where the error is an exception raised by the authentication
+    """
+    results = [None] * len(credentials)
+    to_check = []
+    for i, credential in enumerate(credentials):
+        auth_ref = VERIFIED_AUTH_REFS.get(credential) if reuse else None
+        if auth_ref is not None:
+            results[i] = (auth_ref, None)
+        else:
+            to_check.append(i)
+    if reuse and len(to_check) < len(credentials):
+        LOG.debug("Reusing auth refs of %d verified credentials."
+                  % (len(credentials) - len(to_check)))
+    if not to_check:
+        return results
+
+    workers = min(workers or CONF.openstack.keystone_auth_workers,
+                  len(to_check))
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        fs = dict((executor.submit(_authenticate, credentials[i], admin), i)
+                  for i in to_check)
+        for future in futures.as_completed(fs):
+            try:
+                results[fs[future]] = (future.result(), None)
+            except Exception as e:
+                results[fs[future]] = (None, e)
+    return results
@@ -0,0 +1,272 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Streaming download of big files (like images) to the local disk."""
+
+from concurrent import futures
+import hashlib
+import os
+import threading
+import time
+
+import requests
+
+from rally.common import cfg
+from rally.common import logging
+
+from rally_openstack.common import exceptions
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+# how often the progress of a download is logged, in seconds
+_PROGRESS_INTERVAL = 10
+
+
+def _buffer_size():
+    return CONF.openstack.image_download_buffer_size * 1024
+
+
+class _Progress(object):
+    """Thread-safe counter of downloaded bytes which logs the throughput."""
+
+    def __init__(self, source, total=None):
+        self.source = source
+        self.total = total
+        self.size = 0
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._logged_at = self._started_at
+
+    def add(self, size):
+        with self._lock:
+            self.size += size
+            now = time.time()
+            if now - self._logged_at < _PROGRESS_INTERVAL:
+                return
+            self._logged_at = now
+            LOG.debug("Downloaded %.1f of %s MiB from %s (%.1f MiB/s)."
+                      % (self.size / 1048576.0,
+                         "%.1f" % (self.total / 1048576.0)
+                         if self.total else "?",
+                         self.source,
+                         self.size / 1048576.0 / (now - self._started_at)))
+
+    def stats(self):
+        duration = time.time() - self._started_at
+        return {"size": self.size,
+                "duration": duration,
+                "throughput": self.size / duration if duration else 0.0}
+
+
+def _new_hashes(algorithms):
+    return dict((algorithm, hashlib.new(algorithm))
+                for algorithm in algorithms)
+
+
+def _hash_file(path, hashes, size=None):
+    """Update hashes with the first size bytes (all by default) of a file."""
+    buffer_size = _buffer_size()
+    with open(path, "rb") as f:
+        while size is None or size > 0:
+            chunk = f.read(buffer_size if size is None
+                           else min(buffer_size, size))
+            if not chunk:
+                break
+            for h in hashes.values():
+                h.update(chunk)
+            if size is not None:
+                size -= len(chunk)
+
+
+def _finish(source, hashes, checksums, progress):
+    stats = progress.stats()
+    stats["hashes"] = dict((algorithm, h.hexdigest())
+                           for algorithm, h in hashes.items())
+    for algorithm, expected in (checksums or {}).items():
+        actual = stats["hashes"][algorithm]
+        if actual != expected.lower():
+            raise exceptions.ChecksumMismatch(
+                source=source, algorithm=algorithm, actual=actual,
+                expected=expected)
+    LOG.debug("Downloaded %d bytes from %s in %.2f sec (%.1f MiB/s)."
+              % (stats["size"], source, stats["duration"],
+                 stats["throughput"] / 1048576.0))
+    return stats
+
+
+def save(chunks, path, source=None, checksums=None, hash_algorithms=()):
+    """Write an iterable of data chunks to the file.
+
+    :param chunks: iterable of bytes, e.g. data of a Glance image
+    :param path: path to the file to (re)write
+    :param source: description of the data for messages
+    :param checksums: dict of expected hexdigests of the data, keyed by names
+        of hashlib algorithms. ChecksumMismatch is raised if any differs
+    :param hash_algorithms: names of additional hashlib algorithms to
+        calculate for the data
+    :returns: dict with size (bytes), duration (sec), throughput
+        (bytes per sec) and hashes of the data
+    """
+    source = source or path
+    checksums = checksums or {}
+    hashes = _new_hashes(set(hash_algorithms) | set(checksums))
+    progress = _Progress(source)
+    # a big buffer instead of flushing every chunk to the disk
+    with open(path, "wb", buffering=_buffer_size()) as f:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            f.write(chunk)
+            for h in hashes.values():
+                h.update(chunk)
+            progress.add(len(chunk))
+    return _finish(source, hashes, checksums, progress)
+
+
+def _get_segmented_size(url, verify, segments):
+    """Returns size of the file if it can be downloaded by segments."""
+    if segments < 2:
+        return None
+    response = requests.head(url, allow_redirects=True, verify=verify)
+    if (not response.ok
+            or response.headers.get("Accept-Ranges") != "bytes"):
+        return None
+    try:
+        size = int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+    # small files are downloaded faster by a single request
+    if size < segments * _buffer_size():
+        return None
+    return size
+
+
+def _download_segment(url, path, start, end, verify, progress):
+    response = requests.get(
+        url, stream=True, verify=verify,
+        headers={"Range": "bytes=%d-%d" % (start, end)})
+    try:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise exceptions.RallyException(
+                "Failed to download bytes %d-%d of %s: the server does not "
+                "support ranges." % (start, end, url))
+        offset = start
+        fd = os.open(path, os.O_WRONLY)
+        try:
+            for chunk in response.iter_content(chunk_size=_buffer_size()):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                progress.add(len(chunk))
+        finally:
+            os.close(fd)
+    finally:
+        response.close()
+    if offset != end + 1:
+        raise exceptions.RallyException(
+            "Failed to download bytes %d-%d of %s: got %d bytes only."
+            % (start, end, url, offset - start))
+
+
+def _download_segments(url, path, size, segments, verify, progress):
+    with open(path, "wb") as f:
+        f.truncate(size)
+    segment_size = -(-size // segments)
+    with futures.ThreadPoolExecutor(max_workers=segments) as executor:
+        fs = [executor.submit(_download_segment, url, path, start,
+                              min(start + segment_size, size) - 1,
+                              verify, progress)
+              for start in range(0, size, segment_size)]
+        for future in fs:
+            future.result()
+
+
+def _download_stream(url, path, resume, verify, hashes, progress):
+    offset = os.path.getsize(path) if resume and os.path.isfile(path) else 0
+    headers = {"Range": "bytes=%d-" % offset} if offset else {}
+    response = requests.get(url, stream=True, verify=verify,
+                            headers=headers)
+    try:
+        if offset and response.status_code == 416:
+            # the partial file is broken, start from scratch
+            response.close()
+            offset = 0
+            response = requests.get(url, stream=True, verify=verify)
+        response.raise_for_status()
+        if offset and response.status_code == 206:
+            LOG.debug("Resuming download of %s from byte %d."
+                      % (url, offset))
+            _hash_file(path, hashes, offset)
+            mode = "ab"
+        else:
+            offset = 0
+            mode = "wb"
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            progress.total = offset + int(length)
+
+        buffer_size = _buffer_size()
+        with open(path, mode, buffering=buffer_size) as f:
+            for chunk in response.iter_content(chunk_size=buffer_size):
+                if not chunk:
+                    continue
+                f.write(chunk)
+                for h in hashes.values():
+                    h.update(chunk)
+                progress.add(len(chunk))
+    finally:
+        response.close()
+
+
+def download(url, path, checksums=None, hash_algorithms=(), verify=True,
+             resume=True, segments=None):
+    """Download a file by HTTP(S) URL.
+
+    Data is streamed to the disk via a big buffer (see the
+    image_download_buffer_size option). If the path already contains a part
+    of the file, the download is resumed from its end, if the server
+    supports ranges. Otherwise, if the server supports ranges, the file may
+    be downloaded by several parallel segments.
+
+    :param url: URL of the file
+    :param path: path to store the file to
+    :param checksums: dict of expected hexdigests of the file, keyed by names
+        of hashlib algorithms. ChecksumMismatch is raised if any differs
+    :param hash_algorithms: names of additional hashlib algorithms to
+        calculate for the file
+    :param verify: whether to verify SSL certificates
+    :param resume: whether to resume a download from the existing file
+    :param segments: number of parallel segments to download a file by.
+        Defaults to the image_download_segments option
+    :returns: dict with size (bytes), duration (sec), throughput
+        (bytes per sec) and hashes of the file
+    """
+    checksums = checksums or {}
+    hashes = _new_hashes(set(hash_algorithms) | set(checksums))
+    if segments is None:
+        segments = CONF.openstack.image_download_segments
+
+    size = None
+    if not (resume and os.path.isfile(path) and os.path.getsize(path)):
+        size = _get_segmented_size(url, verify, segments)
+
+    if size:
+        progress = _Progress(url, size)
+        LOG.debug("Downloading %s by %d segments." % (url, segments))
+        _download_segments(url, path, size, segments, verify, progress)
+        _hash_file(path, hashes)
+    else:
+        progress = _Progress(url)
+        _download_stream(url, path, resume, verify, hashes, progress)
+    return _finish(url, hashes, checksums, progress)
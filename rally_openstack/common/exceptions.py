@@ -21,3 +21,9 @@ class AuthenticationFailed(rally_exceptions.InvalidArgumentsException):
     error_code = 220
     msg_fmt = ("Failed to authenticate to %(url)s for user '%(username)s'"
                " in project '%(project)s': %(etype)s: %(error)s")
+
+
+class ChecksumMismatch(RallyException):
+    error_code = 533
+    msg_fmt = ("Checksum mismatch for %(source)s: %(algorithm)s is "
+               "%(actual)s, but %(expected)s is expected.")
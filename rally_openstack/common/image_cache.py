@@ -0,0 +1,256 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from rally.common import cfg
+from rally.common import logging
+
+from rally_openstack.common import download
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+
+def fetch_url(url, path):
+    """Download an image from url to path and return its sha256."""
+    stats = download.download(url, path, hash_algorithms=["sha256"],
+                              verify=False)
+    return stats["hashes"]["sha256"]
+
+
+class ImageCache(object):
+    """Content-addressed on-disk cache of images.
+
+    Images are stored as <cache_dir>/blobs/<sha256 of content>. Every source
+    (an URL or any other string key) refers to a blob via a record in
+    <cache_dir>/sources/<sha256 of source>, so the same content downloaded
+    from different sources is stored once.
+
+    Only one download of a source is performed at a time: other threads and
+    processes wait for it and reuse the result. A failed download leaves its
+    part in <cache_dir>/tmp, so the next one may resume it. Least recently
+    used blobs are evicted when the total size of the cache exceeds max_size,
+    but never while any blob is in use.
+    """
+
+    def __init__(self, cache_dir, max_size):
+        """Init the cache.
+
+        :param cache_dir: path to the directory to store images in
+        :param max_size: max total size of cached images in bytes
+        """
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._source_locks = {}
+        # blob path -> (device, inode, size) of the blob with verified hash
+        self._verified = {}
+
+    def _path(self, *parts):
+        return os.path.join(self.cache_dir, *parts)
+
+    def _source_lock(self, key):
+        with self._lock:
+            return self._source_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key):
+        """Returns path to a blob of the source or None if it is missing."""
+        try:
+            with open(self._path("sources", key)) as f:
+                record = json.load(f)
+            blob = self._path("blobs", record["sha256"])
+            st = os.stat(blob)
+            if st.st_size != record["size"]:
+                return None
+            if not self._verify(blob, record["sha256"], st):
+                LOG.warning("Image %s in the image cache is corrupted."
+                            % record["source"])
+                return None
+            # blobs are evicted by their modification time
+            os.utime(blob)
+        except (OSError, ValueError, KeyError):
+            return None
+        return blob
+
+    def _verify(self, blob, sha256, st):
+        """Checks the hash of a blob once per its inode."""
+        file_id = (st.st_dev, st.st_ino, st.st_size)
+        if self._verified.get(blob) == file_id:
+            return True
+        actual = hashlib.sha256()
+        with open(blob, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                actual.update(chunk)
+        if actual.hexdigest() != sha256:
+            return False
+        self._verified[blob] = file_id
+        return True
+
+    def _fill(self, key, source, fetch):
+        LOG.info("Downloading %s to the image cache %s."
+                 % (source, self.cache_dir))
+        part_path = self._path("tmp", "%s.part" % key)
+        sha256 = fetch(part_path)
+        if not sha256:
+            sha256 = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(chunk)
+            sha256 = sha256.hexdigest()
+        blob = self._path("blobs", sha256)
+        os.rename(part_path, blob)
+        st = os.stat(blob)
+        size = st.st_size
+        # the hash has just been calculated while downloading
+        self._verified[blob] = (st.st_dev, st.st_ino, size)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self._path("tmp"))
+        with os.fdopen(fd, "w") as f:
+            json.dump({"source": source, "sha256": sha256, "size": size}, f)
+        os.rename(tmp_path, self._path("sources", key))
+        return blob
+
+    @contextlib.contextmanager
+    def _usage_lock(self, exclusive=False):
+        """Locks blobs against eviction (or takes them for eviction).
+
+        Users of blobs hold the shared lock, so a blob is never removed
+        between looking it up and opening it. The exclusive lock of eviction
+        is not waited for: the cache is trimmed by the next call instead.
+        """
+        os.makedirs(self._path("locks"), exist_ok=True)
+        with open(self._path("locks", ".usage"), "a") as lock_file:
+            if exclusive:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    yield False
+                    return
+            else:
+                fcntl.flock(lock_file, fcntl.LOCK_SH)
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _evict(self, keep):
+        with self._usage_lock(exclusive=True) as locked:
+            if not locked:
+                LOG.debug("Images of the image cache are in use, eviction "
+                          "is postponed.")
+                return
+            self._evict_unused(keep)
+
+    def _evict_unused(self, keep):
+        blobs = []
+        for name in os.listdir(self._path("blobs")):
+            path = self._path("blobs", name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            blobs.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _mtime, size, _path in blobs)
+        for _mtime, size, path in sorted(blobs):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            LOG.debug("Evicting %s from the image cache." % path)
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            self._verified.pop(path, None)
+            total -= size
+
+    def _get(self, source, fetch):
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        with self._source_lock(key):
+            blob = self._lookup(key)
+            if blob:
+                LOG.debug("Image %s is found in the image cache." % source)
+                return blob
+
+            for name in ("blobs", "sources", "locks", "tmp"):
+                os.makedirs(self._path(name), exist_ok=True)
+            with open(self._path("locks", key), "a") as lock_file:
+                # other processes may download the same image right now
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    blob = self._lookup(key)
+                    if not blob:
+                        blob = self._fill(key, source, fetch)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return blob
+
+    @contextlib.contextmanager
+    def use(self, source, fetch=None):
+        """Yields path to a cached image, downloading it if needed.
+
+        The image is not evicted until the block is left, so it should be
+        opened, linked or copied inside of it. An opened image stays readable
+        after the block even if it is evicted.
+
+        :param source: URL of the image or any other key which identifies
+            its content
+        :param fetch: a callable which accepts a path, stores the image there
+            and returns its sha256 hexdigest (or None to calculate it). It
+            should resume the download if the path already contains a part of
+            the image. By default, the image is downloaded from the source as
+            from URL
+        """
+        if fetch is None:
+            def fetch(path):
+                return fetch_url(source, path)
+
+        with self._usage_lock():
+            blob = self._get(source, fetch)
+            yield blob
+        self._evict(keep=blob)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_image_cache():
+    """Returns the image cache configured via config or None if disabled."""
+    if not CONF.openstack.image_cache_enabled:
+        return None
+    cache_dir = CONF.openstack.image_cache_dir
+    max_size = CONF.openstack.image_cache_size * 1024 * 1024
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = ImageCache(cache_dir, max_size)
+        cache = _caches[cache_dir]
+        cache.max_size = max_size
+    return cache
+
+
+def copy_image(src, dst):
+    """Make a copy of a cached image, hard linking it if possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
@@ -15,6 +15,7 @@
 
 import abc
 import os
+import threading
 from urllib.parse import urlparse
 from urllib.parse import urlunparse
 
@@ -248,6 +249,108 @@ class OSClient(plugin.Plugin):
         return super(OSClient, cls).get(name, platform="openstack", **kwargs)
 
 
+class KeystoneSessionPool(object):
+    """Process-wide pool of keystone sessions shared between iterations.
+
+    Scenarios create new Clients object (with an empty cache) for each
+    iteration. Without the pool it means new authentication per iteration.
+    The pool keeps keystoneauth1 Session objects (with their connection
+    pools) and identity plugins (with issued tokens) per credential, so the
+    same user re-authenticates only when the token is about to expire.
+    """
+
+    _CREDENTIAL_FIELDS = ("auth_url", "username", "password", "tenant_name",
+                          "domain_name", "user_domain_name",
+                          "project_domain_name", "region_name",
+                          "https_insecure", "https_cacert", "https_cert")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._sessions = {}
+        self._auth_refs = {}
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+    @classmethod
+    def make_key(cls, credential, version=None):
+        """Build a hashable key for the credential and keystone version."""
+        key = []
+        for field in cls._CREDENTIAL_FIELDS:
+            value = credential.get(field)
+            if isinstance(value, list):
+                value = tuple(value)
+            key.append(value)
+        key.append(version)
+        return tuple(key)
+
+    def get(self, key, factory):
+        """Return pooled (session, identity plugin) pair.
+
+        :param key: a key built by `make_key` method
+        :param factory: a callable which creates new pair in case of miss
+        """
+        with self._lock:
+            if key in self._sessions:
+                self._stats["hits"] += 1
+                return self._sessions[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # the factory can make HTTP requests (version discovery), so let's
+        # not block other credentials while the session is created.
+        with key_lock:
+            with self._lock:
+                if key in self._sessions:
+                    self._stats["hits"] += 1
+                    return self._sessions[key]
+            session = factory()
+            with self._lock:
+                self._stats["misses"] += 1
+                self._sessions[key] = session
+        return session
+
+    def get_access(self, session, auth_plugin):
+        """Return a token of the plugin, refreshing it before expiration.
+
+        keystoneauth1 re-authenticates only when less than a couple of
+        minutes are left, so the token is invalidated earlier based on
+        `openstack.keystone_token_refresh_margin` option to avoid getting
+        401 in the middle of an iteration.
+        """
+        auth_ref = auth_plugin.get_access(session)
+        margin = CONF.openstack.keystone_token_refresh_margin
+        if margin and auth_ref.will_expire_soon(margin):
+            auth_plugin.invalidate()
+            auth_ref = auth_plugin.get_access(session)
+        with self._lock:
+            previous = self._auth_refs.get(auth_plugin)
+            if previous is not None and previous is not auth_ref:
+                self._stats["refreshes"] += 1
+            self._auth_refs[auth_plugin] = auth_ref
+        return auth_ref
+
+    def stats(self):
+        """Return hits/misses/refreshes counters and size of the pool."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._sessions)
+        return stats
+
+    def clear(self):
+        """Drop all pooled sessions and reset counters."""
+        with self._lock:
+            for session, _auth_plugin in self._sessions.values():
+                try:
+                    session.session.close()
+                except Exception:
+                    LOG.debug("Failed to close pooled keystone session.")
+            self._key_locks = {}
+            self._sessions = {}
+            self._auth_refs = {}
+            self._stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+
+SESSION_POOL = KeystoneSessionPool()
+
+
 @configure("keystone", supported_versions=("2", "3"))
 class Keystone(OSClient):
     """Wrapper for KeystoneClient which hides OpenStack auth details."""
@@ -266,7 +369,11 @@ class Keystone(OSClient):
         try:
             if "keystone_auth_ref" not in self.cache:
                 sess, plugin = self.get_session()
-                self.cache["keystone_auth_ref"] = plugin.get_access(sess)
+                if CONF.openstack.keystone_session_reuse:
+                    auth_ref = SESSION_POOL.get_access(sess, plugin)
+                else:
+                    auth_ref = plugin.get_access(sess)
+                self.cache["keystone_auth_ref"] = auth_ref
         except Exception as original_e:
             e = AuthenticationFailed(
                 error=original_e,
@@ -287,51 +394,60 @@ class Keystone(OSClient):
     def get_session(self, version=None):
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
-            from keystoneauth1 import discover
-            from keystoneauth1 import identity
-            from keystoneauth1 import session
-
-            version = self.choose_version(version)
-            auth_url = self.credential.auth_url
-            if version is not None:
-                auth_url = self._remove_url_version()
-
-            password_args = {
-                "auth_url": auth_url,
-                "username": self.credential.username,
-                "password": self.credential.password,
-                "tenant_name": self.credential.tenant_name
-            }
-
-            if version is None:
-                # NOTE(rvasilets): If version not specified than we discover
-                # available version with the smallest number. To be able to
-                # discover versions we need session
-                temp_session = session.Session(
-                    verify=(self.credential.https_cacert
-                            or not self.credential.https_insecure),
-                    cert=self.credential.https_cert,
-                    timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
-                temp_session.session.close()
-
-            if "v2.0" not in password_args["auth_url"] and version != "2":
-                password_args.update({
-                    "user_domain_name": self.credential.user_domain_name,
-                    "domain_name": self.credential.domain_name,
-                    "project_domain_name": self.credential.project_domain_name
-                })
-            identity_plugin = identity.Password(**password_args)
-            sess = session.Session(
-                auth=identity_plugin,
+            if CONF.openstack.keystone_session_reuse:
+                self.cache[key] = SESSION_POOL.get(
+                    SESSION_POOL.make_key(self.credential,
+                                          self.choose_version(version)),
+                    lambda: self._create_session(version))
+            else:
+                self.cache[key] = self._create_session(version)
+        return self.cache[key]
+
+    def _create_session(self, version=None):
+        from keystoneauth1 import discover
+        from keystoneauth1 import identity
+        from keystoneauth1 import session
+
+        version = self.choose_version(version)
+        auth_url = self.credential.auth_url
+        if version is not None:
+            auth_url = self._remove_url_version()
+
+        password_args = {
+            "auth_url": auth_url,
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "tenant_name": self.credential.tenant_name
+        }
+
+        if version is None:
+            # NOTE(rvasilets): If version not specified than we discover
+            # available version with the smallest number. To be able to
+            # discover versions we need session
+            temp_session = session.Session(
                 verify=(self.credential.https_cacert
                         or not self.credential.https_insecure),
                 cert=self.credential.https_cert,
                 timeout=CONF.openstack_client_http_timeout)
-            self.cache[key] = (sess, identity_plugin)
-        return self.cache[key]
+            version = str(discover.Discover(
+                temp_session,
+                password_args["auth_url"]).version_data()[0]["version"][0])
+            temp_session.session.close()
+
+        if "v2.0" not in password_args["auth_url"] and version != "2":
+            password_args.update({
+                "user_domain_name": self.credential.user_domain_name,
+                "domain_name": self.credential.domain_name,
+                "project_domain_name": self.credential.project_domain_name
+            })
+        identity_plugin = identity.Password(**password_args)
+        sess = session.Session(
+            auth=identity_plugin,
+            verify=(self.credential.https_cacert
+                    or not self.credential.https_insecure),
+            cert=self.credential.https_cert,
+            timeout=CONF.openstack_client_http_timeout)
+        return sess, identity_plugin
 
     def _remove_url_version(self):
         """Remove any version from the auth_url.
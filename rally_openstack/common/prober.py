@@ -0,0 +1,212 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process reachability checks of many hosts (ICMP echo or TCP connect)."""
+
+import errno
+import os
+import select
+import socket
+import struct
+import threading
+import time
+
+from rally.common import cfg
+from rally.common import logging
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+_ECHO_REQUEST = {4: 8, 6: 128}
+_ECHO_REPLY = {4: 0, 6: 129}
+_PROTO = {4: socket.IPPROTO_ICMP, 6: socket.IPPROTO_ICMPV6}
+_FAMILY = {4: socket.AF_INET, 6: socket.AF_INET6}
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _version(ip):
+    return 6 if ":" in ip else 4
+
+
+class Prober(object):
+    """Checks reachability of hosts without spawning `ping` processes.
+
+    All hosts are pinged via one ICMP socket per address family and replies
+    are dispatched to waiting threads by one receiver thread. Unprivileged
+    datagram ICMP sockets are used if the kernel permits them (see
+    net.ipv4.ping_group_range), otherwise raw sockets are tried. If neither
+    is permitted, a host is considered reachable if it accepts or actively
+    refuses TCP connection to `openstack.vm_ping_tcp_port` port.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # version -> (socket, is_raw) or None if ICMP is not permitted
+        self._sockets = {}
+        self._waiters = {}
+        self._seq = 0
+        self._ident = os.getpid() & 0xFFFF
+        self._thread = None
+        # wakes the receiver up to select on a new socket
+        self._wakeup_r, self._wakeup_w = os.pipe()
+
+    def _get_socket(self, version):
+        with self._lock:
+            if version in self._sockets:
+                return self._sockets[version]
+            sock = None
+            for sock_type, is_raw in ((socket.SOCK_DGRAM, False),
+                                      (socket.SOCK_RAW, True)):
+                try:
+                    sock = (socket.socket(_FAMILY[version], sock_type,
+                                          _PROTO[version]), is_raw)
+                    break
+                except OSError as e:
+                    LOG.debug("Failed to open %s ICMPv%s socket: %s"
+                              % ("raw" if is_raw else "datagram",
+                                 version, e))
+            if sock is None:
+                LOG.warning("ICMPv%s is not permitted, TCP connect to port "
+                            "%s is used to check hosts instead."
+                            % (version, CONF.openstack.vm_ping_tcp_port))
+            self._sockets[version] = sock
+            if sock and self._thread is None:
+                self._thread = threading.Thread(target=self._receive)
+                self._thread.daemon = True
+                self._thread.start()
+            elif sock:
+                os.write(self._wakeup_w, b"\0")
+            return sock
+
+    def _next_seq(self):
+        with self._lock:
+            self._seq = (self._seq + 1) & 0xFFFF
+            return self._seq
+
+    def _receive(self):
+        while True:
+            try:
+                self._receive_once(timeout=1)
+            except Exception:
+                LOG.exception("Failed to process ICMP replies.")
+
+    def _receive_once(self, timeout):
+        with self._lock:
+            sockets = dict((sock[0], (version, sock[1]))
+                           for version, sock in self._sockets.items()
+                           if sock)
+        readable, _w, _e = select.select(list(sockets) + [self._wakeup_r],
+                                         [], [], timeout)
+        for sock in readable:
+            if sock == self._wakeup_r:
+                os.read(self._wakeup_r, 512)
+                continue
+            version, is_raw = sockets[sock]
+            data, address = sock.recvfrom(2048)
+            self._dispatch(version, is_raw, data, address[0], time.time())
+
+    def _dispatch(self, version, is_raw, data, address, received_at):
+        if is_raw and version == 4:
+            # raw IPv4 sockets receive packets with the IP header
+            data = data[(data[0] & 0x0F) * 4:]
+        if len(data) < 8:
+            return
+        icmp_type, _code, _csum, ident, seq = struct.unpack("!BBHHH",
+                                                            data[:8])
+        if icmp_type != _ECHO_REPLY[version]:
+            return
+        # the kernel sets own identifiers of datagram ICMP sockets
+        if is_raw and ident != self._ident:
+            return
+        key = (socket.inet_pton(_FAMILY[version], address), seq)
+        with self._lock:
+            waiter = self._waiters.get(key)
+        if waiter:
+            waiter["rtt"] = received_at - waiter["sent_at"]
+            waiter["event"].set()
+
+    def ping(self, ip, timeout=1.0):
+        """Send ICMP echo request and wait for a reply.
+
+        :returns: RTT in seconds or None if there is no reply
+        :raises OSError: if ICMP is not permitted
+        """
+        version = _version(ip)
+        sock = self._get_socket(version)
+        if sock is None:
+            raise OSError(errno.EPERM, "ICMPv%s is not permitted" % version)
+        sock, _is_raw = sock
+
+        seq = self._next_seq()
+        header = struct.pack("!BBHHH", _ECHO_REQUEST[version], 0, 0,
+                             self._ident, seq)
+        payload = struct.pack("!d", time.time())
+        if version == 4:
+            # kernel calculates checksums of ICMPv6 packets
+            header = struct.pack("!BBHHH", _ECHO_REQUEST[version], 0,
+                                 _checksum(header + payload), self._ident,
+                                 seq)
+
+        key = (socket.inet_pton(_FAMILY[version], ip), seq)
+        waiter = {"event": threading.Event(), "rtt": None,
+                  "sent_at": time.time()}
+        with self._lock:
+            self._waiters[key] = waiter
+        try:
+            sock.sendto(header + payload, (ip, 0))
+            waiter["event"].wait(timeout)
+        except OSError as e:
+            # e.g. no route to the host
+            LOG.debug("Failed to ping %s: %s" % (ip, e))
+        finally:
+            with self._lock:
+                self._waiters.pop(key, None)
+        return waiter["rtt"]
+
+    @staticmethod
+    def tcp_connect(ip, port, timeout=1.0):
+        """Check that the host answers to TCP connection.
+
+        :returns: RTT in seconds or None if there is no answer
+        """
+        started_at = time.time()
+        try:
+            socket.create_connection((ip, port), timeout=timeout).close()
+        except ConnectionRefusedError:
+            # the host is up, the port is just closed
+            pass
+        except OSError:
+            return None
+        return time.time() - started_at
+
+    def probe(self, ip, timeout=1.0):
+        """Check that the host is reachable.
+
+        :returns: RTT in seconds or None if the host is unreachable
+        """
+        try:
+            return self.ping(ip, timeout)
+        except OSError:
+            return self.tcp_connect(ip, CONF.openstack.vm_ping_tcp_port,
+                                    timeout)
+
+
+PROBER = Prober()
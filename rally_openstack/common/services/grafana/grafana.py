@@ -12,6 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
+
 import requests
 
 from rally.common import logging
@@ -72,22 +74,96 @@ class GrafanaService(service.Service):
                 LOG.debug("Metric instance found in Grafana")
                 return True
 
-    @atomic.action_timer("grafana.push_metric")
-    def push_metric(self, seed):
-        """Push metric by GET request using pushgateway.
+    @atomic.action_timer("grafana.check_metrics")
+    def check_metrics(self, seeds, since, sleep_time, retries_total,
+                      min_interval=0.1):
+        """Check metrics with seed names in Grafana datasource at once.
 
-        :param seed: random name for metric to push
+        Every check is one query of all metrics which are not found yet.
+        Checks are made often at first and then with doubled intervals up
+        to sleep_time, so the time when metrics became visible is measured
+        precisely.
+
+        :param seeds: random metric names
+        :param since: time (as time.time() returns) to measure latencies of
+            metrics from, e.g. the time when metrics were pushed
+        :param sleep_time: max sleep time between checking metrics in
+                           seconds
+        :param retries_total: total number of sleep_time intervals to check
+                              metrics in Grafana
+        :param min_interval: min sleep time between checking metrics in
+                             seconds
+        :return: dict with time (in sec) since `since` until the metric was
+            found in Grafana datasource or None by seed names
         """
+        query_url = ("http://%(vip)s:%(port)s/api/datasources/proxy/:"
+                     "%(datasource)s/api/v1/query" % {
+                         "vip": self._spec["monitor_vip"],
+                         "port": self._spec["grafana"]["port"],
+                         "datasource": self._spec["datasource_id"]})
+        latencies = dict((seed, None) for seed in seeds)
+        deadline = time.time() + sleep_time * retries_total
+        interval = min(min_interval, sleep_time)
+        LOG.info("Check %s metrics in Grafana" % len(latencies))
+        with requests.Session() as session:
+            session.auth = (self._spec["grafana"]["user"],
+                            self._spec["grafana"]["password"])
+            while True:
+                pending = sorted(s for s, t in latencies.items() if t is None)
+                resp = session.get(
+                    query_url,
+                    params={"query": "{__name__=~\"%s\"}" % "|".join(
+                        pending)})
+                checked_at = time.time()
+                LOG.debug("Grafana response code: %s" % resp.status_code)
+                result = resp.json().get("data") or {}
+                for metric in result.get("result", []):
+                    seed = metric.get("metric", {}).get("__name__")
+                    if seed in latencies and latencies[seed] is None:
+                        latencies[seed] = checked_at - since
+                if all(t is not None for t in latencies.values()):
+                    LOG.debug("All metrics found in Grafana")
+                    break
+                if checked_at + interval > deadline:
+                    LOG.debug("Metrics %s are not found in Grafana"
+                              % ", ".join(pending))
+                    break
+                commonutils.interruptable_sleep(interval)
+                interval = min(interval * 2, sleep_time)
+        return latencies
+
+    def _push(self, data):
         push_url = "http://%(ip)s:%(port)s/metrics/job/%(job)s" % {
             "ip": self._spec["monitor_vip"],
             "port": self._spec["pushgateway_port"],
             "job": self._spec["job_name"]
         }
-        resp = requests.post(push_url,
+        return requests.post(push_url,
                              headers={"Content-type": "text/xml"},
-                             data="%s 12345\n" % seed)
+                             data=data)
+
+    @atomic.action_timer("grafana.push_metric")
+    def push_metric(self, seed):
+        """Push metric by GET request using pushgateway.
+
+        :param seed: random name for metric to push
+        """
+        resp = self._push("%s 12345\n" % seed)
         if resp.ok:
             LOG.info("Metric %s pushed" % seed)
         else:
             LOG.error("Error during push metric %s" % seed)
         return resp.ok
+
+    @atomic.action_timer("grafana.push_metrics")
+    def push_metrics(self, seeds):
+        """Push metrics by one request using pushgateway.
+
+        :param seeds: random names for metrics to push
+        """
+        resp = self._push("".join("%s 12345\n" % seed for seed in seeds))
+        if resp.ok:
+            LOG.info("%s metrics pushed" % len(seeds))
+        else:
+            LOG.error("Error during push of %s metrics" % len(seeds))
+        return resp.ok
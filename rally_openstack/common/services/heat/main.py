@@ -16,6 +16,8 @@ from rally.common import utils as common_utils
 from rally.task import atomic
 from rally.task import utils
 
+from rally_openstack.common.services.heat import templates
+
 CONF = cfg.CONF
 
 
@@ -41,11 +43,11 @@ class Stack(common_utils.RandomNameGeneratorMixin):
         """
         self.scenario = scenario
         self.task = task
-        self.template = open(template).read()
+        self.template = templates.TEMPLATES.read(template)
         self.files = {}
         self.parameters = parameters
         for name, path in files.items():
-            self.files[name] = open(path).read()
+            self.files[name] = templates.TEMPLATES.read(path)
 
     def _wait(self, ready_statuses, failure_statuses):
         self.stack = utils.wait_for_status(
@@ -0,0 +1,96 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Registry of Heat templates and their files shared by iterations."""
+
+import copy
+import os
+import threading
+
+
+class ReadOnlyDict(dict):
+    """A dict which can not be changed, so it can be shared by iterations.
+
+    It is still a dict, so clients serialize it as usual. Copies (including
+    deep ones) and unpickled objects are plain dicts, which can be changed.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("%s can not be changed." % self.__class__.__name__)
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class TemplateRegistry(object):
+    """Content of template files read once until the files change.
+
+    Files are compared with the last read by modification time and size,
+    so every iteration costs a stat call instead of reading the files.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # path -> (mtime, size, content)
+        self._contents = {}
+        # tuple of paths -> (tuple of contents, ReadOnlyDict)
+        self._files = {}
+
+    def read(self, path):
+        """Return content of the file.
+
+        :param path: path to the file, "~" is expanded
+        """
+        path = os.path.expanduser(path)
+        st = os.stat(path)
+        with self._lock:
+            cached = self._contents.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns,
+                                                 st.st_size):
+            return cached[2]
+        with open(path, "r") as f:
+            content = f.read()
+        with self._lock:
+            self._contents[path] = (st.st_mtime_ns, st.st_size, content)
+        return content
+
+    def files(self, paths):
+        """Return contents of files as a read-only dict shared by callers.
+
+        :param paths: paths to files, "~" is expanded. Keys of the result
+            are expanded paths (the same as "file_dict" type returns)
+        """
+        key = tuple(os.path.expanduser(path) for path in paths)
+        contents = tuple(self.read(path) for path in key)
+        with self._lock:
+            cached = self._files.get(key)
+            if cached is None or cached[0] != contents:
+                cached = (contents, ReadOnlyDict(zip(key, contents)))
+                self._files[key] = cached
+        return cached[1]
+
+    def clear(self):
+        with self._lock:
+            self._contents = {}
+            self._files = {}
+
+
+TEMPLATES = TemplateRegistry()
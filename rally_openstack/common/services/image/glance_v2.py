@@ -21,6 +21,7 @@ from rally.task import atomic
 from rally.task import utils
 import requests
 
+from rally_openstack.common import image_cache
 from rally_openstack.common import service
 from rally_openstack.common.services.image import glance_common
 from rally_openstack.common.services.image import image
@@ -36,6 +37,10 @@ class GlanceV2Service(service.Service, glance_common.GlanceMixin):
     def upload_data(self, image_id, image_location):
         """Upload the data for an image.
 
+        Images downloaded by URL are kept in the local image cache (see
+        openstack.image_cache_enabled option), so next uploads of the same
+        image are streamed from the disk.
+
         :param image_id: Image ID to upload data to.
         :param image_location: Location of the data to upload to.
         """
@@ -43,8 +48,12 @@ class GlanceV2Service(service.Service, glance_common.GlanceMixin):
         image_data = None
         response = None
         try:
+            cache = image_cache.get_image_cache()
             if os.path.isfile(image_location):
                 image_data = open(image_location, "rb")
+            elif cache:
+                with cache.use(image_location) as blob:
+                    image_data = open(blob, "rb")
             else:
                 response = requests.get(image_location, stream=True,
                                         verify=False)
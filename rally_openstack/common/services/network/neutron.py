@@ -73,10 +73,18 @@ def _clean_dict(**kwargs):
 class NeutronService(service.Service):
     """A helper class for Neutron API"""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, capabilities=None, **kwargs):
+        """Init service.
+
+        :param capabilities: CapabilityCache object of the task to share
+            extensions and external networks between services of iterations
+        """
         super(NeutronService, self).__init__(*args, **kwargs)
         self._cached_supported_extensions = None
         self._client = None
+        self._capabilities = capabilities
+        # None means unknown until the first bulk request
+        self._bulk_supported = None
 
     @property
     def client(self):
@@ -87,7 +95,8 @@ class NeutronService(service.Service):
     def create_network_topology(
             self, network_create_args=None,
             router_create_args=None, router_per_subnet=False,
-            subnet_create_args=None, subnets_count=1, subnets_dualstack=False
+            subnet_create_args=None, subnets_count=1, subnets_dualstack=False,
+            bulk=False
     ):
         """Create net infrastructure(network, router, subnets).
 
@@ -108,44 +117,91 @@ class NeutronService(service.Service):
             IPv6, the third for IPv4,..). If subnet_create_args includes one of
             ('cidr', 'start_cidr', 'ip_version') keys, subnets_dualstack
             parameter will be ignored.
+        :param bulk: Whether to create all subnets by one bulk request.
         """
-        subnet_create_args = dict(subnet_create_args or {})
+        return self.create_network_topologies(
+            count=1, network_create_args=network_create_args,
+            router_create_args=router_create_args,
+            router_per_subnet=router_per_subnet,
+            subnet_create_args=subnet_create_args,
+            subnets_count=subnets_count,
+            subnets_dualstack=subnets_dualstack,
+            bulk=bulk)[0]
+
+    def create_network_topologies(
+            self, count, network_create_args=None,
+            router_create_args=None, router_per_subnet=False,
+            subnet_create_args=None, subnets_count=1, subnets_dualstack=False,
+            bulk=False
+    ):
+        """Create several net infrastructures(network, router, subnets).
 
-        network = self.create_network(**(network_create_args or {}))
-        subnet_create_args["network_id"] = network["id"]
+        :param count: Number of networks to create.
+        :param bulk: Whether to create networks and subnets of all
+            infrastructures by bulk requests (see create_networks and
+            create_subnets methods).
 
-        routers = []
-        if router_create_args is not None:
-            for i in range(subnets_count if router_per_subnet else 1):
-                routers.append(self.create_router(**router_create_args))
+        Other arguments are equal to the create_network_topology method.
+        Returns a list of infrastructures in the format of
+        create_network_topology method.
+        """
+        subnet_create_args = dict(subnet_create_args or {})
+
+        if bulk:
+            networks = self.create_networks(count=count,
+                                            **(network_create_args or {}))
+        else:
+            networks = [self.create_network(**(network_create_args or {}))
+                        for i in range(count)]
 
-        subnets = []
-        ip_versions = itertools.cycle([4, 6] if subnets_dualstack else [4])
         use_subnets_dualstack = (
             "cidr" not in subnet_create_args
             and "start_cidr" not in subnet_create_args
             and "ip_version" not in subnet_create_args
         )
 
-        for i in range(subnets_count):
-            if use_subnets_dualstack:
-                subnet_create_args["ip_version"] = next(ip_versions)
-            if routers:
-                if router_per_subnet:
-                    router = routers[i]
+        topologies = []
+        subnets = []
+        subnets_create_args = []
+        for network in networks:
+            routers = []
+            if router_create_args is not None:
+                for i in range(subnets_count if router_per_subnet else 1):
+                    routers.append(self.create_router(**router_create_args))
+
+            ip_versions = itertools.cycle(
+                [4, 6] if subnets_dualstack else [4])
+            for i in range(subnets_count):
+                create_args = dict(subnet_create_args,
+                                   network_id=network["id"])
+                if use_subnets_dualstack:
+                    create_args["ip_version"] = next(ip_versions)
+                if routers:
+                    if router_per_subnet:
+                        router = routers[i]
+                    else:
+                        router = routers[0]
+                    create_args["router_id"] = router["id"]
+                if bulk:
+                    subnets_create_args.append(create_args)
                 else:
-                    router = routers[0]
-                subnet_create_args["router_id"] = router["id"]
+                    subnets.append(self.create_subnet(**create_args))
 
-            subnets.append(self.create_subnet(**subnet_create_args))
+            topologies.append({
+                "network": network,
+                "subnets": [],
+                "routers": routers
+            })
 
-        network["subnets"] = [s["id"] for s in subnets]
+        if bulk:
+            subnets = self.create_subnets(subnets_create_args)
+        for i, topology in enumerate(topologies):
+            topology["subnets"] = subnets[i * subnets_count:
+                                          (i + 1) * subnets_count]
+            topology["network"]["subnets"] = [
+                s["id"] for s in topology["subnets"]]
 
-        return {
-            "network": network,
-            "subnets": subnets,
-            "routers": routers
-        }
+        return topologies
 
     def delete_network_topology(self, topo):
         """Delete network topology
@@ -235,7 +291,46 @@ class NeutronService(service.Service):
             the network.
         :returns: neutron network dict
         """
-        body = _clean_dict(
+        body = self._network_body(
+            project_id=project_id,
+            admin_state_up=admin_state_up,
+            dns_domain=dns_domain,
+            mtu=mtu,
+            port_security_enabled=port_security_enabled,
+            provider_network_type=provider_network_type,
+            provider_physical_network=provider_physical_network,
+            provider_segmentation_id=provider_segmentation_id,
+            qos_policy_id=qos_policy_id,
+            router_external=router_external,
+            segments=segments,
+            shared=shared,
+            vlan_transparent=vlan_transparent,
+            description=description,
+            availability_zone_hints=availability_zone_hints
+        )
+        resp = self.client.create_network({"network": body})
+        if router_external:
+            self._invalidate_capability("external_networks")
+        return resp["network"]
+
+    @_create_network_arg_adapter()
+    def _network_body(self,
+                      project_id=_NONE,
+                      admin_state_up=_NONE,
+                      dns_domain=_NONE,
+                      mtu=_NONE,
+                      port_security_enabled=_NONE,
+                      provider_network_type=_NONE,
+                      provider_physical_network=_NONE,
+                      provider_segmentation_id=_NONE,
+                      qos_policy_id=_NONE,
+                      router_external=_NONE,
+                      segments=_NONE,
+                      shared=_NONE,
+                      vlan_transparent=_NONE,
+                      description=_NONE,
+                      availability_zone_hints=_NONE):
+        return _clean_dict(
             name=self.generate_random_name(),
             tenant_id=project_id,
             admin_state_up=admin_state_up,
@@ -255,8 +350,68 @@ class NeutronService(service.Service):
                 "router:external": router_external
             }
         )
-        resp = self.client.create_network({"network": body})
-        return resp["network"]
+
+    def create_networks(self, count, batch_size=None, **kwargs):
+        """Create neutron networks by bulk requests.
+
+        :param count: Number of networks to create.
+        :param batch_size: Max number of networks per request. Defaults to
+            openstack.neutron_bulk_create_batch_size config option.
+        :param kwargs: Arguments of networks, the format is equal to the
+            create_network method.
+        :returns: list of neutron network dicts
+        """
+        with atomic.ActionTimer(self, "neutron.create_%s_networks" % count):
+            bodies = [self._network_body(**kwargs) for i in range(count)]
+            networks = self._create_bulk("network", bodies, batch_size)
+        if any(body.get("router:external") for body in bodies):
+            self._invalidate_capability("external_networks")
+        return networks
+
+    def _create_bulk(self, resource, bodies, batch_size=None):
+        """Create resources by bulk requests of batch_size resources.
+
+        If bulk requests are not supported by Neutron, resources are created
+        one by one.
+        """
+        from neutronclient.common import exceptions as neutron_exceptions
+
+        create = getattr(self.client, "create_%s" % resource)
+        batch_size = (batch_size
+                      or CONF.openstack.neutron_bulk_create_batch_size)
+        created = []
+        for start in range(0, len(bodies), batch_size):
+            batch = bodies[start:start + batch_size]
+            if self._supports_bulk():
+                try:
+                    resp = create({"%ss" % resource: batch})
+                except neutron_exceptions.BadRequest as e:
+                    if "bulk" not in str(e).lower():
+                        raise
+                    LOG.info("Neutron does not support bulk requests, %ss "
+                             "are created one by one: %s" % (resource, e))
+                    self._bulk_supported = False
+                    self._get_capability("neutron_bulk", lambda: False,
+                                         refresh=True)
+                else:
+                    resources = list(resp["%ss" % resource])
+                    if len(resources) != len(batch):
+                        raise exceptions.RallyException(
+                            "Neutron created %s %ss instead of %s by a bulk "
+                            "request." % (len(resources), resource,
+                                          len(batch)))
+                    created.extend(resources)
+                    continue
+            for body in batch:
+                created.append(create({resource: body})[resource])
+        return created
+
+    def _supports_bulk(self):
+        if self._bulk_supported is None and self._capabilities is not None:
+            key = self._capabilities.make_key(self._clients.credential,
+                                              "neutron_bulk")
+            self._bulk_supported = self._capabilities.peek(key)
+        return self._bulk_supported is not False
 
     @atomic.action_timer("neutron.show_network")
     def get_network(self, network_id, fields=_NONE):
@@ -372,6 +527,8 @@ class NeutronService(service.Service):
         if not body:
             raise TypeError("No updates for a network.")
         resp = self.client.update_network(network_id, {"network": body})
+        if router_external is not _NONE:
+            self._invalidate_capability("external_networks")
         return resp["network"]
 
     @atomic.action_timer("neutron.delete_network")
@@ -381,6 +538,12 @@ class NeutronService(service.Service):
         :param network_id: Network ID
         """
         self.client.delete_network(network_id)
+        if self._capabilities is not None:
+            key = self._capabilities.make_key(self._clients.credential,
+                                              "external_networks")
+            if any(net["id"] == network_id
+                   for net in self._capabilities.peek(key) or []):
+                self._invalidate_capability("external_networks")
 
     @atomic.action_timer("neutron.list_networks")
     def list_networks(self, name=_NONE, router_external=_NONE, status=_NONE,
@@ -400,6 +563,16 @@ class NeutronService(service.Service):
         filters = _clean_dict(name=name, status=status, **kwargs)
         return self.client.list_networks(**filters)["networks"]
 
+    def list_external_networks(self):
+        """List external networks.
+
+        The listing is shared via the capability cache of the task if the
+        service has it, so it should not be changed by callers.
+        """
+        return self._get_capability(
+            "external_networks",
+            lambda: self.list_networks(router_external=True))
+
     IPv4_DEFAULT_DNS_NAMESERVERS = ["8.8.8.8", "8.8.4.4"]
     IPv6_DEFAULT_DNS_NAMESERVERS = ["dead:beaf::1", "dead:beaf::2"]
 
@@ -463,7 +636,41 @@ class NeutronService(service.Service):
         :param dns_publish_fixed_ip: Whether to publish DNS records for IPs
             from this subnet. Default is false.
         """
+        body = self._subnet_body(
+            network_id,
+            project_id=project_id,
+            enable_dhcp=enable_dhcp,
+            dns_nameservers=dns_nameservers,
+            allocation_pools=allocation_pools,
+            host_routes=host_routes,
+            ip_version=ip_version,
+            gateway_ip=gateway_ip,
+            cidr=cidr,
+            start_cidr=start_cidr,
+            prefixlen=prefixlen,
+            ipv6_address_mode=ipv6_address_mode,
+            ipv6_ra_mode=ipv6_ra_mode,
+            segment_id=segment_id,
+            subnetpool_id=subnetpool_id,
+            use_default_subnetpool=use_default_subnetpool,
+            service_types=service_types,
+            dns_publish_fixed_ip=dns_publish_fixed_ip
+        )
+
+        subnet = self.client.create_subnet({"subnet": body})["subnet"]
+        if router_id:
+            self.add_interface_to_router(router_id=router_id,
+                                         subnet_id=subnet["id"])
+        return subnet
 
+    def _subnet_body(self, network_id, project_id=_NONE, enable_dhcp=_NONE,
+                     dns_nameservers=_NONE, allocation_pools=_NONE,
+                     host_routes=_NONE, ip_version=_NONE, gateway_ip=_NONE,
+                     cidr=_NONE, start_cidr=_NONE, prefixlen=_NONE,
+                     ipv6_address_mode=_NONE, ipv6_ra_mode=_NONE,
+                     segment_id=_NONE, subnetpool_id=_NONE,
+                     use_default_subnetpool=_NONE, service_types=_NONE,
+                     dns_publish_fixed_ip=_NONE):
         if cidr == _NONE:
             ip_version, cidr = net_utils.generate_cidr(
                 ip_version=ip_version, start_cidr=(start_cidr or None))
@@ -476,7 +683,7 @@ class NeutronService(service.Service):
             else:
                 dns_nameservers = self.IPv6_DEFAULT_DNS_NAMESERVERS
 
-        body = _clean_dict(
+        return _clean_dict(
             name=self.generate_random_name(),
             network_id=network_id,
             tenant_id=project_id,
@@ -497,11 +704,29 @@ class NeutronService(service.Service):
             dns_publish_fixed_ip=dns_publish_fixed_ip
         )
 
-        subnet = self.client.create_subnet({"subnet": body})["subnet"]
-        if router_id:
-            self.add_interface_to_router(router_id=router_id,
-                                         subnet_id=subnet["id"])
-        return subnet
+    def create_subnets(self, subnets_create_args, batch_size=None):
+        """Create neutron subnets by bulk requests.
+
+        :param subnets_create_args: A list of dicts with arguments of
+            subnets. The format is equal to the create_subnet method.
+        :param batch_size: Max number of subnets per request. Defaults to
+            openstack.neutron_bulk_create_batch_size config option.
+        :returns: list of neutron subnet dicts
+        """
+        count = len(subnets_create_args)
+        with atomic.ActionTimer(self, "neutron.create_%s_subnets" % count):
+            routers = []
+            bodies = []
+            for create_args in subnets_create_args:
+                create_args = dict(create_args)
+                routers.append(create_args.pop("router_id", None))
+                bodies.append(self._subnet_body(**create_args))
+            subnets = self._create_bulk("subnet", bodies, batch_size)
+            for router_id, subnet in zip(routers, subnets):
+                if router_id:
+                    self.add_interface_to_router(router_id=router_id,
+                                                 subnet_id=subnet["id"])
+        return subnets
 
     @atomic.action_timer("neutron.show_subnet")
     def get_subnet(self, subnet_id):
@@ -622,7 +847,7 @@ class NeutronService(service.Service):
         """
 
         if external_gateway_info is _NONE and discover_external_gw:
-            for external_network in self.list_networks(router_external=True):
+            for external_network in self.list_external_networks():
                 external_gateway_info = {"network_id": external_network["id"]}
                 if enable_snat is _NONE:
                     permission = self._clients.credential.permission
@@ -810,12 +1035,31 @@ class NeutronService(service.Service):
             (name is restricted param)
         :returns: neutron port dict
         """
+        body = self._port_body(network_id, **kwargs)
+        return self.client.create_port({"port": body})["port"]
+
+    def _port_body(self, network_id, **kwargs):
         kwargs["name"] = self.generate_random_name()
-        body = _clean_dict(
+        return _clean_dict(
             network_id=network_id,
             **kwargs
         )
-        return self.client.create_port({"port": body})["port"]
+
+    def create_ports(self, network_id, count, batch_size=None, **kwargs):
+        """Create neutron ports by bulk requests.
+
+        :param network_id: neutron network dict
+        :param count: Number of ports to create.
+        :param batch_size: Max number of ports per request. Defaults to
+            openstack.neutron_bulk_create_batch_size config option.
+        :param kwargs: other optional neutron port creation params
+            (name is restricted param)
+        :returns: list of neutron port dicts
+        """
+        with atomic.ActionTimer(self, "neutron.create_%s_ports" % count):
+            bodies = [self._port_body(network_id, **kwargs)
+                      for i in range(count)]
+            return self._create_bulk("port", bodies, batch_size)
 
     @atomic.action_timer("neutron.show_port")
     def get_port(self, port_id, fields=_NONE):
@@ -941,7 +1185,7 @@ class NeutronService(service.Service):
         elif floating_network:
             net_id = self.find_network(floating_network, external=True)["id"]
         else:
-            ext_networks = self.list_networks(router_external=True)
+            ext_networks = self.list_external_networks()
             if not ext_networks:
                 raise exceptions.NotFoundException(
                     "Failed to allocate floating IP since no external "
@@ -1357,9 +1601,20 @@ class NeutronService(service.Service):
     def cached_supported_extensions(self):
         """Return cached list of extension if exist or fetch it if is missed"""
         if self._cached_supported_extensions is None:
-            self._cached_supported_extensions = self.list_extensions()
+            self._cached_supported_extensions = self._get_capability(
+                "neutron_extensions", self.list_extensions)
         return self._cached_supported_extensions
 
+    def _get_capability(self, kind, fetch, refresh=False):
+        if self._capabilities is None:
+            return fetch()
+        key = self._capabilities.make_key(self._clients.credential, kind)
+        return self._capabilities.get(key, fetch, refresh=refresh)
+
+    def _invalidate_capability(self, kind):
+        if self._capabilities is not None:
+            self._capabilities.invalidate(kind)
+
     def supports_extension(self, extension, silent=False):
         """Check whether a neutron extension is supported.
 
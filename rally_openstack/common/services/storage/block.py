@@ -79,6 +79,22 @@ class BlockStorage(service.UnifiedService):
             imageRef=imageRef, scheduler_hints=scheduler_hints,
             backup_id=backup_id)
 
+    @service.should_be_overridden
+    def create_volumes(self, size, count, volume_type=None,
+                       max_in_flight=None):
+        """Create several volumes and wait for all of them at once.
+
+        :param size: Size of volumes in GB
+        :param count: Number of volumes to create
+        :param volume_type: Type of volumes
+        :param max_in_flight: max number of volumes which are being created
+            at the same time (all of them by default)
+        :returns: Return a list of new volumes.
+        """
+        return self._impl.create_volumes(size, count=count,
+                                         volume_type=volume_type,
+                                         max_in_flight=max_in_flight)
+
     @service.should_be_overridden
     def list_volumes(self, detailed=True, search_opts=None, marker=None,
                      limit=None, sort=None):
@@ -14,12 +14,14 @@
 
 import random
 
+from rally.common import utils as rutils
 from rally import exceptions
 from rally.task import atomic
 from rally.task import utils as bench_utils
 
 from rally_openstack.common.services.image import image
 from rally_openstack.common.services.storage import block
+from rally_openstack.common import utils
 
 
 CONF = block.CONF
@@ -58,6 +60,51 @@ class CinderMixin(object):
             check_interval=CONF.openstack.cinder_volume_create_poll_interval
         )
 
+    def _wait_available_volumes(self, volumes):
+        """Wait for several volumes using one listing per poll."""
+        return utils.wait_for_statuses(
+            volumes,
+            ready_statuses=["available"],
+            list_resources=lambda: self._get_client().volumes.list(
+                detailed=True),
+            timeout=CONF.openstack.cinder_volume_create_timeout,
+            check_interval=CONF.openstack.cinder_volume_create_poll_interval
+        )
+
+    # a keyword argument of volumes.create which sets a name of a volume
+    _volume_name_arg = "name"
+
+    def create_volumes(self, size, count, volume_type=None,
+                       max_in_flight=None):
+        """Create several volumes and wait for all of them at once.
+
+        Requests to create volumes are sent without waiting for the previous
+        volumes, up to `max_in_flight` ones. All of them are polled with one
+        listing of volumes per check.
+
+        :param size: Size of volumes in GB
+        :param count: Number of volumes to create
+        :param volume_type: Type of volumes
+        :param max_in_flight: max number of volumes which are being created
+            at the same time (all of them by default)
+        :returns: list of created volumes
+        """
+        max_in_flight = max_in_flight or count
+        aname = "cinder_v%s.create_%s_volumes" % (self.version, count)
+        with atomic.ActionTimer(self, aname):
+            created = []
+            for start in range(0, count, max_in_flight):
+                window = []
+                for i in range(min(max_in_flight, count - start)):
+                    kwargs = {self._volume_name_arg:
+                              self.generate_random_name()}
+                    window.append(self._get_client().volumes.create(
+                        size, volume_type=volume_type, **kwargs))
+                rutils.interruptable_sleep(
+                    CONF.openstack.cinder_volume_create_prepoll_delay)
+                created.extend(self._wait_available_volumes(window))
+            return created
+
     def get_volume(self, volume_id):
         """Get target volume information."""
         aname = "cinder_v%s.get_volume" % self.version
@@ -494,6 +541,14 @@ class UnifiedCinderMixin(object):
             id=encryption_type.encryption_id,
             volume_type_id=encryption_type.volume_type_id)
 
+    def create_volumes(self, size, count, volume_type=None,
+                       max_in_flight=None):
+        """Create several volumes and wait for all of them at once."""
+        return [self._unify_volume(volume)
+                for volume in self._impl.create_volumes(
+                    size, count=count, volume_type=volume_type,
+                    max_in_flight=max_in_flight)]
+
     def delete_volume(self, volume):
         """Delete a volume."""
         self._impl.delete_volume(volume)
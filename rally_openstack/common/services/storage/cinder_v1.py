@@ -28,6 +28,8 @@ CONF = block.CONF
 @service.service("cinder", service_type="block-storage", version="1")
 class CinderV1Service(service.Service, cinder_common.CinderMixin):
 
+    _volume_name_arg = "display_name"
+
     @atomic.action_timer("cinder_v1.create_volume")
     def create_volume(self, size, snapshot_id=None, source_volid=None,
                       display_name=None, display_description=None,
@@ -0,0 +1,121 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+from rally.common import logging
+from rally import exceptions
+from rally.task import utils as task_utils
+
+
+LOG = logging.getLogger(__name__)
+
+DELETED_STATUSES = ("DELETED", "DELETE_COMPLETE")
+
+
+def wait_for_statuses(resources, ready_statuses, list_resources,
+                      failure_statuses=("error",), status_attr="status",
+                      timeout=60, check_interval=1, check_deletion=False,
+                      id_attr="id", on_ready=None):
+    """Wait for a bunch of resources to reach one of ready statuses.
+
+    It is an analogue of rally.task.utils.wait_for_status with
+    rally.task.utils.get_from_manager as update_resource, but instead of
+    fetching every resource separately on each poll, it refreshes all pending
+    resources with a single listing.
+
+    :param resources: list of resources to wait for
+    :param ready_statuses: list of statuses which mean that a resource is
+        ready
+    :param list_resources: a callable without arguments which returns an
+        iterable of fresh resources. It should include all resources from
+        `resources` which still exist (other resources are ignored)
+    :param failure_statuses: list of statuses which mean that a resource is
+        broken
+    :param status_attr: name of attribute which stores a status
+    :param timeout: max time to wait for all resources
+    :param check_interval: time to sleep between polls
+    :param check_deletion: if True, a resource which disappeared from the
+        listing is considered as ready one
+    :param id_attr: name of attribute which identifies a resource
+    :param on_ready: optional callable which is called with a resource as
+        soon as it is found in one of ready statuses
+    :returns: list of updated resources in the same order as an original one.
+        Deleted resources are represented with None
+    """
+    if not isinstance(ready_statuses, (set, list, tuple)):
+        raise ValueError("Ready statuses should be supplied as set, list or "
+                         "tuple")
+    ready_statuses = set(s.upper() for s in ready_statuses)
+    failure_statuses = set(s.upper() for s in failure_statuses or [])
+    if ready_statuses & failure_statuses:
+        raise ValueError("Can't wait for resources statuses. Ready and "
+                         "Failure statuses conflict.")
+    if not ready_statuses:
+        raise ValueError("Can't wait for resources statuses. No ready "
+                         "statuses provided")
+
+    results = list(resources)
+    pending = dict((getattr(r, id_attr), i) for i, r in enumerate(results))
+    latest_statuses = dict(
+        (rid, task_utils.get_status(results[i], status_attr))
+        for rid, i in pending.items())
+    start = time.time()
+
+    while pending:
+        fresh = dict((getattr(r, id_attr), r) for r in list_resources())
+
+        for rid, idx in list(pending.items()):
+            resource = fresh.get(rid)
+            status = (task_utils.get_status(resource, status_attr)
+                      if resource is not None else None)
+            if resource is None or status in DELETED_STATUSES:
+                if not check_deletion:
+                    raise exceptions.GetResourceNotFound(
+                        resource=results[idx])
+                results[idx] = None
+                pending.pop(rid)
+                continue
+
+            results[idx] = resource
+            if status != latest_statuses[rid]:
+                LOG.debug("Waiting for resource %(resource)s. Status "
+                          "changed: %(latest)s => %(current)s"
+                          % {"resource": getattr(resource, "name", rid),
+                             "latest": latest_statuses[rid],
+                             "current": status})
+                latest_statuses[rid] = status
+
+            if status in ready_statuses:
+                pending.pop(rid)
+                if on_ready:
+                    on_ready(resource)
+            elif status in failure_statuses:
+                raise exceptions.GetResourceErrorStatus(
+                    resource=resource, status=status,
+                    fault=getattr(resource, "fault", "n/a"))
+
+        if not pending:
+            break
+
+        time.sleep(check_interval)
+        if time.time() - start > timeout:
+            resource = results[min(pending.values())]
+            raise exceptions.TimeoutException(
+                desired_status="('%s')" % "', '".join(ready_statuses),
+                resource_name=getattr(resource, "name", repr(resource)),
+                resource_type=resource.__class__.__name__,
+                resource_id=getattr(resource, id_attr, "<no id>"),
+                resource_status=task_utils.get_status(resource, status_attr),
+                timeout=timeout)
+
+    return results
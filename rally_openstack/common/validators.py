@@ -26,6 +26,7 @@ from rally.plugins.common import validators
 from rally.task import types
 
 from rally_openstack.common import consts
+from rally_openstack.task import capabilities
 from rally_openstack.task.contexts.keystone import roles
 from rally_openstack.task.contexts.nova import flavors as flavors_ctx
 from rally_openstack.task import types as openstack_types
@@ -134,7 +135,8 @@ class ImageExistsValidator(validation.Validator):
         try:
             for user in context["users"]:
                 image_processor = openstack_types.GlanceImage(
-                    context={"admin": {"credential": user["credential"]}})
+                    context={"admin": {"credential": user["credential"]},
+                             "task": context.get("task")})
                 image_id = image_processor.pre_process(image_args, config={})
                 user["credential"].clients().glance().images.get(image_id)
         except (glance_exc.HTTPNotFound, exceptions.InvalidScenarioArgument):
@@ -237,7 +239,7 @@ class FlavorExistsValidator(validation.Validator):
         flavor.id = "<context flavor: %s>" % flavor.name
         return flavor
 
-    def _get_validated_flavor(self, config, clients, param_name):
+    def _get_validated_flavor(self, config, clients, param_name, task=None):
 
         from novaclient import exceptions as nova_exc
 
@@ -245,8 +247,10 @@ class FlavorExistsValidator(validation.Validator):
         if not flavor_value:
             self.fail("Parameter %s is not specified." % param_name)
         try:
+            # the task shares listings of flavors between validators
             flavor_processor = openstack_types.Flavor(
-                context={"admin": {"credential": clients.credential}})
+                context={"admin": {"credential": clients.credential},
+                         "task": task})
             flavor_id = flavor_processor.pre_process(flavor_value, config={})
             flavor = clients.nova().flavors.get(flavor=flavor_id)
             return flavor
@@ -264,7 +268,8 @@ class FlavorExistsValidator(validation.Validator):
         clients = context["users"][0]["credential"].clients()
         self._get_validated_flavor(config=config,
                                    clients=clients,
-                                   param_name=self.param_name)
+                                   param_name=self.param_name,
+                                   task=context.get("task"))
 
 
 @validation.add("required_platform", platform="openstack", users=True)
@@ -291,7 +296,7 @@ class ImageValidOnFlavorValidator(FlavorExistsValidator):
         self.fail_on_404_image = fail_on_404_image
         self.validate_disk = validate_disk
 
-    def _get_validated_image(self, config, clients, param_name):
+    def _get_validated_image(self, config, clients, param_name, task=None):
 
         from glanceclient import exc as glance_exc
 
@@ -318,7 +323,8 @@ class ImageValidOnFlavorValidator(FlavorExistsValidator):
                 return image
         try:
             image_processor = openstack_types.GlanceImage(
-                context={"admin": {"credential": clients.credential}})
+                context={"admin": {"credential": clients.credential},
+                         "task": task})
             image_id = image_processor.pre_process(image_args, config={})
             image = clients.glance().images.get(image_id)
             if hasattr(image, "to_dict"):
@@ -345,11 +351,13 @@ class ImageValidOnFlavorValidator(FlavorExistsValidator):
 
             if not flavor:
                 flavor = self._get_validated_flavor(
-                    config, clients, self.param_name)
+                    config, clients, self.param_name,
+                    task=context.get("task"))
 
             try:
                 image = self._get_validated_image(config, clients,
-                                                  self.image_name)
+                                                  self.image_name,
+                                                  task=context.get("task"))
             except validation.ValidationError:
                 if not self.fail_on_404_image:
                     return
@@ -411,7 +419,8 @@ class RequiredServicesValidator(validation.Validator):
             api_versions = config.get("contexts", {}).get(
                 "api_versions@openstack", {})
 
-        available_services = creds.clients().services().values()
+        available_services = capabilities.get_services(
+            capabilities.get_cache(context), creds.clients()).values()
 
         for service in self.services:
             service_config = api_versions.get(service, {})
@@ -581,9 +590,10 @@ class VolumeTypeExistsValidator(validation.Validator):
                       % self.param)
 
         for user in context["users"]:
-            clients = user["credential"].clients()
-            vt_names = [vt.name for vt in
-                        clients.cinder().volume_types.list()]
+            vt_processor = openstack_types.VolumeType(
+                context={"admin": {"credential": user["credential"]},
+                         "task": context.get("task")})
+            vt_names = [vt.name for vt in vt_processor.list_resources()]
             ctx = config.get("contexts", {}).get("volume_types", [])
             vt_names += ctx
             if volume_type not in vt_names:
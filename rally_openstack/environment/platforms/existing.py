@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import copy
 import json
 import traceback
@@ -19,6 +20,7 @@ import traceback
 from rally.common import cfg
 from rally.common import logging
 from rally.env import platform
+from rally_openstack.common import credential_check
 from rally_openstack.common import osclients
 
 
@@ -184,75 +186,95 @@ class OpenStack(platform.Platform):
             "errors": []
         }
 
+    @staticmethod
+    def _format_auth_failure(user, error, is_admin):
+        if isinstance(error, osclients.exceptions.RallyException):
+            # all rally native exceptions should provide user-friendly
+            # messages
+            return error.format_message()
+        if logging.is_debug():
+            LOG.exception("Something unexpected had happened while "
+                          "validating OpenStack credentials.", exc_info=error)
+        d = copy.deepcopy(user)
+        d["password"] = "***"
+        return ("Bad %s creds: \n%s"
+                % ("admin" if is_admin else "user",
+                   json.dumps(d, indent=2, sort_keys=True)))
+
+    @staticmethod
+    def _check_api_client(clients, name):
+        if not hasattr(clients, name):
+            return {
+                "available": False,
+                "message": ("There is no OSClient plugin '%s' for"
+                            " communicating with OpenStack API."
+                            % name)}
+        client = getattr(clients, name)
+        try:
+            client.validate_version(client.choose_version())
+            client.create_client()
+        except osclients.exceptions.RallyException as e:
+            return {
+                "available": False,
+                "message": ("Invalid setting for '%(client)s':"
+                            " %(error)s") % {
+                    "client": name, "error": e.format_message()}
+            }
+        except Exception:
+            return {
+                "available": False,
+                "message": ("Can not create '%(client)s' with"
+                            " %(version)s version.") % {
+                    "client": name,
+                    "version": client.choose_version()},
+                "traceback": traceback.format_exc()
+            }
+
     def check_health(self):
         """Check whatever platform is alive."""
 
-        users_to_check = self.platform_data["users"]
-        if self.platform_data["admin"]:
-            users_to_check.append(self.platform_data["admin"])
-        clients = None
-        for user in users_to_check:
-            user["api_info"] = self.platform_data.get("api_info", {})
-            try:
-                clients = osclients.Clients(user)
-                if self.platform_data["admin"] == user:
-                    clients.verified_keystone()
-                else:
-                    clients.keystone()
-            except osclients.exceptions.RallyException as e:
-                # all rally native exceptions should provide user-friendly
-                # messages
-                return {"available": False,
-                        "message": e.format_message(),
-                        "traceback": traceback.format_exc()}
-            except Exception:
-                d = copy.deepcopy(user)
-                d["password"] = "***"
-                if logging.is_debug():
-                    LOG.exception("Something unexpected had happened while "
-                                  "validating OpenStack credentials.")
-                if self.platform_data["admin"] == user:
-                    user_role = "admin"
-                else:
-                    user_role = "user"
-                return {
-                    "available": False,
-                    "message": (
-                        "Bad %s creds: \n%s"
-                        % (user_role,
-                           json.dumps(d, indent=2, sort_keys=True))),
-                    "traceback": traceback.format_exc()
-                }
+        users = list(self.platform_data["users"])
+        admin = self.platform_data["admin"]
+        api_info = self.platform_data.get("api_info", {})
+        for user in users + ([admin] if admin else []):
+            user["api_info"] = api_info
 
-        for name in self.platform_data.get("api_info", {}):
-            if name == "keystone":
-                continue
-            if not hasattr(clients, name):
-                return {
-                    "available": False,
-                    "message": ("There is no OSClient plugin '%s' for"
-                                " communicating with OpenStack API."
-                                % name)}
-            client = getattr(clients, name)
-            try:
-                client.validate_version(client.choose_version())
-                client.create_client()
-            except osclients.exceptions.RallyException as e:
-                return {
-                    "available": False,
-                    "message": ("Invalid setting for '%(client)s':"
-                                " %(error)s") % {
-                        "client": name, "error": e.format_message()}
-                }
-            except Exception:
-                return {
-                    "available": False,
-                    "message": ("Can not create '%(client)s' with"
-                                " %(version)s version.") % {
-                        "client": name,
-                        "version": client.choose_version()},
-                    "traceback": traceback.format_exc()
-                }
+        # users are authenticated in parallel and all failures are reported
+        # at once instead of stopping at the first bad credential
+        checks = [(user, False, result) for user, result in zip(
+            users, credential_check.authenticate(users))]
+        if admin:
+            checks.append(
+                (admin, True,
+                 credential_check.authenticate([admin], admin=True)[0]))
+        failures = [(self._format_auth_failure(user, error, is_admin), error)
+                    for user, is_admin, (_auth_ref, error) in checks
+                    if error is not None]
+        if failures:
+            message = failures[0][0]
+            if len(failures) > 1:
+                message = "%d of %d credentials are invalid:\n%s" % (
+                    len(failures), len(checks),
+                    "\n".join(msg for msg, _error in failures))
+            error = failures[0][1]
+            return {"available": False,
+                    "message": message,
+                    "traceback": "".join(traceback.format_exception(
+                        type(error), error, error.__traceback__))}
+
+        names = [name for name in api_info if name != "keystone"]
+        if not names or not checks:
+            return {"available": True}
+        clients = osclients.Clients(admin or users[-1])
+        with futures.ThreadPoolExecutor(
+                max_workers=min(len(names),
+                                CONF.openstack.keystone_auth_workers)
+        ) as executor:
+            results = list(executor.map(
+                lambda name: self._check_api_client(clients, name), names))
+        for result in results:
+            if result:
+                return result
 
         return {"available": True}
 
@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Task-scoped cache of capabilities of the cloud.
+
+Services are created for every iteration, so capabilities which they check
+(Neutron extensions, external networks, services of the catalog) were
+requested from the cloud again and again while they do not change during a
+task. The cache keeps them per (endpoint, credential role, kind) with a TTL
+for the duration of a task.
+"""
+
+import collections
+import threading
+import time
+
+from rally.common import cfg
+from rally.common import logging
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+# caches of the latest tasks are kept, older ones are dropped
+_MAX_TASKS = 4
+
+
+class CapabilityCache(object):
+    """Capabilities of the cloud fetched during one task."""
+
+    def __init__(self, ttl):
+        """Init cache.
+
+        :param ttl: time (in sec) after which a capability is fetched again
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # key -> (fetched_at, value)
+        self._values = {}
+        self._stats = {"hits": 0, "misses": 0, "expired": 0}
+
+    @staticmethod
+    def make_key(credential, kind, *args):
+        """Build a key of a capability.
+
+        :param credential: OpenStackCredential object which is used to fetch
+            the capability. Capabilities differ for admins and users
+        :param kind: kind of the capability, e.g. "neutron_extensions"
+        :param args: arguments of the capability
+        """
+        return (credential.get("auth_url"), credential.get("region_name"),
+                credential.get("endpoint_type"),
+                credential.get("permission"), kind, args)
+
+    def _get_fresh(self, key):
+        cached = self._values.get(key)
+        if cached is None:
+            return None
+        if time.time() - cached[0] >= self.ttl:
+            del self._values[key]
+            self._stats["expired"] += 1
+            return None
+        return cached
+
+    def get(self, key, fetch, refresh=False):
+        """Return the capability, fetching it if it is missed or expired.
+
+        :param key: a key built by `make_key` method
+        :param fetch: a callable which returns the capability
+        :param refresh: whether to fetch the capability again
+        """
+        with self._lock:
+            cached = None if refresh else self._get_fresh(key)
+            if cached is not None:
+                self._stats["hits"] += 1
+                return cached[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # let's not block capabilities of other keys
+        with key_lock:
+            with self._lock:
+                cached = None if refresh else self._get_fresh(key)
+                if cached is not None:
+                    self._stats["hits"] += 1
+                    return cached[1]
+            value = fetch()
+            with self._lock:
+                self._stats["misses"] += 1
+                self._values[key] = (time.time(), value)
+        return value
+
+    def peek(self, key):
+        """Return the capability if it is cached, None otherwise."""
+        with self._lock:
+            cached = self._get_fresh(key)
+        return None if cached is None else cached[1]
+
+    def invalidate(self, kind=None):
+        """Drop capabilities of the kind (all by default)."""
+        with self._lock:
+            for key in list(self._values):
+                if kind is None or key[4] == kind:
+                    del self._values[key]
+
+    def stats(self):
+        """Return hits/misses/expired counters and number of capabilities."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._values)
+        return stats
+
+
+_CACHES = collections.OrderedDict()
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(context):
+    """Return the capability cache of a task.
+
+    :param context: a context which contains the task (like the one of
+        validators, scenarios or contexts)
+    :returns: CapabilityCache object or None if the cache is disabled or the
+        context does not contain the task
+    """
+    ttl = CONF.openstack.capability_cache_ttl
+    if not ttl:
+        return None
+    try:
+        task_uuid = (context or {})["task"]["uuid"]
+    except (KeyError, TypeError):
+        return None
+    with _CACHES_LOCK:
+        cache = _CACHES.pop(task_uuid, None)
+        if cache is None:
+            cache = CapabilityCache(ttl)
+        _CACHES[task_uuid] = cache
+        while len(_CACHES) > _MAX_TASKS:
+            _CACHES.popitem(last=False)
+    return cache
+
+
+def invalidate(context, kind=None):
+    """Drop cached capabilities of the kind, e.g. after changing them."""
+    cache = get_cache(context)
+    if cache is not None:
+        cache.invalidate(kind)
+
+
+def clear():
+    """Drop caches of all tasks."""
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
+
+def get_services(cache, clients):
+    """Return services of the catalog, i.e. {"service_type": "name", ...}.
+
+    :param cache: CapabilityCache object or None
+    :param clients: osclients.Clients object
+    """
+    if cache is None:
+        return clients.services()
+    key = cache.make_key(clients.credential, "services")
+    return cache.get(key, clients.services)
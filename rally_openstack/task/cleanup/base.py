@@ -41,7 +41,8 @@ class NoName(object):
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.openstack.resource_deletion_timeout,
-             interval=1, threads=CONF.openstack.cleanup_threads):
+             interval=1, threads=CONF.openstack.cleanup_threads,
+             depends_on=None):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -61,6 +62,12 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param depends_on: Names of resource managers in format <service> or
+                       <service>.<resource> which should finish cleanup
+                       before this one starts. Resource managers of the same
+                       service are always processed in order. None means
+                       that all resource managers with lower order should
+                       finish first
     """
 
     def inner(cls):
@@ -75,6 +82,7 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._depends_on = depends_on
 
         return cls
 
@@ -92,11 +100,26 @@ class ResourceManager(object):
     list() and is_deleted() methods to make them fit to your case.
     """
 
-    def __init__(self, resource=None, admin=None, user=None, tenant_uuid=None):
+    def __init__(self, resource=None, admin=None, user=None, tenant_uuid=None,
+                 cache=None, name_prefix=None):
+        """Init resource manager.
+
+        :param resource: raw resource object
+        :param admin: admin clients
+        :param user: user clients
+        :param tenant_uuid: id of tenant to process
+        :param cache: dict shared between resource managers of one cleanup
+            run. It can be used to share listings between tenants. The
+            "tenant_uuids" key contains ids of all tenants to process.
+        :param name_prefix: a prefix which all names of resources to delete
+            should start with. It can be used for server-side filtering.
+        """
         self.admin = admin
         self.user = user
         self.raw_resource = resource
         self.tenant_uuid = tenant_uuid
+        self.cache = cache if cache is not None else {}
+        self.name_prefix = name_prefix
 
     def _manager(self):
         client = self._admin_required and self.admin or self.user
@@ -13,9 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import itertools
+import os
+import threading
 import time
 
 from rally.common import broker
+from rally.common import cfg
 from rally.common import logging
 from rally.common.plugin import discover
 from rally.common.plugin import plugin
@@ -23,13 +28,130 @@ from rally.common import utils as rutils
 from rally_openstack.task.cleanup import base
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
+class DeletionPoller(object):
+    """Waits for deletion of resources in a single thread.
+
+    Resource managers put resources here right after sending delete requests,
+    so their worker threads do not block in a sleep-poll loop and can proceed
+    with the next resources.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._counter = itertools.count()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run,
+                                        name="cleanup-deletion-poller")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+
+    def add(self, owner, resource, msg_kw):
+        """Start waiting for resource deletion.
+
+        :param owner: an object to group resources by. See wait() method
+        :param resource: instance of resource manager initiated with resource
+                         that was requested to delete
+        :param msg_kw: dict with details of resource to log
+        """
+        now = time.time()
+        with self._cond:
+            self._pending[next(self._counter)] = {
+                "owner": owner, "resource": resource, "msg_kw": msg_kw,
+                "started_at": now, "check_at": now, "failures": 0}
+            self._cond.notify_all()
+
+    def wait(self, owner):
+        """Wait until all resources of the owner are deleted or timed out."""
+        with self._cond:
+            while not self._stopped and any(
+                    e["owner"] is owner for e in self._pending.values()):
+                self._cond.wait()
+
+    def _check(self, entry):
+        """Check resource and return True if waiting for it is over."""
+        resource = entry["resource"]
+        try:
+            if resource.is_deleted():
+                return True
+        except Exception:
+            LOG.exception(
+                "Seems like %s.%s.is_deleted(self) method is broken "
+                "It shouldn't raise any exceptions."
+                % (resource.__module__, type(resource).__name__))
+
+            # NOTE(boris-42): Avoid LOG spamming in case of bad
+            #                 is_deleted() method
+            entry["failures"] += 1
+            if entry["failures"] > resource._max_attempts:
+                LOG.warning("Resource deletion failed, timeout occurred for "
+                            "%(service)s.%(resource)s: %(uuid)s."
+                            % entry["msg_kw"])
+                return True
+
+        now = time.time()
+        if now + resource._interval - entry["started_at"] >= (
+                resource._timeout):
+            LOG.warning("Resource deletion failed, timeout occurred for "
+                        "%(service)s.%(resource)s: %(uuid)s."
+                        % entry["msg_kw"])
+            return True
+        entry["check_at"] = now + resource._interval
+        return False
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.time()
+                due = [(key, e) for key, e in self._pending.items()
+                       if e["check_at"] <= now]
+                if not due:
+                    timeout = None
+                    if self._pending:
+                        timeout = min(e["check_at"]
+                                      for e in self._pending.values()) - now
+                    self._cond.wait(timeout)
+                    continue
+
+            finished = []
+            for key, entry in due:
+                try:
+                    if self._check(entry):
+                        finished.append(key)
+                except Exception:
+                    # the poller should not die, otherwise waiters hang
+                    LOG.exception("Failed to check deletion of %s"
+                                  % entry["resource"])
+                    finished.append(key)
+
+            if finished:
+                with self._cond:
+                    for key in finished:
+                        self._pending.pop(key)
+                    self._cond.notify_all()
+
+
 class SeekAndDestroy(object):
 
     def __init__(self, manager_cls, admin, users,
-                 resource_classes=None, task_id=None):
+                 resource_classes=None, task_id=None, cache=None,
+                 poller=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -41,6 +163,11 @@ class SeekAndDestroy(object):
         :param resource_classes: Resource classes to match resource names
                                  against
         :param task_id: The UUID of task to match resource names against
+        :param cache: dict shared between resource managers of one cleanup
+                      run. Allows to share listings between tenants
+        :param poller: DeletionPoller instance to wait for deletion of
+                       resources. If it is not specified, a worker thread
+                       waits for deletion of each resource itself
         """
         self.manager_cls = manager_cls
         self.admin = admin
@@ -48,6 +175,35 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        self.cache = cache if cache is not None else {}
+        self.poller = poller
+        self.name_prefix = self._get_name_prefix()
+
+    def _get_name_prefix(self):
+        """Returns a prefix which all names of resources to delete start with.
+
+        Resource managers may use it for server-side filtering. None is
+        returned if there is no such common prefix.
+        """
+        if self.task_id and not isinstance(self.task_id, str):
+            return None
+        default_matcher = rutils.RandomNameGeneratorMixin.name_matches_object
+        prefixes = []
+        for cls in self.resource_classes:
+            if (getattr(cls.name_matches_object, "__func__", None)
+                    is not default_matcher.__func__):
+                # custom matching rules can not be turned into a prefix
+                return None
+            match = cls._resource_name_placeholder_re.match(
+                cls.RESOURCE_NAME_FORMAT)
+            if not match:
+                return None
+            prefix = match.group("prefix")
+            if self.task_id:
+                prefix += cls._generate_task_id_part(
+                    self.task_id, len(match.group("task")))
+            prefixes.append(prefix)
+        return os.path.commonprefix(prefixes) or None
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -90,6 +246,10 @@ class SeekAndDestroy(object):
             else:
                 LOG.warning("%(msg)s Reason: %(e)s" % {"msg": msg, "e": e})
         else:
+            if self.poller:
+                self.poller.add(self, resource, msg_kw)
+                return
+
             started = time.time()
             failures_count = 0
             while time.time() - started < resource._timeout:
@@ -139,10 +299,15 @@ class SeekAndDestroy(object):
         if self.admin and (not self.users
                            or self.manager_cls._perform_for_admin_only):
             manager = self.manager_cls(
-                admin=self._get_cached_client(self.admin))
+                admin=self._get_cached_client(self.admin),
+                cache=self.cache,
+                name_prefix=self.name_prefix)
             _publish(self.admin, None, manager)
 
         else:
+            self.cache.setdefault(
+                "tenant_uuids",
+                sorted(set(u["tenant_id"] for u in self.users)))
             visited_tenants = set()
             admin_client = self._get_cached_client(self.admin)
             for user in self.users:
@@ -154,7 +319,9 @@ class SeekAndDestroy(object):
                 manager = self.manager_cls(
                     admin=admin_client,
                     user=self._get_cached_client(user),
-                    tenant_uuid=user["tenant_id"])
+                    tenant_uuid=user["tenant_id"],
+                    cache=self.cache,
+                    name_prefix=self.name_prefix)
                 _publish(self.admin, user, manager)
 
     def _consumer(self, cache, args):
@@ -178,6 +345,8 @@ class SeekAndDestroy(object):
 
         broker.run(self._publisher, self._consumer,
                    consumers_count=self.manager_cls._threads)
+        if self.poller:
+            self.poller.wait(self)
 
 
 def list_resource_names(admin_required=None):
@@ -237,6 +406,50 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def get_dependencies(resource_managers):
+    """Returns resource managers which should finish before each one.
+
+    :param resource_managers: list of resource managers sorted by order
+    :returns: dict with resource managers as keys and sets of resource
+              managers they depend on as values
+    """
+    dependencies = {}
+    for i, mgr in enumerate(resource_managers):
+        dependencies[mgr] = set()
+        for prev in resource_managers[:i]:
+            if (mgr._depends_on is None
+                    or prev._service == mgr._service
+                    or prev._service in mgr._depends_on
+                    or "%s.%s" % (prev._service, prev._resource)
+                    in mgr._depends_on):
+                dependencies[mgr].add(prev)
+    return dependencies
+
+
+def _run_pipeline(resource_managers, func, workers):
+    """Call func for each resource manager respecting their dependencies.
+
+    Resource managers which do not depend on each other are processed
+    simultaneously.
+    """
+    dependencies = get_dependencies(resource_managers)
+    pending = list(resource_managers)
+    finished = set()
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            for mgr in list(pending):
+                if dependencies[mgr] <= finished:
+                    pending.remove(mgr)
+                    running[executor.submit(func, mgr)] = mgr
+            done, _ = futures.wait(running,
+                                   return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                finished.add(running.pop(future))
+                # re-raise an error if any
+                future.result()
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None,
             superclass=plugin.Plugin, task_id=None):
     """Generic cleaner.
@@ -245,7 +458,8 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     with _service from services or _resource from resources.
 
     Then goes through all passed users and using cleaners cleans all related
-    resources.
+    resources. Cleaners which do not depend on each other (see depends_on
+    argument of base.resource decorator) work simultaneously.
 
     :param names: Use only resource managers that have names in this list.
                   There are in as _service or
@@ -273,10 +487,23 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
-    for manager in find_resource_managers(names, admin_required):
+    # the cache is shared by all resource managers of one cleanup run, so
+    # listings can be reused between tenants
+    cache = {}
+    poller = DeletionPoller()
+
+    def _cleanup(manager):
         LOG.debug("Cleaning up %(service)s %(resource)s objects"
                   % {"service": manager._service,
                      "resource": manager._resource})
         SeekAndDestroy(manager, admin, users,
                        resource_classes=resource_classes,
-                       task_id=task_id).exterminate()
+                       task_id=task_id, cache=cache,
+                       poller=poller).exterminate()
+
+    poller.start()
+    try:
+        _run_pipeline(find_resource_managers(names, admin_required),
+                      _cleanup, CONF.openstack.cleanup_parallel_managers)
+    finally:
+        poller.stop()
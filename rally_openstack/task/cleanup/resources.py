@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import re
+
 from rally.common import cfg
 from rally.common import logging
+from rally.common import utils as rutils
 from rally.task import utils as task_utils
 
 from rally_openstack.common.services.identity import identity
@@ -143,8 +146,27 @@ _nova_order = get_order(200)
                tenant_resource=True)
 class NovaServer(base.ResourceManager):
     def list(self):
-        """List all servers."""
-        return self._manager().list(limit=-1)
+        """List all servers page by page.
+
+        If all names of servers to delete share a prefix, only servers whose
+        names start with it are requested.
+        """
+        search_opts = {}
+        if self.name_prefix:
+            search_opts["name"] = "^%s" % re.escape(self.name_prefix)
+        page_size = CONF.openstack.cleanup_list_page_size
+        marker = None
+        while True:
+            servers = rutils.retry(3, self._manager().list,
+                                   search_opts=search_opts, marker=marker,
+                                   limit=page_size)
+            # NOTE: a page can be shorter than the limit if Nova caps it
+            #   with its own max_limit, so only an empty page is the end
+            if not servers or servers[-1].id == marker:
+                break
+            for server in servers:
+                yield server
+            marker = servers[-1].id
 
     def delete(self):
         if getattr(self.raw_resource, "OS-EXT-STS:locked", False):
@@ -202,6 +224,8 @@ _neutron_order = get_order(300)
 
 @base.resource(service=None, resource=None, admin_required=True)
 class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
+    # attributes to request while listing resources. None means all of them
+    _list_fields = None
 
     @property
     def _neutron(self):
@@ -232,13 +256,26 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
         else:
             return self._resource + "s"
 
+    def _list_pages(self, plural_key, client=None, **filters):
+        """Iterate over resources fetching them page by page."""
+        client = client or self._manager()
+        list_method = getattr(client, "list_%s" % plural_key)
+        pages = list_method(retrieve_all=False,
+                            limit=CONF.openstack.cleanup_list_page_size,
+                            **filters)
+        for page in pages:
+            for resource in page[plural_key]:
+                yield resource
+
     def list(self):
-        list_method = getattr(self._manager(), "list_%s" % self._plural_key)
-        result = list_method(tenant_id=self.tenant_uuid)[self._plural_key]
+        filters = {"tenant_id": self.tenant_uuid}
+        if self._list_fields:
+            filters["fields"] = list(self._list_fields)
+        result = self._list_pages(self._plural_key, **filters)
         if self.tenant_uuid:
-            result = [r for r in result if r["tenant_id"] == self.tenant_uuid]
+            result = (r for r in result if r["tenant_id"] == self.tenant_uuid)
 
-        return result
+        return list(result)
 
 
 class NeutronLbaasV1Mixin(NeutronMixin):
@@ -383,6 +420,8 @@ class NeutronBgpvpn(NeutronMixin):
 @base.resource("neutron", "floatingip", order=next(_neutron_order),
                tenant_resource=True)
 class NeutronFloatingIP(NeutronMixin):
+    _list_fields = ("id", "description", "tenant_id")
+
     def name(self):
         return self.raw_resource.get("description", "")
 
@@ -400,6 +439,7 @@ class NeutronFloatingIP(NeutronMixin):
                tenant_resource=True)
 class NeutronTrunk(NeutronMixin):
     # Trunks must be deleted before the parent/subports are deleted
+    _list_fields = ("id", "name", "tenant_id")
 
     def list(self):
         try:
@@ -416,10 +456,10 @@ class NeutronPort(NeutronMixin):
     # NOTE(andreykurilin): port is the kind of resource that can be created
     #   automatically. In this case it doesn't have name field which matches
     #   our resource name templates.
-
-    def __init__(self, *args, **kwargs):
-        super(NeutronPort, self).__init__(*args, **kwargs)
-        self._cache = {}
+    _list_fields = ("id", "name", "tenant_id", "device_owner", "device_id")
+    _router_fields = ("id", "name", "tenant_id")
+    # max number of tenants to filter by in a single request
+    _tenants_per_request = 50
 
     @property
     def ROUTER_INTERFACE_OWNERS(self):
@@ -430,11 +470,36 @@ class NeutronPort(NeutronMixin):
         return self._neutron.ROUTER_GATEWAY_OWNER
 
     def _get_resources(self, resource):
-        if resource not in self._cache:
-            resources = getattr(self._neutron, "list_%s" % resource)()
-            self._cache[resource] = [r for r in resources
-                                     if r["tenant_id"] == self.tenant_uuid]
-        return self._cache[resource]
+        """Returns resources of the tenant.
+
+        Listings are stored in the cache shared between managers of one
+        cleanup run. With admin credentials, resources of all tenants are
+        fetched at once, so the following tenants do not trigger new
+        requests.
+        """
+        if not self.tenant_uuid:
+            return []
+        by_tenant = self.cache.setdefault("neutron.%s" % resource, {})
+        if self.tenant_uuid not in by_tenant:
+            tenants = [self.tenant_uuid]
+            if self.admin:
+                tenants.extend(t for t in self.cache.get("tenant_uuids", [])
+                               if t not in by_tenant and t not in tenants)
+            fetched = dict((tenant_id, []) for tenant_id in tenants)
+            fields = (self._list_fields if resource == "ports"
+                      else self._router_fields)
+            client = self.admin.neutron() if self.admin else None
+            step = self._tenants_per_request
+            for i in range(0, len(tenants), step):
+                for r in self._list_pages(resource, client=client,
+                                          tenant_id=tenants[i:i + step],
+                                          fields=list(fields)):
+                    if r["tenant_id"] in fetched:
+                        fetched[r["tenant_id"]].append(r)
+            # the cache is filled only by complete listings, so a failed
+            # request does not look like a tenant without resources
+            by_tenant.update(fetched)
+        return by_tenant[self.tenant_uuid]
 
     def list(self):
         ports = self._get_resources("ports")
@@ -470,24 +535,26 @@ class NeutronPort(NeutronMixin):
 @base.resource("neutron", "subnet", order=next(_neutron_order),
                tenant_resource=True)
 class NeutronSubnet(NeutronMixin):
-    pass
+    _list_fields = ("id", "name", "tenant_id")
 
 
 @base.resource("neutron", "network", order=next(_neutron_order),
                tenant_resource=True)
 class NeutronNetwork(NeutronMixin):
-    pass
+    _list_fields = ("id", "name", "tenant_id")
 
 
 @base.resource("neutron", "router", order=next(_neutron_order),
                tenant_resource=True)
 class NeutronRouter(NeutronMixin):
-    pass
+    _list_fields = ("id", "name", "tenant_id")
 
 
 @base.resource("neutron", "security_group", order=next(_neutron_order),
                tenant_resource=True)
 class NeutronSecurityGroup(NeutronMixin):
+    _list_fields = ("id", "name", "tenant_id")
+
     def list(self):
         try:
             tenant_sgs = super(NeutronSecurityGroup, self).list()
@@ -512,40 +579,45 @@ class NeutronQuota(QuotaMixin):
 # CINDER
 
 _cinder_order = get_order(400)
+# volumes can be attached to servers, other services do not use cinder
+#   resources before cinder cleanup
+_cinder_depends_on = ("magnum", "heat", "senlin", "nova")
 
 
 @base.resource("cinder", "backups", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on)
 class CinderVolumeBackup(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "volume_types", order=next(_cinder_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               depends_on=_cinder_depends_on)
 class CinderVolumeType(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "volume_snapshots", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on)
 class CinderVolumeSnapshot(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "transfers", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on)
 class CinderVolumeTransfer(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "volumes", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=_cinder_depends_on)
 class CinderVolume(base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "image_volumes_cache", order=next(_cinder_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               depends_on=_cinder_depends_on)
 class CinderImageVolumeCache(base.ResourceManager):
 
     def _glance(self):
@@ -569,13 +641,15 @@ class CinderImageVolumeCache(base.ResourceManager):
 
 
 @base.resource("cinder", "quotas", order=next(_cinder_order),
-               admin_required=True, tenant_resource=True)
+               admin_required=True, tenant_resource=True,
+               depends_on=_cinder_depends_on)
 class CinderQuotas(QuotaMixin, base.ResourceManager):
     pass
 
 
 @base.resource("cinder", "qos_specs", order=next(_cinder_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               depends_on=_cinder_depends_on)
 class CinderQos(base.ResourceManager):
     pass
 
@@ -699,7 +773,8 @@ class SaharaNodeGroup(SynchronizedDeletion, base.ResourceManager):
 
 # CEILOMETER
 
-@base.resource("ceilometer", "alarms", order=700, tenant_resource=True)
+@base.resource("ceilometer", "alarms", order=700, tenant_resource=True,
+               depends_on=())
 class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
     def id(self):
@@ -716,7 +791,7 @@ class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
 # ZAQAR
 
-@base.resource("zaqar", "queues", order=800)
+@base.resource("zaqar", "queues", order=800, depends_on=())
 class ZaqarQueues(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
@@ -760,13 +835,14 @@ class DesignateResource(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("designate", "servers", order=next(_designate_order),
-               admin_required=True, perform_for_admin_only=True, threads=1)
+               admin_required=True, perform_for_admin_only=True, threads=1,
+               depends_on=())
 class DesignateServer(DesignateResource):
     pass
 
 
 @base.resource("designate", "zones", order=next(_designate_order),
-               tenant_resource=True, threads=1)
+               tenant_resource=True, threads=1, depends_on=())
 class DesignateZones(DesignateResource):
 
     def list(self):
@@ -812,7 +888,7 @@ class SwiftMixin(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("swift", "object", order=next(_swift_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class SwiftObject(SwiftMixin):
 
     def list(self):
@@ -828,7 +904,7 @@ class SwiftObject(SwiftMixin):
 
 
 @base.resource("swift", "container", order=next(_swift_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class SwiftContainer(SwiftMixin):
 
     def list(self):
@@ -842,20 +918,20 @@ _mistral_order = get_order(1100)
 
 
 @base.resource("mistral", "workbooks", order=next(_mistral_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class MistralWorkbooks(SynchronizedDeletion, base.ResourceManager):
     def delete(self):
         self._manager().delete(self.raw_resource.name)
 
 
 @base.resource("mistral", "workflows", order=next(_mistral_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class MistralWorkflows(SynchronizedDeletion, base.ResourceManager):
     pass
 
 
 @base.resource("mistral", "executions", order=next(_mistral_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class MistralExecutions(SynchronizedDeletion, base.ResourceManager):
 
     def name(self):
@@ -912,25 +988,25 @@ class GnocchiMixin(base.ResourceManager):
 
 
 @base.resource("gnocchi", "archive_policy_rule", order=next(_gnocchi_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True, depends_on=())
 class GnocchiArchivePolicyRule(GnocchiMixin):
     pass
 
 
 @base.resource("gnocchi", "archive_policy", order=next(_gnocchi_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True, depends_on=())
 class GnocchiArchivePolicy(GnocchiMixin):
     pass
 
 
 @base.resource("gnocchi", "resource_type", order=next(_gnocchi_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True, depends_on=())
 class GnocchiResourceType(GnocchiMixin):
     pass
 
 
 @base.resource("gnocchi", "metric", order=next(_gnocchi_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class GnocchiMetric(GnocchiMixin):
 
     def id(self):
@@ -953,7 +1029,7 @@ class GnocchiMetric(GnocchiMixin):
 
 
 @base.resource("gnocchi", "resource", order=next(_gnocchi_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=())
 class GnocchiResource(GnocchiMixin):
     def id(self):
         return self.raw_resource["id"]
@@ -1005,13 +1081,13 @@ class WatcherMixin(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("watcher", "audit_template", order=next(_watcher_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True, depends_on=())
 class WatcherTemplate(WatcherMixin):
     pass
 
 
 @base.resource("watcher", "action_plan", order=next(_watcher_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True, depends_on=())
 class WatcherActionPlan(WatcherMixin):
 
     def name(self):
@@ -1019,7 +1095,7 @@ class WatcherActionPlan(WatcherMixin):
 
 
 @base.resource("watcher", "audit", order=next(_watcher_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True, depends_on=())
 class WatcherAudit(WatcherMixin):
 
     def name(self):
@@ -1099,7 +1175,7 @@ class KeystoneEc2(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("barbican", "secrets", order=1500, admin_required=True,
-               perform_for_admin_only=True)
+               perform_for_admin_only=True, depends_on=())
 class BarbicanSecrets(base.ResourceManager):
 
     def id(self):
@@ -1115,12 +1191,12 @@ class BarbicanSecrets(base.ResourceManager):
 
 
 @base.resource("barbican", "containers", order=1500, admin_required=True,
-               perform_for_admin_only=True)
+               perform_for_admin_only=True, depends_on=())
 class BarbicanContainers(base.ResourceManager):
     pass
 
 
 @base.resource("barbican", "orders", order=1500, admin_required=True,
-               perform_for_admin_only=True)
+               perform_for_admin_only=True, depends_on=())
 class BarbicanOrders(base.ResourceManager):
     pass
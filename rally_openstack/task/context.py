@@ -12,11 +12,24 @@
 
 import functools
 
+from rally.common import broker
+from rally.common import cfg
+from rally.common import logging
+from rally import exceptions
 from rally.task import context
 
 
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
 configure = functools.partial(context.configure, platform="openstack")
 
+RESOURCE_MANAGEMENT_WORKERS_SCHEMA = {
+    "type": "integer",
+    "minimum": 1,
+    "description": "The number of tenants to process in parallel."
+}
+
 
 class OpenStackContext(context.Context):
     """A base class for all OpenStack context classes."""
@@ -35,3 +48,57 @@ class OpenStackContext(context.Context):
             if user["tenant_id"] not in processed_tenants:
                 processed_tenants.add(user["tenant_id"])
                 yield user, user["tenant_id"]
+
+    def _run_per_tenants(self, func, users=None):
+        """Call a function for a single user of each tenant in parallel.
+
+        The number of parallel calls is limited by
+        `resource_management_workers` property of the context config or by
+        `openstack.context_resource_management_workers` option. As soon as
+        the function fails for any tenant, not started tenants are skipped.
+
+        :param func: a callable which accepts user and tenant_id
+        :param users: list of users to process. Users from the context are
+            used by default
+        :returns: a dict with results of `func` per tenant_id
+        :raises ContextSetupFailure: if `func` failed for any tenant
+        """
+        tenants = list(self._iterate_per_tenants(users))
+        if not tenants:
+            return {}
+        workers = self.config.get(
+            "resource_management_workers",
+            CONF.openstack.context_resource_management_workers)
+        threads = max(1, min(workers, len(tenants)))
+
+        results = {}
+        errors = []
+
+        def publish(queue):
+            queue.extend(tenants)
+
+        def consume(cache, args):
+            user, tenant_id = args
+            if errors:
+                return
+            try:
+                results[tenant_id] = func(user, tenant_id)
+            except Exception as e:
+                if logging.is_debug():
+                    LOG.exception("Failed to process tenant %s" % tenant_id)
+                errors.append((tenant_id, e))
+
+        LOG.debug("Processing %(tenants)d tenants using %(threads)d threads"
+                  % {"tenants": len(tenants), "threads": threads})
+        broker.run(publish, consume, threads)
+
+        if errors:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to process %(failed)d of %(total)d tenants: "
+                    "%(errors)s"
+                    % {"failed": len(errors), "total": len(tenants),
+                       "errors": "; ".join(
+                           "%s: [%s] %s" % (tenant_id, e.__class__.__name__, e)
+                           for tenant_id, e in errors)})
+        return results
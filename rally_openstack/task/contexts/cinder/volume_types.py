@@ -21,6 +21,7 @@ from rally_openstack.common import osclients
 from rally_openstack.common.services.storage import block
 from rally_openstack.task.cleanup import manager as resource_manager
 from rally_openstack.task import context
+from rally_openstack.task import discovery
 
 
 LOG = logging.getLogger(__name__)
@@ -50,6 +51,8 @@ class VolumeTypeGenerator(context.OpenStackContext):
             vtype = cinder_service.create_volume_type(vtype_name)
             self.context["volume_types"].append({"id": vtype.id,
                                                  "name": vtype_name})
+        # scenarios can look up new volume types by name
+        discovery.invalidate(self.context, "volume_types")
 
     def cleanup(self):
         mather = utils.make_name_matcher(*self.config)
@@ -58,3 +61,4 @@ class VolumeTypeGenerator(context.OpenStackContext):
             admin=self.context["admin"],
             superclass=mather,
             task_id=self.get_owner_id())
+        discovery.invalidate(self.context, "volume_types")
@@ -42,7 +42,15 @@ class VolumeGenerator(context.OpenStackContext):
             "volumes_per_tenant": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "max_in_flight": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The max number of volumes of a tenant which "
+                               "are being created at the same time."
+            },
+            "resource_management_workers":
+                context.RESOURCE_MANAGEMENT_WORKERS_SCHEMA
         },
         "required": ["size"],
         "additionalProperties": False
@@ -56,19 +64,22 @@ class VolumeGenerator(context.OpenStackContext):
         size = self.config["size"]
         volume_type = self.config.get("type", None)
         volumes_per_tenant = self.config["volumes_per_tenant"]
+        max_in_flight = self.config.get("max_in_flight")
 
-        for user, tenant_id in self._iterate_per_tenants():
-            self.context["tenants"][tenant_id].setdefault("volumes", [])
+        def create_volumes(user, tenant_id):
             clients = osclients.Clients(user["credential"])
             cinder_service = block.BlockStorage(
                 clients,
                 name_generator=self.generate_random_name,
                 atomic_inst=self.atomic_actions())
-            for i in range(volumes_per_tenant):
-                vol = cinder_service.create_volume(size,
-                                                   volume_type=volume_type)
-                self.context["tenants"][tenant_id]["volumes"].append(
-                    vol._as_dict())
+            volumes = cinder_service.create_volumes(
+                size, count=volumes_per_tenant, volume_type=volume_type,
+                max_in_flight=max_in_flight)
+            self.context["tenants"][tenant_id].setdefault("volumes", [])
+            self.context["tenants"][tenant_id]["volumes"].extend(
+                vol._as_dict() for vol in volumes)
+
+        self._run_per_tenants(create_volumes)
 
     def cleanup(self):
         resource_manager.cleanup(
@@ -22,6 +22,7 @@ from rally_openstack.common import osclients
 from rally_openstack.common.services.image import image
 from rally_openstack.task.cleanup import manager as resource_manager
 from rally_openstack.task import context
+from rally_openstack.task import discovery
 
 
 CONF = cfg.CONF
@@ -97,6 +98,8 @@ class ImageGenerator(context.OpenStackContext):
                 "enum": ["qcow2", "raw", "vhd", "vmdk", "vdi", "iso", "aki",
                          "ari", "ami"],
             },
+            "resource_management_workers":
+                context.RESOURCE_MANAGEMENT_WORKERS_SCHEMA
         },
         "oneOf": [{"description": "It is been used since Rally 0.10.0",
                    "required": ["image_url", "disk_format",
@@ -159,7 +162,7 @@ class ImageGenerator(context.OpenStackContext):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in self._iterate_per_tenants():
+        def create_images(user, tenant_id):
             current_images = []
             clients = osclients.Clients(user["credential"])
             image_service = image.Image(
@@ -178,6 +181,10 @@ class ImageGenerator(context.OpenStackContext):
 
             self.context["tenants"][tenant_id]["images"] = current_images
 
+        self._run_per_tenants(create_images)
+        # scenarios can look up new images by name
+        discovery.invalidate(self.context, "images")
+
     def cleanup(self):
         if self.context.get("admin", {}):
             # NOTE(andreykurilin): Glance does not require the admin for
@@ -205,3 +212,4 @@ class ImageGenerator(context.OpenStackContext):
                                  users=self.context.get("users", []),
                                  superclass=matcher,
                                  task_id=self.get_owner_id())
+        discovery.invalidate(self.context, "images")
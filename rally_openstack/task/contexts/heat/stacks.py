@@ -46,7 +46,9 @@ class StackGenerator(context.OpenStackContext):
             "resources_per_stack": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "resource_management_workers":
+                context.RESOURCE_MANAGEMENT_WORKERS_SCHEMA
         },
         "additionalProperties": False
     }
@@ -71,7 +73,8 @@ class StackGenerator(context.OpenStackContext):
     def setup(self):
         template = self._prepare_stack_template(
             self.config["resources_per_stack"])
-        for user, tenant_id in self._iterate_per_tenants():
+
+        def create_stacks(user, tenant_id):
             heat_scenario = heat_utils.HeatScenario(
                 {"user": user, "task": self.context["task"],
                  "owner_id": self.context["owner_id"]})
@@ -80,6 +83,8 @@ class StackGenerator(context.OpenStackContext):
                 stack = heat_scenario._create_stack(template)
                 self.context["tenants"][tenant_id]["stacks"].append(stack.id)
 
+        self._run_per_tenants(create_stacks)
+
     def cleanup(self):
         resource_manager.cleanup(names=["heat.stacks"],
                                  users=self.context.get("users", []),
@@ -25,6 +25,7 @@ from rally import exceptions
 
 from rally_openstack.common import consts
 from rally_openstack.common import credential
+from rally_openstack.common import credential_check
 from rally_openstack.common import osclients
 from rally_openstack.common.services.identity import identity
 from rally_openstack.common.services.network import neutron
@@ -245,15 +246,30 @@ class UserGenerator(context.OpenStackContext):
         LOG.debug("Using existing users for OpenStack platform.")
         api_info = copy.deepcopy(self.env["platforms"]["openstack"].get(
             "api_info", {}))
+        credentials = []
         for user_credential in self.existing_users:
             user_credential = copy.deepcopy(user_credential)
             if "api_info" in user_credential:
                 api_info.update(user_credential["api_info"])
             user_credential["api_info"] = api_info
-            user_credential = credential.OpenStackCredential(**user_credential)
-            user_clients = osclients.Clients(user_credential)
-            user_id = user_clients.keystone.auth_ref.user_id
-            tenant_id = user_clients.keystone.auth_ref.project_id
+            credentials.append(
+                credential.OpenStackCredential(**user_credential))
+
+        # users verified by the health check of the environment are not
+        # authenticated again, others are authenticated in parallel
+        results = credential_check.authenticate(credentials, reuse=True)
+        errors = ["%s: %s" % (user_credential.username, error)
+                  for user_credential, (_auth_ref, error)
+                  in zip(credentials, results) if error is not None]
+        if errors:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to authenticate %d of %d existing users:\n%s"
+                    % (len(errors), len(credentials), "\n".join(errors)))
+
+        for user_credential, (auth_ref, _error) in zip(credentials, results):
+            user_id = auth_ref.user_id
+            tenant_id = auth_ref.project_id
 
             if tenant_id not in self.context["tenants"]:
                 self.context["tenants"][tenant_id] = {
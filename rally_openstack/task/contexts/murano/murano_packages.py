@@ -50,7 +50,8 @@ class PackageGenerator(context.OpenStackContext):
             zip_name = pckg_path
         elif os.path.isdir(pckg_path):
             is_config_app_dir = True
-            zip_name = mutils.pack_dir(pckg_path)
+            zip_name = mutils.open_archives(self.context["task"]).get(
+                pckg_path)
         else:
             msg = "There is no zip archive or directory by this path: %s"
             raise exceptions.ContextSetupFailure(msg=msg % pckg_path,
@@ -62,9 +63,9 @@ class PackageGenerator(context.OpenStackContext):
             if is_config_app_dir:
                 self.context["tenants"][tenant_id]["murano_ctx"] = zip_name
             # TODO(astudenov): use self.generate_random_name()
-            package = clients.murano().packages.create(
-                {"categories": ["Web"], "tags": ["tag"]},
-                {"file": open(zip_name, "rb")})
+            with open(zip_name, "rb") as f:
+                package = clients.murano().packages.create(
+                    {"categories": ["Web"], "tags": ["tag"]}, {"file": f})
 
             self.context["tenants"][tenant_id]["packages"].append(package)
 
@@ -73,3 +74,4 @@ class PackageGenerator(context.OpenStackContext):
                                  users=self.context.get("users", []),
                                  superclass=self.__class__,
                                  task_id=self.get_owner_id())
+        mutils.close_archives(self.context["task"])
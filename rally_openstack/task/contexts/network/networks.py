@@ -18,6 +18,7 @@ from rally.common import validation
 
 from rally_openstack.common import consts
 from rally_openstack.common.services.network import neutron
+from rally_openstack.task import capabilities
 from rally_openstack.task.cleanup import manager as resource_manager
 from rally_openstack.task import context
 
@@ -61,6 +62,11 @@ class Network(context.OpenStackContext):
             "dualstack": {
                 "type": "boolean",
             },
+            "bulk": {
+                "type": "boolean",
+                "description": "Create networks and subnets of a tenant by "
+                               "bulk requests"
+            },
             "router": {
                 "type": "object",
                 "properties": {
@@ -84,7 +90,9 @@ class Network(context.OpenStackContext):
                     }
                 },
                 "additionalProperties": False
-            }
+            },
+            "resource_management_workers":
+                context.RESOURCE_MANAGEMENT_WORKERS_SCHEMA
         },
         "additionalProperties": False
     }
@@ -95,7 +103,8 @@ class Network(context.OpenStackContext):
         "subnets_per_network": 1,
         "network_create_args": {},
         "router": {"external": True},
-        "dualstack": False
+        "dualstack": False,
+        "bulk": False
     }
 
     def setup(self):
@@ -104,14 +113,15 @@ class Network(context.OpenStackContext):
         #               sockets are left open. This problem is eliminated by
         #               creating a connection in setup and cleanup separately.
 
-        for user, tenant_id in self._iterate_per_tenants():
+        def create_networks(user, tenant_id):
             self.context["tenants"][tenant_id]["networks"] = []
             self.context["tenants"][tenant_id]["subnets"] = []
 
             client = neutron.NeutronService(
                 user["credential"].clients(),
                 name_generator=self.generate_random_name,
-                atomic_inst=self.atomic_actions()
+                atomic_inst=self.atomic_actions(),
+                capabilities=capabilities.get_cache(self.context)
             )
             network_create_args = self.config["network_create_args"].copy()
             subnet_create_args = {
@@ -129,15 +139,26 @@ class Network(context.OpenStackContext):
                 external = router_create_args.pop("external")
                 router_create_args["discover_external_gw"] = external
 
-            for i in range(self.config["networks_per_tenant"]):
-
-                net_infra = client.create_network_topology(
+            if self.config["bulk"]:
+                net_infras = client.create_network_topologies(
+                    count=self.config["networks_per_tenant"],
                     network_create_args=network_create_args,
                     subnet_create_args=subnet_create_args,
                     subnets_dualstack=self.config["dualstack"],
                     subnets_count=self.config["subnets_per_network"],
-                    router_create_args=router_create_args)
-
+                    router_create_args=router_create_args,
+                    bulk=True)
+            else:
+                net_infras = (
+                    client.create_network_topology(
+                        network_create_args=network_create_args,
+                        subnet_create_args=subnet_create_args,
+                        subnets_dualstack=self.config["dualstack"],
+                        subnets_count=self.config["subnets_per_network"],
+                        router_create_args=router_create_args)
+                    for i in range(self.config["networks_per_tenant"]))
+
+            for net_infra in net_infras:
                 if net_infra["routers"]:
                     router_id = net_infra["routers"][0]["id"]
                 else:
@@ -151,6 +172,8 @@ class Network(context.OpenStackContext):
                     net_infra["subnets"]
                 )
 
+        self._run_per_tenants(create_networks)
+
     def cleanup(self):
         resource_manager.cleanup(
             names=[
@@ -78,7 +78,9 @@ class Router(context.OpenStackContext):
             "availability_zone_hints": {
                 "description": "Require router_availability_zone extension.",
                 "type": "boolean"
-            }
+            },
+            "resource_management_workers":
+                context.RESOURCE_MANAGEMENT_WORKERS_SCHEMA
         },
         "additionalProperties": False
     }
@@ -95,7 +97,8 @@ class Router(context.OpenStackContext):
         for parameter in parameters:
             if parameter in self.config:
                 kwargs[parameter] = self.config[parameter]
-        for user, tenant_id in self._iterate_per_tenants():
+
+        def create_routers(user, tenant_id):
             self.context["tenants"][tenant_id]["routers"] = []
             scenario = neutron_utils.NeutronScenario(
                 context={"user": user, "task": self.context["task"],
@@ -105,6 +108,8 @@ class Router(context.OpenStackContext):
                 router = scenario._create_router(kwargs)
                 self.context["tenants"][tenant_id]["routers"].append(router)
 
+        self._run_per_tenants(create_routers)
+
     def cleanup(self):
         resource_manager.cleanup(
             names=["neutron.router"],
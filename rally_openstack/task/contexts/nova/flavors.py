@@ -21,6 +21,7 @@ from rally_openstack.common import consts
 from rally_openstack.common import osclients
 from rally_openstack.task.cleanup import manager as resource_manager
 from rally_openstack.task import context
+from rally_openstack.task import discovery
 
 
 LOG = logging.getLogger(__name__)
@@ -99,6 +100,8 @@ class FlavorsGenerator(context.OpenStackContext):
 
             self.context["flavors"][flavor_config["name"]] = flavor.to_dict()
             LOG.debug("Created flavor with id '%s'" % flavor.id)
+        # scenarios can look up new flavors by name
+        discovery.invalidate(self.context, "flavors")
 
     def cleanup(self):
         """Delete created flavors."""
@@ -108,6 +111,7 @@ class FlavorsGenerator(context.OpenStackContext):
             admin=self.context["admin"],
             superclass=mather,
             task_id=self.get_owner_id())
+        discovery.invalidate(self.context, "flavors")
 
 
 class FlavorConfig(dict):
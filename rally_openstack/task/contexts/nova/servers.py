@@ -74,7 +74,9 @@ class ServerGenerator(context.OpenStackContext):
                     }
                 ]},
                 "minItems": 1
-            }
+            },
+            "resource_management_workers":
+                context.RESOURCE_MANAGEMENT_WORKERS_SCHEMA
         },
         "required": ["image", "flavor"],
         "additionalProperties": False
@@ -104,13 +106,16 @@ class ServerGenerator(context.OpenStackContext):
         flavor_id = types.Flavor(self.context).pre_process(
             resource_spec=flavor, config={})
 
-        for iter_, (user, tenant_id) in enumerate(self._iterate_per_tenants()):
+        iterations = dict((tenant_id, iter_) for iter_, (user, tenant_id)
+                          in enumerate(self._iterate_per_tenants()))
+
+        def boot_servers(user, tenant_id):
             LOG.debug("Booting servers for user tenant %s" % user["tenant_id"])
             tmp_context = {"user": user,
                            "tenant": self.context["tenants"][tenant_id],
                            "task": self.context["task"],
                            "owner_id": self.context["owner_id"],
-                           "iteration": iter_}
+                           "iteration": iterations[tenant_id]}
             nova_scenario = nova_utils.NovaScenario(tmp_context)
 
             LOG.debug("Calling _boot_servers with image_id=%(image_id)s "
@@ -132,6 +137,8 @@ class ServerGenerator(context.OpenStackContext):
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
 
+        self._run_per_tenants(boot_servers)
+
     def cleanup(self):
         resource_manager.cleanup(names=["nova.servers"],
                                  users=self.context.get("users", []),
@@ -20,6 +20,7 @@ from rally import exceptions
 from rally_openstack.common import consts
 from rally_openstack.task import context
 from rally_openstack.task.contexts.swift import utils as swift_utils
+from rally_openstack.task.scenarios.swift import utils as scenario_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -45,6 +46,20 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin,
                 "type": "integer",
                 "minimum": 1
             },
+            "segment_size": {
+                "description": "Max size of object segments (at least "
+                               "1 MiB). Objects which are bigger are "
+                               "uploaded by segments in parallel as static "
+                               "large objects.",
+                "type": "integer",
+                "minimum": scenario_utils.MIN_SEGMENT_SIZE
+            },
+            "segment_concurrency": {
+                "description": "Number of segments of an object to upload "
+                               "in parallel.",
+                "type": "integer",
+                "minimum": 1
+            },
             "resource_management_workers": {
                 "type": "integer",
                 "minimum": 1
@@ -57,6 +72,7 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin,
         "containers_per_tenant": 1,
         "objects_per_container": 1,
         "object_size": 1024,
+        "segment_concurrency": 4,
         "resource_management_workers": 30
     }
 
@@ -81,9 +97,10 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin,
         objects_num = containers_num * objects_per_container
         LOG.debug("Creating %d objects using %d threads."
                   % (objects_num, threads))
-        objects_count = len(self._create_objects(objects_per_container,
-                                                 self.config["object_size"],
-                                                 threads))
+        objects_count = len(self._create_objects(
+            objects_per_container, self.config["object_size"], threads,
+            segment_size=self.config.get("segment_size"),
+            segment_concurrency=self.config["segment_concurrency"]))
         if objects_count != objects_num:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
@@ -95,5 +112,8 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin,
         """Delete containers and objects, using the broker pattern."""
         threads = self.config["resource_management_workers"]
 
-        self._delete_objects(threads)
-        self._delete_containers(threads)
+        segment_size = self.config.get("segment_size")
+        large_objects = bool(
+            segment_size and self.config["object_size"] > segment_size)
+        self._delete_objects(threads, large_objects=large_objects)
+        self._delete_containers(threads, large_objects=large_objects)
@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally.common import broker
 
 from rally_openstack.task.scenarios.swift import utils as swift_utils
@@ -57,50 +55,54 @@ class SwiftObjectMixin(object):
 
         return containers
 
-    def _create_objects(self, objects_per_container, object_size, threads):
+    def _create_objects(self, objects_per_container, object_size, threads,
+                        segment_size=None, segment_concurrency=4):
         """Create objects and store results in Rally context.
 
         :param objects_per_container: int, number of objects to create
                                       per container
         :param object_size: int, size of created swift objects in byte
         :param threads: int, number of threads to use for broker pattern
+        :param segment_size: int, max size of object segments. Objects which
+                             are bigger are uploaded as static large objects
+        :param segment_concurrency: int, number of segments of an object to
+                                    upload in parallel
 
         :returns: list of tuples containing (account, container, object)
         """
         objects = []
 
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-
-            def publish(queue):
-                for tenant_id in self.context["tenants"]:
-                    items = self.context["tenants"][tenant_id]["containers"]
-                    for container in items:
-                        for i in range(objects_per_container):
-                            queue.append(container)
-
-            def consume(cache, container):
-                user = container["user"]
-                if user["id"] not in cache:
-                    cache[user["id"]] = swift_utils.SwiftScenario(
-                        {"user": user, "task": self.context.get("task", {})})
-                dummy_file.seek(0)
-                object_name = cache[user["id"]]._upload_object(
-                    container["container"],
-                    dummy_file)[1]
-                container["objects"].append(object_name)
-                objects.append((user["tenant_id"], container["container"],
-                                object_name))
-
-            broker.run(publish, consume, threads)
+        def publish(queue):
+            for tenant_id in self.context["tenants"]:
+                items = self.context["tenants"][tenant_id]["containers"]
+                for container in items:
+                    for i in range(objects_per_container):
+                        queue.append(container)
+
+        def consume(cache, container):
+            user = container["user"]
+            if user["id"] not in cache:
+                cache[user["id"]] = swift_utils.SwiftScenario(
+                    {"user": user, "task": self.context.get("task", {})})
+            object_name = cache[user["id"]]._upload_dummy_object(
+                container["container"], object_size,
+                segment_size=segment_size,
+                segment_concurrency=segment_concurrency)[1]
+            container["objects"].append(object_name)
+            objects.append((user["tenant_id"], container["container"],
+                            object_name))
+
+        broker.run(publish, consume, threads)
 
         return objects
 
-    def _delete_containers(self, threads):
+    def _delete_containers(self, threads, large_objects=False):
         """Delete containers created by Swift context and update Rally context.
 
         :param threads: int, number of threads to use for broker pattern
+        :param large_objects: bool, whether objects are static large objects,
+                              which segments containers should be deleted
+                              as well
         """
         def publish(queue):
             for tenant_id in self.context["tenants"]:
@@ -115,16 +117,26 @@ class SwiftObjectMixin(object):
             if user["id"] not in cache:
                 cache[user["id"]] = swift_utils.SwiftScenario(
                     {"user": user, "task": self.context.get("task", {})})
-            cache[user["id"]]._delete_container(container["container"])
+            scenario = cache[user["id"]]
+            scenario._delete_container(container["container"])
+            if large_objects:
+                scenario._delete_container(
+                    scenario._get_segments_container(container["container"]))
             tenant_containers.remove(container)
 
         broker.run(publish, consume, threads)
 
-    def _delete_objects(self, threads):
+    def _delete_objects(self, threads, large_objects=False):
         """Delete objects created by Swift context and update Rally context.
 
         :param threads: int, number of threads to use for broker pattern
+        :param large_objects: bool, whether objects are static large objects,
+                              which segments should be deleted as well
         """
+        kwargs = {}
+        if large_objects:
+            kwargs["query_string"] = "multipart-manifest=delete"
+
         def publish(queue):
             for tenant_id in self.context["tenants"]:
                 containers = self.context["tenants"][tenant_id]["containers"]
@@ -140,7 +152,7 @@ class SwiftObjectMixin(object):
                 cache[user["id"]] = swift_utils.SwiftScenario(
                     {"user": user, "task": self.context.get("task", {})})
             cache[user["id"]]._delete_object(container["container"],
-                                             object_name)
+                                             object_name, **kwargs)
             container["objects"].remove(object_name)
 
         broker.run(publish, consume, threads)
@@ -14,21 +14,200 @@
 #  under the License.
 
 import abc
+import collections
+import datetime as dt
+import hashlib
+import json
+import threading
+import time
 
 from rally.common import broker
 from rally.common import logging
 from rally.common import utils
+from rally import exceptions
 
 from rally_openstack.common import consts
 from rally_openstack.common import osclients
 from rally_openstack.common.services.image import image
 from rally_openstack.task import context
+from rally_openstack.task.scenarios.vm import utils as vm_utils
 from rally_openstack.task.scenarios.vm import vmtasks
 from rally_openstack.task import types
 
 
 LOG = logging.getLogger(__name__)
 
+# Glance tag and properties of cached custom images
+CACHE_TAG = "rally-custom-image"
+CONTEXT_PROPERTY = "rally_custom_image_context"
+FINGERPRINT_PROPERTY = "rally_custom_image_fingerprint"
+BUILDING_PROPERTY = "rally_custom_image_building"
+USED_AT_PROPERTY = "rally_custom_image_used_at"
+
+# options of the context which do not affect the custom image
+_NOT_CUSTOMIZATION_KEYS = ("image", "flavor", "password", "floating_network",
+                           "internal_network", "port", "workers", "cache")
+
+# tasks of this process build images of the same fingerprint one by one
+_BUILD_LOCKS = collections.defaultdict(threading.Lock)
+
+
+# Glance reports times like 2016-02-01T12:00:00Z
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _now():
+    return dt.datetime.utcnow().replace(microsecond=0)
+
+
+def _format_time(value):
+    return value.strftime(_TIME_FORMAT)
+
+
+def _parse_time(value):
+    return dt.datetime.strptime(value, _TIME_FORMAT)
+
+
+class ImageCache(object):
+    """Custom images kept in Glance and shared by tasks.
+
+    Images are tagged with fingerprints of everything which affects them,
+    so an image is reused by next tasks until the base image, the flavor
+    or the customization changes. Tasks which need the same image at the
+    same time wait for the one which builds it: the builder is chosen by
+    the oldest "lock" image (an image without data) of the fingerprint.
+    """
+
+    def __init__(self, glance, context_name, owner=None, max_age=168,
+                 build_timeout=3600, check_interval=5):
+        """Init cache.
+
+        :param glance: glanceclient (API v2) object
+        :param context_name: name of the context which builds images
+        :param owner: the project which owns images. Images are looked
+            for in it and built images are moved to it
+        :param max_age: images of other fingerprints which were not used
+            for this number of hours are deleted
+        :param build_timeout: time (in sec) after which a build of an image
+            by another task is considered failed
+        :param check_interval: interval (in sec) between checks for an
+            image built by another task
+        """
+        self._glance = glance
+        self.context_name = context_name
+        self.owner = owner
+        self.max_age = max_age
+        self.build_timeout = build_timeout
+        self.check_interval = check_interval
+
+    def _list(self, **filters):
+        filters["tag"] = [CACHE_TAG]
+        filters[CONTEXT_PROPERTY] = self.context_name
+        if self.owner:
+            filters["owner"] = self.owner
+        return list(self._glance.images.list(filters=filters))
+
+    def _find(self, fingerprint):
+        images = self._list(status="active",
+                            **{FINGERPRINT_PROPERTY: fingerprint})
+        if images:
+            return max(images, key=lambda i: i["created_at"])
+        return None
+
+    def _is_stale(self, marker):
+        age = _now() - _parse_time(marker["created_at"])
+        return age.total_seconds() > self.build_timeout
+
+    def _live_markers(self, fingerprint):
+        markers = []
+        for marker in self._list(**{BUILDING_PROPERTY: fingerprint}):
+            if self._is_stale(marker):
+                LOG.warning("Build of custom image %s by image %s is "
+                            "stale." % (fingerprint, marker["id"]))
+                with logging.ExceptionLogger(
+                        LOG, "Unable to delete image %s" % marker["id"]):
+                    self._glance.images.delete(marker["id"])
+            else:
+                markers.append(marker)
+        return markers
+
+    def _lock(self, fingerprint):
+        """Return the lock image if this task should build the image."""
+        marker = self._glance.images.create(
+            name="rally-custom-image-lock", container_format="bare",
+            disk_format="raw", tags=[CACHE_TAG],
+            **{CONTEXT_PROPERTY: self.context_name,
+               BUILDING_PROPERTY: fingerprint})
+        markers = self._live_markers(fingerprint) or [marker]
+        winner = min(markers, key=lambda m: (m["created_at"], m["id"]))
+        if winner["id"] == marker["id"]:
+            return marker
+        self._glance.images.delete(marker["id"])
+        return None
+
+    def _mark_used(self, image_id):
+        self._glance.images.update(
+            image_id, **{USED_AT_PROPERTY: _format_time(_now())})
+
+    def get_or_build(self, fingerprint, build):
+        """Return the image of the fingerprint, build it if it is missed.
+
+        :param fingerprint: fingerprint of the image
+        :param build: callable which builds the image and returns it
+        """
+        with _BUILD_LOCKS[fingerprint]:
+            deadline = time.time() + 2 * self.build_timeout
+            while True:
+                cached = self._find(fingerprint)
+                if cached is not None:
+                    LOG.info("Reuse custom image %s" % cached["id"])
+                    self._mark_used(cached["id"])
+                    return cached
+                if not self._live_markers(fingerprint):
+                    marker = self._lock(fingerprint)
+                    if marker is not None:
+                        try:
+                            built = build()
+                            props = {CONTEXT_PROPERTY: self.context_name,
+                                     FINGERPRINT_PROPERTY: fingerprint,
+                                     USED_AT_PROPERTY: _format_time(_now())}
+                            if self.owner:
+                                props["owner"] = self.owner
+                            self._glance.images.update(
+                                built.id,
+                                name=("rally-custom-image-%s"
+                                      % fingerprint[:16]),
+                                **props)
+                            self._glance.image_tags.update(built.id,
+                                                           CACHE_TAG)
+                            return built
+                        finally:
+                            self._glance.images.delete(marker["id"])
+                if time.time() > deadline:
+                    raise exceptions.ContextSetupFailure(
+                        ctx_name=self.context_name,
+                        msg="Custom image %s is not built by another task "
+                            "in time" % fingerprint)
+                utils.interruptable_sleep(self.check_interval)
+
+    def evict(self, keep=()):
+        """Delete images which were not used for max_age hours.
+
+        :param keep: fingerprints of images which should not be deleted
+        """
+        for cached in self._list(status="active"):
+            fingerprint = cached.get(FINGERPRINT_PROPERTY)
+            if not fingerprint or fingerprint in keep:
+                continue
+            used_at = cached.get(USED_AT_PROPERTY) or cached["created_at"]
+            age = _now() - _parse_time(used_at)
+            if age.total_seconds() > self.max_age * 3600:
+                LOG.info("Delete custom image %s which is not used since %s"
+                         % (cached["id"], used_at))
+                with logging.ExceptionLogger(
+                        LOG, "Unable to delete image %s" % cached["id"]):
+                    self._glance.images.delete(cached["id"])
+
 
 class BaseCustomImageGenerator(context.OpenStackContext,
                                metaclass=abc.ABCMeta):
@@ -90,6 +269,28 @@ class BaseCustomImageGenerator(context.OpenStackContext,
             "workers": {
                 "type": "integer",
                 "minimum": 1,
+            },
+            "cache": {
+                "type": "object",
+                "description": "Keep the image in Glance and reuse it by "
+                               "next tasks until the base image, the flavor "
+                               "or the customization changes.",
+                "properties": {
+                    "max_age": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "description": "Delete images of other "
+                                       "fingerprints which were not used "
+                                       "for this number of hours."
+                    },
+                    "build_timeout": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Time (in sec) to wait for an "
+                                       "image built by another task."
+                    }
+                },
+                "additionalProperties": False
             }
         },
         "required": ["image", "flavor"],
@@ -143,7 +344,11 @@ class BaseCustomImageGenerator(context.OpenStackContext,
             broker.run(publish, consume, self.config["workers"])
 
     def create_one_image(self, user, **kwargs):
-        """Create one image for the user."""
+        """Create one image for the user.
+
+        If the cache is configured, the image of the same fingerprint is
+        reused and a new image is kept in Glance for next tasks.
+        """
 
         clients = osclients.Clients(user["credential"])
 
@@ -152,6 +357,59 @@ class BaseCustomImageGenerator(context.OpenStackContext,
         flavor_id = types.Flavor(self.context).pre_process(
             resource_spec=self.config["flavor"], config={})
 
+        if "cache" not in self.config:
+            return self._build_image(user, clients, image_id, flavor_id,
+                                     **kwargs)
+
+        if "admin" in self.context:
+            # the image is built by a user who can be a temporary one, so
+            # the image is moved to the project of the admin which outlives
+            # the task
+            cache_clients = self.context["admin"]["credential"].clients()
+            owner = cache_clients.keystone.auth_ref.project_id
+        else:
+            # without admin users are existing ones
+            cache_clients = clients
+            owner = user["tenant_id"]
+        cache = ImageCache(cache_clients.glance("2"), self.get_name(),
+                           owner=owner, **self.config["cache"])
+        fingerprint = self.get_fingerprint(clients, image_id, flavor_id)
+        custom_image = cache.get_or_build(
+            fingerprint,
+            lambda: self._build_image(user, clients, image_id, flavor_id,
+                                      **kwargs))
+        with logging.ExceptionLogger(
+                LOG, "Unable to delete unused custom images"):
+            cache.evict(keep=[fingerprint])
+        return custom_image
+
+    def get_fingerprint(self, clients, image_id, flavor_id):
+        """Return the fingerprint of everything which affects the image."""
+        base_image = clients.glance("2").images.get(image_id)
+        flavor = clients.nova().flavors.get(flavor_id)
+        inputs = {
+            "context": self.get_name(),
+            "image": [image_id,
+                      base_image.get("os_hash_value")
+                      or base_image.get("checksum")],
+            "flavor": [flavor_id, flavor.vcpus, flavor.ram, flavor.disk],
+            "username": self.config["username"],
+            "userdata": self.config.get("userdata"),
+            "customization": self._get_customization_inputs()
+        }
+        return hashlib.sha256(
+            json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def _get_customization_inputs(self):
+        """Return JSON-serializable inputs of `_customize_image`.
+
+        Override it if the customization depends on anything except the
+        config of the context, e.g. on local files.
+        """
+        return dict((k, v) for k, v in self.config.items()
+                    if k not in _NOT_CUSTOMIZATION_KEYS)
+
+    def _build_image(self, user, clients, image_id, flavor_id, **kwargs):
         vm_scenario = vmtasks.BootRuncommandDelete(self.context,
                                                    clients=clients)
 
@@ -179,6 +437,14 @@ class BaseCustomImageGenerator(context.OpenStackContext,
 
     def cleanup(self):
         """Delete created custom image(s)."""
+        # the workload of the task is finished, so are SSH connections
+        vm_utils.close_ssh_pool(self.context)
+
+        if "cache" in self.config:
+            # images are kept for next tasks
+            for tenant in self.context["tenants"].values():
+                tenant.pop("custom_image", None)
+            return
 
         if "admin" in self.context:
             user = self.context["users"][0]
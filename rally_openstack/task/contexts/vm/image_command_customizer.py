@@ -14,6 +14,8 @@
 #  under the License.
 
 import copy
+import hashlib
+import os
 
 from rally.common import validation
 from rally import exceptions
@@ -88,6 +90,17 @@ class ImageCommandCustomizerContext(custom_image.BaseCustomImageGenerator):
         "$ref": "#/definitions/commandDict"
     }
 
+    def _get_customization_inputs(self):
+        inputs = super(ImageCommandCustomizerContext,
+                       self)._get_customization_inputs()
+        command = inputs["command"] = dict(inputs["command"])
+        # the script and the uploaded file are identified by contents
+        for key in ("script_file", "local_path"):
+            if isinstance(command.get(key), str):
+                with open(os.path.expanduser(command[key]), "rb") as f:
+                    command[key] = hashlib.sha256(f.read()).hexdigest()
+        return inputs
+
     def _customize_image(self, server, fip, user):
         code, out, err = vm_utils.VMScenario(self.context)._run_command(
             fip["ip"], self.config["port"],
@@ -0,0 +1,175 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Task-scoped cache of resource listings used to find resources by name.
+
+Validators, resource types (`rally_openstack.task.types`) and contexts look
+up images, flavors and volume types by name or regexp. Without a cache each
+lookup lists all resources of the kind, i.e. for every user of every
+workload at validation and for every iteration at runtime. The cache keeps
+one listing per (endpoint, project, resource kind, filters) for the duration
+of a task.
+"""
+
+import collections
+import re
+import threading
+
+from rally.common import cfg
+from rally.common import logging
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+# caches of the latest tasks are kept, older ones are dropped
+_MAX_TASKS = 4
+
+
+class Listing(object):
+    """Resources of one listing indexed by their names."""
+
+    def __init__(self, resources):
+        self.resources = list(resources)
+        self._by_name = collections.defaultdict(list)
+        for resource in self.resources:
+            self._by_name[getattr(resource, "name", None)].append(resource)
+        self._by_pattern = {}
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return iter(self.resources)
+
+    def __len__(self):
+        return len(self.resources)
+
+    def by_name(self, name):
+        """Return resources with exactly the name."""
+        return list(self._by_name.get(name, ()))
+
+    def search(self, pattern):
+        """Return resources which names match the regexp (re.search)."""
+        with self._lock:
+            matching = self._by_pattern.get(pattern)
+        if matching is None:
+            compiled = re.compile(pattern)
+            matching = [resource for resource in self.resources
+                        if compiled.search(resource.name or "")]
+            with self._lock:
+                self._by_pattern[pattern] = matching
+        return list(matching)
+
+
+class DiscoveryCache(object):
+    """Listings of resources made during one task."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._listings = {}
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(credential, kind, **filters):
+        """Build a key of a listing.
+
+        :param credential: OpenStackCredential object which is used to list
+            resources. Listings of different projects differ
+        :param kind: kind of resources, e.g. "images"
+        :param filters: arguments of the listing
+        """
+        return (credential.get("auth_url"), credential.get("region_name"),
+                credential.get("tenant_name"),
+                credential.get("project_domain_name"), kind,
+                tuple(sorted((k, repr(v)) for k, v in filters.items())))
+
+    def get(self, key, list_resources, refresh=False):
+        """Return the listing, making it at the first call.
+
+        :param key: a key built by `make_key` method
+        :param list_resources: a callable which returns resources
+        :param refresh: whether to list resources again
+        :returns: Listing object
+        """
+        with self._lock:
+            if not refresh and key in self._listings:
+                self._stats["hits"] += 1
+                return self._listings[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # let's not block listings of other keys
+        with key_lock:
+            with self._lock:
+                listing = self._listings.get(key)
+            if listing is None or refresh:
+                listing = Listing(list_resources())
+                with self._lock:
+                    self._stats["misses"] += 1
+                    self._listings[key] = listing
+            else:
+                with self._lock:
+                    self._stats["hits"] += 1
+        return listing
+
+    def invalidate(self, kind=None):
+        """Drop listings of resources of the kind (all by default)."""
+        with self._lock:
+            for key in list(self._listings):
+                if kind is None or key[4] == kind:
+                    del self._listings[key]
+
+    def stats(self):
+        """Return hits/misses counters and number of listings."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._listings)
+        return stats
+
+
+_CACHES = collections.OrderedDict()
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(context):
+    """Return the discovery cache of a task.
+
+    :param context: a context which contains the task (like the one of
+        validators, scenarios or contexts)
+    :returns: DiscoveryCache object or None if the cache is disabled or the
+        context does not contain the task
+    """
+    if not CONF.openstack.resource_discovery_cache:
+        return None
+    try:
+        task_uuid = (context or {})["task"]["uuid"]
+    except (KeyError, TypeError):
+        return None
+    with _CACHES_LOCK:
+        cache = _CACHES.pop(task_uuid, None)
+        if cache is None:
+            cache = DiscoveryCache()
+        _CACHES[task_uuid] = cache
+        while len(_CACHES) > _MAX_TASKS:
+            _CACHES.popitem(last=False)
+    return cache
+
+
+def invalidate(context, kind):
+    """Drop cached listings of the kind, e.g. after creating resources."""
+    cache = get_cache(context)
+    if cache is not None:
+        cache.invalidate(kind)
+
+
+def clear():
+    """Drop caches of all tasks."""
+    with _CACHES_LOCK:
+        _CACHES.clear()
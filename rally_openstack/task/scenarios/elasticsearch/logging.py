@@ -12,18 +12,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import json
-import requests
-
 from rally.common import cfg
 from rally.common import logging
-from rally.common import utils as commonutils
 from rally.task import atomic
 from rally.task import types
 from rally.task import validation
 
 from rally_openstack.common import consts
 from rally_openstack.task import scenario
+from rally_openstack.task.scenarios.elasticsearch import utils
 from rally_openstack.task.scenarios.nova import utils as nova_utils
 
 CONF = cfg.CONF
@@ -63,23 +60,28 @@ class ElasticsearchLogInstanceName(nova_utils.NovaScenario):
             request_data["query"]["bool"].update(additional_query)
 
         LOG.info("Check server ID %s in elasticsearch" % server_id)
-        i = 0
-        while i < retries_total:
-            LOG.debug("Attempt number %s" % (i + 1))
-            resp = requests.get("http://%(ip)s:%(port)s/_search" % {
-                "ip": logging_vip, "port": elasticsearch_port},
-                data=json.dumps(request_data))
-            result = resp.json()
-            if result["hits"]["total"] < 1 and i + 1 >= retries_total:
-                LOG.debug("No instance data found in Elasticsearch")
-                self.assertGreater(result["hits"]["total"], 0)
-            elif result["hits"]["total"] < 1:
-                i += 1
-                commonutils.interruptable_sleep(sleep_time)
-            else:
-                LOG.debug("Instance data found in Elasticsearch")
-                self.assertGreater(result["hits"]["total"], 0)
-                break
+        # iterations of the task share one checker which searches documents
+        # of all of them by _msearch requests
+        checker = utils.get_checker(
+            self.context, "http://%(ip)s:%(port)s" % {
+                "ip": logging_vip, "port": elasticsearch_port})
+        visible_after = checker.wait(request_data,
+                                     timeout=sleep_time * retries_total,
+                                     max_interval=sleep_time)
+        if visible_after is None:
+            LOG.debug("No instance data found in Elasticsearch")
+            self.assertIsNotNone(
+                visible_after,
+                err_msg="Server %s is not found in Elasticsearch in %s "
+                        "seconds" % (server_id, sleep_time * retries_total))
+        LOG.debug("Instance data found in Elasticsearch")
+        self.add_output(additive={
+            "title": "Elasticsearch log indexing",
+            "description": "Time (in ms) since the server became active "
+                           "until its logs were found in Elasticsearch.",
+            "chart_plugin": "StatsTable",
+            "data": [["log visible after, ms",
+                      round(visible_after * 1000, 1)]]})
 
     def run(self, image, flavor, logging_vip, elasticsearch_port, sleep_time=5,
             retries_total=30, boot_server_kwargs=None, force_delete=False,
@@ -0,0 +1,177 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Checks of documents in Elasticsearch shared by iterations of a task."""
+
+import collections
+import itertools
+import json
+import threading
+import time
+
+import requests
+
+from rally.common import logging
+
+
+LOG = logging.getLogger(__name__)
+
+# checkers of the latest tasks are kept, older ones are dropped
+_MAX_TASKS = 4
+
+
+class _Query(object):
+    """A query of one iteration waiting for documents."""
+
+    def __init__(self, body, min_interval, max_interval):
+        self.body = body
+        self.interval = min_interval
+        self.max_interval = max_interval
+        self.started_at = time.time()
+        self.check_at = self.started_at
+        self.found_at = None
+        self.found = threading.Event()
+
+
+class LogIndexChecker(object):
+    """Searches documents for all waiting iterations by one thread.
+
+    Queries which are due are sent together as one _msearch request over
+    one HTTP session. Every query is checked as soon as it is added and
+    then with intervals doubled after each miss, so the time when documents
+    became visible is measured precisely without flooding Elasticsearch.
+    """
+
+    def __init__(self, url, min_interval=0.1):
+        """Init checker.
+
+        :param url: URL of Elasticsearch, e.g. http://10.0.0.1:9200
+        :param min_interval: min time (in sec) between checks of a query
+            and between requests to Elasticsearch
+        """
+        self.url = url
+        self.min_interval = min_interval
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._queries = {}
+        self._ids = itertools.count()
+        self._thread = None
+
+    def wait(self, body, timeout, max_interval):
+        """Wait for documents which match the query.
+
+        :param body: body of a _search request
+        :param timeout: time (in sec) to wait for documents
+        :param max_interval: max time (in sec) between checks of the query
+        :returns: time (in sec) since the call until documents were found
+            or None if they were not found in time
+        """
+        query = _Query(body, min(self.min_interval, max_interval),
+                       max_interval)
+        with self._lock:
+            key = next(self._ids)
+            self._queries[key] = query
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        self._wakeup.set()
+        try:
+            query.found.wait(timeout)
+        finally:
+            with self._lock:
+                self._queries.pop(key, None)
+        if query.found_at is None:
+            return None
+        return query.found_at - query.started_at
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._queries:
+                    self._thread = None
+                    return
+                # queries added after this point wake the thread up again
+                self._wakeup.clear()
+                now = time.time()
+                due = [q for q in self._queries.values() if q.check_at <= now]
+                next_check = min(q.check_at for q in self._queries.values())
+            if due:
+                self._search(due)
+                # let's batch queries added meanwhile into the next request
+                time.sleep(self.min_interval)
+            else:
+                self._wakeup.wait(next_check - now)
+
+    def _search(self, queries):
+        data = "".join("{}\n%s\n" % json.dumps(q.body) for q in queries)
+        try:
+            resp = self._session.get(
+                "%s/_msearch" % self.url, data=data,
+                headers={"Content-Type": "application/x-ndjson"})
+            responses = resp.json()["responses"]
+        except Exception as e:
+            LOG.warning("Failed to search in Elasticsearch: %s" % e)
+            responses = []
+        checked_at = time.time()
+        with self._lock:
+            for query, result in itertools.zip_longest(queries, responses):
+                if query is None:
+                    break
+                if _hits_total(result) > 0:
+                    query.found_at = checked_at
+                    query.found.set()
+                else:
+                    query.interval = min(query.interval * 2,
+                                         query.max_interval)
+                    query.check_at = checked_at + query.interval
+
+
+def _hits_total(result):
+    # Elasticsearch 7 reports {"value": N, "relation": "eq"} instead of N
+    total = ((result or {}).get("hits") or {}).get("total", 0)
+    if isinstance(total, dict):
+        total = total.get("value", 0)
+    return total
+
+
+_CHECKERS = collections.OrderedDict()
+_CHECKERS_LOCK = threading.Lock()
+
+
+def get_checker(context, url):
+    """Return the checker of Elasticsearch shared by iterations of a task.
+
+    :param context: a context of a scenario
+    :param url: URL of Elasticsearch
+    :returns: LogIndexChecker object. It is not shared if the context does
+        not contain the task
+    """
+    try:
+        task_uuid = context["task"]["uuid"]
+    except (KeyError, TypeError):
+        return LogIndexChecker(url)
+    with _CHECKERS_LOCK:
+        checkers = _CHECKERS.pop(task_uuid, None) or {}
+        _CHECKERS[task_uuid] = checkers
+        while len(_CHECKERS) > _MAX_TASKS:
+            _CHECKERS.popitem(last=False)
+        if url not in checkers:
+            checkers[url] = LogIndexChecker(url)
+        return checkers[url]
+
+
+def clear():
+    """Drop checkers of all tasks."""
+    with _CHECKERS_LOCK:
+        _CHECKERS.clear()
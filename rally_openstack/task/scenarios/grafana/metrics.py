@@ -12,6 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
+
 from rally.common import cfg
 from rally.common import logging
 from rally.task import types
@@ -28,6 +30,25 @@ LOG = logging.getLogger(__name__)
 """Scenarios for Pushgateway and Grafana metrics."""
 
 
+def _check_metrics(scenario, grafana_svc, seeds, since, label, sleep_time,
+                   retries_total):
+    latencies = grafana_svc.check_metrics(seeds, since=since,
+                                          sleep_time=sleep_time,
+                                          retries_total=retries_total)
+    found = sorted(t for t in latencies.values() if t is not None)
+    if found:
+        scenario.add_output(additive={
+            "title": "Grafana metrics latency",
+            "description": "Time (in sec) until metrics were found in "
+                           "Grafana.",
+            "chart_plugin": "StatsTable",
+            "data": [[label, t] for t in found]})
+    missed = sorted(seed for seed, t in latencies.items() if t is None)
+    scenario.assertFalse(
+        missed, err_msg="Metrics %s are not found in Grafana"
+                        % ", ".join(missed))
+
+
 @types.convert(image={"type": "glance_image"},
                flavor={"type": "nova_flavor"})
 @validation.add("required_services", services=[consts.Service.NOVA])
@@ -108,18 +129,23 @@ class PushMetricsInstance(scenario.OpenStackScenario):
 
         self._metric_from_instance(seed, image, flavor, monitor_vip,
                                    pushgateway_port, job_name)
-        checked = grafana_svc.check_metric(seed, sleep_time=sleep_time,
-                                           retries_total=retries_total)
-        self.assertTrue(checked)
+        _check_metrics(self, grafana_svc, [seed], since=time.time(),
+                       label="server active to visible",
+                       sleep_time=sleep_time, retries_total=retries_total)
 
 
+@validation.add("number", param_name="batch_size", minval=1,
+                integer_only=True, nullable=True)
 @scenario.configure(name="GrafanaMetrics.push_metric_locally")
 class PushMetricLocal(scenario.OpenStackScenario):
     """Test monitoring system availability with local pushing random metric."""
 
     def run(self, monitor_vip, pushgateway_port, grafana, datasource_id,
-            job_name, sleep_time=5, retries_total=30):
-        """Push random metric to Pushgateway locally and check it in Grafana.
+            job_name, sleep_time=5, retries_total=30, batch_size=1):
+        """Push random metrics to Pushgateway locally and check in Grafana.
+
+        All metrics of the iteration are pushed by one request and checked
+        by one query per check.
 
         :param monitor_vip: monitoring system IP to push metric
         :param pushgateway_port: Pushgateway port to use for pushing metric
@@ -130,8 +156,9 @@ class PushMetricLocal(scenario.OpenStackScenario):
         :param sleep_time: sleep time between checking metrics in seconds
         :param retries_total: total number of retries to check metric in
                               Grafana
+        :param batch_size: number of random metrics to push and check
         """
-        seed = self.generate_random_name()
+        seeds = [self.generate_random_name() for i in range(batch_size)]
 
         grafana_svc = grafana_service.GrafanaService(
             dict(monitor_vip=monitor_vip, pushgateway_port=pushgateway_port,
@@ -140,8 +167,8 @@ class PushMetricLocal(scenario.OpenStackScenario):
             name_generator=self.generate_random_name,
             atomic_inst=self.atomic_actions())
 
-        pushed = grafana_svc.push_metric(seed)
+        pushed = grafana_svc.push_metrics(seeds)
         self.assertTrue(pushed)
-        checked = grafana_svc.check_metric(seed, sleep_time=sleep_time,
-                                           retries_total=retries_total)
-        self.assertTrue(checked)
+        _check_metrics(self, grafana_svc, seeds, since=time.time(),
+                       label="push to visible", sleep_time=sleep_time,
+                       retries_total=retries_total)
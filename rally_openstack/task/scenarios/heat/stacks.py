@@ -25,7 +25,8 @@ from rally_openstack.task.scenarios.heat import utils
 """Scenarios for Heat stacks."""
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -67,7 +68,8 @@ class ListStacksAndResources(utils.HeatScenario):
                 self.clients("heat").resources.list(stack.id)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -94,7 +96,8 @@ class CreateAndDeleteStack(utils.HeatScenario):
         self._delete_stack(stack)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -124,10 +127,10 @@ class CreateCheckDeleteStack(utils.HeatScenario):
         self._delete_stack(stack)
 
 
-@types.convert(template_path={"type": "file"},
-               updated_template_path={"type": "file"},
-               files={"type": "file_dict"},
-               updated_files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               updated_template_path={"type": "heat_template"},
+               files={"type": "heat_files"},
+               updated_files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -167,7 +170,8 @@ class CreateUpdateDeleteStack(utils.HeatScenario):
         self._delete_stack(stack)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -210,7 +214,8 @@ class CreateStackAndScale(utils.HeatScenario):
         self._scale_stack(stack, output_key, delta)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -255,7 +260,8 @@ class ListStacksAndEvents(utils.HeatScenario):
                 self.clients("heat").events.list(stack.id)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("validate_heat_template", params="template_path")
 @validation.add("required_platform", platform="openstack", users=True)
@@ -287,7 +293,8 @@ class CreateSnapshotRestoreDeleteStack(utils.HeatScenario):
         self._delete_stack(stack)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(context={"cleanup@openstack": ["heat"]},
@@ -315,7 +322,8 @@ class CreateStackAndShowOutputViaAPI(utils.HeatScenario):
         self._stack_show_output_via_API(stack, output_key)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(context={"cleanup@openstack": ["heat"]},
@@ -343,7 +351,8 @@ class CreateStackAndShowOutput(utils.HeatScenario):
         self._stack_show_output(stack, output_key)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(context={"cleanup@openstack": ["heat"]},
@@ -369,7 +378,8 @@ class CreateStackAndListOutputViaAPI(utils.HeatScenario):
         self._stack_list_output_via_API(stack)
 
 
-@types.convert(template_path={"type": "file"}, files={"type": "file_dict"})
+@types.convert(template_path={"type": "heat_template"},
+               files={"type": "heat_files"})
 @validation.add("required_services", services=[consts.Service.HEAT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(context={"cleanup@openstack": ["heat"]},
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime as dt
+import time
+
 from rally.common import cfg
 from rally.common import logging
 from rally import exceptions
@@ -29,6 +32,12 @@ LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
 
+def _event_time(event):
+    # heat reports times of events like 2016-02-01T12:00:00Z
+    return dt.datetime.strptime(event.event_time.rstrip("Z"),
+                                "%Y-%m-%dT%H:%M:%S")
+
+
 class HeatScenario(scenario.OpenStackScenario):
     """Base class for Heat scenarios with basic atomic actions."""
 
@@ -38,7 +47,6 @@ class HeatScenario(scenario.OpenStackScenario):
 
         return list(self.clients("heat").stacks.list())
 
-    @atomic.action_timer("heat.create_stack")
     def _create_stack(self, template, parameters=None,
                       files=None, environment=None):
         """Create a new stack.
@@ -59,25 +67,38 @@ class HeatScenario(scenario.OpenStackScenario):
             "files": files or {},
             "environment": environment or {}
         }
-
-        # heat client returns body instead manager object, so we should
-        # get manager object using stack_id
-        stack_id = self.clients("heat").stacks.create(**kw)["stack"]["id"]
-        stack = self.clients("heat").stacks.get(stack_id)
-
-        self.sleep_between(CONF.openstack.heat_stack_create_prepoll_delay)
-
-        stack = utils.wait_for_status(
-            stack,
-            ready_statuses=["CREATE_COMPLETE"],
-            failure_statuses=["CREATE_FAILED", "ERROR"],
-            update_resource=utils.get_from_manager(),
-            timeout=CONF.openstack.heat_stack_create_timeout,
-            check_interval=CONF.openstack.heat_stack_create_poll_interval)
-
+        by_events = CONF.openstack.heat_stack_wait_by_events
+
+        with atomic.ActionTimer(self, "heat.create_stack"):
+            # heat client returns body instead manager object, so we should
+            # get manager object using stack_id
+            stack_id = self.clients("heat").stacks.create(
+                **kw)["stack"]["id"]
+            stack = self.clients("heat").stacks.get(stack_id)
+
+            self.sleep_between(CONF.openstack.heat_stack_create_prepoll_delay)
+
+            if by_events:
+                times = self._wait_for_stack_events(
+                    stack, "CREATE",
+                    timeout=CONF.openstack.heat_stack_create_timeout,
+                    check_interval=(
+                        CONF.openstack.heat_stack_create_poll_interval))
+                stack = self.clients("heat").stacks.get(stack_id)
+            else:
+                stack = utils.wait_for_status(
+                    stack,
+                    ready_statuses=["CREATE_COMPLETE"],
+                    failure_statuses=["CREATE_FAILED", "ERROR"],
+                    update_resource=utils.get_from_manager(),
+                    timeout=CONF.openstack.heat_stack_create_timeout,
+                    check_interval=(
+                        CONF.openstack.heat_stack_create_poll_interval))
+
+        if by_events:
+            self._add_resource_times_output(stack, "CREATE", times)
         return stack
 
-    @atomic.action_timer("heat.update_stack")
     def _update_stack(self, stack, template, parameters=None,
                       files=None, environment=None):
         """Update an existing stack
@@ -99,18 +120,38 @@ class HeatScenario(scenario.OpenStackScenario):
             "files": files or {},
             "environment": environment or {}
         }
-        self.clients("heat").stacks.update(stack.id, **kw)
-
-        self.sleep_between(CONF.openstack.heat_stack_update_prepoll_delay)
-
-        stack = utils.wait_for_status(
-            stack,
-            ready_statuses=["UPDATE_COMPLETE"],
-            failure_statuses=["UPDATE_FAILED", "ERROR"],
-            update_resource=utils.get_from_manager(),
-            timeout=CONF.openstack.heat_stack_update_timeout,
-            check_interval=CONF.openstack.heat_stack_update_poll_interval)
-        return stack
+        by_events = CONF.openstack.heat_stack_wait_by_events
+        if by_events:
+            marker = self._get_last_stack_event_id(stack)
+            resource_types = self._list_stack_resource_types(stack)
+
+        with atomic.ActionTimer(self, "heat.update_stack"):
+            self.clients("heat").stacks.update(stack.id, **kw)
+
+            self.sleep_between(CONF.openstack.heat_stack_update_prepoll_delay)
+
+            if by_events:
+                times = self._wait_for_stack_events(
+                    stack, "UPDATE",
+                    timeout=CONF.openstack.heat_stack_update_timeout,
+                    check_interval=(
+                        CONF.openstack.heat_stack_update_poll_interval),
+                    marker=marker)
+                updated = self.clients("heat").stacks.get(stack.id)
+            else:
+                updated = utils.wait_for_status(
+                    stack,
+                    ready_statuses=["UPDATE_COMPLETE"],
+                    failure_statuses=["UPDATE_FAILED", "ERROR"],
+                    update_resource=utils.get_from_manager(),
+                    timeout=CONF.openstack.heat_stack_update_timeout,
+                    check_interval=(
+                        CONF.openstack.heat_stack_update_poll_interval))
+
+        if by_events:
+            self._add_resource_times_output(stack, "UPDATE", times,
+                                            resource_types=resource_types)
+        return updated
 
     @atomic.action_timer("heat.check_stack")
     def _check_stack(self, stack):
@@ -129,7 +170,6 @@ class HeatScenario(scenario.OpenStackScenario):
             timeout=CONF.openstack.heat_stack_check_timeout,
             check_interval=CONF.openstack.heat_stack_check_poll_interval)
 
-    @atomic.action_timer("heat.delete_stack")
     def _delete_stack(self, stack):
         """Delete given stack.
 
@@ -137,15 +177,143 @@ class HeatScenario(scenario.OpenStackScenario):
 
         :param stack: stack object
         """
-        stack.delete()
-        utils.wait_for_status(
-            stack,
-            ready_statuses=["DELETE_COMPLETE"],
-            failure_statuses=["DELETE_FAILED", "ERROR"],
-            check_deletion=True,
-            update_resource=utils.get_from_manager(),
-            timeout=CONF.openstack.heat_stack_delete_timeout,
-            check_interval=CONF.openstack.heat_stack_delete_poll_interval)
+        if CONF.openstack.heat_stack_wait_by_events:
+            marker = self._get_last_stack_event_id(stack)
+            resource_types = self._list_stack_resource_types(stack)
+            with atomic.ActionTimer(self, "heat.delete_stack"):
+                stack.delete()
+                times = self._wait_for_stack_events(
+                    stack, "DELETE",
+                    timeout=CONF.openstack.heat_stack_delete_timeout,
+                    check_interval=(
+                        CONF.openstack.heat_stack_delete_poll_interval),
+                    marker=marker)
+            self._add_resource_times_output(stack, "DELETE", times,
+                                            resource_types=resource_types)
+            return
+
+        with atomic.ActionTimer(self, "heat.delete_stack"):
+            stack.delete()
+            utils.wait_for_status(
+                stack,
+                ready_statuses=["DELETE_COMPLETE"],
+                failure_statuses=["DELETE_FAILED", "ERROR"],
+                check_deletion=True,
+                update_resource=utils.get_from_manager(),
+                timeout=CONF.openstack.heat_stack_delete_timeout,
+                check_interval=CONF.openstack.heat_stack_delete_poll_interval)
+
+    def _get_last_stack_event_id(self, stack):
+        """Return id of the latest event of the stack or None."""
+        events = self.clients("heat").events.list(
+            "%s/%s" % (stack.stack_name, stack.id), sort_dir="desc", limit=1)
+        return events[0].id if events else None
+
+    def _list_stack_resource_types(self, stack):
+        """Return types of resources of the stack by names of resources."""
+        resources = self.clients("heat").resources.list(
+            "%s/%s" % (stack.stack_name, stack.id))
+        return dict((r.resource_name, r.resource_type) for r in resources)
+
+    def _wait_for_stack_events(self, stack, action, timeout, check_interval,
+                               marker=None):
+        """Wait for the end of the stack action by new events of the stack.
+
+        Every check requests only events which are newer than the last seen
+        one, so the wait ends as soon as the stack reports the end of the
+        action.
+
+        :param stack: stack object
+        :param action: action of the stack to wait for, e.g. "CREATE"
+        :param timeout: time (in sec) to wait for the end of the action
+        :param check_interval: interval (in sec) between checks
+        :param marker: id of the last event of the stack before the action
+        :returns: list of names of resources and times (in sec) which they
+            took to finish the action
+        """
+        heat = self.clients("heat")
+        stack_ref = "%s/%s" % (stack.stack_name, stack.id)
+        ready_status = "%s_COMPLETE" % action
+        failure_status = "%s_FAILED" % action
+        stack_status = stack.stack_status
+        stack_reason = ""
+        # (name, action) of resources in progress -> time of the start
+        in_progress = {}
+        times = []
+        start = time.time()
+        while True:
+            try:
+                events = heat.events.list(stack_ref, marker=marker,
+                                          sort_dir="asc")
+            except Exception as e:
+                code = getattr(e, "code", getattr(e, "http_status", 400))
+                if action == "DELETE" and code == 404:
+                    # the stack is gone before we have seen the last event
+                    break
+                raise
+            for event in events:
+                marker = event.id
+                if event.physical_resource_id == stack.id:
+                    stack_status = event.resource_status
+                    stack_reason = event.resource_status_reason
+                    continue
+                res_action, _sep, res_status = (
+                    event.resource_status.rpartition("_"))
+                if res_status == "PROGRESS":
+                    in_progress[(event.resource_name,
+                                 res_action[:-len("_IN")])] = (
+                        _event_time(event))
+                elif res_status in ("COMPLETE", "FAILED"):
+                    started = in_progress.pop(
+                        (event.resource_name, res_action), None)
+                    if started is not None:
+                        times.append((event.resource_name,
+                                      (_event_time(event)
+                                       - started).total_seconds()))
+            if stack_status == failure_status:
+                raise exceptions.GetResourceErrorStatus(
+                    resource=stack.stack_name, status=stack_status,
+                    fault=stack_reason)
+            if stack_status == ready_status:
+                break
+            if time.time() - start > timeout:
+                raise exceptions.TimeoutException(
+                    desired_status=ready_status,
+                    resource_name=stack.stack_name,
+                    resource_type="stack",
+                    resource_id=stack.id,
+                    resource_status=stack_status,
+                    timeout=timeout)
+            time.sleep(check_interval)
+        return times
+
+    def _add_resource_times_output(self, stack, action, times,
+                                   resource_types=None):
+        """Add times of resources to the output by types of resources.
+
+        :param stack: stack object
+        :param action: action of the stack, e.g. "CREATE"
+        :param times: names of resources and their times (in sec), see
+            `_wait_for_stack_events`
+        :param resource_types: types of resources by names of resources.
+            Resources which are missed here are listed
+        """
+        if not times:
+            return
+        resource_types = dict(resource_types or {})
+        if any(name not in resource_types for name, _t in times):
+            resource_types.update(self._list_stack_resource_types(stack))
+        by_type = {}
+        for name, seconds in times:
+            res_type = resource_types.get(name, name)
+            by_type[res_type] = max(by_type.get(res_type, 0), seconds)
+        self.add_output(additive={
+            "title": "Heat stack %s by resource type" % action.lower(),
+            "description": "The longest time (in sec) which resources of "
+                           "every type took to %s." % action.lower(),
+            "chart_plugin": "StatsTable",
+            "data": [[res_type, by_type[res_type]]
+                     for res_type in sorted(by_type)]})
 
     @atomic.action_timer("heat.suspend_stack")
     def _suspend_stack(self, stack):
@@ -12,15 +12,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
 import random
 import string
+import threading
 import time
 
 from kubernetes import client as k8s_config
 from kubernetes.client.api import core_v1_api
 from kubernetes.client import api_client
 from kubernetes.client.rest import ApiException
+from kubernetes import watch
 
 from rally.common import cfg
 from rally.common import utils as common_utils
@@ -33,6 +36,18 @@ from rally_openstack.task import scenario
 
 CONF = cfg.CONF
 
+# Kubernetes API clients of the latest tasks are kept, older ones are dropped
+_MAX_TASKS = 4
+# task uuid -> {cluster uuid: CoreV1Api object}
+_K8S_CLIENTS = collections.OrderedDict()
+_K8S_CLIENTS_LOCK = threading.Lock()
+
+
+def clear_k8s_clients():
+    """Drop cached Kubernetes API clients of all tasks."""
+    with _K8S_CLIENTS_LOCK:
+        _K8S_CLIENTS.clear()
+
 
 class MagnumScenario(scenario.OpenStackScenario):
     """Base class for Magnum scenarios with basic atomic actions."""
@@ -149,7 +164,26 @@ class MagnumScenario(scenario.OpenStackScenario):
         return self.clients("magnum").certificates.create(**csr_req)
 
     def _get_k8s_api_client(self):
+        """Return an API client of the Kubernetes cluster of the tenant.
+
+        Clients are cached per cluster for the duration of a task, so
+        connection pools and loaded certificates are reused by iterations.
+        """
         cluster_uuid = self.context["tenant"]["cluster"]
+        task_uuid = self.context.get("task", {}).get("uuid")
+        if task_uuid is None:
+            return self._make_k8s_api_client(cluster_uuid)
+        with _K8S_CLIENTS_LOCK:
+            clients = _K8S_CLIENTS.pop(task_uuid, {})
+            _K8S_CLIENTS[task_uuid] = clients
+            while len(_K8S_CLIENTS) > _MAX_TASKS:
+                _K8S_CLIENTS.popitem(last=False)
+            if cluster_uuid not in clients:
+                clients[cluster_uuid] = self._make_k8s_api_client(
+                    cluster_uuid)
+            return clients[cluster_uuid]
+
+    def _make_k8s_api_client(self, cluster_uuid):
         cluster = self._get_cluster(cluster_uuid)
         cluster_template = self._get_cluster_template(
             cluster.cluster_template_id)
@@ -181,6 +215,38 @@ class MagnumScenario(scenario.OpenStackScenario):
 
         return core_v1_api.CoreV1Api(client)
 
+    def _watch_k8s_object(self, list_objects, name, is_ready, timeout,
+                          check_interval):
+        """Wait for a Kubernetes object to become ready using the watch API.
+
+        :param list_objects: a method of CoreV1Api which lists objects
+        :param name: name of the object in the "default" namespace
+        :param is_ready: a callable which checks whether the object is ready
+        :param timeout: time (in sec) to wait for the object
+        :param check_interval: time to sleep before watching again if the
+            watch is closed by the server
+        :returns: a tuple with the readiness and the latest object (None if
+            the object has not been seen)
+        """
+        start = time.time()
+        latest = None
+        while True:
+            left = int(timeout - (time.time() - start))
+            if left <= 0:
+                return False, latest
+            watcher = watch.Watch()
+            for event in watcher.stream(
+                    list_objects, namespace="default",
+                    field_selector="metadata.name=%s" % name,
+                    timeout_seconds=left):
+                if event["type"] not in ("ADDED", "MODIFIED"):
+                    continue
+                latest = event["object"]
+                if is_ready(latest):
+                    watcher.stop()
+                    return True, latest
+            common_utils.interruptable_sleep(check_interval)
+
     @atomic.action_timer("magnum.k8s_list_v1pods")
     def _list_v1pods(self):
         """List all pods.
@@ -211,27 +277,26 @@ class MagnumScenario(scenario.OpenStackScenario):
                     raise
             time.sleep(2)
 
-        start = time.time()
-        while True:
-            resp = k8s_api.read_namespaced_pod(
-                name=podname, namespace="default")
-
-            if resp.status.conditions:
-                for condition in resp.status.conditions:
-                    if condition.type.lower() == "ready" and \
-                       condition.status.lower() == "true":
-                        return resp
-
-            if (time.time() - start > CONF.openstack.k8s_pod_create_timeout):
-                raise exceptions.TimeoutException(
-                    desired_status="Ready",
-                    resource_name=podname,
-                    resource_type="Pod",
-                    resource_id=resp.metadata.uid,
-                    resource_status=resp.status,
-                    timeout=CONF.openstack.k8s_pod_create_timeout)
-            common_utils.interruptable_sleep(
-                CONF.openstack.k8s_pod_create_poll_interval)
+        def is_ready(pod):
+            conditions = pod.status.conditions if pod.status else None
+            return any(condition.type.lower() == "ready"
+                       and condition.status.lower() == "true"
+                       for condition in conditions or [])
+
+        with atomic.ActionTimer(self, "magnum.k8s_wait_for_v1pod_ready"):
+            ready, resp = self._watch_k8s_object(
+                k8s_api.list_namespaced_pod, podname, is_ready,
+                timeout=CONF.openstack.k8s_pod_create_timeout,
+                check_interval=CONF.openstack.k8s_pod_create_poll_interval)
+        if not ready:
+            raise exceptions.TimeoutException(
+                desired_status="Ready",
+                resource_name=podname,
+                resource_type="Pod",
+                resource_id=resp.metadata.uid if resp else None,
+                resource_status=resp.status if resp else None,
+                timeout=CONF.openstack.k8s_pod_create_timeout)
+        return resp
 
     @atomic.action_timer("magnum.k8s_list_v1rcs")
     def _list_v1rcs(self):
@@ -258,22 +323,22 @@ class MagnumScenario(scenario.OpenStackScenario):
             body=manifest,
             namespace="default")
         expectd_status = resp.spec.replicas
-        start = time.time()
-        while True:
-            resp = k8s_api.read_namespaced_replication_controller(
-                name=rcname,
-                namespace="default")
-            status = resp.status.replicas
-            if status == expectd_status:
-                return resp
-            else:
-                if time.time() - start > CONF.openstack.k8s_rc_create_timeout:
-                    raise exceptions.TimeoutException(
-                        desired_status=expectd_status,
-                        resource_name=rcname,
-                        resource_type="ReplicationController",
-                        resource_id=resp.metadata.uid,
-                        resource_status=status,
-                        timeout=CONF.openstack.k8s_rc_create_timeout)
-                common_utils.interruptable_sleep(
-                    CONF.openstack.k8s_rc_create_poll_interval)
+
+        def is_ready(rc):
+            return bool(rc.status) and rc.status.replicas == expectd_status
+
+        ready, resp = self._watch_k8s_object(
+            k8s_api.list_namespaced_replication_controller, rcname,
+            is_ready,
+            timeout=CONF.openstack.k8s_rc_create_timeout,
+            check_interval=CONF.openstack.k8s_rc_create_poll_interval)
+        if not ready:
+            raise exceptions.TimeoutException(
+                desired_status=expectd_status,
+                resource_name=rcname,
+                resource_type="ReplicationController",
+                resource_id=resp.metadata.uid if resp else None,
+                resource_status=(resp.status.replicas
+                                 if resp and resp.status else None),
+                timeout=CONF.openstack.k8s_rc_create_timeout)
+        return resp
@@ -56,7 +56,8 @@ class ImportAndListPackages(utils.MuranoScenario):
             self._import_package(package_path)
             self._list_packages(include_disabled=include_disabled)
         finally:
-            os.remove(package_path)
+            if package_path != package:
+                os.remove(package_path)
 
 
 @types.convert(package={"type": "expand_user_path"})
@@ -82,10 +83,11 @@ class ImportAndDeletePackage(utils.MuranoScenario):
         """
         package_path = self._zip_package(package)
         try:
-            package = self._import_package(package_path)
-            self._delete_package(package)
+            imported = self._import_package(package_path)
+            self._delete_package(imported)
         finally:
-            os.remove(package_path)
+            if package_path != package:
+                os.remove(package_path)
 
 
 @types.convert(package={"type": "expand_user_path"})
@@ -119,11 +121,12 @@ class PackageLifecycle(utils.MuranoScenario):
         """
         package_path = self._zip_package(package)
         try:
-            package = self._import_package(package_path)
-            self._update_package(package, body, operation)
-            self._delete_package(package)
+            imported = self._import_package(package_path)
+            self._update_package(imported, body, operation)
+            self._delete_package(imported)
         finally:
-            os.remove(package_path)
+            if package_path != package:
+                os.remove(package_path)
 
 
 @types.convert(package={"type": "expand_user_path"})
@@ -156,4 +159,5 @@ class ImportAndFilterApplications(utils.MuranoScenario):
             self._import_package(package_path)
             self._filter_applications(filter_query)
         finally:
-            os.remove(package_path)
+            if package_path != package:
+                os.remove(package_path)
@@ -13,9 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import os
 import shutil
 import tempfile
+import threading
 import uuid
 import zipfile
 
@@ -31,6 +33,26 @@ from rally_openstack.task import scenario
 CONF = cfg.CONF
 
 
+# all files of archives get the same modification time, so archives of the
+# same content are byte-identical
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _walk(directory):
+    """Yield (absolute path, relative path) of files in a stable order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for f in sorted(files):
+            abspath = os.path.join(root, f)
+            yield abspath, os.path.relpath(abspath, directory)
+
+
+def _copy_to_zip(zipf, info, fileobj):
+    with zipf.open(info, mode="w") as dst:
+        shutil.copyfileobj(fileobj, dst, _CHUNK_SIZE)
+
+
 def pack_dir(source_directory, zip_name=None):
     """Archive content of the directory into .zip
 
@@ -38,6 +60,7 @@ def pack_dir(source_directory, zip_name=None):
     into zip archive. When zip_name is specified, it would be used
     as a destination for the archive. Otherwise method would
     try to use temporary file as a destination for the archive.
+    Archives of the same content are byte-identical.
 
     :param source_directory: root of the newly created archive.
         Directory is added recursively.
@@ -49,19 +72,133 @@ def pack_dir(source_directory, zip_name=None):
 
     if not zip_name:
         fp = tempfile.NamedTemporaryFile(delete=False)
+        fp.close()
         zip_name = fp.name
     zipf = zipfile.ZipFile(zip_name, mode="w")
     try:
-        for root, dirs, files in os.walk(source_directory):
-            for f in files:
-                abspath = os.path.join(root, f)
-                relpath = os.path.relpath(abspath, source_directory)
-                zipf.write(abspath, relpath)
+        for abspath, relpath in _walk(source_directory):
+            info = zipfile.ZipInfo(relpath, _ZIP_DATE_TIME)
+            info.external_attr = (os.stat(abspath).st_mode & 0xFFFF) << 16
+            with open(abspath, "rb") as f:
+                _copy_to_zip(zipf, info, f)
     finally:
         zipf.close()
     return zip_name
 
 
+class PackageArchives(object):
+    """Cache of zip archives of Murano application directories of a task.
+
+    Archives are keyed by a hash of the directory content, so the
+    murano_packages context and all iterations of package scenarios use the
+    same archive until files of the directory change. Sizes and modification
+    times of files are compared first, the content is hashed only if they
+    differ from the previous call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # the directory is created at once, so processes of the runner which
+        # are forked later put their archives into it as well
+        self._tmp_dir = tempfile.mkdtemp(prefix="rally_murano_")
+        # directory -> (sizes and mtimes of files, content hash)
+        self._fingerprints = {}
+        # content hash -> path to archive
+        self._archives = {}
+
+    @staticmethod
+    def _stat(directory):
+        stats = []
+        for abspath, relpath in _walk(directory):
+            st = os.stat(abspath)
+            stats.append((relpath, st.st_size, st.st_mtime_ns))
+        return tuple(stats)
+
+    @staticmethod
+    def _hash(directory):
+        sha256 = hashlib.sha256()
+        for abspath, relpath in _walk(directory):
+            sha256.update(("%s\0%d\0" % (
+                relpath, os.path.getsize(abspath))).encode("utf-8"))
+            with open(abspath, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def get(self, directory):
+        """Return path to the archive of the directory, packing it if needed.
+
+        :param directory: path to directory with Murano application
+        """
+        directory = os.path.realpath(os.path.expanduser(directory))
+        with self._lock:
+            stats = self._stat(directory)
+            fingerprint = self._fingerprints.get(directory)
+            if fingerprint is not None and fingerprint[0] == stats:
+                digest = fingerprint[1]
+            else:
+                digest = self._hash(directory)
+                self._fingerprints[directory] = (stats, digest)
+
+            archive = self._archives.get(digest)
+            if archive is None or not os.path.exists(archive):
+                archive = os.path.join(self._tmp_dir, "%s.zip" % digest)
+                part = "%s.%d.part" % (archive, os.getpid())
+                pack_dir(directory, part)
+                os.rename(part, archive)
+                self._archives[digest] = archive
+        return archive
+
+    def clear(self):
+        """Remove all archives."""
+        with self._lock:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._fingerprints = {}
+            self._archives = {}
+
+
+_ARCHIVES = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def open_archives(task):
+    """Start caching archives of application directories of a task.
+
+    The murano_packages context opens the cache in its setup, i.e. before
+    the runner starts processes of iterations, and closes it on cleanup.
+
+    :param task: a task (like the one of scenarios or contexts)
+    :returns: PackageArchives object
+    """
+    with _ARCHIVES_LOCK:
+        archives = _ARCHIVES.get(task["uuid"])
+        if archives is None:
+            archives = _ARCHIVES[task["uuid"]] = PackageArchives()
+    return archives
+
+
+def get_archives(task):
+    """Return the cache of archives of a task or None if it is not opened."""
+    try:
+        task_uuid = task["uuid"]
+    except (KeyError, TypeError):
+        return None
+    with _ARCHIVES_LOCK:
+        return _ARCHIVES.get(task_uuid)
+
+
+def close_archives(task):
+    """Remove archives of a task, e.g. when it is finished."""
+    try:
+        task_uuid = task["uuid"]
+    except (KeyError, TypeError):
+        return
+    with _ARCHIVES_LOCK:
+        archives = _ARCHIVES.pop(task_uuid, None)
+    if archives is not None:
+        archives.clear()
+
+
 class MuranoScenario(scenario.OpenStackScenario):
     """Base class for Murano scenarios with basic atomic actions."""
 
@@ -160,9 +297,10 @@ class MuranoScenario(scenario.OpenStackScenario):
         :returns: imported package
         """
 
-        package = self.clients("murano").packages.create(
-            {}, {"file": open(package)}
-        )
+        with open(package, "rb") as f:
+            package = self.clients("murano").packages.create(
+                {}, {"file": f}
+            )
 
         return package
 
@@ -226,50 +364,49 @@ class MuranoPackageManager(common_utils.RandomNameGeneratorMixin):
         with open(filename, "w") as f:
             yaml.safe_dump(data, f)
 
-    def _change_app_fullname(self, app_dir):
-        """Change application full name.
-
-        To avoid name conflict error during package import (when user
-        tries to import a few packages into the same tenant) need to change the
-        application name. For doing this need to replace following parts
-        in manifest.yaml
-        from
-            ...
-            FullName: app.name
-            ...
-            Classes:
-              app.name: app_class.yaml
-        to:
-            ...
-            FullName: <new_name>
-            ...
-            Classes:
-              <new_name>: app_class.yaml
-
-        :param app_dir: path to directory with Murano application context
-        """
-
+    def _rename_app(self, manifest):
+        """Set a new random application full name in the manifest."""
         new_fullname = self.generate_random_name()
 
-        manifest_file = os.path.join(app_dir, "manifest.yaml")
-        manifest = self._read_from_file(manifest_file)
-
         class_file_name = manifest["Classes"][manifest["FullName"]]
 
-        # update manifest.yaml file
         del manifest["Classes"][manifest["FullName"]]
         manifest["FullName"] = new_fullname
         manifest["Classes"][new_fullname] = class_file_name
-        self._write_to_file(manifest, manifest_file)
+        return manifest
+
+    def _copy_renamed(self, archive):
+        """Copy the archive with a new application full name.
+
+        :param archive: path to zip archive with Murano application
+        :returns: path to a temporary zip archive
+        """
+        fp = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+        fp.close()
+        with zipfile.ZipFile(archive) as src, \
+                zipfile.ZipFile(fp.name, mode="w") as dst:
+            for info in src.infolist():
+                new_info = zipfile.ZipInfo(info.filename, _ZIP_DATE_TIME)
+                new_info.external_attr = info.external_attr
+                new_info.compress_type = info.compress_type
+                if info.filename == "manifest.yaml":
+                    manifest = yaml.safe_load(src.read(info))
+                    dst.writestr(new_info,
+                                 yaml.safe_dump(self._rename_app(manifest)))
+                else:
+                    with src.open(info) as f:
+                        _copy_to_zip(dst, new_info, f)
+        return fp.name
 
     def _prepare_package(self, package_path):
         """Check whether the package path is path to zip archive or not.
 
         If package_path is not a path to zip archive but path to Murano
         application folder, than method prepares zip archive with Murano
-        application. It copies directory with Murano app files to temporary
-        folder, changes manifest.yaml and class file (to avoid '409 Conflict'
-        errors in Murano) and prepares zip package.
+        application. It takes the cached archive of the folder (see
+        PackageArchives) if the task has it, and copies it to a temporary file
+        with changed application name in manifest.yaml (to avoid
+        '409 Conflict' errors in Murano).
 
         :param package_path: path to zip archive or directory with package
                              components
@@ -277,15 +414,13 @@ class MuranoPackageManager(common_utils.RandomNameGeneratorMixin):
         """
 
         if not zipfile.is_zipfile(package_path):
-            tmp_dir = tempfile.mkdtemp()
-            pkg_dir = os.path.join(tmp_dir, "package/")
+            archives = get_archives(self.task)
+            if archives is not None:
+                return self._copy_renamed(archives.get(package_path))
+            archive = pack_dir(package_path)
             try:
-                shutil.copytree(os.path.expanduser(package_path), pkg_dir)
-
-                self._change_app_fullname(pkg_dir)
-                package_path = pack_dir(pkg_dir)
-
+                package_path = self._copy_renamed(archive)
             finally:
-                shutil.rmtree(tmp_dir)
+                os.remove(archive)
 
         return package_path
@@ -546,17 +546,24 @@ class SetAndClearRouterGateway(utils.NeutronBaseScenario):
 class CreateAndListPorts(utils.NeutronBaseScenario):
 
     def run(self, network_create_args=None,
-            port_create_args=None, ports_per_network=1):
+            port_create_args=None, ports_per_network=1, bulk=False):
         """Create and a given number of ports and list all ports.
 
         :param network_create_args: dict, POST /v2.0/networks request
                                     options. Deprecated.
         :param port_create_args: dict, POST /v2.0/ports request options
         :param ports_per_network: int, number of ports for one network
+        :param bulk: bool, whether to create ports by bulk requests
         """
         network = self._get_or_create_network(**(network_create_args or {}))
-        for i in range(ports_per_network):
-            self.neutron.create_port(network["id"], **(port_create_args or {}))
+        if bulk:
+            self.neutron.create_ports(network["id"],
+                                      count=ports_per_network,
+                                      **(port_create_args or {}))
+        else:
+            for i in range(ports_per_network):
+                self.neutron.create_port(network["id"],
+                                         **(port_create_args or {}))
 
         self.neutron.list_ports()
 
@@ -685,7 +692,7 @@ class CreateAndDeletePorts(utils.NeutronBaseScenario):
                     platform="openstack")
 class CreateAndBindPorts(utils.NeutronBaseScenario):
 
-    def run(self, ports_per_network=1):
+    def run(self, ports_per_network=1, bulk=False):
         """Bind a given number of ports.
 
         Measure the performance of port binding and all of its pre-requisites:
@@ -696,6 +703,8 @@ class CreateAndBindPorts(utils.NeutronBaseScenario):
         * openstack port update (binding)
 
         :param ports_per_network: int, number of ports for one network
+        :param bulk: bool, whether to create subnets and ports by bulk
+            requests
         """
 
         # NOTE(bence romsics): Find a host where we can expect to bind
@@ -714,11 +723,21 @@ class CreateAndBindPorts(utils.NeutronBaseScenario):
 
         tenant_id = self.context["tenant"]["id"]
         for network in self.context["tenants"][tenant_id]["networks"]:
-            self.neutron.create_subnet(network_id=network["id"], ip_version=4)
-            self.neutron.create_subnet(network_id=network["id"], ip_version=6)
-
-            for i in range(ports_per_network):
-                port = self.neutron.create_port(network_id=network["id"])
+            if bulk:
+                self.neutron.create_subnets(
+                    [{"network_id": network["id"], "ip_version": 4},
+                     {"network_id": network["id"], "ip_version": 6}])
+                ports = self.neutron.create_ports(network["id"],
+                                                  count=ports_per_network)
+            else:
+                self.neutron.create_subnet(network_id=network["id"],
+                                           ip_version=4)
+                self.neutron.create_subnet(network_id=network["id"],
+                                           ip_version=6)
+                ports = (self.neutron.create_port(network_id=network["id"])
+                         for i in range(ports_per_network))
+
+            for port in ports:
                 # port bind needs admin role
                 self.admin_neutron.update_port(
                     port_id=port["id"],
@@ -22,6 +22,7 @@ from rally.task import atomic
 from rally.task import utils
 
 from rally_openstack.common.services.network import neutron
+from rally_openstack.task import capabilities
 from rally_openstack.task import scenario
 
 
@@ -36,17 +37,20 @@ class NeutronBaseScenario(scenario.OpenStackScenario):
 
     def __init__(self, *args, **kwargs):
         super(NeutronBaseScenario, self).__init__(*args, **kwargs)
+        cache = capabilities.get_cache(self.context)
         if hasattr(self, "_clients"):
             self.neutron = neutron.NeutronService(
                 clients=self._clients,
                 name_generator=self.generate_random_name,
-                atomic_inst=self.atomic_actions()
+                atomic_inst=self.atomic_actions(),
+                capabilities=cache
             )
         if hasattr(self, "_admin_clients"):
             self.admin_neutron = neutron.NeutronService(
                 clients=self._admin_clients,
                 name_generator=self.generate_random_name,
-                atomic_inst=self.atomic_actions()
+                atomic_inst=self.atomic_actions(),
+                capabilities=cache
             )
 
     def _get_or_create_network(self, **network_create_args):
@@ -13,6 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import itertools
+import os
+import re
+import time
 
 from rally.common import cfg
 from rally.common import logging
@@ -21,6 +26,7 @@ from rally.task import atomic
 from rally.task import utils
 
 from rally_openstack.common.services.image import image as image_service
+from rally_openstack.common import utils as common_utils
 from rally_openstack.task import scenario
 from rally_openstack.task.scenarios.cinder import utils as cinder_utils
 from rally_openstack.task.scenarios.neutron import utils as neutron_utils
@@ -426,16 +432,57 @@ class NovaScenario(neutron_utils.NeutronBaseScenario,
                 else:
                     server.delete()
 
-            for server in servers:
-                utils.wait_for_status(
-                    server,
-                    ready_statuses=["deleted"],
-                    check_deletion=True,
-                    update_resource=utils.get_from_manager(),
-                    timeout=CONF.openstack.nova_server_delete_timeout,
-                    check_interval=(
-                        CONF.openstack.nova_server_delete_poll_interval)
-                )
+            self._wait_for_servers(
+                servers,
+                ready_statuses=["deleted"],
+                check_deletion=True,
+                timeout=CONF.openstack.nova_server_delete_timeout,
+                check_interval=CONF.openstack.nova_server_delete_poll_interval
+            )
+
+    def _wait_for_servers(self, servers, ready_statuses, timeout,
+                          check_interval, check_deletion=False,
+                          list_servers=None, on_ready=None):
+        """Wait for servers statuses using one listing per poll.
+
+        :param servers: list of servers to wait for
+        :param ready_statuses: list of statuses to wait for
+        :param timeout: max time to wait for all servers
+        :param check_interval: time to sleep between polls
+        :param check_deletion: whether disappeared server should be considered
+            as ready
+        :param list_servers: optional callable which returns fresh servers.
+            By default, servers are listed by their common name prefix
+        :param on_ready: optional callable which is called with a server as
+            soon as it reaches one of ready statuses
+        :returns: list of updated servers
+        """
+        if not servers:
+            return []
+        if list_servers is None:
+            search_opts = {}
+            prefix = os.path.commonprefix([getattr(s, "name", None) or ""
+                                           for s in servers])
+            if prefix:
+                # nova treats name filter as a regular expression
+                search_opts["name"] = "^%s" % re.escape(prefix)
+            servers_manager = servers[0].manager
+
+            def list_servers():
+                # all pages are fetched, otherwise servers which are missed
+                # in the first page look like deleted ones
+                return servers_manager.list(detailed=True,
+                                            search_opts=search_opts,
+                                            limit=-1)
+
+        return common_utils.wait_for_statuses(
+            servers,
+            ready_statuses=ready_statuses,
+            list_resources=list_servers,
+            check_deletion=check_deletion,
+            timeout=timeout,
+            check_interval=check_interval,
+            on_ready=on_ready)
 
     @atomic.action_timer("nova.create_server_group")
     def _create_server_group(self, **kwargs):
@@ -580,7 +627,12 @@ class NovaScenario(neutron_utils.NeutronBaseScenario,
         """Boot multiple servers.
 
         Returns when all the servers are actually booted and are in the
-        "Active" state.
+        "Active" state. Servers of each request are tracked by its
+        reservation ID, requests are sent by
+        `openstack.nova_server_boot_concurrency` parallel API calls and
+        time to ACTIVE status of each server is reported as output. A request
+        of more than `openstack.nova_server_boot_batch_size` instances is
+        split into several API calls.
 
         :param image_id: ID of the image to be used for server creation
         :param flavor_id: ID of the flavor to be used for server creation
@@ -601,28 +653,91 @@ class NovaScenario(neutron_utils.NeutronBaseScenario,
                 nic["net-id"] = self._get_network_id(nic["net-name"])
 
         name_prefix = self.generate_random_name()
+        servers_manager = self.clients("nova").servers
+        batch_size = (CONF.openstack.nova_server_boot_batch_size
+                      or instances_amount)
+        # number of servers of each boot API call
+        counts = []
+        for i in range(requests):
+            counts.extend(min(batch_size, instances_amount - start)
+                          for start in range(0, instances_amount, batch_size))
+        # server id -> time when its boot request was sent
+        started_at = {}
+        latencies = []
+
+        def create(i):
+            started = time.time()
+            # Nova returns only one server even when min_count > 1, so a
+            # reservation ID is requested to find all servers of the request
+            reservation_id = servers_manager.create(
+                "%s_%d" % (name_prefix, i),
+                image_id, flavor_id,
+                min_count=counts[i],
+                max_count=counts[i],
+                reservation_id=True,
+                **kwargs)
+            return reservation_id, started
+
+        def list_reservation(reservation_id):
+            return servers_manager.list(
+                detailed=True,
+                search_opts={"reservation_id": reservation_id},
+                limit=-1)
+
+        def discover(i):
+            reservation_id, started = reservations[i]
+            found = list_reservation(reservation_id)
+            # servers may appear in the listing with a delay
+            while len(found) < counts[i]:
+                if (time.time() - started
+                        > CONF.openstack.nova_server_boot_timeout):
+                    raise exceptions.RallyException(
+                        "Only %(found)d of %(count)d servers of reservation "
+                        "%(reservation)s are found."
+                        % {"found": len(found), "count": counts[i],
+                           "reservation": reservation_id})
+                time.sleep(CONF.openstack.nova_server_boot_poll_interval)
+                found = list_reservation(reservation_id)
+            for server in found:
+                started_at[server.id] = started
+            return found
+
+        def on_ready(server):
+            latencies.append(time.time() - started_at[server.id])
+
+        concurrency = max(1, min(len(counts),
+                                 CONF.openstack.nova_server_boot_concurrency))
         with atomic.ActionTimer(self, "nova.boot_servers"):
-            for i in range(requests):
-                self.clients("nova").servers.create(
-                    "%s_%d" % (name_prefix, i),
-                    image_id, flavor_id,
-                    min_count=instances_amount,
-                    max_count=instances_amount,
-                    **kwargs)
-            # NOTE(msdubov): Nova python client returns only one server even
-            #                when min_count > 1, so we have to rediscover
-            #                all the created servers manually.
-            servers = [s for s in self.clients("nova").servers.list()
-                       if s.name.startswith(name_prefix)]
-            self.sleep_between(CONF.openstack.nova_server_boot_prepoll_delay)
-            servers = [utils.wait_for_status(
-                server,
-                ready_statuses=["ACTIVE"],
-                update_resource=utils.
-                get_from_manager(),
-                timeout=CONF.openstack.nova_server_boot_timeout,
-                check_interval=CONF.openstack.nova_server_boot_poll_interval
-            ) for server in servers]
+            with futures.ThreadPoolExecutor(
+                    max_workers=concurrency) as executor:
+                reservations = list(executor.map(create,
+                                                 range(len(counts))))
+                reservation_ids = [rid for rid, _started in reservations]
+                servers = list(itertools.chain.from_iterable(
+                    executor.map(discover, range(len(counts)))))
+
+                def list_servers():
+                    return itertools.chain.from_iterable(
+                        executor.map(list_reservation, reservation_ids))
+
+                self.sleep_between(
+                    CONF.openstack.nova_server_boot_prepoll_delay)
+                servers = self._wait_for_servers(
+                    servers,
+                    ready_statuses=["ACTIVE"],
+                    timeout=CONF.openstack.nova_server_boot_timeout,
+                    check_interval=(
+                        CONF.openstack.nova_server_boot_poll_interval),
+                    list_servers=list_servers,
+                    on_ready=on_ready)
+        if latencies:
+            self.add_output(additive={
+                "title": "Server boot latency",
+                "description": "Time from a boot request to ACTIVE status "
+                               "of each booted server, in seconds",
+                "chart_plugin": "StatsTable",
+                "data": [["Time to ACTIVE", round(latency, 3)]
+                         for latency in latencies]})
         return servers
 
     @atomic.action_timer("nova.associate_floating_ip")
@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally.task import validation
 
 from rally_openstack.common import consts
@@ -25,6 +23,9 @@ from rally_openstack.task.scenarios.swift import utils
 """Scenarios for Swift Objects."""
 
 
+@validation.add("number", param_name="segment_size",
+                minval=utils.MIN_SEGMENT_SIZE, integer_only=True,
+                nullable=True)
 @validation.add("required_services", services=[consts.Service.SWIFT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(
@@ -33,24 +34,31 @@ from rally_openstack.task.scenarios.swift import utils
     platform="openstack")
 class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024,
+            segment_size=None, segment_concurrency=4, **kwargs):
         """Create container and objects then list all objects.
 
         :param objects_per_container: int, number of objects to upload
         :param object_size: int, temporary local object size
+        :param segment_size: int, max size of object segments (at least
+                             1 MiB). Objects which are bigger are uploaded by
+                             segments in parallel as static large objects
+        :param segment_concurrency: int, number of segments to upload in
+                                    parallel
         :param kwargs: dict, optional parameters to create container
         """
 
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                self._upload_object(container_name, dummy_file)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            self._upload_dummy_object(
+                container_name, object_size, segment_size=segment_size,
+                segment_concurrency=segment_concurrency)
         self._list_objects(container_name)
 
 
+@validation.add("number", param_name="segment_size",
+                minval=utils.MIN_SEGMENT_SIZE, integer_only=True,
+                nullable=True)
 @validation.add("required_services", services=[consts.Service.SWIFT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(
@@ -59,30 +67,43 @@ class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
     platform="openstack")
 class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024,
+            segment_size=None, segment_concurrency=4, **kwargs):
         """Create container and objects then delete everything created.
 
         :param objects_per_container: int, number of objects to upload
         :param object_size: int, temporary local object size
+        :param segment_size: int, max size of object segments (at least
+                             1 MiB). Objects which are bigger are uploaded by
+                             segments in parallel as static large objects
+        :param segment_concurrency: int, number of segments to upload in
+                                    parallel
         :param kwargs: dict, optional parameters to create container
         """
-        container_name = None
         objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                object_name = self._upload_object(container_name,
-                                                  dummy_file)[1]
-                objects_list.append(object_name)
-
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            object_name = self._upload_dummy_object(
+                container_name, object_size, segment_size=segment_size,
+                segment_concurrency=segment_concurrency)[1]
+            objects_list.append(object_name)
+
+        delete_kwargs = {}
+        large_objects = bool(segment_size and object_size > segment_size)
+        if large_objects:
+            # delete segments of large objects as well
+            delete_kwargs["query_string"] = "multipart-manifest=delete"
         for object_name in objects_list:
-            self._delete_object(container_name, object_name)
+            self._delete_object(container_name, object_name, **delete_kwargs)
         self._delete_container(container_name)
+        if large_objects:
+            self._delete_container(
+                self._get_segments_container(container_name))
 
 
+@validation.add("number", param_name="segment_size",
+                minval=utils.MIN_SEGMENT_SIZE, integer_only=True,
+                nullable=True)
 @validation.add("required_services", services=[consts.Service.SWIFT])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(
@@ -91,27 +112,44 @@ class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
     platform="openstack")
 class CreateContainerAndObjectThenDownloadObject(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024, stream=False,
+            chunk_size=65536, segments=1, verify_checksum=False,
+            segment_size=None, segment_concurrency=4, **kwargs):
         """Create container and objects then download all objects.
 
         :param objects_per_container: int, number of objects to upload
         :param object_size: int, temporary local object size
+        :param stream: bool, whether to download objects by chunks without
+                       keeping them in memory. Throughput and time to the
+                       first byte are reported for streamed downloads
+        :param chunk_size: int, size of chunks to stream objects by
+        :param segments: int, number of parallel range requests to stream
+                         every object by
+        :param verify_checksum: bool, whether to compare MD5 of streamed
+                                objects with their ETags (only for objects
+                                streamed in one segment)
+        :param segment_size: int, max size of object segments (at least
+                             1 MiB). Objects which are bigger are uploaded by
+                             segments in parallel as static large objects
+        :param segment_concurrency: int, number of segments to upload in
+                                    parallel
         :param kwargs: dict, optional parameters to create container
         """
-        container_name = None
         objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                object_name = self._upload_object(container_name,
-                                                  dummy_file)[1]
-                objects_list.append(object_name)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            object_name = self._upload_dummy_object(
+                container_name, object_size, segment_size=segment_size,
+                segment_concurrency=segment_concurrency)[1]
+            objects_list.append(object_name)
 
         for object_name in objects_list:
-            self._download_object(container_name, object_name)
+            if stream:
+                self._stream_object(container_name, object_name,
+                                    chunk_size=chunk_size, segments=segments,
+                                    verify_checksum=verify_checksum)
+            else:
+                self._download_object(container_name, object_name)
 
 
 @validation.add("required_services", services=[consts.Service.SWIFT])
@@ -139,17 +177,38 @@ class ListObjectsInContainers(utils.SwiftScenario):
     platform="openstack")
 class ListAndDownloadObjectsInContainers(utils.SwiftScenario):
 
-    def run(self):
-        """List and download objects in all containers."""
+    def run(self, stream=False, chunk_size=65536, segments=1,
+            verify_checksum=False):
+        """List and download objects in all containers.
+
+        :param stream: bool, whether to download objects by chunks without
+                       keeping them in memory. Throughput and time to the
+                       first byte are reported for streamed downloads
+        :param chunk_size: int, size of chunks to stream objects by
+        :param segments: int, number of parallel range requests to stream
+                         every object by
+        :param verify_checksum: bool, whether to compare MD5 of streamed
+                                objects with their ETags (only for objects
+                                streamed in one segment)
+        """
 
         containers = self._list_containers()[1]
 
         objects_dict = {}
         for container in containers:
             container_name = container["name"]
+            if container_name.endswith(self._get_segments_container("")):
+                # segments are downloaded as parts of large objects
+                continue
             objects_dict[container_name] = self._list_objects(
                 container_name)[1]
 
         for container_name, objects in objects_dict.items():
             for obj in objects:
-                self._download_object(container_name, obj["name"])
+                if stream:
+                    self._stream_object(container_name, obj["name"],
+                                        chunk_size=chunk_size,
+                                        segments=segments,
+                                        verify_checksum=verify_checksum)
+                else:
+                    self._download_object(container_name, obj["name"])
@@ -13,11 +13,56 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import hashlib
+import itertools
+import json
+import threading
+import time
+
 from rally.task import atomic
 
+from rally_openstack.common import exceptions
+from rally_openstack.common import osclients
 from rally_openstack.task import scenario
 
 
+# all dummy objects are read from this buffer
+_ZEROS = bytes(1024 * 1024)
+
+# Swift refuses segments of static large objects (except the last one) which
+# are smaller than this by default
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+
+class DummyContent(object):
+    """File-like object of the given size filled with zeros.
+
+    Chunks are slices of one shared buffer, so dummy objects are uploaded
+    without temporary files and without allocating memory per object.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._pos = 0
+
+    def read(self, size=-1):
+        remaining = self.size - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size > len(_ZEROS):
+            # short reads are allowed, callers read until the end
+            size = len(_ZEROS)
+        self._pos += size
+        return _ZEROS if size == len(_ZEROS) else _ZEROS[:size]
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos):
+        self._pos = pos
+
+
 class SwiftScenario(scenario.OpenStackScenario):
     """Base class for Swift scenarios with basic atomic actions."""
 
@@ -105,6 +150,231 @@ class SwiftScenario(scenario.OpenStackScenario):
         return self.clients("swift").get_object(container_name, object_name,
                                                 **kwargs)
 
+    @staticmethod
+    def _read_body(body, md5=None):
+        """Read chunks of a response body dropping them.
+
+        :param body: iterator of chunks of a response body
+        :param md5: hashlib md5 object to update with chunks
+        :returns: tuple, (number of read bytes, time of the first chunk)
+        """
+        size = 0
+        first_chunk_at = None
+        for chunk in body:
+            if first_chunk_at is None:
+                first_chunk_at = time.time()
+            size += len(chunk)
+            if md5 is not None:
+                md5.update(chunk)
+        return size, first_chunk_at
+
+    def _get_thread_client(self, clients):
+        """Return swift client of the current thread.
+
+        Swift connections are not thread-safe, so every thread of a pool
+        keeps its own one.
+
+        :param clients: threading.local object to keep clients in
+        """
+        swift = getattr(clients, "swift", None)
+        if swift is None:
+            swift = clients.swift = osclients.Clients(
+                self.context["user"]["credential"]).swift()
+        return swift
+
+    def _download_segment(self, clients, container_name, object_name, start,
+                          end, chunk_size):
+        swift = self._get_thread_client(clients)
+        started_at = time.time()
+        headers, body = swift.get_object(
+            container_name, object_name, resp_chunk_size=chunk_size,
+            headers={"Range": "bytes=%d-%d" % (start, end)})
+        size, first_byte_at = self._read_body(body)
+        finished_at = time.time()
+        return {"size": size, "started_at": started_at,
+                "first_byte_at": first_byte_at or finished_at,
+                "finished_at": finished_at}
+
+    def _stream_object(self, container_name, object_name, chunk_size=65536,
+                       segments=1, verify_checksum=False):
+        """Download object by chunks without keeping it in memory.
+
+        Throughput, time to the first byte and latencies of segments are
+        reported as an additive output.
+
+        :param container_name: str, name of the container to download object
+                               from
+        :param object_name: str, name of the object to download
+        :param chunk_size: int, size of chunks to read the object by
+        :param segments: int, number of parallel range requests to download
+                         the object by
+        :param verify_checksum: bool, whether to compare MD5 of the object
+                                with its ETag. Checked only for objects which
+                                are downloaded in one segment and are not
+                                large objects
+        :returns: dict, with number of downloaded bytes ("size"), duration
+                  of the download ("duration") and time to the first byte
+                  ("first_byte")
+        """
+        with atomic.ActionTimer(self, "swift.stream_object"):
+            size = None
+            if segments > 1:
+                size = int(self.clients("swift").head_object(
+                    container_name, object_name)["content-length"])
+            started_at = time.time()
+            if size:
+                segment_size = -(-size // segments)
+                clients = threading.local()
+                with atomic.ActionTimer(self, "swift.download_segments"):
+                    with futures.ThreadPoolExecutor(
+                            max_workers=segments) as executor:
+                        fs = [executor.submit(
+                            self._download_segment, clients, container_name,
+                            object_name, start,
+                            min(start + segment_size, size) - 1, chunk_size)
+                            for start in range(0, size, segment_size)]
+                        results = [f.result() for f in fs]
+                downloaded = sum(r["size"] for r in results)
+                first_byte_at = min(r["first_byte_at"] for r in results)
+            else:
+                md5 = hashlib.md5() if verify_checksum else None
+                with atomic.ActionTimer(self, "swift.first_byte"):
+                    headers, body = self.clients("swift").get_object(
+                        container_name, object_name,
+                        resp_chunk_size=chunk_size)
+                    body = iter(body)
+                    first_chunk = next(body, b"")
+                first_byte_at = time.time()
+                downloaded = self._read_body(
+                    itertools.chain([first_chunk], body), md5)[0]
+                results = []
+                etag = headers.get("etag", "").strip("\"")
+                if (md5 is not None and etag
+                        and "x-object-manifest" not in headers
+                        and "x-static-large-object" not in headers
+                        and md5.hexdigest() != etag):
+                    raise exceptions.ChecksumMismatch(
+                        source="%s/%s" % (container_name, object_name),
+                        algorithm="md5", actual=md5.hexdigest(),
+                        expected=etag)
+            finished_at = time.time()
+            first_byte_at = first_byte_at or finished_at
+
+        duration = finished_at - started_at
+        data = [["Throughput, MiB/s",
+                 round(downloaded / 1048576.0 / duration, 3)
+                 if duration else 0],
+                ["Time to first byte, s", round(first_byte_at - started_at,
+                                                3)]]
+        data.extend(["Segment latency, s",
+                     round(r["finished_at"] - r["started_at"], 3)]
+                    for r in results)
+        self.add_output(additive={
+            "title": "Swift object download",
+            "description": "Throughput of object downloads, time from "
+                           "a download request to the first byte and "
+                           "durations of range requests",
+            "chart_plugin": "StatsTable",
+            "data": data})
+        return {"size": downloaded, "duration": duration,
+                "first_byte": first_byte_at - started_at}
+
+    def _upload_segment(self, clients, container_name, size):
+        segment_name = self.generate_random_name()
+        started_at = time.time()
+        etag = self._get_thread_client(clients).put_object(
+            container_name, segment_name, DummyContent(size),
+            content_length=size)
+        return {"path": "/%s/%s" % (container_name, segment_name),
+                "etag": etag, "size_bytes": size, "started_at": started_at,
+                "finished_at": time.time()}
+
+    @staticmethod
+    def _get_segments_container(container_name):
+        """Return name of the container for segments of large objects."""
+        return "%s_segments" % container_name
+
+    def _upload_large_object(self, container_name, object_size, segment_size,
+                             concurrency=4):
+        """Upload a dummy static large object (SLO).
+
+        Segments are uploaded in parallel, each thread uses its own
+        connection for all its segments. Segments are stored in a separate
+        "<container_name>_segments" container, so listings of the container
+        contain only objects. Delete the object with
+        "multipart-manifest=delete" query string to delete segments as well.
+
+        :param container_name: str, name of the container to upload object to
+        :param object_size: int, size of the object
+        :param segment_size: int, max size of segments, at least
+                             MIN_SEGMENT_SIZE
+        :param concurrency: int, number of segments to upload in parallel
+        :returns: tuple, (etag and object name)
+        """
+        object_name = self.generate_random_name()
+        segments_container = self._get_segments_container(container_name)
+        with atomic.ActionTimer(self, "swift.upload_large_object"):
+            # the container is created by the first object, the next ones
+            # just update it
+            with atomic.ActionTimer(self, "swift.create_segments_container"):
+                self.clients("swift").put_container(segments_container)
+            started_at = time.time()
+            clients = threading.local()
+            sizes = [min(segment_size, object_size - offset)
+                     for offset in range(0, object_size, segment_size)]
+            with atomic.ActionTimer(self, "swift.upload_segments"):
+                with futures.ThreadPoolExecutor(
+                        max_workers=min(concurrency, len(sizes))) as executor:
+                    fs = [executor.submit(self._upload_segment, clients,
+                                          segments_container, size)
+                          for size in sizes]
+                    segments = [f.result() for f in fs]
+
+            manifest = [dict((k, segment[k])
+                             for k in ("path", "etag", "size_bytes"))
+                        for segment in segments]
+            with atomic.ActionTimer(self, "swift.put_manifest"):
+                etag = self.clients("swift").put_object(
+                    container_name, object_name, json.dumps(manifest),
+                    query_string="multipart-manifest=put")
+            duration = time.time() - started_at
+
+        data = [["Throughput, MiB/s",
+                 round(object_size / 1048576.0 / duration, 3)
+                 if duration else 0]]
+        for segment in segments:
+            seg_duration = segment["finished_at"] - segment["started_at"]
+            data.append(["Segment throughput, MiB/s",
+                         round(segment["size_bytes"] / 1048576.0
+                               / seg_duration, 3) if seg_duration else 0])
+        self.add_output(additive={
+            "title": "Swift large object upload",
+            "description": "Throughput of large object uploads and of "
+                           "uploads of their segments",
+            "chart_plugin": "StatsTable",
+            "data": data})
+        return etag, object_name
+
+    def _upload_dummy_object(self, container_name, object_size,
+                             segment_size=None, segment_concurrency=4):
+        """Upload an object of zeros.
+
+        :param container_name: str, name of the container to upload object to
+        :param object_size: int, size of the object
+        :param segment_size: int, max size of segments (at least
+                             MIN_SEGMENT_SIZE). Objects which are bigger are
+                             uploaded as static large objects
+        :param segment_concurrency: int, number of segments to upload in
+                                    parallel
+        :returns: tuple, (etag and object name)
+        """
+        if segment_size and object_size > segment_size:
+            return self._upload_large_object(
+                container_name, object_size, segment_size,
+                concurrency=segment_concurrency)
+        return self._upload_object(container_name, DummyContent(object_size),
+                                   content_length=object_size)
+
     @atomic.action_timer("swift.delete_object")
     def _delete_object(self, container_name, object_name, **kwargs):
         """Delete object from container.
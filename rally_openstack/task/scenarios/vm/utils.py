@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import contextlib
+import hashlib
 import io
 import os.path
-import subprocess
-import sys
+import shlex
+import threading
 
 import netaddr
 
@@ -26,6 +29,7 @@ from rally.task import atomic
 from rally.task import utils
 from rally.utils import sshutils
 
+from rally_openstack.common import prober
 from rally_openstack.task.scenarios.nova import utils as nova_utils
 
 LOG = logging.getLogger(__name__)
@@ -44,6 +48,8 @@ class Host(object):
     def __init__(self, ip):
         self.ip = netaddr.IPAddress(ip)
         self.status = self.ICMP_DOWN_STATUS
+        # round-trip time of the last successful check, in seconds
+        self.rtt = None
 
     @property
     def id(self):
@@ -51,21 +57,13 @@ class Host(object):
 
     @classmethod
     def update_status(cls, server):
-        """Check ip address is pingable and update status."""
-        ping = "ping" if server.ip.version == 4 else "ping6"
-        if sys.platform.startswith("linux"):
-            cmd = [ping, "-c1", "-w1", server.ip.format()]
-        else:
-            cmd = [ping, "-c1", server.ip.format()]
-
-        proc = subprocess.Popen(cmd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        proc.wait()
+        """Check ip address is reachable and update status."""
+        rtt = prober.PROBER.probe(server.ip.format())
         LOG.debug("Host %s is ICMP %s"
-                  % (server.ip.format(), proc.returncode and "down" or "up"))
-        if proc.returncode == 0:
+                  % (server.ip.format(), "down" if rtt is None else "up"))
+        if rtt is not None:
             server.status = cls.ICMP_UP_STATUS
+            server.rtt = rtt
         else:
             server.status = cls.ICMP_DOWN_STATUS
         return server
@@ -80,6 +78,230 @@ class Host(object):
         return not self.__eq__(other)
 
 
+class _PooledSSH(sshutils.SSH):
+    """SSH connection which is shared between iterations via SSHPool.
+
+    All commands are executed as separate channels of one transport, so
+    only the first command pays for the handshake and key exchange.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.keepalive = kwargs.pop("keepalive", 0)
+        super(_PooledSSH, self).__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        # the number of users which checked the connection out of the pool
+        self.users = 0
+        # whether the connection should be closed once it is released
+        self.discarded = False
+
+    def is_alive(self):
+        transport = self._client and self._client.get_transport()
+        return bool(transport and transport.is_active())
+
+    def _get_client(self):
+        with self._lock:
+            if self._client and not self.is_alive():
+                LOG.debug("SSH connection to %s is broken, reconnecting."
+                          % self.host)
+                self._close()
+            if self._client:
+                return self._client
+            client = super(_PooledSSH, self)._get_client()
+            if self.keepalive:
+                client.get_transport().set_keepalive(self.keepalive)
+            return client
+
+    def _close(self):
+        if self._client:
+            try:
+                self._client.close()
+            except Exception:
+                LOG.debug("Failed to close SSH connection to %s."
+                          % self.host)
+            self._client = False
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+
+class SSHPool(object):
+    """Pool of SSH connections shared between iterations of a task.
+
+    Connections are keyed by (host, port, user, credentials) and are checked
+    out of the pool for the time of use. Broken connections are
+    re-established on the next use and least recently used idle ones are
+    closed when the pool exceeds `openstack.vm_ssh_pool_size`. Connections
+    which are in use are never closed by the pool, it exceeds the limit
+    instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = collections.OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(username, host, port=22, pkey=None, password=None):
+        """Build a hashable key without keeping the secrets in it."""
+        secret = "%s\n%s" % (pkey or "", password or "")
+        return (host, port, username,
+                hashlib.sha256(secret.encode("utf-8")).hexdigest())
+
+    def _trim(self):
+        """Pop least recently used idle connections over the limit."""
+        idle = [key for key, ssh in self._connections.items()
+                if not ssh.users]
+        extra = len(self._connections) - CONF.openstack.vm_ssh_pool_size
+        return [self._connections.pop(key) for key in idle[:max(0, extra)]]
+
+    def checkout(self, username, host, port=22, pkey=None, password=None):
+        """Take a pooled SSH connection, creating it if needed.
+
+        The connection should be returned via `release` method.
+        """
+        key = self.make_key(username, host, port, pkey, password)
+        with self._lock:
+            ssh = self._connections.get(key)
+            if ssh is not None:
+                self._stats["hits"] += 1
+                self._connections.move_to_end(key)
+            else:
+                self._stats["misses"] += 1
+                ssh = _PooledSSH(
+                    username, host, port=port, pkey=pkey, password=password,
+                    keepalive=CONF.openstack.vm_ssh_keepalive_interval)
+                self._connections[key] = ssh
+            ssh.users += 1
+            evicted = self._trim()
+        for old in evicted:
+            old.close()
+        return ssh
+
+    def release(self, ssh):
+        """Return a connection taken via `checkout` method to the pool."""
+        with self._lock:
+            ssh.users -= 1
+            evicted = self._trim()
+            if ssh.discarded and not ssh.users:
+                evicted.append(ssh)
+        for old in evicted:
+            old.close()
+
+    @contextlib.contextmanager
+    def connection(self, username, host, port=22, pkey=None, password=None):
+        """Check a connection out of the pool for the block."""
+        ssh = self.checkout(username, host, port=port, pkey=pkey,
+                            password=password)
+        try:
+            yield ssh
+        finally:
+            self.release(ssh)
+
+    def discard(self, host):
+        """Close all connections to the host, e.g. when it is deleted.
+
+        Connections which are in use are closed once they are released.
+        """
+        with self._lock:
+            keys = [key for key in self._connections if key[0] == host]
+            connections = []
+            for key in keys:
+                ssh = self._connections.pop(key)
+                ssh.discarded = True
+                if not ssh.users:
+                    connections.append(ssh)
+        for ssh in connections:
+            ssh.close()
+
+    def stats(self):
+        """Return hits/misses counters and size of the pool."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._connections)
+        return stats
+
+    def clear(self):
+        """Close all pooled connections and reset counters."""
+        with self._lock:
+            connections = list(self._connections.values())
+            for ssh in connections:
+                ssh.discarded = True
+            self._connections = collections.OrderedDict()
+            self._stats = {"hits": 0, "misses": 0}
+        for ssh in connections:
+            ssh.close()
+
+
+# a pool for callers without a task in the context
+SSH_POOL = SSHPool()
+
+# pools of the latest tasks are kept, connections of older ones are closed
+_MAX_TASKS = 4
+_SSH_POOLS = collections.OrderedDict()
+_SSH_POOLS_LOCK = threading.Lock()
+
+
+def get_ssh_pool(context):
+    """Return the pool of SSH connections of a task.
+
+    :param context: a context which contains the task (like the one of
+        scenarios or contexts)
+    """
+    try:
+        task_uuid = (context or {})["task"]["uuid"]
+    except (KeyError, TypeError):
+        return SSH_POOL
+    with _SSH_POOLS_LOCK:
+        pool = _SSH_POOLS.pop(task_uuid, None) or SSHPool()
+        _SSH_POOLS[task_uuid] = pool
+        dropped = []
+        while len(_SSH_POOLS) > _MAX_TASKS:
+            dropped.append(_SSH_POOLS.popitem(last=False)[1])
+    for old in dropped:
+        old.clear()
+    return pool
+
+
+def close_ssh_pool(context):
+    """Close SSH connections of a task, e.g. when it is finished."""
+    try:
+        task_uuid = context["task"]["uuid"]
+    except (KeyError, TypeError):
+        return
+    with _SSH_POOLS_LOCK:
+        pool = _SSH_POOLS.pop(task_uuid, None)
+    if pool is not None:
+        pool.clear()
+
+
+def upload_and_run(ssh, script, remote_path, cmd, stdin=None,
+                   mode=0o755):
+    """Upload a script, make it executable and run it.
+
+    Uploading, chmod and the command cost a single round trip, unless the
+    command needs its own stdin. In that case the upload and chmod are still
+    done by one command.
+
+    :param ssh: A SSHClient instance.
+    :param script: an open file or str with content of the script
+    :param remote_path: path to upload the script to
+    :param cmd: command to run (as a list), which usually includes
+        remote_path
+    :param stdin: an open file or str to pass to the command stdin
+    :param mode: permissions to set for the uploaded script
+
+    :returns: tuple (exit_status, stdout, stderr)
+    """
+    upload = "cat > %(path)s && chmod 0%(mode)o %(path)s" % {
+        "path": shlex.quote(remote_path), "mode": mode}
+    if stdin is None:
+        cmd = " ".join(shlex.quote(str(p)) for p in cmd)
+        return ssh.execute("%s && %s" % (upload, cmd), stdin=script)
+    ssh.run(upload, stdin=script)
+    return ssh.execute(cmd, stdin=stdin)
+
+
 class VMScenario(nova_utils.NovaScenario):
     """Base class for VM scenarios with basic atomic actions.
 
@@ -122,10 +344,6 @@ class VMScenario(nova_utils.NovaScenario):
                 raise ValueError("command 'remote_path' value must be str "
                                  "or list type")
             cmd.extend(remote_path)
-            if command.get("local_path"):
-                ssh.put_file(os.path.expanduser(
-                    command["local_path"]), remote_path[-1],
-                    mode=self.USER_RWX_OTHERS_RX_ACCESS_MODE)
 
         if command.get("script_file"):
             stdin = open(os.path.expanduser(command["script_file"]), "rb")
@@ -135,6 +353,13 @@ class VMScenario(nova_utils.NovaScenario):
 
         cmd.extend(command.get("command_args") or [])
 
+        if remote_path and command.get("local_path"):
+            with open(os.path.expanduser(command["local_path"]),
+                      "rb") as script:
+                return upload_and_run(
+                    ssh, script, remote_path[-1], cmd, stdin=stdin,
+                    mode=self.USER_RWX_OTHERS_RX_ACCESS_MODE)
+
         return ssh.execute(cmd, stdin=stdin)
 
     def _boot_server_with_fip(self, image, flavor, use_floating_ip=True,
@@ -179,6 +404,8 @@ class VMScenario(nova_utils.NovaScenario):
                 self.neutron.delete_floatingip(fip["id"])
 
     def _delete_server_with_fip(self, server, fip, force_delete=False):
+        # the address can be reused by another server
+        get_ssh_pool(self.context).discard(fip["ip"])
         if fip["is_floating"]:
             self._delete_floating_ip(server, fip)
         return self._delete_server(server, force=force_delete)
@@ -190,22 +417,29 @@ class VMScenario(nova_utils.NovaScenario):
     @atomic.action_timer("vm.wait_for_ping")
     def _wait_for_ping(self, server_ip):
         server = Host(server_ip)
-        utils.wait_for_status(
+        server = utils.wait_for_status(
             server,
             ready_statuses=[Host.ICMP_UP_STATUS],
             update_resource=Host.update_status,
             timeout=CONF.openstack.vm_ping_timeout,
             check_interval=CONF.openstack.vm_ping_poll_interval
         )
+        if server.rtt is not None:
+            self.add_output(additive={
+                "title": "Ping RTT",
+                "description": "Round-trip time of the first successful "
+                               "check of the server reachability, in ms",
+                "chart_plugin": "StatsTable",
+                "data": [["RTT", round(server.rtt * 1000, 3)]]})
 
     def _run_command(self, server_ip, port, username, password, command,
                      pkey=None, timeout=120, interval=1):
         """Run command via SSH on server.
 
-        Create SSH connection for server, wait for server to become available
-        (there is a delay between server being set to ACTIVE and sshd being
-        available). Then call run_command_over_ssh to actually execute the
-        command.
+        Get SSH connection for server from the pool (or create a new one if
+        the pool is disabled), wait for server to become available (there is
+        a delay between server being set to ACTIVE and sshd being available).
+        Then call run_command_over_ssh to actually execute the command.
 
         :param server_ip: server ip address
         :param port: ssh port for SSH connection
@@ -221,6 +455,13 @@ class VMScenario(nova_utils.NovaScenario):
         :returns: tuple (exit_status, stdout, stderr)
         """
         pkey = pkey if pkey else self.context["user"]["keypair"]["private"]
+        if CONF.openstack.vm_ssh_pool_size:
+            pool = get_ssh_pool(self.context)
+            with pool.connection(username, server_ip, port=port,
+                                 pkey=pkey, password=password) as ssh:
+                self._wait_for_ssh(ssh, timeout, interval)
+                return self._run_command_over_ssh(ssh, command)
+
         ssh = sshutils.SSH(username, server_ip, port=port,
                            pkey=pkey, password=password)
         try:
@@ -337,8 +337,10 @@ class RuncommandHeat(vm_utils.VMScenario):
             script = pkgutil.get_data(*script)
         else:
             script = open(workload["file"]).read()
-        ssh.execute("cat > /tmp/.rally-workload", stdin=script)
-        ssh.execute("chmod +x /tmp/.rally-workload")
+        # the script and its stdin can not share one command, but uploading
+        # and chmod are done by one
+        ssh.run("cat > /tmp/.rally-workload && chmod +x /tmp/.rally-workload",
+                stdin=script)
         with atomic.ActionTimer(self, "runcommand_heat.workload"):
             status, out, err = ssh.execute(
                 "/tmp/.rally-workload",
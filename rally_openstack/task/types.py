@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import abc
 import copy
 import operator
 import re
@@ -22,8 +23,10 @@ from rally import exceptions
 from rally.task import types
 
 from rally_openstack.common import osclients
+from rally_openstack.common.services.heat import templates
 from rally_openstack.common.services.image import image
 from rally_openstack.common.services.storage import block
+from rally_openstack.task import discovery
 
 
 LOG = logging.getLogger(__name__)
@@ -45,6 +48,7 @@ class OpenStackResourceType(types.ResourceType):
         elif self._context.get("users"):
             self._clients = osclients.Clients(
                 self._context["users"][0]["credential"])
+        self._discovery = discovery.get_cache(self._context)
 
     def _find_resource(self, resource_spec, resources):
         """Return the resource whose name matches the pattern.
@@ -69,10 +73,11 @@ class OpenStackResourceType(types.ResourceType):
 
         :returns: resource object mapped to `name` or `regex`
         """
+        if not isinstance(resources, discovery.Listing):
+            resources = discovery.Listing(resources)
         if "name" in resource_spec:
             # In a case of pattern string exactly matches resource name
-            matching_exact = [resource for resource in resources
-                              if resource.name == resource_spec["name"]]
+            matching_exact = resources.by_name(resource_spec["name"])
             if len(matching_exact) == 1:
                 return matching_exact[0]
             elif len(matching_exact) > 1:
@@ -101,8 +106,7 @@ class OpenStackResourceType(types.ResourceType):
                     "resource_spec": resource_spec})
 
         pattern = re.compile(patternstr)
-        matching = [resource for resource in resources
-                    if re.search(pattern, resource.name or "")]
+        matching = resources.search(patternstr)
         if not matching:
             raise exceptions.InvalidScenarioArgument(
                 "%(typename)s with pattern '%(pattern)s' not found" % {
@@ -122,36 +126,88 @@ class OpenStackResourceType(types.ResourceType):
         return matching[0]
 
 
+class ListedResourceType(OpenStackResourceType):
+    """A base class for ResourceTypes which find resources in listings.
+
+    Listings are shared via the discovery cache of the task.
+    """
+
+    # kind of resources listed by `_list` method, see `list_resources`
+    _resource_kind = None
+
+    @abc.abstractmethod
+    def _list(self, **filters):
+        """List all resources of the kind."""
+
+    def list_resources(self, refresh=False, **filters):
+        """List resources via the discovery cache of the task.
+
+        :param refresh: whether to list resources even if they are cached
+        :param filters: arguments of `_list` method
+        :returns: discovery.Listing object
+        """
+        if self._discovery is None:
+            # the context has no task, so only the cache of one
+            # preprocessing is available
+            cache_id = (self._resource_kind,
+                        hash(frozenset(filters.items())))
+            if refresh or cache_id not in self._cache:
+                self._cache[cache_id] = discovery.Listing(
+                    self._list(**filters))
+            return self._cache[cache_id]
+        key = self._discovery.make_key(self._clients.credential,
+                                       self._resource_kind, **filters)
+        return self._discovery.get(key, lambda: self._list(**filters),
+                                   refresh=refresh)
+
+    def _find_listed(self, find, **filters):
+        """Call find with listed resources, refreshing them on a miss."""
+        try:
+            return find(self.list_resources(**filters))
+        except exceptions.InvalidScenarioArgument:
+            if self._discovery is None:
+                raise
+            # the resource could be created after the listing was cached
+            return find(self.list_resources(refresh=True, **filters))
+
+
 @plugin.configure(name="nova_flavor")
-class Flavor(OpenStackResourceType):
+class Flavor(ListedResourceType):
     """Find Nova's flavor ID by name or regexp."""
 
+    _resource_kind = "flavors"
+
+    def _list(self):
+        return self._clients.nova().flavors.list()
+
     def pre_process(self, resource_spec, config):
         resource_id = resource_spec.get("id")
         if not resource_id:
-            novaclient = self._clients.nova()
-            resource_id = types._id_from_name(
-                resource_config=resource_spec,
-                resources=novaclient.flavors.list(),
-                typename="flavor")
+            resource_id = self._find_listed(
+                lambda flavors: types._id_from_name(
+                    resource_config=resource_spec,
+                    resources=flavors,
+                    typename="flavor"))
         return resource_id
 
 
 @plugin.configure(name="glance_image")
-class GlanceImage(OpenStackResourceType):
+class GlanceImage(ListedResourceType):
     """Find Glance's image ID by name or regexp."""
 
+    _resource_kind = "images"
+
+    def _list(self, **list_kwargs):
+        return image.Image(self._clients).list_images(**list_kwargs)
+
     def pre_process(self, resource_spec, config):
         resource_id = resource_spec.get("id")
         list_kwargs = resource_spec.get("list_kwargs", {})
 
         if not resource_id:
-            cache_id = hash(frozenset(list_kwargs.items()))
-            if cache_id not in self._cache:
-                glance = image.Image(self._clients)
-                self._cache[cache_id] = glance.list_images(**list_kwargs)
-            images = self._cache[cache_id]
-            resource = self._find_resource(resource_spec, images)
+            resource = self._find_listed(
+                lambda images: self._find_resource(resource_spec, images),
+                **list_kwargs)
             return resource.id
         return resource_id
 
@@ -195,20 +251,48 @@ class EC2Image(OpenStackResourceType):
 
 
 @plugin.configure(name="cinder_volume_type")
-class VolumeType(OpenStackResourceType):
+class VolumeType(ListedResourceType):
     """Find Cinder volume type ID by name or regexp."""
 
+    _resource_kind = "volume_types"
+
+    def _list(self):
+        return block.BlockStorage(self._clients).list_types()
+
     def pre_process(self, resource_spec, config):
         resource_id = resource_spec.get("id")
         if not resource_id:
-            cinder = block.BlockStorage(self._clients)
-            resource_id = types._id_from_name(
-                resource_config=resource_spec,
-                resources=cinder.list_types(),
-                typename="volume_type")
+            resource_id = self._find_listed(
+                lambda volume_types: types._id_from_name(
+                    resource_config=resource_spec,
+                    resources=volume_types,
+                    typename="volume_type"))
         return resource_id
 
 
+@plugin.configure(name="heat_template")
+class HeatTemplate(types.ResourceType):
+    """Return content of the template file by its path.
+
+    Unlike "file" type, the file is read once until it changes.
+    """
+
+    def pre_process(self, resource_spec, config):
+        return templates.TEMPLATES.read(resource_spec)
+
+
+@plugin.configure(name="heat_files")
+class HeatFiles(types.ResourceType):
+    """Return the read-only dictionary of file paths and their contents.
+
+    Unlike "file_dict" type, files are read once until they change and all
+    iterations share the same dictionary.
+    """
+
+    def pre_process(self, resource_spec, config):
+        return templates.TEMPLATES.files(resource_spec)
+
+
 @plugin.configure(name="neutron_network")
 class NeutronNetwork(OpenStackResourceType):
     """Find Neutron network ID by it's name."""
@@ -12,14 +12,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
+import collections
+from concurrent import futures
+import hashlib
+import html
 import json
 import os
+import threading
 
 from rally.common import cfg
 from rally.common import logging
 from rally.common import opts
 from rally.common.plugin import plugin
 from rally.task.processing import charts
+from rally.task.processing import utils
 
 
 OPTS = {
@@ -31,7 +38,27 @@ OPTS = {
                  "(embed only trace id), 'raw' (embed raw osprofiler's native "
                  "report) or a path to directory (raw osprofiler's native "
                  "reports for each iteration will be saved separately there "
-                 "to decrease the size of rally report itself)")
+                 "to decrease the size of rally report itself)"),
+        cfg.BoolOpt(
+            "osprofiler_chart_shared_template",
+            default=False,
+            help="Save one osprofiler's native report page to the directory "
+                 "of osprofiler_chart_mode and only traces of iterations "
+                 "next to it. Traces are fetched in background threads and "
+                 "percentiles of spans of all traces are saved to "
+                 "osprofiler-spans.html of the directory."),
+        cfg.IntOpt(
+            "osprofiler_fetch_workers",
+            default=8,
+            min=1,
+            help="Number of threads which fetch traces from OSProfiler's "
+                 "backend for osprofiler_chart_shared_template."),
+        cfg.StrOpt(
+            "osprofiler_trace_cache_dir",
+            default=None,
+            help="Directory to keep traces fetched from OSProfiler's "
+                 "backend in, so reports can be generated again without "
+                 "fetching them.")
     ]
 }
 
@@ -47,6 +74,168 @@ def _datetime_json_serialize(obj):
         return obj
 
 
+def _read_template():
+    from osprofiler import cmd
+
+    path = "%s/template.html" % os.path.dirname(cmd.__file__)
+    with open(path) as f:
+        return f.read()
+
+
+def _span_name(span_info):
+    name = "%s.%s %s" % (span_info.get("project"), span_info.get("service"),
+                         span_info.get("name"))
+    # RPC calls and other traced functions are distinguished by functions
+    for key, payload in sorted(span_info.items()):
+        if key.startswith("meta.raw_payload.") and isinstance(payload, dict):
+            function = (payload.get("info") or {}).get("function") or {}
+            if function.get("name"):
+                return "%s %s" % (name, function["name"])
+    return name
+
+
+class SharedTemplateReport(object):
+    """Traces of iterations rendered by one osprofiler's native report page.
+
+    The page is saved to the directory once and it loads a trace from a
+    script file which name is given by the URL fragment. Traces are
+    fetched by background threads and durations of their spans are
+    aggregated to the table of percentiles.
+    """
+
+    PAGE = "osprofiler.html"
+    SPANS = "osprofiler-spans.html"
+
+    # the report is run only when the trace is loaded, so it is kept as
+    # a non-executable script and the angular application is bootstrapped
+    # manually instead of by the ng-app attribute
+    _REPORT_SCRIPT = "<script type=\"text/x-osprofiler-report\" id=\"report\">"
+    _LOADER = (
+        "<script>(function() {\n"
+        "    var name = decodeURIComponent(location.hash.slice(1));\n"
+        "    if (!/^w_[\\w.-]+\\.js$/.test(name)) {\n"
+        "        return;\n"
+        "    }\n"
+        "    var trace = document.createElement(\"script\");\n"
+        "    trace.src = name;\n"
+        "    trace.onload = function() {\n"
+        "        var report = document.createElement(\"script\");\n"
+        "        report.text = document.getElementById(\"report\").text;\n"
+        "        document.body.appendChild(report);\n"
+        "        angular.bootstrap(document, [\"app\"]);\n"
+        "    };\n"
+        "    document.body.appendChild(trace);\n"
+        "})();</script>\n")
+
+    def __init__(self, directory, fetch_trace, workers):
+        self.directory = directory
+        self._fetch_trace = fetch_trace
+        self._executor = futures.ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._spans = collections.defaultdict(list)
+        self._write_page()
+
+    def _write_page(self):
+        page = _read_template().replace("$LOCAL", "false").replace(
+            "$DATA", "window.OSProfilerTrace").replace(" ng-app=\"app\"", "")
+        data = page.index("window.OSProfilerTrace")
+        start = page.rindex("<script", 0, data)
+        end = page.index("</script>", data) + len("</script>")
+        page = (page[:start] + self._REPORT_SCRIPT
+                + page[page.index(">", start) + 1:end] + "\n" + self._LOADER
+                + page[end:])
+        with open(os.path.join(self.directory, self.PAGE), "w") as f:
+            f.write(page)
+
+    def add(self, conn_str, trace_id, file_name):
+        """Schedule fetching of the trace and return URL of its chart."""
+        future = self._executor.submit(self._save_trace, conn_str, trace_id,
+                                       file_name)
+        with self._lock:
+            self._pending.append(future)
+        return "%s#%s" % (os.path.join(self.directory, self.PAGE), file_name)
+
+    def _save_trace(self, conn_str, trace_id, file_name):
+        trace = self._fetch_trace(conn_str, trace_id)
+        if trace:
+            self._add_spans(trace.get("children", []))
+        else:
+            trace = {"info": {"name": "Failed to fetch trace %s" % trace_id,
+                              "started": 0, "finished": 0},
+                     "children": []}
+        with open(os.path.join(self.directory, file_name), "w") as f:
+            f.write("var OSProfilerTrace = %s;\n" % json.dumps(
+                trace, separators=(",", ":"),
+                default=_datetime_json_serialize))
+
+    def _add_spans(self, spans):
+        for span in spans:
+            info = span.get("info", {})
+            if "started" in info and "finished" in info:
+                with self._lock:
+                    self._spans[_span_name(info)].append(
+                        info["finished"] - info["started"])
+            self._add_spans(span.get("children", []))
+
+    def span_stats(self):
+        """Return rows of percentiles (in ms) of spans of all traces."""
+        rows = []
+        with self._lock:
+            spans = dict((k, sorted(v)) for k, v in self._spans.items())
+        for name in sorted(spans):
+            points = spans[name]
+            rows.append([name, len(points), points[0]]
+                        + [utils.percentile(points, p, ignore_sorting=True)
+                           for p in (0.5, 0.9, 0.95)]
+                        + [points[-1]])
+        return rows
+
+    def flush(self):
+        """Wait for all traces and save percentiles of their spans."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        futures.wait(pending)
+        for future in pending:
+            if future.exception():
+                LOG.error("Failed to save OSProfiler trace: %s"
+                          % future.exception())
+        header = ["Span", "Count", "Min (ms)", "Median (ms)", "90%ile (ms)",
+                  "95%ile (ms)", "Max (ms)"]
+        lines = ["<table>",
+                 "<tr>%s</tr>" % "".join("<th>%s</th>" % h for h in header)]
+        for row in self.span_stats():
+            lines.append("<tr>%s</tr>" % "".join(
+                "<td>%s</td>" % html.escape(str(v)) for v in row))
+        lines.append("</table>")
+        with open(os.path.join(self.directory, self.SPANS), "w") as f:
+            f.write("<!DOCTYPE html>\n<html><body>\n%s\n</body></html>\n"
+                    % "\n".join(lines))
+
+
+_REPORTS = {}
+_REPORTS_LOCK = threading.Lock()
+
+
+def _get_report(directory, fetch_trace):
+    with _REPORTS_LOCK:
+        if directory not in _REPORTS:
+            _REPORTS[directory] = SharedTemplateReport(
+                directory, fetch_trace,
+                workers=CONF.openstack.osprofiler_fetch_workers)
+        return _REPORTS[directory]
+
+
+@atexit.register
+def flush_reports():
+    """Wait for traces of all shared template reports and save them."""
+    with _REPORTS_LOCK:
+        reports = list(_REPORTS.values())
+        _REPORTS.clear()
+    for report in reports:
+        report.flush()
+
+
 @plugin.configure(name="OSProfiler")
 class OSProfilerChart(charts.OutputEmbeddedChart,
                       charts.OutputEmbeddedExternalChart,
@@ -55,6 +244,30 @@ class OSProfilerChart(charts.OutputEmbeddedChart,
 
     @classmethod
     def _fetch_osprofiler_data(cls, connection_str, trace_id):
+        cache_dir = CONF.openstack.osprofiler_trace_cache_dir
+        if not cache_dir:
+            return cls._fetch_osprofiler_trace(connection_str, trace_id)
+
+        cache_dir = os.path.expanduser(cache_dir)
+        key = hashlib.sha256(
+            ("%s %s" % (connection_str, trace_id)).encode()).hexdigest()
+        path = os.path.join(cache_dir, "%s.json" % key)
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+        osp_data = cls._fetch_osprofiler_trace(connection_str, trace_id)
+        if osp_data:
+            os.makedirs(cache_dir, exist_ok=True)
+            # the trace is written to a temporary file at first, so
+            # concurrent readers never see a partial one
+            tmp_path = "%s.%s.tmp" % (path, threading.get_ident())
+            with open(tmp_path, "w") as f:
+                json.dump(osp_data, f, default=_datetime_json_serialize)
+            os.replace(tmp_path, path)
+        return osp_data
+
+    @classmethod
+    def _fetch_osprofiler_trace(cls, connection_str, trace_id):
         from osprofiler.drivers import base
         from osprofiler import opts as osprofiler_opts
 
@@ -74,11 +287,7 @@ class OSProfilerChart(charts.OutputEmbeddedChart,
 
     @classmethod
     def _generate_osprofiler_report(cls, osp_data):
-        from osprofiler import cmd
-
-        path = "%s/template.html" % os.path.dirname(cmd.__file__)
-        with open(path) as f:
-            html_obj = f.read()
+        html_obj = _read_template()
 
         osp_data = json.dumps(osp_data,
                               indent=4,
@@ -103,6 +312,19 @@ class OSProfilerChart(charts.OutputEmbeddedChart,
             #   used  before rally-openstack 1.5.0 .
             data["data"]["trace_id"] = data["data"]["trace_id"][0]
 
+        if (data["data"].get("conn_str") and mode not in (None, "text", "raw")
+                and CONF.openstack.osprofiler_chart_shared_template
+                and "workload_uuid" in data["data"]):
+            file_name = "w_%s-%s.js" % (data["data"]["workload_uuid"],
+                                        data["data"]["iteration"])
+            report = _get_report(mode, cls._fetch_osprofiler_data)
+            return charts.OutputEmbeddedExternalChart.render_complete_data(
+                {"title": "{0} : {1}".format(data["title"],
+                                             data["data"]["trace_id"]),
+                 "widget": "EmbeddedChart",
+                 "data": report.add(data["data"]["conn_str"],
+                                    data["data"]["trace_id"], file_name)})
+
         if data["data"].get("conn_str") and mode != "text":
             osp_data = cls._fetch_osprofiler_data(
                 data["data"]["conn_str"],
@@ -27,6 +27,8 @@ from rally.verification import utils
 
 from rally_openstack.common import consts
 from rally_openstack.common import credential
+from rally_openstack.common import download
+from rally_openstack.common import image_cache
 from rally_openstack.common.services.image import image
 from rally_openstack.common.services.network import neutron
 from rally_openstack.verification.tempest import config as conf
@@ -187,37 +189,60 @@ class TempestContext(context.VerifierContext):
         if image:
             LOG.debug("Downloading image '%s' from Glance to %s."
                       % (image.name, target_path))
-            with open(target_path, "wb") as image_file:
-                for chunk in self.clients.glance().images.data(image.id):
-                    image_file.write(chunk)
+            source = "glance://%s" % image.id
+
+            def fetch(path):
+                return self._download_image_from_glance(image, path)
         else:
             LOG.debug("Downloading image from %s to %s."
                       % (conf.CONF.openstack.img_url, target_path))
-            try:
-                response = requests.get(conf.CONF.openstack.img_url,
-                                        stream=True)
-            except requests.ConnectionError as err:
-                msg = ("Failed to download image. Possibly there is no "
-                       "connection to Internet. Error: %s."
-                       % (str(err) or "unknown"))
-                raise exceptions.RallyException(msg)
-
-            if response.status_code == 200:
-                with open(target_path, "wb") as image_file:
-                    for chunk in response.iter_content(chunk_size=1024):
-                        if chunk:   # filter out keep-alive new chunks
-                            image_file.write(chunk)
-                            image_file.flush()
-            else:
-                if response.status_code == 404:
-                    msg = "Failed to download image. Image was not found."
-                else:
-                    msg = ("Failed to download image. HTTP error code %d."
-                           % response.status_code)
-                raise exceptions.RallyException(msg)
+            source = conf.CONF.openstack.img_url
+            fetch = self._download_image_from_url
+
+        cache = image_cache.get_image_cache()
+        if cache:
+            with cache.use(source, fetch=fetch) as blob:
+                image_cache.copy_image(blob, target_path)
+        else:
+            # the image is downloaded to the target path only when it is
+            # complete, so a broken download is never taken for the image
+            part_path = "%s.part" % target_path
+            fetch(part_path)
+            os.rename(part_path, target_path)
 
         LOG.debug("The image has been successfully downloaded!")
 
+    def _download_image_from_glance(self, image, path):
+        checksums = {}
+        if getattr(image, "os_hash_algo", None) and getattr(
+                image, "os_hash_value", None):
+            checksums[image.os_hash_algo] = image.os_hash_value
+        if getattr(image, "checksum", None):
+            checksums["md5"] = image.checksum
+        stats = download.save(self.clients.glance().images.data(image.id),
+                              path, source="image '%s'" % image.name,
+                              checksums=checksums,
+                              hash_algorithms=["sha256"])
+        return stats["hashes"]["sha256"]
+
+    def _download_image_from_url(self, path):
+        try:
+            stats = download.download(conf.CONF.openstack.img_url, path,
+                                      hash_algorithms=["sha256"])
+        except requests.ConnectionError as err:
+            msg = ("Failed to download image. Possibly there is no "
+                   "connection to Internet. Error: %s."
+                   % (str(err) or "unknown"))
+            raise exceptions.RallyException(msg)
+        except requests.HTTPError as err:
+            if err.response.status_code == 404:
+                msg = "Failed to download image. Image was not found."
+            else:
+                msg = ("Failed to download image. HTTP error code %d."
+                       % err.response.status_code)
+            raise exceptions.RallyException(msg)
+        return stats["hashes"]["sha256"]
+
     def _download_image(self):
         image_path = os.path.join(self.data_dir, self.image_name)
         if os.path.isfile(image_path):
@@ -0,0 +1,145 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from http import server
+import json
+import re
+import threading
+from unittest import mock
+from urllib import parse
+
+from rally_openstack.common.services.grafana import grafana
+from tests.unit import test
+
+
+GRAFANA = "rally_openstack.common.services.grafana.grafana"
+
+
+class StubMonitoring(server.HTTPServer):
+    """Pushgateway and Grafana which shows metrics after a few queries."""
+
+    def __init__(self, visible_after=1):
+        super(StubMonitoring, self).__init__(("127.0.0.1", 0), StubHandler)
+        self.visible_after = visible_after
+        self.pushed = {}
+        self.pushes = []
+        self.queries = []
+
+
+class StubHandler(server.BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        self.server.pushes.append((self.path, data))
+        for line in data.splitlines():
+            self.server.pushed[line.split()[0]] = 0
+        self._reply(200, {})
+
+    def do_GET(self):
+        url = parse.urlparse(self.path)
+        query = parse.parse_qs(url.query)["query"][0]
+        self.server.queries.append((url.path, query))
+        match = re.match(r"^\{__name__=~\"(.*)\"\}$", query)
+        pattern = match.group(1) if match else query
+        result = []
+        for name in self.server.pushed:
+            if re.fullmatch(pattern, name):
+                self.server.pushed[name] += 1
+                if self.server.pushed[name] > self.server.visible_after:
+                    result.append({"metric": {"__name__": name},
+                                   "value": [0, "12345"]})
+        self._reply(200, {"status": "success",
+                          "data": {"resultType": "vector",
+                                   "result": result}})
+
+
+class GrafanaServiceTestCase(test.TestCase):
+
+    def setUp(self):
+        super(GrafanaServiceTestCase, self).setUp()
+        self.stub = StubMonitoring()
+        thread = threading.Thread(target=self.stub.serve_forever,
+                                  kwargs={"poll_interval": 0.01})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.stub.server_close)
+        self.addCleanup(self.stub.shutdown)
+        port = self.stub.server_address[1]
+        self.service = grafana.GrafanaService(
+            {"monitor_vip": "127.0.0.1",
+             "pushgateway_port": port,
+             "grafana": {"port": port, "user": "admin", "password": "pass"},
+             "datasource_id": 1,
+             "job_name": "rally_test"})
+
+    def test_push_metrics(self):
+        self.assertTrue(self.service.push_metrics(["foo", "bar"]))
+
+        self.assertEqual([("/metrics/job/rally_test",
+                           "foo 12345\nbar 12345\n")],
+                         self.stub.pushes)
+
+    def test_push_metric(self):
+        self.assertTrue(self.service.push_metric("foo"))
+
+        self.assertEqual([("/metrics/job/rally_test", "foo 12345\n")],
+                         self.stub.pushes)
+
+    def _mock_clock(self):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        mock.patch("%s.time.time" % GRAFANA,
+                   side_effect=lambda: now[0]).start()
+        return mock.patch("rally.common.utils.interruptable_sleep",
+                          side_effect=sleep).start()
+
+    def test_check_metrics(self):
+        mock_sleep = self._mock_clock()
+        self.stub.pushed = {"foo": 0, "bar": 1}
+
+        latencies = self.service.check_metrics(
+            ["foo", "bar", "baz"], since=0, sleep_time=1, retries_total=3)
+
+        self.assertEqual({"foo": 0.1, "bar": 0.0, "baz": None}, latencies)
+        path = "/api/datasources/proxy/:1/api/v1/query"
+        self.assertEqual(
+            [(path, "{__name__=~\"bar|baz|foo\"}"),
+             (path, "{__name__=~\"baz|foo\"}")]
+            + [(path, "{__name__=~\"baz\"}")] * 4,
+            self.stub.queries)
+        self.assertEqual(
+            [mock.call(0.1), mock.call(0.2), mock.call(0.4),
+             mock.call(0.8), mock.call(1)],
+            mock_sleep.call_args_list)
+
+    def test_check_metric(self):
+        self._mock_clock()
+        self.stub.pushed = {"foo": 1}
+
+        self.assertTrue(self.service.check_metric("foo", sleep_time=1,
+                                                  retries_total=3))
+        self.assertEqual(
+            [("/api/datasources/proxy/:1/api/v1/query", "foo")],
+            self.stub.queries)
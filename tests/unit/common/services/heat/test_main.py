@@ -24,22 +24,18 @@ class Stack(main.Stack):
 
 class StackTestCase(test.ScenarioTestCase):
 
-    @mock.patch("rally_openstack.common.services.heat.main.open",
-                create=True)
-    def test___init__(self, mock_open):
-        reads = [mock.Mock(), mock.Mock()]
-        reads[0].read.return_value = "template_contents"
-        reads[1].read.return_value = "file1_contents"
-        mock_open.side_effect = reads
+    @mock.patch("rally_openstack.common.services.heat.main.templates."
+                "TEMPLATES")
+    def test___init__(self, mock_templates):
+        mock_templates.read.side_effect = ["template_contents",
+                                           "file1_contents"]
         stack = main.Stack("scenario", "task", "template",
                            parameters="parameters",
                            files={"f1_name": "f1_path"})
         self.assertEqual("template_contents", stack.template)
         self.assertEqual({"f1_name": "file1_contents"}, stack.files)
         self.assertEqual([mock.call("template"), mock.call("f1_path")],
-                         mock_open.mock_calls)
-        reads[0].read.assert_called_once_with()
-        reads[1].read.assert_called_once_with()
+                         mock_templates.read.mock_calls)
 
     @mock.patch("rally_openstack.common.services.heat.main.utils")
     def test__wait(self, mock_utils):
@@ -55,12 +51,13 @@ class StackTestCase(test.ScenarioTestCase):
             update_resource=mock_utils.get_from_manager())
 
     @mock.patch("rally.task.atomic")
-    @mock.patch("rally_openstack.common.services.heat.main.open")
+    @mock.patch("rally_openstack.common.services.heat.main.templates."
+                "TEMPLATES")
     @mock.patch("rally_openstack.common.services.heat.main.Stack._wait")
-    def test_create(self, mock_stack__wait, mock_open, mock_task_atomic):
+    def test_create(self, mock_stack__wait, mock_templates, mock_task_atomic):
         mock_scenario = mock.MagicMock(_atomic_actions=[])
         mock_scenario.generate_random_name.return_value = "fake_name"
-        mock_open().read.return_value = "fake_content"
+        mock_templates.read.return_value = "fake_content"
         mock_new_stack = {
             "stack": {
                 "id": "fake_id"
@@ -84,13 +81,14 @@ class StackTestCase(test.ScenarioTestCase):
                                                  ["CREATE_FAILED"])
 
     @mock.patch("rally.task.atomic")
-    @mock.patch("rally_openstack.common.services.heat.main.open")
+    @mock.patch("rally_openstack.common.services.heat.main.templates."
+                "TEMPLATES")
     @mock.patch("rally_openstack.common.services.heat.main.Stack._wait")
-    def test_update(self, mock_stack__wait, mock_open, mock_task_atomic):
+    def test_update(self, mock_stack__wait, mock_templates, mock_task_atomic):
         mock_scenario = mock.MagicMock(
             stack_id="fake_id", _atomic_actions=[])
         mock_parameters = mock.Mock()
-        mock_open().read.return_value = "fake_content"
+        mock_templates.read.return_value = "fake_content"
         stack = main.Stack(
             scenario=mock_scenario, task=mock.Mock(),
             template=None, files={}, parameters=mock_parameters
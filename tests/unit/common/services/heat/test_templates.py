@@ -0,0 +1,93 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import mock
+
+from rally_openstack.common.services.heat import templates
+from tests.unit import test
+
+
+class ReadOnlyDictTestCase(test.TestCase):
+
+    def test_readonly(self):
+        files = templates.ReadOnlyDict({"foo": "bar"})
+
+        self.assertEqual({"foo": "bar"}, files)
+        self.assertEqual("{\"foo\": \"bar\"}", json.dumps(files))
+        self.assertRaises(TypeError, files.__setitem__, "foo", "baz")
+        self.assertRaises(TypeError, files.update, foo="baz")
+        self.assertRaises(TypeError, files.pop, "foo")
+        self.assertEqual({"foo": "bar"}, files)
+
+    def test_copy(self):
+        files = templates.ReadOnlyDict({"foo": {"bar": "baz"}})
+
+        for copied in (copy.copy(files), copy.deepcopy(files),
+                       pickle.loads(pickle.dumps(files))):
+            self.assertIs(dict, type(copied))
+            self.assertEqual(files, copied)
+            copied["foo"] = "changed"
+        self.assertEqual({"foo": {"bar": "baz"}}, files)
+        self.assertIsNot(files["foo"], copy.deepcopy(files)["foo"])
+
+
+class TemplateRegistryTestCase(test.TestCase):
+
+    def setUp(self):
+        super(TemplateRegistryTestCase, self).setUp()
+        self.registry = templates.TemplateRegistry()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def _write(self, name, content, mtime=None):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_read(self):
+        path = self._write("template.yaml", "foo", mtime=1000)
+
+        self.assertEqual("foo", self.registry.read(path))
+        with mock.patch("%s.open" % templates.__name__,
+                        create=True) as mock_open:
+            self.assertEqual("foo", self.registry.read(path))
+        self.assertFalse(mock_open.called)
+
+        self._write("template.yaml", "bar", mtime=2000)
+        self.assertEqual("bar", self.registry.read(path))
+
+    def test_files(self):
+        foo = self._write("foo.yaml", "foo", mtime=1000)
+        bar = self._write("bar.yaml", "bar", mtime=1000)
+
+        files = self.registry.files([foo, bar])
+
+        self.assertEqual({foo: "foo", bar: "bar"}, files)
+        self.assertIsInstance(files, templates.ReadOnlyDict)
+        self.assertIs(files, self.registry.files([foo, bar]))
+
+        self._write("bar.yaml", "baz", mtime=2000)
+        changed = self.registry.files([foo, bar])
+        self.assertEqual({foo: "foo", bar: "baz"}, changed)
+        self.assertEqual({foo: "foo", bar: "bar"}, files)
+
+        self.registry.clear()
+        self.assertIsNot(changed, self.registry.files([foo, bar]))
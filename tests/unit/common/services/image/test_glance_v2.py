@@ -36,6 +36,9 @@ class GlanceV2ServiceTestCase(test.TestCase):
         self.mock_wait_for_status = fixtures.MockPatch(
             "rally.task.utils.wait_for_status")
         self.useFixture(self.mock_wait_for_status)
+        self.mock_get_image_cache = mock.patch(
+            "%s.glance_v2.image_cache.get_image_cache" % PATH,
+            return_value=None).start()
 
     def _get_temp_file_name(self):
         # return a temp file that will be cleaned automatically
@@ -60,6 +63,21 @@ class GlanceV2ServiceTestCase(test.TestCase):
         self.gc.images.upload.assert_called_once_with(
             image_id, mock_requests_get.return_value.raw)
 
+    @mock.patch("%s.glance_v2.open" % PATH, create=True)
+    @mock.patch("requests.get")
+    def test_upload_from_cache(self, mock_requests_get, mock_open):
+        cache = self.mock_get_image_cache.return_value = mock.MagicMock()
+
+        self.service.upload_data("foo", image_location="http://image")
+
+        cache.use.assert_called_once_with("http://image")
+        blob = cache.use.return_value.__enter__.return_value
+        mock_open.assert_called_once_with(blob, "rb")
+        self.gc.images.upload.assert_called_once_with(
+            "foo", mock_open.return_value)
+        mock_open.return_value.close.assert_called_once_with()
+        self.assertFalse(mock_requests_get.called)
+
     @mock.patch("%s.glance_v2.GlanceV2Service.upload_data" % PATH)
     def test_create_image(self, mock_upload_data):
         image_name = "image_name"
@@ -14,13 +14,16 @@
 
 from unittest import mock
 
+from rally.common import cfg
 from rally import exceptions
 from rally_openstack.common import credential
 from rally_openstack.common.services.network import neutron
+from rally_openstack.task import capabilities
 from tests.unit import test
 
 
 PATH = "rally_openstack.common.services.network.neutron"
+CONF = cfg.CONF
 
 
 class NeutronServiceTestCase(test.TestCase):
@@ -138,6 +141,45 @@ class NeutronServiceTestCase(test.TestCase):
             self.nc.add_interface_router.call_args_list
         )
 
+    def test_create_network_topologies_bulk(self):
+        networks = [{"id": "net-1"}, {"id": "net-2"}]
+        subnets = [{"id": "subnet-%s" % i} for i in range(4)]
+        self.nc.create_network.return_value = {"networks": networks}
+        self.nc.create_router.side_effect = [{"router": {"id": "r-1"}},
+                                             {"router": {"id": "r-2"}}]
+        self.nc.create_subnet.return_value = {"subnets": subnets}
+
+        topologies = self.neutron.create_network_topologies(
+            count=2, router_create_args={}, subnets_count=2, bulk=True)
+
+        self.assertEqual(
+            [{"network": {"id": "net-1", "subnets": ["subnet-0",
+                                                     "subnet-1"]},
+              "subnets": subnets[:2],
+              "routers": [{"id": "r-1"}]},
+             {"network": {"id": "net-2", "subnets": ["subnet-2",
+                                                     "subnet-3"]},
+              "subnets": subnets[2:],
+              "routers": [{"id": "r-2"}]}],
+            topologies)
+        self.nc.create_network.assert_called_once_with(
+            {"networks": [{"name": "s-1"}, {"name": "s-2"}]})
+        self.nc.create_subnet.assert_called_once_with(
+            {"subnets": [{"name": mock.ANY, "network_id": net_id,
+                          "dns_nameservers": mock.ANY, "ip_version": 4,
+                          "cidr": mock.ANY}
+                         for net_id in ("net-1", "net-1", "net-2", "net-2")]})
+        self.assertEqual(
+            [mock.call("r-1", {"subnet_id": "subnet-0"}),
+             mock.call("r-1", {"subnet_id": "subnet-1"}),
+             mock.call("r-2", {"subnet_id": "subnet-2"}),
+             mock.call("r-2", {"subnet_id": "subnet-3"})],
+            self.nc.add_interface_router.call_args_list)
+        self.assertIn("neutron.create_2_networks",
+                      [a["name"] for a in self.atomic_inst])
+        self.assertIn("neutron.create_4_subnets",
+                      [a["name"] for a in self.atomic_inst])
+
     def test_delete_network_topology(self):
         topo = {
             "network": {"id": "net-id"},
@@ -633,6 +675,79 @@ class NeutronServiceTestCase(test.TestCase):
             {"port": {"name": "s-1", "network_id": net_id}}
         )
 
+    def test_create_ports(self):
+        CONF.set_override("neutron_bulk_create_batch_size", 2, "openstack")
+        self.addCleanup(CONF.clear_override,
+                        "neutron_bulk_create_batch_size", "openstack")
+        self.nc.create_port.side_effect = [
+            {"ports": [{"id": "p-1"}, {"id": "p-2"}]},
+            {"ports": [{"id": "p-3"}]}]
+
+        self.assertEqual(
+            [{"id": "p-1"}, {"id": "p-2"}, {"id": "p-3"}],
+            self.neutron.create_ports("net-id", count=3,
+                                      admin_state_up=False))
+
+        self.assertEqual(
+            [mock.call({"ports": [
+                {"name": "s-1", "network_id": "net-id",
+                 "admin_state_up": False},
+                {"name": "s-2", "network_id": "net-id",
+                 "admin_state_up": False}]}),
+             mock.call({"ports": [
+                 {"name": "s-3", "network_id": "net-id",
+                  "admin_state_up": False}]})],
+            self.nc.create_port.call_args_list)
+        self._test_atomic_action_timer(self.atomic_inst,
+                                       "neutron.create_3_ports")
+
+    def test_create_ports_without_bulk(self):
+        from neutronclient.common import exceptions as neutron_exceptions
+
+        cache = capabilities.CapabilityCache(ttl=600)
+        self.neutron._capabilities = cache
+        self.nc.create_port.side_effect = [
+            neutron_exceptions.BadRequest("Bulk operation not supported"),
+            {"port": {"id": "p-1"}},
+            {"port": {"id": "p-2"}},
+            {"port": {"id": "p-3"}}]
+
+        self.assertEqual(
+            [{"id": "p-1"}, {"id": "p-2"}],
+            self.neutron.create_ports("net-id", count=2, batch_size=5))
+
+        self.assertEqual(
+            [mock.call({"ports": [{"name": "s-1", "network_id": "net-id"},
+                                  {"name": "s-2", "network_id": "net-id"}]}),
+             mock.call({"port": {"name": "s-1", "network_id": "net-id"}}),
+             mock.call({"port": {"name": "s-2", "network_id": "net-id"}})],
+            self.nc.create_port.call_args_list)
+
+        # other services of the task do not try bulk requests again
+        service = neutron.NeutronService(clients=self.clients,
+                                         name_generator=mock.Mock(),
+                                         capabilities=cache)
+        self.assertEqual([{"id": "p-3"}],
+                         service.create_ports("net-id", count=1))
+        self.assertIn("port", self.nc.create_port.call_args[0][0])
+
+    def test_create_ports_bad_request(self):
+        from neutronclient.common import exceptions as neutron_exceptions
+
+        self.nc.create_port.side_effect = neutron_exceptions.BadRequest(
+            "Invalid input")
+
+        self.assertRaises(neutron_exceptions.BadRequest,
+                          self.neutron.create_ports, "net-id", count=2)
+        self.nc.create_port.assert_called_once_with({"ports": mock.ANY})
+
+    def test_create_ports_partially_created(self):
+        self.nc.create_port.return_value = {"ports": [{"id": "p-1"}]}
+
+        self.assertRaises(exceptions.RallyException,
+                          self.neutron.create_ports, "net-id", count=2)
+        self.nc.create_port.assert_called_once_with({"ports": mock.ANY})
+
     def test_get_port(self):
         port = "foo"
         self.nc.show_port.return_value = {"port": port}
@@ -1260,3 +1375,40 @@ class NeutronServiceTestCase(test.TestCase):
 
         # this should be called once
         self.nc.list_extensions.assert_called_once_with()
+
+    def test_capabilities(self):
+        cache = capabilities.CapabilityCache(ttl=600)
+        services = [neutron.NeutronService(clients=self.clients,
+                                           name_generator=mock.Mock(),
+                                           capabilities=cache)
+                    for i in range(2)]
+        self.nc.list_extensions.return_value = {
+            "extensions": [{"alias": "foo"}]}
+        networks = [{"id": "ext-net"}]
+        self.nc.list_networks.return_value = {"networks": networks}
+
+        for service in services:
+            self.assertTrue(service.supports_extension("foo"))
+            self.assertEqual(networks, service.list_external_networks())
+        self.nc.list_extensions.assert_called_once_with()
+        self.nc.list_networks.assert_called_once_with(
+            **{"router:external": True})
+
+        # the listing is kept until external networks change
+        services[0].delete_network("net")
+        services[0].list_external_networks()
+        self.assertEqual(1, self.nc.list_networks.call_count)
+
+        services[0].delete_network("ext-net")
+        services[1].list_external_networks()
+        self.assertEqual(2, self.nc.list_networks.call_count)
+
+        self.nc.create_network.return_value = {"network": {"id": "net"}}
+        services[0].create_network(router_external=True)
+        services[1].list_external_networks()
+        self.assertEqual(3, self.nc.list_networks.call_count)
+
+        self.nc.update_network.return_value = {"network": {"id": "net"}}
+        services[0].update_network("net", router_external=False)
+        services[1].list_external_networks()
+        self.assertEqual(4, self.nc.list_networks.call_count)
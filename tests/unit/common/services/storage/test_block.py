@@ -42,6 +42,12 @@ class BlockTestCase(test.TestCase):
             scheduler_hints=None, snapshot_id=None,
             source_volid=None, user_id=None, volume_type=None, backup_id=None)
 
+    def test_create_volumes(self):
+        self.assertEqual(self.service._impl.create_volumes.return_value,
+                         self.service.create_volumes(1, count=3))
+        self.service._impl.create_volumes.assert_called_once_with(
+            1, count=3, volume_type=None, max_in_flight=None)
+
     def test_list_volumes(self):
         self.assertEqual(self.service._impl.list_volumes.return_value,
                          self.service.list_volumes(detailed=True))
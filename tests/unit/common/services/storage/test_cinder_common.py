@@ -112,6 +112,58 @@ class CinderMixinTestCase(test.ScenarioTestCase):
             check_interval=CONF.openstack.cinder_volume_create_poll_interval
         )
 
+    @mock.patch("%s.cinder_common.utils.wait_for_statuses" % BASE_PATH)
+    def test__wait_available_volumes(self, mock_wait_for_statuses):
+        volumes = [fakes.FakeVolume(), fakes.FakeVolume()]
+        self.assertEqual(mock_wait_for_statuses.return_value,
+                         self.service._wait_available_volumes(volumes))
+
+        mock_wait_for_statuses.assert_called_once_with(
+            volumes,
+            ready_statuses=["available"],
+            list_resources=mock.ANY,
+            timeout=CONF.openstack.cinder_volume_create_timeout,
+            check_interval=CONF.openstack.cinder_volume_create_poll_interval
+        )
+        list_resources = mock_wait_for_statuses.call_args[1]["list_resources"]
+        self.assertEqual(self.cinder.volumes.list.return_value,
+                         list_resources())
+        self.cinder.volumes.list.assert_called_once_with(detailed=True)
+
+    def test_create_volumes(self):
+        self.service.generate_random_name = mock.MagicMock(
+            side_effect=["vol-%s" % i for i in range(5)])
+        self.cinder.volumes.create.side_effect = [
+            fakes.FakeVolume(id=str(i)) for i in range(5)]
+        self.service._wait_available_volumes = mock.MagicMock(
+            side_effect=lambda volumes: volumes)
+
+        volumes = self.service.create_volumes(1, count=5, volume_type="t",
+                                              max_in_flight=2)
+
+        self.assertEqual(["0", "1", "2", "3", "4"], [v.id for v in volumes])
+        self.cinder.volumes.create.assert_has_calls(
+            [mock.call(1, volume_type="t", name="vol-%s" % i)
+             for i in range(5)])
+        self.assertEqual(
+            [["0", "1"], ["2", "3"], ["4"]],
+            [[v.id for v in c[0][0]]
+             for c in self.service._wait_available_volumes.call_args_list])
+        self._test_atomic_action_timer(self.atomic_actions(),
+                                       "cinder_v%s.create_5_volumes"
+                                       % self.version)
+
+    def test_create_volumes_without_limit(self):
+        self.service._wait_available_volumes = mock.MagicMock(
+            side_effect=lambda volumes: volumes)
+
+        volumes = self.service.create_volumes(1, count=3)
+
+        self.assertEqual(3, len(volumes))
+        self.assertEqual(3, self.cinder.volumes.create.call_count)
+        self.service._wait_available_volumes.assert_called_once_with(
+            [self.cinder.volumes.create.return_value] * 3)
+
     def test_get_volume(self):
         self.assertEqual(self.cinder.volumes.get.return_value,
                          self.service.get_volume(1))
@@ -497,6 +549,19 @@ class UnifiedCinderMixinTestCase(test.TestCase):
         self.assertEqual(1, encryption_type.id)
         self.assertEqual("volume_type", encryption_type.volume_type_id)
 
+    def test_create_volumes(self):
+        self.service._unify_volume = mock.MagicMock(
+            side_effect=["unified1", "unified2"])
+        self.service._impl.create_volumes.return_value = ["vol1", "vol2"]
+
+        self.assertEqual(["unified1", "unified2"],
+                         self.service.create_volumes(1, count=2,
+                                                     max_in_flight=1))
+        self.service._impl.create_volumes.assert_called_once_with(
+            1, count=2, volume_type=None, max_in_flight=1)
+        self.service._unify_volume.assert_has_calls(
+            [mock.call("vol1"), mock.call("vol2")])
+
     def test_delete_volume(self):
         self.service.delete_volume("volume")
         self.service._impl.delete_volume.assert_called_once_with("volume")
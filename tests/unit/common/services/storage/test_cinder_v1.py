@@ -88,6 +88,16 @@ class CinderV1ServiceTestCase(test.ScenarioTestCase):
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_volume)
 
+    def test_create_volumes(self):
+        self.service.generate_random_name = mock.MagicMock(
+            return_value="volume")
+        self.service._wait_available_volumes = mock.MagicMock(
+            return_value=["created"])
+
+        self.assertEqual(["created"], self.service.create_volumes(1, count=1))
+        self.cinder.volumes.create.assert_called_once_with(
+            1, volume_type=None, display_name="volume")
+
     def test_update_volume(self):
         return_value = {"volume": fakes.FakeVolume()}
         self.cinder.volumes.update.return_value = return_value
@@ -0,0 +1,115 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from rally.common import cfg
+
+from rally_openstack.common import credential
+from rally_openstack.common import credential_check
+from tests.unit import test
+
+
+CONF = cfg.CONF
+PATH = "rally_openstack.common.credential_check"
+
+
+def _credential(username):
+    return {"auth_url": "http://example.com", "username": username,
+            "password": "secret", "tenant_name": "foo"}
+
+
+class VerifiedAuthRefsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(VerifiedAuthRefsTestCase, self).setUp()
+        self.auth_refs = credential_check.VerifiedAuthRefs()
+
+    def test_add_and_get(self):
+        auth_ref = mock.Mock()
+        auth_ref.will_expire_soon.return_value = False
+        self.auth_refs.add(_credential("foo"), auth_ref)
+
+        self.assertIs(auth_ref, self.auth_refs.get(
+            credential.OpenStackCredential(**_credential("foo"))))
+        self.assertIsNone(self.auth_refs.get(_credential("bar")))
+        auth_ref.will_expire_soon.assert_called_with(
+            CONF.openstack.keystone_token_refresh_margin)
+
+        self.auth_refs.clear()
+        self.assertIsNone(self.auth_refs.get(_credential("foo")))
+
+    def test_get_expiring(self):
+        auth_ref = mock.Mock()
+        auth_ref.will_expire_soon.return_value = True
+        self.auth_refs.add(_credential("foo"), auth_ref)
+
+        self.assertIsNone(self.auth_refs.get(_credential("foo")))
+
+
+@mock.patch("%s.osclients.Clients" % PATH)
+class AuthenticateTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AuthenticateTestCase, self).setUp()
+        credential_check.VERIFIED_AUTH_REFS.clear()
+        self.addCleanup(credential_check.VERIFIED_AUTH_REFS.clear)
+
+    def test_authenticate(self, mock_clients):
+        auth_refs = {}
+
+        def clients(user):
+            client = mock.Mock()
+            if user["username"] == "bad":
+                type(client.keystone).auth_ref = mock.PropertyMock(
+                    side_effect=Exception("bad creds"))
+            else:
+                client.keystone.auth_ref = auth_refs.setdefault(
+                    user["username"], mock.Mock())
+            return client
+
+        mock_clients.side_effect = clients
+        users = [_credential("foo"), _credential("bad"), _credential("bar")]
+
+        results = credential_check.authenticate(users, workers=2)
+
+        self.assertEqual((auth_refs["foo"], None), results[0])
+        self.assertIsNone(results[1][0])
+        self.assertEqual("bad creds", "%s" % results[1][1])
+        self.assertEqual((auth_refs["bar"], None), results[2])
+        self.assertEqual(3, mock_clients.call_count)
+        self.assertFalse(mock_clients.return_value.verified_keystone.called)
+
+    def test_authenticate_admin(self, mock_clients):
+        results = credential_check.authenticate([_credential("admin")],
+                                                admin=True)
+
+        mock_clients.return_value.verified_keystone.assert_called_once_with()
+        self.assertEqual(
+            [(mock_clients.return_value.keystone.auth_ref, None)], results)
+
+    def test_authenticate_reuse(self, mock_clients):
+        auth_ref = mock.Mock()
+        auth_ref.will_expire_soon.return_value = False
+        credential_check.VERIFIED_AUTH_REFS.add(_credential("foo"), auth_ref)
+
+        results = credential_check.authenticate(
+            [_credential("foo"), _credential("bar")], reuse=True)
+
+        self.assertEqual([(auth_ref, None),
+                          (mock_clients.return_value.keystone.auth_ref,
+                           None)], results)
+        mock_clients.assert_called_once_with(_credential("bar"))
+
+        mock_clients.reset_mock()
+        credential_check.authenticate([_credential("foo")], reuse=True)
+        self.assertFalse(mock_clients.called)
@@ -0,0 +1,256 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import re
+import threading
+from unittest import mock
+
+import fixtures
+import requests
+
+from rally.common import cfg
+
+from rally_openstack.common import download
+from rally_openstack.common import exceptions
+from tests.unit import test
+
+
+CONF = cfg.CONF
+PATH = "rally_openstack.common.download"
+
+DATA = b"0123456789" * 100
+
+
+class FakeServer(object):
+    """Fake of requests.get/head which serves DATA and supports ranges."""
+
+    def __init__(self, data=DATA, ranges=True, chunk_size=64):
+        self.data = data
+        self.ranges = ranges
+        self.chunk_size = chunk_size
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _response(self, status_code, data, headers):
+        response = mock.Mock(status_code=status_code, headers=headers,
+                             ok=status_code < 400)
+
+        def raise_for_status():
+            if status_code >= 400:
+                raise requests.HTTPError(response=response)
+
+        response.raise_for_status.side_effect = raise_for_status
+        response.iter_content.side_effect = lambda chunk_size: (
+            data[i:i + self.chunk_size]
+            for i in range(0, len(data), self.chunk_size))
+        return response
+
+    def head(self, url, **kwargs):
+        headers = {"Content-Length": str(len(self.data))}
+        if self.ranges:
+            headers["Accept-Ranges"] = "bytes"
+        return self._response(200, b"", headers)
+
+    def get(self, url, headers=None, **kwargs):
+        with self._lock:
+            self.calls.append((headers or {}).get("Range"))
+        range_ = (headers or {}).get("Range")
+        if not range_ or not self.ranges:
+            return self._response(
+                200, self.data, {"Content-Length": str(len(self.data))})
+        start, end = re.match(r"bytes=(\d+)-(\d*)", range_).groups()
+        start = int(start)
+        end = int(end) if end else len(self.data) - 1
+        if start >= len(self.data):
+            return self._response(416, b"", {})
+        data = self.data[start:end + 1]
+        return self._response(206, data, {"Content-Length": str(len(data))})
+
+
+class DownloadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DownloadTestCase, self).setUp()
+        self.tmp_dir = self.useFixture(fixtures.TempDir())
+        self.path = self.tmp_dir.join("image")
+        mock.patch("%s._buffer_size" % PATH, return_value=64).start()
+        self.server = FakeServer()
+        mock.patch("%s.requests.get" % PATH,
+                   side_effect=self.server.get).start()
+        mock.patch("%s.requests.head" % PATH,
+                   side_effect=self.server.head).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def _write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_download(self):
+        stats = download.download("http://example.com/image", self.path,
+                                  hash_algorithms=["sha256"])
+
+        self.assertEqual(DATA, self._read())
+        self.assertEqual(len(DATA), stats["size"])
+        self.assertIn("duration", stats)
+        self.assertIn("throughput", stats)
+        self.assertEqual({"sha256": hashlib.sha256(DATA).hexdigest()},
+                         stats["hashes"])
+        self.assertEqual([None], self.server.calls)
+
+    def test_download_checksums(self):
+        stats = download.download(
+            "http://example.com/image", self.path,
+            checksums={"md5": hashlib.md5(DATA).hexdigest().upper()})
+
+        self.assertEqual({"md5": hashlib.md5(DATA).hexdigest()},
+                         stats["hashes"])
+
+    def test_download_checksum_mismatch(self):
+        self.assertRaises(exceptions.ChecksumMismatch,
+                          download.download, "http://example.com/image",
+                          self.path, checksums={"md5": "foo"})
+
+    def test_download_resume(self):
+        self._write(DATA[:300])
+
+        stats = download.download("http://example.com/image", self.path,
+                                  hash_algorithms=["sha256"])
+
+        self.assertEqual(DATA, self._read())
+        self.assertEqual(["bytes=300-"], self.server.calls)
+        self.assertEqual(len(DATA) - 300, stats["size"])
+        self.assertEqual(hashlib.sha256(DATA).hexdigest(),
+                         stats["hashes"]["sha256"])
+
+    def test_download_resume_not_supported(self):
+        self.server.ranges = False
+        self._write(b"garbage")
+
+        download.download("http://example.com/image", self.path)
+
+        self.assertEqual(DATA, self._read())
+
+    def test_download_resume_broken_part(self):
+        self._write(DATA + b"garbage")
+
+        download.download("http://example.com/image", self.path)
+
+        self.assertEqual(DATA, self._read())
+        self.assertEqual(["bytes=%d-" % (len(DATA) + 7), None],
+                         self.server.calls)
+
+    def test_download_without_resume(self):
+        self._write(DATA[:300])
+
+        download.download("http://example.com/image", self.path,
+                          resume=False)
+
+        self.assertEqual(DATA, self._read())
+        self.assertEqual([None], self.server.calls)
+
+    def test_download_http_error(self):
+        response = self.server._response(404, b"", {})
+
+        with mock.patch("%s.requests.get" % PATH, return_value=response):
+            e = self.assertRaises(requests.HTTPError, download.download,
+                                  "http://example.com/image", self.path)
+        self.assertEqual(404, e.response.status_code)
+
+    def test_download_by_segments(self):
+        self.server.data = DATA * 10
+        stats = download.download("http://example.com/image", self.path,
+                                  hash_algorithms=["sha256"], segments=3)
+
+        self.assertEqual(DATA * 10, self._read())
+        self.assertEqual(["bytes=0-3333", "bytes=3334-6667",
+                          "bytes=6668-9999"], sorted(self.server.calls))
+        self.assertEqual(hashlib.sha256(DATA * 10).hexdigest(),
+                         stats["hashes"]["sha256"])
+        self.assertEqual(len(DATA) * 10, stats["size"])
+
+    def test_download_by_segments_from_config(self):
+        CONF.set_override("image_download_segments", 2, "openstack")
+        self.addCleanup(CONF.clear_override, "image_download_segments",
+                        "openstack")
+        self.server.data = DATA * 10
+
+        download.download("http://example.com/image", self.path)
+
+        self.assertEqual(DATA * 10, self._read())
+        self.assertEqual(2, len(self.server.calls))
+
+    def test_download_by_segments_not_supported(self):
+        self.server.ranges = False
+        self.server.data = DATA * 10
+
+        download.download("http://example.com/image", self.path, segments=3)
+
+        self.assertEqual(DATA * 10, self._read())
+        self.assertEqual([None], self.server.calls)
+
+    def test_download_by_segments_small_file(self):
+        self.server.data = DATA[:100]
+
+        download.download("http://example.com/image", self.path, segments=3)
+
+        self.assertEqual(DATA[:100], self._read())
+        self.assertEqual([None], self.server.calls)
+
+    def test_download_by_segments_short_segment(self):
+        self.server.data = DATA * 10
+        get = self.server.get
+
+        def short_get(url, headers=None, **kwargs):
+            response = get(url, headers=headers, **kwargs)
+            response.iter_content.side_effect = lambda chunk_size: [b"x"]
+            return response
+
+        with mock.patch("%s.requests.get" % PATH, side_effect=short_get):
+            self.assertRaises(exceptions.RallyException, download.download,
+                              "http://example.com/image", self.path,
+                              segments=3)
+
+    def test_save(self):
+        stats = download.save([b"ima", b"", b"ge"], self.path,
+                              checksums={"md5": hashlib.md5(
+                                  b"image").hexdigest()},
+                              hash_algorithms=["sha256"])
+
+        self.assertEqual(b"image", self._read())
+        self.assertEqual(5, stats["size"])
+        self.assertEqual({"md5": hashlib.md5(b"image").hexdigest(),
+                          "sha256": hashlib.sha256(b"image").hexdigest()},
+                         stats["hashes"])
+
+    def test_save_checksum_mismatch(self):
+        e = self.assertRaises(exceptions.ChecksumMismatch, download.save,
+                              [b"image"], self.path, source="image 'foo'",
+                              checksums={"md5": "foo"})
+        self.assertIn("image 'foo'", "%s" % e)
+
+    @mock.patch("%s.time.time" % PATH)
+    def test_progress(self, mock_time):
+        mock_time.side_effect = [0, 5, 20, 30]
+        progress = download._Progress("source", total=2048)
+
+        with mock.patch("%s.LOG" % PATH) as mock_log:
+            progress.add(1024)
+            progress.add(1024)
+
+        self.assertEqual(1, mock_log.debug.call_count)
+        self.assertEqual({"size": 2048, "duration": 30,
+                          "throughput": 2048 / 30.0}, progress.stats())
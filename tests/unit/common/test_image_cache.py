@@ -0,0 +1,244 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import os
+import threading
+from unittest import mock
+
+import fixtures
+
+from rally.common import cfg
+
+from rally_openstack.common import image_cache
+from tests.unit import test
+
+
+CONF = cfg.CONF
+PATH = "rally_openstack.common.image_cache"
+
+
+class ImageCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ImageCacheTestCase, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.cache = image_cache.ImageCache(self.cache_dir, 1024)
+
+    def _fetch(self, data):
+        def fetch(path):
+            with open(path, "wb") as f:
+                f.write(data)
+
+        return mock.Mock(side_effect=fetch)
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _get(self, source, fetch=None):
+        with self.cache.use(source, fetch=fetch) as path:
+            return path
+
+    def test_get(self):
+        fetch = self._fetch(b"image")
+
+        path = self._get("http://example.com/image", fetch=fetch)
+        self.assertEqual(b"image", self._read(path))
+        self.assertEqual(hashlib.sha256(b"image").hexdigest(),
+                         os.path.basename(path))
+
+        self.assertEqual(path,
+                         self._get("http://example.com/image", fetch=fetch))
+        self.assertEqual(1, fetch.call_count)
+
+    def test_get_same_content(self):
+        path1 = self._get("source1", fetch=self._fetch(b"image"))
+        path2 = self._get("source2", fetch=self._fetch(b"image"))
+
+        self.assertEqual(path1, path2)
+        self.assertEqual(1, len(os.listdir(os.path.join(self.cache_dir,
+                                                        "blobs"))))
+
+    def test_get_corrupted_blob(self):
+        path = self._get("source", fetch=self._fetch(b"image"))
+        with open(path, "wb") as f:
+            f.write(b"ima")
+
+        fetch = self._fetch(b"image")
+        self.assertEqual(path, self._get("source", fetch=fetch))
+        self.assertEqual(b"image", self._read(path))
+        fetch.assert_called_once_with(mock.ANY)
+
+    def test_get_corrupted_blob_of_the_same_size(self):
+        path = self._get("source", fetch=self._fetch(b"image"))
+        with open(path, "wb") as f:
+            f.write(b"imagf")
+
+        # the hash of a blob is verified once by every process
+        self.cache = image_cache.ImageCache(self.cache_dir, 1024)
+        fetch = self._fetch(b"image")
+        self.assertEqual(path, self._get("source", fetch=fetch))
+        self.assertEqual(b"image", self._read(path))
+        fetch.assert_called_once_with(mock.ANY)
+
+    def test_get_with_sha256_from_fetch(self):
+        def fetch(path):
+            self._fetch(b"image")(path)
+            return "sum"
+
+        path = self._get("source", fetch=fetch)
+
+        self.assertEqual(os.path.join(self.cache_dir, "blobs", "sum"), path)
+        self.assertEqual(b"image", self._read(path))
+
+    def test_get_failed(self):
+        def fetch(path):
+            with open(path, "wb") as f:
+                f.write(b"ima")
+            raise RuntimeError("boom")
+
+        self.assertRaises(RuntimeError, self._get, "source", fetch=fetch)
+        self.assertEqual([], os.listdir(os.path.join(self.cache_dir, "blobs")))
+
+        # the part of the image is passed to the next download to resume it
+        fetch = mock.Mock(side_effect=lambda path: self.assertEqual(
+            b"ima", self._read(path)))
+        self._get("source", fetch=fetch)
+        fetch.assert_called_once_with(mock.ANY)
+
+    @mock.patch("%s.fetch_url" % PATH)
+    def test_get_from_url(self, mock_fetch_url):
+        mock_fetch_url.side_effect = (
+            lambda url, path: self._fetch(b"image")(path))
+
+        path = self._get("http://example.com/image")
+
+        self.assertEqual(b"image", self._read(path))
+        mock_fetch_url.assert_called_once_with("http://example.com/image",
+                                               mock.ANY)
+
+    def test_get_concurrently(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch(path):
+            started.set()
+            release.wait(10)
+            with open(path, "wb") as f:
+                f.write(b"image")
+
+        fetch = mock.Mock(side_effect=fetch)
+        results = []
+
+        def get():
+            results.append(self._get("source", fetch=fetch))
+
+        threads = [threading.Thread(target=get) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        started.wait(10)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, fetch.call_count)
+        self.assertEqual(3, len(results))
+        self.assertEqual(1, len(set(results)))
+
+    def test_evict(self):
+        self.cache = image_cache.ImageCache(self.cache_dir, 10)
+        path1 = self._get("source1", fetch=self._fetch(b"a" * 4))
+        path2 = self._get("source2", fetch=self._fetch(b"b" * 4))
+        os.utime(path1, (1, 1))
+        os.utime(path2, (2, 2))
+        # the first image is used again, so the second one is the least
+        #   recently used
+        self._get("source1", fetch=self._fetch(b"a" * 4))
+
+        path3 = self._get("source3", fetch=self._fetch(b"c" * 4))
+
+        self.assertTrue(os.path.exists(path1))
+        self.assertFalse(os.path.exists(path2))
+        self.assertTrue(os.path.exists(path3))
+
+    def test_evict_postponed_while_images_are_used(self):
+        self.cache = image_cache.ImageCache(self.cache_dir, 4)
+        with self.cache.use("source1", fetch=self._fetch(b"a" * 4)) as path1:
+            path2 = self._get("source2", fetch=self._fetch(b"b" * 4))
+            # the first image can not be evicted while it is used
+            self.assertTrue(os.path.exists(path1))
+            self.assertTrue(os.path.exists(path2))
+
+        # the image which has just been used is kept
+        self.assertTrue(os.path.exists(path1))
+        self.assertFalse(os.path.exists(path2))
+
+    def test_evict_keeps_the_new_image(self):
+        self.cache = image_cache.ImageCache(self.cache_dir, 2)
+
+        path = self._get("source", fetch=self._fetch(b"image"))
+
+        self.assertTrue(os.path.exists(path))
+
+
+class ImageCacheHelpersTestCase(test.TestCase):
+
+    def test_get_image_cache(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        CONF.set_override("image_cache_enabled", True, "openstack")
+        self.addCleanup(CONF.clear_override, "image_cache_enabled",
+                        "openstack")
+        CONF.set_override("image_cache_dir", cache_dir, "openstack")
+        CONF.set_override("image_cache_size", 2, "openstack")
+        self.addCleanup(CONF.clear_override, "image_cache_dir", "openstack")
+        self.addCleanup(CONF.clear_override, "image_cache_size", "openstack")
+
+        cache = image_cache.get_image_cache()
+
+        self.assertEqual(cache_dir, cache.cache_dir)
+        self.assertEqual(2 * 1024 * 1024, cache.max_size)
+        self.assertIs(cache, image_cache.get_image_cache())
+
+    def test_get_image_cache_disabled(self):
+        # the cache is disabled by default
+        self.assertIsNone(image_cache.get_image_cache())
+
+    @mock.patch("%s.download.download" % PATH)
+    def test_fetch_url(self, mock_download):
+        mock_download.return_value = {"hashes": {"sha256": "sum"}}
+
+        self.assertEqual(
+            "sum", image_cache.fetch_url("http://example.com/image", "path"))
+
+        mock_download.assert_called_once_with(
+            "http://example.com/image", "path", hash_algorithms=["sha256"],
+            verify=False)
+
+    def test_copy_image(self):
+        tmp_dir = self.useFixture(fixtures.TempDir())
+        src = tmp_dir.join("src")
+        with open(src, "wb") as f:
+            f.write(b"image")
+
+        image_cache.copy_image(src, tmp_dir.join("dst"))
+
+        with open(tmp_dir.join("dst"), "rb") as f:
+            self.assertEqual(b"image", f.read())
+
+    @mock.patch("%s.shutil.copyfile" % PATH)
+    @mock.patch("%s.os.link" % PATH, side_effect=OSError)
+    def test_copy_image_to_another_fs(self, mock_link, mock_copyfile):
+        image_cache.copy_image("src", "dst")
+
+        mock_link.assert_called_once_with("src", "dst")
+        mock_copyfile.assert_called_once_with("src", "dst")
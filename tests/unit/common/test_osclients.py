@@ -155,6 +155,74 @@ class CachedTestCase(test.TestCase):
         self.assertEqual({}, clients.cache)
 
 
+class KeystoneSessionPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(KeystoneSessionPoolTestCase, self).setUp()
+        self.pool = osclients.KeystoneSessionPool()
+        self.credential = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "user", "pass", "tenant")
+
+    def test_make_key(self):
+        key = self.pool.make_key(self.credential, "3")
+        self.assertEqual(key, self.pool.make_key(
+            oscredential.OpenStackCredential(
+                "http://auth_url/v3", "user", "pass", "tenant"), "3"))
+        self.assertNotEqual(key, self.pool.make_key(self.credential, "2"))
+        self.assertNotEqual(key, self.pool.make_key(
+            oscredential.OpenStackCredential(
+                "http://auth_url/v3", "user", "new_pass", "tenant"), "3"))
+
+    def test_get(self):
+        factory = mock.Mock(side_effect=lambda: (mock.Mock(), mock.Mock()))
+
+        first = self.pool.get("key1", factory)
+        self.assertIs(first, self.pool.get("key1", factory))
+        self.assertIsNot(first, self.pool.get("key2", factory))
+
+        self.assertEqual(2, factory.call_count)
+        self.assertEqual({"hits": 1, "misses": 2, "refreshes": 0, "size": 2},
+                         self.pool.stats())
+
+    def test_get_access(self):
+        session = mock.Mock()
+        auth_plugin = mock.Mock()
+        token1 = mock.Mock(**{"will_expire_soon.return_value": False})
+        token2 = mock.Mock(**{"will_expire_soon.return_value": False})
+        auth_plugin.get_access.side_effect = [token1, token1, token2]
+
+        self.assertEqual(token1, self.pool.get_access(session, auth_plugin))
+        self.assertEqual(token1, self.pool.get_access(session, auth_plugin))
+        self.assertEqual(token2, self.pool.get_access(session, auth_plugin))
+
+        self.assertFalse(auth_plugin.invalidate.called)
+        self.assertEqual(1, self.pool.stats()["refreshes"])
+        token1.will_expire_soon.assert_called_with(300)
+
+    def test_get_access_refreshes_expiring_token(self):
+        session = mock.Mock()
+        auth_plugin = mock.Mock()
+        old_token = mock.Mock(**{"will_expire_soon.return_value": True})
+        new_token = mock.Mock()
+        auth_plugin.get_access.side_effect = [old_token, new_token]
+
+        self.assertEqual(new_token,
+                         self.pool.get_access(session, auth_plugin))
+        auth_plugin.invalidate.assert_called_once_with()
+        self.assertEqual([mock.call(session), mock.call(session)],
+                         auth_plugin.get_access.call_args_list)
+
+    def test_clear(self):
+        session = mock.Mock()
+        self.pool.get("key", lambda: (session, mock.Mock()))
+
+        self.pool.clear()
+
+        session.session.close.assert_called_once_with()
+        self.assertEqual({"hits": 0, "misses": 0, "refreshes": 0, "size": 0},
+                         self.pool.stats())
+
+
 @ddt.ddt
 class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
 
@@ -258,6 +326,32 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
             self.ksa_session.Session.call_args_list
         )
 
+    def test_keystone_get_session_reuses_pooled_session(self):
+        self.set_up_keystone_mocks()
+
+        sess1 = osclients.Keystone(self.credential, {}).get_session("3")
+        sess2 = osclients.Keystone(self.credential, {}).get_session("3")
+
+        self.assertIs(sess1, sess2)
+        self.ksa_password.assert_called_once_with(
+            auth_url="http://auth_url/", password="pass",
+            tenant_name="tenant", username="user", domain_name=None,
+            project_domain_name=None, user_domain_name=None)
+        self.assertEqual({"hits": 1, "misses": 1, "refreshes": 0, "size": 1},
+                         osclients.SESSION_POOL.stats())
+
+    def test_keystone_get_session_without_reuse(self):
+        self.set_up_keystone_mocks()
+        cfg.CONF.set_override("keystone_session_reuse", False, "openstack")
+        self.addCleanup(cfg.CONF.clear_override, "keystone_session_reuse",
+                        "openstack")
+
+        osclients.Keystone(self.credential, {}).get_session("3")
+        osclients.Keystone(self.credential, {}).get_session("3")
+
+        self.assertEqual(2, self.ksa_password.call_count)
+        self.assertEqual(0, osclients.SESSION_POOL.stats()["size"])
+
     def test_keystone_property(self):
         keystone = osclients.Keystone(self.credential, None)
         self.assertRaises(exceptions.RallyException, lambda: keystone.keystone)
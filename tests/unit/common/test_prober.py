@@ -0,0 +1,190 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import socket
+import struct
+import time
+from unittest import mock
+
+from rally.common import cfg
+
+from rally_openstack.common import prober
+from tests.unit import test
+
+
+CONF = cfg.CONF
+PATH = "rally_openstack.common.prober"
+
+
+def _reply(seq, ident=0, icmp_type=0, ip_header=b""):
+    return ip_header + struct.pack("!BBHHH", icmp_type, 0, 0, ident, seq)
+
+
+class ProberTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProberTestCase, self).setUp()
+        self.prober = prober.Prober()
+
+    def test__checksum(self):
+        # an example from RFC 1071
+        data = bytes([0x00, 0x01, 0xf2, 0x03, 0xf4, 0xf5, 0xf6, 0xf7])
+        self.assertEqual(~0xddf2 & 0xFFFF, prober._checksum(data))
+        self.assertEqual(prober._checksum(b"\x01\x00"),
+                         prober._checksum(b"\x01"))
+
+    @mock.patch("%s.threading.Thread" % PATH)
+    @mock.patch("%s.socket.socket" % PATH)
+    def test__get_socket_datagram(self, mock_socket, mock_thread):
+        sock = self.prober._get_socket(4)
+
+        self.assertEqual((mock_socket.return_value, False), sock)
+        mock_socket.assert_called_once_with(
+            socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        mock_thread.return_value.start.assert_called_once_with()
+        self.assertIs(sock, self.prober._get_socket(4))
+        self.assertEqual(1, mock_socket.call_count)
+
+    @mock.patch("%s.threading.Thread" % PATH)
+    @mock.patch("%s.socket.socket" % PATH)
+    def test__get_socket_raw(self, mock_socket, mock_thread):
+        raw_sock = mock.Mock()
+        mock_socket.side_effect = [PermissionError(), raw_sock]
+
+        self.assertEqual((raw_sock, True), self.prober._get_socket(6))
+        mock_socket.assert_called_with(
+            socket.AF_INET6, socket.SOCK_RAW, socket.IPPROTO_ICMPV6)
+
+    @mock.patch("%s.threading.Thread" % PATH)
+    @mock.patch("%s.socket.socket" % PATH, side_effect=PermissionError())
+    def test__get_socket_not_permitted(self, mock_socket, mock_thread):
+        self.assertIsNone(self.prober._get_socket(4))
+        self.assertRaises(OSError, self.prober.ping, "1.2.3.4")
+        self.assertEqual(2, mock_socket.call_count)
+        self.assertFalse(mock_thread.called)
+
+    def _send_reply(self, is_raw, reply):
+        def sendto(packet, address):
+            icmp_type, code, csum, ident, seq = struct.unpack(
+                "!BBHHH", packet[:8])
+            self.assertEqual((8, 0), (icmp_type, code))
+            self.assertEqual(0, prober._checksum(packet))
+            self.prober._dispatch(4, is_raw, reply(seq, ident), address[0],
+                                  time.time())
+
+        return sendto
+
+    def test_ping(self):
+        sock = mock.Mock()
+        sock.sendto.side_effect = self._send_reply(
+            False, lambda seq, ident: _reply(seq))
+        self.prober._sockets[4] = (sock, False)
+
+        rtt = self.prober.ping("1.2.3.4", timeout=0.1)
+
+        self.assertGreaterEqual(rtt, 0)
+        sock.sendto.assert_called_once_with(mock.ANY, ("1.2.3.4", 0))
+        self.assertEqual({}, self.prober._waiters)
+
+    def test_ping_raw(self):
+        sock = mock.Mock()
+        ip_header = b"\x45" + b"\0" * 19
+        sock.sendto.side_effect = self._send_reply(
+            True, lambda seq, ident: _reply(seq, ident, ip_header=ip_header))
+        self.prober._sockets[4] = (sock, True)
+
+        self.assertIsNotNone(self.prober.ping("1.2.3.4", timeout=0.1))
+
+    def test_ping_ignores_foreign_replies(self):
+        sock = mock.Mock()
+        ip_header = b"\x45" + b"\0" * 19
+
+        def sendto(packet, address):
+            seq = struct.unpack("!H", packet[6:8])[0]
+            for data, addr in (
+                    # another identifier
+                    (_reply(seq, self.prober._ident + 1, ip_header=ip_header),
+                     "1.2.3.4"),
+                    # another type
+                    (_reply(seq, self.prober._ident, icmp_type=3,
+                            ip_header=ip_header), "1.2.3.4"),
+                    # another host
+                    (_reply(seq, self.prober._ident, ip_header=ip_header),
+                     "1.2.3.5"),
+                    # garbage
+                    (ip_header + b"\0", "1.2.3.4")):
+                self.prober._dispatch(4, True, data, addr, 0)
+
+        sock.sendto.side_effect = sendto
+        self.prober._sockets[4] = (sock, True)
+
+        self.assertIsNone(self.prober.ping("1.2.3.4", timeout=0.01))
+
+    def test_ping_no_route(self):
+        sock = mock.Mock()
+        sock.sendto.side_effect = OSError("No route to host")
+        self.prober._sockets[6] = (sock, False)
+
+        self.assertIsNone(self.prober.ping("::1", timeout=0.01))
+
+    @mock.patch("%s.select.select" % PATH)
+    def test__receive_once(self, mock_select):
+        sock = mock.Mock()
+        sock.recvfrom.return_value = (_reply(7), ("1.2.3.4", 0))
+        self.prober._sockets = {4: (sock, False), 6: None}
+        mock_select.return_value = ([sock], [], [])
+        self.prober._dispatch = mock.Mock()
+
+        self.prober._receive_once(0.1)
+
+        mock_select.assert_called_once_with(
+            [sock, self.prober._wakeup_r], [], [], 0.1)
+        self.prober._dispatch.assert_called_once_with(
+            4, False, _reply(7), "1.2.3.4", mock.ANY)
+
+    @mock.patch("%s.select.select" % PATH)
+    def test__receive_once_wakeup(self, mock_select):
+        self.prober._dispatch = mock.Mock()
+        os.write(self.prober._wakeup_w, b"\0")
+        mock_select.return_value = ([self.prober._wakeup_r], [], [])
+
+        self.prober._receive_once(0.1)
+
+        self.assertFalse(self.prober._dispatch.called)
+
+    @mock.patch("%s.socket.create_connection" % PATH)
+    def test_tcp_connect(self, mock_create_connection):
+        self.assertIsNotNone(prober.Prober.tcp_connect("1.2.3.4", 22))
+        mock_create_connection.assert_called_once_with(("1.2.3.4", 22),
+                                                       timeout=1.0)
+
+        mock_create_connection.side_effect = ConnectionRefusedError()
+        self.assertIsNotNone(prober.Prober.tcp_connect("1.2.3.4", 22))
+
+        mock_create_connection.side_effect = socket.timeout()
+        self.assertIsNone(prober.Prober.tcp_connect("1.2.3.4", 22))
+
+    def test_probe(self):
+        self.prober.ping = mock.Mock(return_value=0.1)
+        self.prober.tcp_connect = mock.Mock()
+
+        self.assertEqual(0.1, self.prober.probe("1.2.3.4"))
+        self.assertFalse(self.prober.tcp_connect.called)
+
+    def test_probe_tcp_fallback(self):
+        self.prober.ping = mock.Mock(side_effect=PermissionError())
+        self.prober.tcp_connect = mock.Mock(return_value=0.2)
+
+        self.assertEqual(0.2, self.prober.probe("1.2.3.4", timeout=2))
+        self.prober.tcp_connect.assert_called_once_with(
+            "1.2.3.4", CONF.openstack.vm_ping_tcp_port, 2)
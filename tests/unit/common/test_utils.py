@@ -0,0 +1,123 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from rally import exceptions
+
+from rally_openstack.common import utils
+from tests.unit import test
+
+
+PATH = "rally_openstack.common.utils"
+
+
+class FakeResource(object):
+    def __init__(self, id, status, name=None):
+        self.id = id
+        self.status = status
+        self.name = name or id
+
+
+class WaitForStatusesTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WaitForStatusesTestCase, self).setUp()
+        self.mock_sleep = mock.patch("%s.time.sleep" % PATH).start()
+
+    def test_wait_for_statuses(self):
+        resources = [FakeResource("a", "BUILD"), FakeResource("b", "BUILD")]
+        listings = [
+            [FakeResource("a", "BUILD"), FakeResource("b", "ACTIVE"),
+             FakeResource("c", "ERROR")],
+            [FakeResource("a", "ACTIVE"), FakeResource("b", "ACTIVE")]
+        ]
+        list_resources = mock.Mock(side_effect=listings)
+
+        result = utils.wait_for_statuses(
+            resources, ready_statuses=["active"],
+            list_resources=list_resources, check_interval=3)
+
+        self.assertEqual([listings[1][0], listings[0][1]], result)
+        self.assertEqual(2, list_resources.call_count)
+        self.mock_sleep.assert_called_once_with(3)
+
+    def test_wait_for_statuses_on_ready(self):
+        resources = [FakeResource("a", "BUILD"), FakeResource("b", "BUILD")]
+        listings = [
+            [FakeResource("a", "BUILD"), FakeResource("b", "ACTIVE")],
+            [FakeResource("a", "ACTIVE"), FakeResource("b", "ACTIVE")]
+        ]
+        on_ready = mock.Mock()
+
+        utils.wait_for_statuses(
+            resources, ready_statuses=["active"],
+            list_resources=mock.Mock(side_effect=listings),
+            on_ready=on_ready)
+
+        self.assertEqual([mock.call(listings[0][1]),
+                          mock.call(listings[1][0])],
+                         on_ready.call_args_list)
+
+    def test_wait_for_statuses_deletion(self):
+        resources = [FakeResource("a", "ACTIVE"), FakeResource("b", "ACTIVE")]
+        list_resources = mock.Mock(side_effect=[
+            [FakeResource("a", "DELETING"), FakeResource("b", "DELETED")],
+            []])
+
+        self.assertEqual(
+            [None, None],
+            utils.wait_for_statuses(resources, ready_statuses=["deleted"],
+                                    list_resources=list_resources,
+                                    check_deletion=True))
+        self.assertEqual(2, list_resources.call_count)
+
+    def test_wait_for_statuses_not_found(self):
+        list_resources = mock.Mock(return_value=[])
+
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          utils.wait_for_statuses,
+                          [FakeResource("a", "BUILD")],
+                          ready_statuses=["active"],
+                          list_resources=list_resources)
+
+    def test_wait_for_statuses_failure(self):
+        list_resources = mock.Mock(return_value=[FakeResource("a", "ERROR")])
+
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          utils.wait_for_statuses,
+                          [FakeResource("a", "BUILD")],
+                          ready_statuses=["active"],
+                          list_resources=list_resources)
+
+    @mock.patch("%s.time.time" % PATH)
+    def test_wait_for_statuses_timeout(self, mock_time):
+        mock_time.side_effect = [1, 3, 5]
+        list_resources = mock.Mock(
+            side_effect=lambda: [FakeResource("a", "ACTIVE"),
+                                 FakeResource("b", "BUILD")])
+
+        self.assertRaises(exceptions.TimeoutException,
+                          utils.wait_for_statuses,
+                          [FakeResource("a", "BUILD"),
+                           FakeResource("b", "BUILD")],
+                          ready_statuses=["active"],
+                          list_resources=list_resources, timeout=3)
+        self.assertEqual(2, list_resources.call_count)
+
+    def test_wait_for_statuses_wrong_statuses(self):
+        self.assertRaises(ValueError, utils.wait_for_statuses, [],
+                          ready_statuses="active", list_resources=None)
+        self.assertRaises(ValueError, utils.wait_for_statuses, [],
+                          ready_statuses=["error"], list_resources=None)
+        self.assertRaises(ValueError, utils.wait_for_statuses, [],
+                          ready_statuses=[], list_resources=None)
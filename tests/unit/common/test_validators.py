@@ -170,7 +170,8 @@ class ImageExistsValidatorTestCase(test.TestCase):
 
         mock_glance_image.assert_called_once_with(
             context={"admin": {
-                "credential": self.context["users"][0]["credential"]}})
+                "credential": self.context["users"][0]["credential"]},
+                "task": self.context.get("task")})
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
@@ -298,7 +299,8 @@ class FlavorExistsValidatorTestCase(test.TestCase):
         self.assertEqual("flavor", result)
 
         mock_flavor.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}}
+            context={"admin": {"credential": clients.credential},
+                     "task": None}
         )
         mock_flavor_obj = mock_flavor.return_value
         mock_flavor_obj.pre_process.assert_called_once_with(
@@ -364,7 +366,8 @@ class FlavorExistsValidatorTestCase(test.TestCase):
         self.validator._get_validated_flavor.assert_called_once_with(
             config=config,
             clients=ctx["users"][0]["credential"].clients(),
-            param_name=self.validator.param_name)
+            param_name=self.validator.param_name,
+            task=ctx.get("task"))
 
 
 @ddt.ddt
@@ -546,7 +549,8 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
                                                      "image")
         self.assertEqual(image, result)
         mock_glance_image.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}})
+            context={"admin": {"credential": clients.credential},
+                     "task": None})
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
@@ -577,7 +581,8 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
         self.assertEqual(image, result)
 
         mock_glance_image.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}})
+            context={"admin": {"credential": clients.credential},
+                     "task": None})
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
@@ -595,7 +600,8 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
                          e.message)
 
         mock_glance_image.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}})
+            context={"admin": {"credential": clients.credential},
+                     "task": None})
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
@@ -925,18 +931,22 @@ class VolumeTypeExistsValidatorTestCase(test.TestCase):
             "The parameter 'fake_param' is required and should not be empty.",
             e.message)
 
-    def test_validate_with_ctx(self):
-        clients = self.context["users"][0]["credential"].clients()
-        clients.cinder().volume_types.list.return_value = []
+    @mock.patch("%s.openstack_types.VolumeType" % PATH)
+    def test_validate_with_ctx(self, mock_volume_type):
+        mock_volume_type.return_value.list_resources.return_value = []
         ctx = {"args": {"volume_type": "fake_type"},
                "contexts": {"volume_types": ["fake_type"]}}
         result = self.validator.validate(self.context, ctx, None, None)
 
         self.assertIsNone(result)
+        mock_volume_type.assert_called_once_with(
+            context={"admin": {
+                "credential": self.context["users"][0]["credential"]},
+                "task": self.context.get("task")})
 
-    def test_validate_with_ctx_failed(self):
-        clients = self.context["users"][0]["credential"].clients()
-        clients.cinder().volume_types.list.return_value = []
+    @mock.patch("%s.openstack_types.VolumeType" % PATH)
+    def test_validate_with_ctx_failed(self, mock_volume_type):
+        mock_volume_type.return_value.list_resources.return_value = []
         config = {"args": {"volume_type": "fake_type"},
                   "contexts": {"volume_types": ["fake_type_2"]}}
         e = self.assertRaises(
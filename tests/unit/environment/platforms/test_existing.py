@@ -284,14 +284,18 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
         self._check_health_schema(result)
         self.assertEqual({"available": True}, result)
         mock_clients.assert_has_calls(
-            [mock.call(pdata["users"][0]), mock.call().keystone(),
-             mock.call(pdata["users"][1]), mock.call().keystone(),
-             mock.call(pdata["admin"]), mock.call().verified_keystone()])
+            [mock.call(pdata["users"][0]), mock.call(pdata["users"][1])],
+            any_order=True)
+        mock_clients.assert_has_calls(
+            [mock.call(pdata["admin"]), mock.call().verified_keystone()])
+        self.assertEqual(3, mock_clients.call_count)
+        self.assertEqual(2, len(pdata["users"]))
 
     @mock.patch("rally_openstack.common.osclients.Clients")
     def test_check_failed_with_native_rally_exc(self, mock_clients):
         e = exceptions.RallyException("foo")
-        mock_clients.return_value.keystone.side_effect = e
+        type(mock_clients.return_value.keystone).auth_ref = (
+            mock.PropertyMock(side_effect=e))
         pdata = {"admin": None,
                  "users": [{"username": "balbab", "password": "12345"}]}
         result = existing.OpenStack({}, platform_data=pdata).check_health()
@@ -324,7 +328,8 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
 
     @mock.patch("rally_openstack.common.osclients.Clients")
     def test_check_failed_users(self, mock_clients):
-        mock_clients.return_value.keystone.side_effect = Exception
+        type(mock_clients.return_value.keystone).auth_ref = (
+            mock.PropertyMock(side_effect=Exception))
         pdata = {"admin": None,
                  "users": [{"username": "balbab", "password": "12345"}]}
         result = existing.OpenStack({}, platform_data=pdata).check_health()
@@ -340,6 +345,27 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
             result)
         self.assertIn("Traceback (most recent call last)", result["traceback"])
 
+    @mock.patch("rally_openstack.common.osclients.Clients")
+    def test_check_failed_many_users(self, mock_clients):
+        def clients(user):
+            if user["username"] == "good":
+                return mock.Mock()
+            raise exceptions.RallyException("%s is bad" % user["username"])
+
+        mock_clients.side_effect = clients
+        pdata = {"admin": None,
+                 "users": [{"username": name, "password": "12345"}
+                           for name in ("bad1", "good", "bad2")]}
+        result = existing.OpenStack({}, platform_data=pdata).check_health()
+        self._check_health_schema(result)
+        self.assertEqual(
+            {"available": False,
+             "message": "2 of 3 credentials are invalid:\n"
+                        "bad1 is bad\nbad2 is bad",
+             "traceback": mock.ANY},
+            result)
+        self.assertIn("bad1 is bad", result["traceback"])
+
     @mock.patch("rally_openstack.common.osclients.Clients")
     def test_check_health_with_api_info(self, mock_clients):
         pdata = {"admin": mock.MagicMock(),
@@ -350,6 +376,7 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
         self.assertEqual({"available": True}, result)
         mock_clients.assert_has_calls(
             [mock.call(pdata["admin"]), mock.call().verified_keystone(),
+             mock.call(pdata["admin"]),
              mock.call().fakeclient.choose_version(),
              mock.call().fakeclient.validate_version(
                  mock_clients.return_value.fakeclient.choose_version
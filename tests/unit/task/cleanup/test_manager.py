@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 from unittest import mock
 
 from rally.common import utils
@@ -108,13 +109,15 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_mgr = self._manager([Exception, Exception, [1, 2, 3]],
                                  _perform_for_admin_only=False)
         admin = mock.MagicMock()
-        publish = manager.SeekAndDestroy(mock_mgr, admin, None)._publisher
+        destroyer = manager.SeekAndDestroy(mock_mgr, admin, None)
+        publish = destroyer._publisher
 
         queue = []
         publish(queue)
         mock__get_cached_client.assert_called_once_with(admin)
         mock_mgr.assert_called_once_with(
-            admin=mock__get_cached_client.return_value)
+            admin=mock__get_cached_client.return_value,
+            cache=destroyer.cache, name_prefix="rally_")
         self.assertEqual(queue, [(admin, None, x) for x in range(1, 4)])
 
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
@@ -122,14 +125,15 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_mgr = self._manager([Exception, Exception, [1, 2, 3]],
                                  _perform_for_admin_only=True)
         admin = mock.MagicMock()
-        publish = manager.SeekAndDestroy(
-            mock_mgr, admin, ["u1", "u2"])._publisher
+        destroyer = manager.SeekAndDestroy(mock_mgr, admin, ["u1", "u2"])
+        publish = destroyer._publisher
 
         queue = []
         publish(queue)
         mock__get_cached_client.assert_called_once_with(admin)
         mock_mgr.assert_called_once_with(
-            admin=mock__get_cached_client.return_value)
+            admin=mock__get_cached_client.return_value,
+            cache=destroyer.cache, name_prefix="rally_")
         self.assertEqual(queue, [(admin, None, x) for x in range(1, 4)])
 
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
@@ -141,7 +145,9 @@ class SeekAndDestroyTestCase(test.TestCase):
 
         admin = mock.MagicMock()
         users = [{"tenant_id": 1, "id": 1}, {"tenant_id": 2, "id": 2}]
-        publish = manager.SeekAndDestroy(mock_mgr, admin, users)._publisher
+        cache = {}
+        publish = manager.SeekAndDestroy(mock_mgr, admin, users,
+                                         cache=cache)._publisher
 
         queue = []
         publish(queue)
@@ -149,12 +155,14 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_client = mock__get_cached_client.return_value
         mock_mgr.assert_has_calls([
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[0]["tenant_id"]),
+                      tenant_uuid=users[0]["tenant_id"], cache=cache,
+                      name_prefix="rally_"),
             mock.call().list(),
             mock.call().list(),
             mock.call().list(),
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[1]["tenant_id"]),
+                      tenant_uuid=users[1]["tenant_id"], cache=cache,
+                      name_prefix="rally_"),
             mock.call().list(),
             mock.call().list()
         ])
@@ -166,6 +174,7 @@ class SeekAndDestroyTestCase(test.TestCase):
         expected_queue = [(admin, users[0], x) for x in range(1, 4)]
         expected_queue += [(admin, users[1], x) for x in range(4, 6)]
         self.assertEqual(expected_queue, queue)
+        self.assertEqual([1, 2], cache["tenant_uuids"])
 
     @mock.patch("%s.LOG" % BASE)
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
@@ -180,8 +189,8 @@ class SeekAndDestroyTestCase(test.TestCase):
                  {"tenant_id": 1, "id": 2},
                  {"tenant_id": 2, "id": 3}]
 
-        publish = manager.SeekAndDestroy(
-            mock_mgr, None, users)._publisher
+        destroyer = manager.SeekAndDestroy(mock_mgr, None, users)
+        publish = destroyer._publisher
 
         queue = []
         publish(queue)
@@ -189,11 +198,13 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_client = mock__get_cached_client.return_value
         mock_mgr.assert_has_calls([
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[0]["tenant_id"]),
+                      tenant_uuid=users[0]["tenant_id"],
+                      cache=destroyer.cache, name_prefix="rally_"),
             mock.call().list(),
             mock.call().list(),
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[2]["tenant_id"]),
+                      tenant_uuid=users[2]["tenant_id"],
+                      cache=destroyer.cache, name_prefix="rally_"),
             mock.call().list(),
             mock.call().list(),
             mock.call().list()
@@ -281,6 +292,55 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
+    def test__get_name_prefix(self):
+        class A(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "s_rally_abc_XXXXXXXX_XXXXXXXX"
+
+        class B(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "s_rally_XXXXXXXX_XXXXXXXX"
+
+        destroyer = manager.SeekAndDestroy(None, None, None,
+                                           resource_classes=[A])
+        self.assertEqual("s_rally_abc_", destroyer.name_prefix)
+
+        destroyer = manager.SeekAndDestroy(None, None, None,
+                                           resource_classes=[A, B])
+        self.assertEqual("s_rally_", destroyer.name_prefix)
+
+        task_id = "a5c2d9a8-1e44-4cb6-9a4c-4f3d2c1b0e9f"
+        destroyer = manager.SeekAndDestroy(None, None, None,
+                                           resource_classes=[A],
+                                           task_id=task_id)
+        self.assertEqual(
+            "s_rally_abc_%s" % A._generate_task_id_part(task_id, 8),
+            destroyer.name_prefix)
+
+    def test__get_name_prefix_with_non_string_task_id(self):
+        class A(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "s_rally_abc_XXXXXXXX_XXXXXXXX"
+
+        destroyer = manager.SeekAndDestroy(None, None, None,
+                                           resource_classes=[A],
+                                           task_id=mock.Mock())
+        self.assertIsNone(destroyer.name_prefix)
+
+    def test__get_name_prefix_not_available(self):
+        class A(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "XXXXXXXX_XXXXXXXX"
+
+        class B(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "foo"
+
+        class C(utils.RandomNameGeneratorMixin):
+            @classmethod
+            def name_matches_object(cls, name, task_id=None, exact=True):
+                return True
+
+        for resource_classes in ([A], [B], [C], [A, C]):
+            destroyer = manager.SeekAndDestroy(
+                None, None, None, resource_classes=resource_classes)
+            self.assertIsNone(destroyer.name_prefix)
+
     @mock.patch("%s.broker.run" % BASE)
     def test_exterminate(self, mock_broker_run):
         manager_cls = mock.MagicMock(_threads=5)
@@ -293,6 +353,156 @@ class SeekAndDestroyTestCase(test.TestCase):
                                                 cleaner._consumer,
                                                 consumers_count=5)
 
+    @mock.patch("%s.broker.run" % BASE)
+    def test_exterminate_with_poller(self, mock_broker_run):
+        poller = mock.Mock()
+        cleaner = manager.SeekAndDestroy(mock.MagicMock(_threads=5), None,
+                                         None, poller=poller)
+        cleaner.exterminate()
+
+        poller.wait.assert_called_once_with(cleaner)
+
+    def test__delete_single_resource_with_poller(self):
+        poller = mock.Mock()
+        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
+                                       _interval=0.01)
+
+        destroyer = manager.SeekAndDestroy(None, None, None, poller=poller)
+        destroyer._delete_single_resource(mock_resource)
+
+        mock_resource.delete.assert_called_once_with()
+        self.assertFalse(mock_resource.is_deleted.called)
+        poller.add.assert_called_once_with(destroyer, mock_resource, mock.ANY)
+
+
+class DeletionPollerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DeletionPollerTestCase, self).setUp()
+        self.poller = manager.DeletionPoller()
+        self.poller.start()
+        self.addCleanup(self.poller.stop)
+
+    def _resource(self, **kwargs):
+        kwargs.setdefault("_max_attempts", 3)
+        kwargs.setdefault("_timeout", 10)
+        kwargs.setdefault("_interval", 0.001)
+        return mock.MagicMock(**kwargs)
+
+    def test_wait(self):
+        res1 = self._resource()
+        res1.is_deleted.side_effect = [False, False, True]
+        res2 = self._resource()
+        res2.is_deleted.return_value = True
+        owner = object()
+
+        self.poller.add(owner, res1, {})
+        self.poller.add(owner, res2, {})
+        self.poller.wait(owner)
+
+        self.assertEqual(3, res1.is_deleted.call_count)
+        res2.is_deleted.assert_called_once_with()
+
+    def test_wait_for_owner(self):
+        res1 = self._resource(_timeout=100, _interval=10)
+        res1.is_deleted.return_value = False
+        res2 = self._resource()
+        res2.is_deleted.return_value = True
+
+        self.poller.add("owner1", res1, {})
+        self.poller.add("owner2", res2, {})
+        self.poller.wait("owner2")
+
+        res2.is_deleted.assert_called_once_with()
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_wait_timeout(self, mock_log):
+        res = self._resource(_timeout=0.01, _interval=0.004)
+        res.is_deleted.return_value = False
+
+        self.poller.add("owner", res, {"service": "s", "resource": "r",
+                                       "uuid": "id"})
+        self.poller.wait("owner")
+
+        self.assertTrue(res.is_deleted.called)
+        mock_log.warning.assert_called_once_with(
+            "Resource deletion failed, timeout occurred for s.r: id.")
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_wait_broken_is_deleted(self, mock_log):
+        res = self._resource(_max_attempts=3)
+        res.is_deleted.side_effect = Exception
+
+        self.poller.add("owner", res, {"service": "s", "resource": "r",
+                                       "uuid": "id"})
+        self.poller.wait("owner")
+
+        self.assertEqual(4, res.is_deleted.call_count)
+        self.assertEqual(4, mock_log.exception.call_count)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+
+class PipelineTestCase(test.TestCase):
+
+    def _mgr(self, service, resource, depends_on=None):
+        return mock.Mock(_service=service, _resource=resource,
+                         _depends_on=depends_on,
+                         __repr__=lambda s: "%s.%s" % (service, resource))
+
+    def test_get_dependencies(self):
+        servers = self._mgr("nova", "servers")
+        keypairs = self._mgr("nova", "keypairs", depends_on=())
+        volumes = self._mgr("cinder", "volumes", depends_on=("nova",))
+        objects = self._mgr("swift", "object", depends_on=())
+        containers = self._mgr("swift", "container", depends_on=())
+        images = self._mgr("glance", "images",
+                           depends_on=("nova.servers", "cinder.volumes"))
+        users = self._mgr("keystone", "user")
+        managers = [servers, keypairs, volumes, objects, containers, images,
+                    users]
+
+        self.assertEqual(
+            {servers: set(),
+             keypairs: {servers},
+             volumes: {servers, keypairs},
+             objects: set(),
+             containers: {objects},
+             images: {servers, volumes},
+             users: set(managers[:-1])},
+            manager.get_dependencies(managers))
+
+    def test__run_pipeline(self):
+        servers = self._mgr("nova", "servers")
+        objects = self._mgr("swift", "object", depends_on=())
+        volumes = self._mgr("cinder", "volumes", depends_on=("nova",))
+        users = self._mgr("keystone", "user")
+
+        objects_started = threading.Event()
+        calls = []
+
+        def func(mgr):
+            if mgr is servers:
+                # swift objects do not wait for nova servers
+                self.assertTrue(objects_started.wait(10))
+            elif mgr is objects:
+                objects_started.set()
+            calls.append(mgr)
+
+        manager._run_pipeline([servers, objects, volumes, users], func, 4)
+
+        self.assertEqual(4, len(calls))
+        self.assertLess(calls.index(servers), calls.index(volumes))
+        self.assertEqual(users, calls[-1])
+
+    def test__run_pipeline_failed(self):
+        servers = self._mgr("nova", "servers")
+        users = self._mgr("keystone", "user")
+        func = mock.Mock(side_effect=[RuntimeError("boom")])
+
+        self.assertRaises(RuntimeError, manager._run_pipeline,
+                          [servers, users], func, 4)
+        func.assert_called_once_with(servers)
+
 
 class ResourceManagerTestCase(test.TestCase):
 
@@ -362,7 +572,8 @@ class ResourceManagerTestCase(test.TestCase):
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_depends_on=None),
+                              mock.MagicMock(_depends_on=None)])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy,
                      mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
@@ -385,12 +596,15 @@ class ResourceManagerTestCase(test.TestCase):
                       "admin",
                       ["user"],
                       resource_classes=[A],
-                      task_id="task_id"),
+                      task_id="task_id", cache={}, poller=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       "admin",
                       ["user"],
                       resource_classes=[A],
-                      task_id="task_id"),
+                      task_id="task_id", cache={}, poller=mock.ANY),
             mock.call().exterminate()
         ])
+        cache = mock_seek_and_destroy.call_args_list[0][1]["cache"]
+        self.assertIs(cache,
+                      mock_seek_and_destroy.call_args_list[1][1]["cache"])
@@ -21,9 +21,13 @@ from neutronclient.common import exceptions as neutron_exceptions
 from novaclient import exceptions as nova_exc
 from watcherclient.common.apiclient import exceptions as watcher_exceptions
 
+from rally.common import cfg
+
 from rally_openstack.task.cleanup import resources
 from tests.unit import test
 
+
+CONF = cfg.CONF
 BASE = "rally_openstack.task.cleanup.resources"
 GLANCE_V2_PATH = ("rally_openstack.common.services.image.glance_v2."
                   "GlanceV2Service")
@@ -77,12 +81,47 @@ class MagnumMixinTestCase(test.TestCase):
 class NovaServerTestCase(test.TestCase):
 
     def test_list(self):
+        servers = [mock.Mock(id="s1"), mock.Mock(id="s2")]
+        server = resources.NovaServer()
+        server._manager = mock.MagicMock()
+        server._manager.return_value.list.side_effect = [servers, []]
+
+        self.assertEqual(servers, list(server.list()))
+
+        self.assertEqual(
+            [mock.call(search_opts={}, marker=None, limit=1000),
+             mock.call(search_opts={}, marker="s2", limit=1000)],
+            server._manager.return_value.list.call_args_list)
+
+    def test_list_with_ignored_marker(self):
+        servers = [mock.Mock(id="s1"), mock.Mock(id="s2")]
         server = resources.NovaServer()
         server._manager = mock.MagicMock()
+        server._manager.return_value.list.return_value = servers
+
+        self.assertEqual(servers, list(server.list()))
+        self.assertEqual(2, server._manager.return_value.list.call_count)
 
-        server.list()
+    def test_list_paginated_by_name_prefix(self):
+        CONF.set_override("cleanup_list_page_size", 2, "openstack")
+        self.addCleanup(CONF.clear_override, "cleanup_list_page_size",
+                        "openstack")
+        servers = [mock.Mock(id="s%s" % i) for i in range(3)]
+        server = resources.NovaServer(name_prefix="s_rally.")
+        server._manager = mock.MagicMock()
+        # Nova caps the second page with its own max_limit
+        server._manager.return_value.list.side_effect = [servers[:2],
+                                                         servers[2:3],
+                                                         []]
 
-        server._manager.return_value.list.assert_called_once_with(limit=-1)
+        self.assertEqual(servers, list(server.list()))
+
+        search_opts = {"name": "^s_rally\\."}
+        self.assertEqual(
+            [mock.call(search_opts=search_opts, marker=None, limit=2),
+             mock.call(search_opts=search_opts, marker="s1", limit=2),
+             mock.call(search_opts=search_opts, marker="s2", limit=2)],
+            server._manager.return_value.list.call_args_list)
 
     def test_delete(self):
         server = resources.NovaServer()
@@ -175,14 +214,14 @@ class NeutronMixinTestCase(test.TestCase):
         neut.tenant_uuid = "user_tenant"
 
         some_resources = [{"tenant_id": neut.tenant_uuid}, {"tenant_id": "a"}]
-        neut.user.neutron().list_some_resources.return_value = {
+        neut.user.neutron().list_some_resources.return_value = [{
             "some_resources": some_resources
-        }
+        }]
 
         self.assertEqual([some_resources[0]], list(neut.list()))
 
         neut.user.neutron().list_some_resources.assert_called_once_with(
-            tenant_id=neut.tenant_uuid)
+            retrieve_all=False, limit=1000, tenant_id=neut.tenant_uuid)
 
 
 class NeutronLbaasV1MixinTestCase(test.TestCase):
@@ -205,13 +244,13 @@ class NeutronLbaasV1MixinTestCase(test.TestCase):
         neut.tenant_uuid = "user_tenant"
 
         some_resources = [{"tenant_id": neut.tenant_uuid}, {"tenant_id": "a"}]
-        neut._manager().list_some_resources.return_value = {
+        neut._manager().list_some_resources.return_value = [{
             "some_resources": some_resources
-        }
+        }]
 
         self.assertEqual([some_resources[0]], list(neut.list()))
         neut._manager().list_some_resources.assert_called_once_with(
-            tenant_id=neut.tenant_uuid)
+            retrieve_all=False, limit=1000, tenant_id=neut.tenant_uuid)
 
     def test_list_lbaas_unavailable(self):
         neut = self.get_neutron_lbaasv1_mixin()
@@ -241,13 +280,13 @@ class NeutronLbaasV2MixinTestCase(test.TestCase):
         neut.tenant_uuid = "user_tenant"
 
         some_resources = [{"tenant_id": neut.tenant_uuid}, {"tenant_id": "a"}]
-        neut._manager().list_some_resources.return_value = {
+        neut._manager().list_some_resources.return_value = [{
             "some_resources": some_resources
-        }
+        }]
 
         self.assertEqual([some_resources[0]], list(neut.list()))
         neut._manager().list_some_resources.assert_called_once_with(
-            tenant_id=neut.tenant_uuid)
+            retrieve_all=False, limit=1000, tenant_id=neut.tenant_uuid)
 
     def test_list_lbaasv2_unavailable(self):
         neut = self.get_neutron_lbaasv2_mixin()
@@ -339,12 +378,13 @@ class NeutronFloatingIPTestCase(test.TestCase):
         fips = {"floatingips": [{"tenant_id": "foo", "id": "foo"}]}
 
         user = mock.MagicMock()
-        user.neutron.return_value.list_floatingips.return_value = fips
+        user.neutron.return_value.list_floatingips.return_value = [fips]
 
         self.assertEqual(fips["floatingips"], list(
             resources.NeutronFloatingIP(user=user, tenant_uuid="foo").list()))
         user.neutron.return_value.list_floatingips.assert_called_once_with(
-            tenant_id="foo")
+            retrieve_all=False, limit=1000, tenant_id="foo",
+            fields=["id", "description", "tenant_id"])
 
 
 class NeutronTrunkTestcase(test.TestCase):
@@ -352,11 +392,12 @@ class NeutronTrunkTestcase(test.TestCase):
     def test_list(self):
         user = mock.MagicMock()
         trunk = resources.NeutronTrunk(user=user)
-        user.neutron().list_trunks.return_value = {
-            "trunks": ["trunk"]}
+        user.neutron().list_trunks.return_value = [{
+            "trunks": ["trunk"]}]
         self.assertEqual(["trunk"], trunk.list())
         user.neutron().list_trunks.assert_called_once_with(
-            tenant_id=None)
+            retrieve_all=False, limit=1000, tenant_id=None,
+            fields=["id", "name", "tenant_id"])
 
     def test_list_with_not_found(self):
 
@@ -369,7 +410,8 @@ class NeutronTrunkTestcase(test.TestCase):
 
         self.assertEqual([], trunk.list())
         user.neutron().list_trunks.assert_called_once_with(
-            tenant_id=None)
+            retrieve_all=False, limit=1000, tenant_id=None,
+            fields=["id", "name", "tenant_id"])
 
 
 class NeutronPortTestCase(test.TestCase):
@@ -490,14 +532,63 @@ class NeutronPortTestCase(test.TestCase):
             list_routers = mock.Mock()
 
         neutron = FakeNeutronClient
-        neutron.list_ports.return_value = {"ports": ports}
-        neutron.list_routers.return_value = {"routers": routers}
+        neutron.list_ports.return_value = [{"ports": ports}]
+        neutron.list_routers.return_value = [{"routers": routers}]
 
         user = mock.Mock(neutron=neutron)
         self.assertEqual(expected_ports, resources.NeutronPort(
             user=user, tenant_uuid=tenant_uuid).list())
-        neutron.list_ports.assert_called_once_with()
-        neutron.list_routers.assert_called_once_with()
+        neutron.list_ports.assert_called_once_with(
+            retrieve_all=False, limit=1000, tenant_id=[tenant_uuid],
+            fields=["id", "name", "tenant_id", "device_owner", "device_id"])
+        neutron.list_routers.assert_called_once_with(
+            retrieve_all=False, limit=1000, tenant_id=[tenant_uuid],
+            fields=["id", "name", "tenant_id"])
+
+    def test_list_shares_listings_between_tenants(self):
+        ports = [{"tenant_id": "t1", "id": "p1", "name": "foo"},
+                 {"tenant_id": "t2", "id": "p2", "name": "bar"},
+                 {"tenant_id": "t3", "id": "p3", "name": "baz"}]
+        admin = mock.MagicMock()
+        admin_neutron = admin.neutron.return_value
+        admin_neutron.list_ports.return_value = [{"ports": ports[:1]},
+                                                 {"ports": ports[1:]}]
+        cache = {"tenant_uuids": ["t1", "t2"]}
+
+        self.assertEqual(
+            [ports[0]],
+            resources.NeutronPort(admin=admin, user=mock.MagicMock(),
+                                  tenant_uuid="t1", cache=cache).list())
+        self.assertEqual(
+            [ports[1]],
+            resources.NeutronPort(admin=admin, user=mock.MagicMock(),
+                                  tenant_uuid="t2", cache=cache).list())
+
+        admin_neutron.list_ports.assert_called_once_with(
+            retrieve_all=False, limit=1000, tenant_id=["t1", "t2"],
+            fields=["id", "name", "tenant_id", "device_owner", "device_id"])
+        self.assertFalse(admin_neutron.list_routers.called)
+
+    def test_list_does_not_cache_failed_listing(self):
+        ports = [{"tenant_id": "t1", "id": "p1", "name": "foo"}]
+        user = mock.MagicMock()
+        neutron = user.neutron.return_value
+        neutron.list_ports.side_effect = [RuntimeError("Error"),
+                                          [{"ports": ports}]]
+        cache = {}
+
+        port = resources.NeutronPort(user=user, tenant_uuid="t1",
+                                     cache=cache)
+        self.assertRaises(RuntimeError, port.list)
+        self.assertEqual({}, cache["neutron.ports"])
+
+        self.assertEqual(ports, port.list())
+        self.assertEqual(2, neutron.list_ports.call_count)
+
+    def test_list_without_tenant(self):
+        user = mock.MagicMock()
+        self.assertEqual([], resources.NeutronPort(user=user).list())
+        self.assertFalse(user.neutron.return_value.list_ports.called)
 
 
 @ddt.ddt
@@ -516,15 +607,16 @@ class NeutronSecurityGroupTestCase(test.TestCase):
         neut._resource = "security_group"
         neut.tenant_uuid = "user_tenant"
 
-        neut.user.neutron().list_security_groups.return_value = {
+        neut.user.neutron().list_security_groups.return_value = [{
             "security_groups": sg_list
-        }
+        }]
 
         expected_result = [sg_list[1]]
         self.assertEqual(expected_result, list(neut.list()))
 
         neut.user.neutron().list_security_groups.assert_called_once_with(
-            tenant_id=neut.tenant_uuid)
+            retrieve_all=False, limit=1000, tenant_id=neut.tenant_uuid,
+            fields=["id", "name", "tenant_id"])
 
     def test_list_with_not_found(self):
 
@@ -542,7 +634,8 @@ class NeutronSecurityGroupTestCase(test.TestCase):
         self.assertEqual(expected_result, list(neut.list()))
 
         neut.user.neutron().list_security_groups.assert_called_once_with(
-            tenant_id=neut.tenant_uuid)
+            retrieve_all=False, limit=1000, tenant_id=neut.tenant_uuid,
+            fields=["id", "name", "tenant_id"])
 
 
 class NeutronQuotaTestCase(test.TestCase):
@@ -17,6 +17,7 @@ from unittest import mock
 
 import ddt
 
+from rally import exceptions
 from rally.task import context
 
 from rally_openstack.task.contexts.cinder import volumes
@@ -50,6 +51,11 @@ class VolumeGeneratorTestCase(test.ScenarioTestCase):
 
     @ddt.data({"config": {"size": 1, "volumes_per_tenant": 5}},
               {"config": {"size": 1, "type": None, "volumes_per_tenant": 5}},
+              {"config": {"size": 1, "volumes_per_tenant": 5,
+                          "max_in_flight": 2,
+                          "resource_management_workers": 1}},
+              {"config": {"size": 1, "volumes_per_tenant": 5,
+                          "max_in_flight": 0}, "valid": False},
               {"config": {"size": 1, "type": -1, "volumes_per_tenant": 5},
                "valid": False})
     @ddt.unpack
@@ -66,9 +72,10 @@ class VolumeGeneratorTestCase(test.ScenarioTestCase):
                                       name="vol", status="avaiable")
 
         mock_service = mock_block_storage.return_value
-        mock_service.create_volume.return_value = created_volume
-        users_per_tenant = 5
         volumes_per_tenant = config.get("volumes_per_tenant", 5)
+        mock_service.create_volumes.return_value = (
+            [created_volume] * volumes_per_tenant)
+        users_per_tenant = 5
         tenants = self._gen_tenants(2)
         users = []
         for id_ in tenants:
@@ -97,11 +104,29 @@ class VolumeGeneratorTestCase(test.ScenarioTestCase):
             new_context["tenants"][id_].setdefault("volumes", [])
             for i in range(volumes_per_tenant):
                 new_context["tenants"][id_]["volumes"].append(
-                    mock_service.create_volume.return_value._as_dict())
+                    created_volume._as_dict())
 
         volumes_ctx = volumes.VolumeGenerator(self.context)
         volumes_ctx.setup()
         self.assertEqual(new_context, self.context)
+        mock_service.create_volumes.assert_has_calls(
+            [mock.call(config["size"], count=volumes_per_tenant,
+                       volume_type=config.get("type"),
+                       max_in_flight=config.get("max_in_flight"))] * 2)
+
+    @mock.patch("%s.block.BlockStorage" % SERVICE)
+    def test_setup_fails(self, mock_block_storage):
+        mock_service = mock_block_storage.return_value
+        mock_service.create_volumes.side_effect = Exception("Error")
+        self.context.update({
+            "config": {"volumes": {"size": 1, "volumes_per_tenant": 5}},
+            "users": [{"id": "u1", "tenant_id": "t1",
+                       "credential": mock.MagicMock()}],
+            "tenants": {"t1": {"name": "t1"}}
+        })
+
+        volumes_ctx = volumes.VolumeGenerator(self.context)
+        self.assertRaises(exceptions.ContextSetupFailure, volumes_ctx.setup)
 
     @mock.patch("%s.cinder.volumes.resource_manager.cleanup" % CTX)
     def test_cleanup(self, mock_cleanup):
@@ -48,7 +48,8 @@ class AdminCleanupTestCase(test.TestCase):
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_depends_on=None),
+                              mock.MagicMock(_depends_on=None)])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers,
                      mock_itersubclasses):
@@ -75,12 +76,12 @@ class AdminCleanupTestCase(test.TestCase):
                       ctx["admin"],
                       ctx["users"],
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
+                      task_id="task_id", cache={}, poller=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       ctx["admin"],
                       ctx["users"],
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
+                      task_id="task_id", cache={}, poller=mock.ANY),
             mock.call().exterminate()
         ])
@@ -175,8 +175,8 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
         })
 
     @mock.patch("%s.credential.OpenStackCredential" % CTX)
-    @mock.patch("%s.osclients.Clients" % CTX)
-    def test_use_existing_users(self, mock_clients,
+    @mock.patch("%s.credential_check.authenticate" % CTX)
+    def test_use_existing_users(self, mock_authenticate,
                                 mock_open_stack_credential):
         user1 = {"tenant_name": "proj", "username": "usr",
                  "password": "pswd", "auth_url": "https://example.com"}
@@ -203,7 +203,7 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
 
         auth_ref = AuthRef()
 
-        mock_clients.return_value.keystone.auth_ref = auth_ref
+        mock_authenticate.return_value = [(auth_ref, None)] * 3
 
         self.platforms["openstack"]["users"] = user_list
 
@@ -225,6 +225,24 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
         self.assertEqual({"p0": {"id": "p0", "name": creds.tenant_name},
                           "p1": {"id": "p1", "name": creds.tenant_name}},
                          self.context["tenants"])
+        mock_authenticate.assert_called_once_with([creds] * 3, reuse=True)
+
+    @mock.patch("%s.credential_check.authenticate" % CTX)
+    def test_use_existing_users_failed(self, mock_authenticate):
+        self.platforms["openstack"]["users"] = [
+            {"tenant_name": "proj", "username": "usr%s" % i,
+             "password": "pswd", "auth_url": "https://example.com"}
+            for i in range(3)]
+        mock_authenticate.return_value = [
+            (mock.Mock(), None), (None, Exception("foo")),
+            (None, Exception("bar"))]
+
+        user_generator = users.UserGenerator(self.context)
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              user_generator.setup)
+
+        self.assertIn("Failed to authenticate 2 of 3 existing users:\n"
+                      "usr1: foo\nusr2: bar", "%s" % e)
 
 
 class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
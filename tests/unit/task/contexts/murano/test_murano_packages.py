@@ -96,9 +96,16 @@ class MuranoPackageGeneratorTestCase(test.TestCase):
             superclass=murano_packages.PackageGenerator,
             task_id="foo_uuid")
 
+    @mock.patch("%s.mutils.close_archives" % CTX)
+    @mock.patch("%s.mutils.open_archives" % CTX)
     @mock.patch("%s.osclients" % CTX)
     @mock.patch("%s.resource_manager.cleanup" % CTX)
-    def test_cleanup_with_dir(self, mock_cleanup, mock_osclients):
+    def test_cleanup_with_dir(self, mock_cleanup, mock_osclients,
+                              mock_open_archives, mock_close_archives):
+        mock_archives = mock_open_archives.return_value
+        mock_archives.get.return_value = (
+            "rally-jobs/extra/murano/applications/HelloReporter/"
+            "io.murano.apps.HelloReporter.zip")
         mock_app = mock.Mock(id="fake_app_id")
         (mock_osclients.Clients().murano().
             packages.create.return_value) = mock_app
@@ -111,6 +118,13 @@ class MuranoPackageGeneratorTestCase(test.TestCase):
         murano_ctx.setup()
         murano_ctx.cleanup()
 
+        mock_open_archives.assert_called_once_with(ctx_dict["task"])
+        mock_archives.get.assert_called_once_with(app_dir)
+        self.assertEqual(
+            mock_archives.get.return_value,
+            murano_ctx.context["tenants"]["tenant_0"]["murano_ctx"])
+        mock_close_archives.assert_called_once_with(ctx_dict["task"])
+
         mock_cleanup.assert_called_once_with(
             names=["murano.packages"],
             users=murano_ctx.context["users"],
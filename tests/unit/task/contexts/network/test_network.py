@@ -161,6 +161,37 @@ class NetworkTestCase(test.TestCase):
         self.assertFalse(nc.create_router.called)
         self.assertFalse(nc.add_interface_router.called)
 
+    def test_setup_bulk(self):
+        ctx = self.get_context(networks_per_tenant=2,
+                               subnets_per_network=1,
+                               router=None,
+                               bulk=True)
+        networks = [{"id": "net-1"}, {"id": "net-2"}]
+        subnets = [{"id": "subnet-1"}, {"id": "subnet-2"}]
+        for user in ctx["users"]:
+            clients = user["credential"].clients.return_value
+            clients.neutron.return_value.create_network.return_value = {
+                "networks": [dict(n) for n in networks]}
+            clients.neutron.return_value.create_subnet.return_value = {
+                "subnets": subnets}
+        user = ctx["users"][0]
+        nc = user["credential"].clients.return_value.neutron.return_value
+
+        network_context.Network(ctx).setup()
+
+        ctx_data = ctx["tenants"][ctx["users"][0]["tenant_id"]]
+        self.assertEqual(
+            [{"id": "net-1", "router_id": None, "subnets": ["subnet-1"]},
+             {"id": "net-2", "router_id": None, "subnets": ["subnet-2"]}],
+            ctx_data["networks"])
+        self.assertEqual(subnets, ctx_data["subnets"])
+        nc.create_network.assert_called_once_with(
+            {"networks": [{"name": mock.ANY}] * 2})
+        self.assertEqual(
+            ["net-1", "net-2"],
+            [s["network_id"]
+             for s in nc.create_subnet.call_args[0][0]["subnets"]])
+
     @mock.patch("%s.resource_manager.cleanup" % PATH)
     def test_cleanup(self, mock_cleanup):
         ctx = self.get_context()
@@ -16,12 +16,21 @@
 from unittest import mock
 
 from rally import exceptions
+from rally.task import context
 from rally_openstack.task.contexts.swift import objects
 from tests.unit import test
 
 
 class SwiftObjectGeneratorTestCase(test.TestCase):
 
+    def test_validate_segment_size(self):
+        self.assertEqual([], context.Context.validate(
+            "swift_objects", None, None, {"segment_size": 1024 * 1024},
+            vtype="syntax"))
+        self.assertGreater(len(context.Context.validate(
+            "swift_objects", None, None, {"segment_size": 1024},
+            vtype="syntax")), 0)
+
     @mock.patch("rally_openstack.common.osclients.Clients")
     def test_setup(self, mock_clients):
         containers_per_tenant = 2
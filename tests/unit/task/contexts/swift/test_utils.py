@@ -154,6 +154,24 @@ class SwiftObjectMixinTestCase(test.TestCase):
             self.assertEqual(0,
                              len(context["tenants"][tenant_id]["containers"]))
 
+    @mock.patch("rally_openstack.common.osclients.Clients")
+    def test__delete_containers_large(self, mock_clients):
+        context = test.get_test_context()
+        context["tenants"] = {
+            "1001": {"name": "t1_name",
+                     "containers": [{"user": {"id": "u1",
+                                              "tenant_id": "1001",
+                                              "credential": mock.MagicMock()},
+                                     "container": "c1",
+                                     "objects": []}]}}
+
+        SwiftContext(context)._delete_containers(1, large_objects=True)
+
+        mock_swift = mock_clients.return_value.swift.return_value
+        self.assertEqual([mock.call("c1"), mock.call("c1_segments")],
+                         mock_swift.delete_container.call_args_list)
+        self.assertEqual([], context["tenants"]["1001"]["containers"])
+
     @mock.patch("rally_openstack.common.osclients.Clients")
     def test__delete_objects(self, mock_clients):
         context = test.get_test_context()
@@ -194,3 +212,41 @@ class SwiftObjectMixinTestCase(test.TestCase):
         for tenant_id in context["tenants"]:
             for container in context["tenants"][tenant_id]["containers"]:
                 self.assertEqual(0, len(container["objects"]))
+
+    @mock.patch("rally_openstack.common.osclients.Clients")
+    def test__delete_objects_large(self, mock_clients):
+        context = test.get_test_context()
+        context["tenants"] = {
+            "1001": {"name": "t1_name",
+                     "containers": [{"user": {"id": "u1",
+                                              "tenant_id": "1001",
+                                              "credential": mock.MagicMock()},
+                                     "container": "c1",
+                                     "objects": ["o1"]}]}}
+
+        SwiftContext(context)._delete_objects(1, large_objects=True)
+
+        mock_swift = mock_clients.return_value.swift.return_value
+        mock_swift.delete_object.assert_called_once_with(
+            "c1", "o1", query_string="multipart-manifest=delete")
+
+    @mock.patch("rally_openstack.task.scenarios.swift.utils.SwiftScenario."
+                "_upload_large_object")
+    def test__create_objects_large(self,
+                                   mock_swift_scenario__upload_large_object):
+        mock_swift_scenario__upload_large_object.return_value = ("etag", "o1")
+        context = test.get_test_context()
+        context["tenants"] = {
+            "1001": {"name": "t1_name",
+                     "containers": [{"user": {"id": "u1",
+                                              "tenant_id": "1001",
+                                              "credential": mock.MagicMock()},
+                                     "container": "c1",
+                                     "objects": []}]}}
+
+        objects_list = SwiftContext(context)._create_objects(
+            1, 100, 1, segment_size=30, segment_concurrency=2)
+
+        self.assertEqual([("1001", "c1", "o1")], objects_list)
+        mock_swift_scenario__upload_large_object.assert_called_once_with(
+            "c1", 100, 30, concurrency=2)
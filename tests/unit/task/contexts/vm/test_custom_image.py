@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime as dt
 from unittest import mock
 
 from rally.task import context
@@ -199,3 +200,245 @@ class BaseCustomImageContextVMTestCase(test.TestCase):
             [mock.call(self.context["users"][i],
                        {"id": "custom_image%d" % i}) for i in range(3)],
             generator_ctx.delete_one_image.mock_calls)
+
+    @mock.patch("%s.ImageCache" % BASE)
+    @mock.patch("%s.osclients.Clients" % BASE)
+    @mock.patch("%s.types.GlanceImage" % BASE)
+    @mock.patch("%s.types.Flavor" % BASE)
+    def test_create_one_image_cached(self, mock_flavor, mock_glance_image,
+                                     mock_clients, mock_image_cache):
+        mock_flavor.return_value.pre_process.return_value = "flavor"
+        mock_glance_image.return_value.pre_process.return_value = "image"
+        self.context["config"]["test_custom_image"]["cache"] = {
+            "max_age": 24}
+        generator_ctx = FakeImageGenerator(self.context)
+        generator_ctx.get_fingerprint = mock.Mock(return_value="fp")
+        generator_ctx._build_image = mock.Mock()
+        cache = mock_image_cache.return_value
+        user = {"credential": "credential", "tenant_id": "tenant_id0"}
+
+        self.assertEqual(cache.get_or_build.return_value,
+                         generator_ctx.create_one_image(user, nics="nics"))
+
+        admin_clients = self.context["admin"]["credential"].clients
+        # images are moved to the project of the admin which outlives
+        # temporary users
+        mock_image_cache.assert_called_once_with(
+            admin_clients.return_value.glance.return_value,
+            "test_custom_image",
+            owner=admin_clients.return_value.keystone.auth_ref.project_id,
+            max_age=24)
+        admin_clients.return_value.glance.assert_called_once_with("2")
+        generator_ctx.get_fingerprint.assert_called_once_with(
+            mock_clients.return_value, "image", "flavor")
+        cache.get_or_build.assert_called_once_with("fp", mock.ANY)
+        cache.evict.assert_called_once_with(keep=["fp"])
+
+        build = cache.get_or_build.call_args[0][1]
+        self.assertEqual(generator_ctx._build_image.return_value, build())
+        generator_ctx._build_image.assert_called_once_with(
+            user, mock_clients.return_value, "image", "flavor", nics="nics")
+
+        # without admin images are looked for in the tenant of the user
+        self.context.pop("admin")
+        mock_image_cache.reset_mock()
+        generator_ctx.create_one_image(user)
+        mock_image_cache.assert_called_once_with(
+            mock_clients.return_value.glance.return_value,
+            "test_custom_image", owner="tenant_id0", max_age=24)
+
+    def test_get_fingerprint(self):
+        clients = mock.Mock()
+        clients.glance.return_value.images.get.return_value = {
+            "id": "image", "checksum": "md5", "os_hash_value": "sha512"}
+        clients.nova.return_value.flavors.get.return_value = mock.Mock(
+            vcpus=1, ram=512, disk=10)
+        generator_ctx = FakeImageGenerator(self.context)
+
+        fingerprint = generator_ctx.get_fingerprint(clients, "image",
+                                                    "flavor")
+
+        self.assertEqual(64, len(fingerprint))
+        clients.glance.assert_called_once_with("2")
+        clients.glance.return_value.images.get.assert_called_once_with(
+            "image")
+        clients.nova.return_value.flavors.get.assert_called_once_with(
+            "flavor")
+
+        # workers and networks do not affect the image
+        self.context["config"]["test_custom_image"]["workers"] = 4
+        self.context["config"]["test_custom_image"]["port"] = 22
+        self.assertEqual(fingerprint, FakeImageGenerator(
+            self.context).get_fingerprint(clients, "image", "flavor"))
+
+        self.context["config"]["test_custom_image"]["userdata"] = "foo"
+        self.assertNotEqual(fingerprint, FakeImageGenerator(
+            self.context).get_fingerprint(clients, "image", "flavor"))
+
+    @mock.patch("%s.vm_utils.close_ssh_pool" % BASE)
+    def test_cleanup_cached(self, mock_close_ssh_pool):
+        self.context["config"]["test_custom_image"]["cache"] = {}
+        for tenant in self.context["tenants"].values():
+            tenant["custom_image"] = {"id": "image"}
+        generator_ctx = FakeImageGenerator(self.context)
+        generator_ctx.delete_one_image = mock.Mock()
+
+        generator_ctx.cleanup()
+
+        mock_close_ssh_pool.assert_called_once_with(generator_ctx.context)
+        self.assertFalse(generator_ctx.delete_one_image.called)
+        for tenant in self.context["tenants"].values():
+            self.assertNotIn("custom_image", tenant)
+
+
+class ImageCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ImageCacheTestCase, self).setUp()
+        self.glance = mock.Mock()
+        self.images = {}
+        self.glance.images.list.side_effect = self._list
+        self.glance.images.create.side_effect = self._create
+        self.glance.images.delete.side_effect = self.images.pop
+        self.cache = custom_image.ImageCache(self.glance, "ctx", max_age=1,
+                                             build_timeout=60)
+        self.now = custom_image._now()
+
+    def _add(self, image_id, age=0, **props):
+        created_at = self.now - dt.timedelta(seconds=age)
+        image = {"id": image_id, "status": "active",
+                 "tags": [custom_image.CACHE_TAG],
+                 "rally_custom_image_context": "ctx",
+                 "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ")}
+        image.update(props)
+        self.images[image_id] = image
+        return image
+
+    def _list(self, filters):
+        filters = dict(filters)
+        self.assertEqual([custom_image.CACHE_TAG], filters.pop("tag"))
+        return [i for i in sorted(self.images.values(),
+                                  key=lambda i: i["id"])
+                if all(i.get(k) == v for k, v in filters.items())]
+
+    def _create(self, **kwargs):
+        kwargs.pop("tags")
+        for key in ("name", "container_format", "disk_format"):
+            kwargs.pop(key)
+        return self._add("marker-%s" % len(self.images), status="queued",
+                         **kwargs)
+
+    def test__parse_time(self):
+        self.assertEqual(dt.datetime(2016, 2, 1, 12, 0, 1),
+                         custom_image._parse_time("2016-02-01T12:00:01Z"))
+        now = custom_image._now()
+        self.assertEqual(
+            now, custom_image._parse_time(custom_image._format_time(now)))
+
+    def test_get_or_build_found(self):
+        self._add("old", age=20, rally_custom_image_fingerprint="fp")
+        self._add("new", rally_custom_image_fingerprint="fp")
+        self._add("other", rally_custom_image_fingerprint="other-fp")
+        build = mock.Mock()
+
+        self.assertEqual(self.images["new"],
+                         self.cache.get_or_build("fp", build))
+
+        self.assertFalse(build.called)
+        self.glance.images.update.assert_called_once_with(
+            "new", rally_custom_image_used_at=mock.ANY)
+
+    def test_get_or_build(self):
+        build = mock.Mock()
+        build.return_value.id = "built"
+
+        self.assertEqual(build.return_value,
+                         self.cache.get_or_build("0123456789abcdef0", build))
+
+        build.assert_called_once_with()
+        self.glance.images.create.assert_called_once_with(
+            name="rally-custom-image-lock", container_format="bare",
+            disk_format="raw", tags=[custom_image.CACHE_TAG],
+            rally_custom_image_context="ctx",
+            rally_custom_image_building="0123456789abcdef0")
+        self.glance.images.update.assert_called_once_with(
+            "built", name="rally-custom-image-0123456789abcdef",
+            rally_custom_image_context="ctx",
+            rally_custom_image_fingerprint="0123456789abcdef0",
+            rally_custom_image_used_at=mock.ANY)
+        self.glance.image_tags.update.assert_called_once_with(
+            "built", custom_image.CACHE_TAG)
+        # the lock is released
+        self.assertEqual({}, self.images)
+
+    def test_get_or_build_moves_image_to_owner(self):
+        self.cache.owner = "project"
+        build = mock.Mock()
+        build.return_value.id = "built"
+
+        self.cache.get_or_build("fp", build)
+
+        self.glance.images.update.assert_called_once_with(
+            "built", name="rally-custom-image-fp",
+            rally_custom_image_context="ctx",
+            rally_custom_image_fingerprint="fp",
+            rally_custom_image_used_at=mock.ANY, owner="project")
+        self.assertEqual(
+            "project", self.glance.images.list.call_args[1]["filters"][
+                "owner"])
+
+    def test_get_or_build_fails(self):
+        build = mock.Mock(side_effect=ValueError("boom"))
+
+        self.assertRaises(ValueError, self.cache.get_or_build, "fp", build)
+        self.assertEqual({}, self.images)
+
+    @mock.patch("%s.utils.interruptable_sleep" % BASE)
+    def test_get_or_build_by_another_task(self, mock_interruptable_sleep):
+        self._add("marker", status="queued",
+                  rally_custom_image_building="fp")
+
+        def sleep(seconds):
+            # another task finishes the build
+            self.images.pop("marker")
+            self._add("built", rally_custom_image_fingerprint="fp")
+
+        mock_interruptable_sleep.side_effect = sleep
+        build = mock.Mock()
+
+        self.assertEqual("built",
+                         self.cache.get_or_build("fp", build)["id"])
+        self.assertFalse(build.called)
+        self.assertFalse(self.glance.images.create.called)
+        mock_interruptable_sleep.assert_called_once_with(5)
+
+    def test_get_or_build_stale_build(self):
+        self._add("marker", age=100, status="queued",
+                  rally_custom_image_building="fp")
+        build = mock.Mock()
+
+        self.cache.get_or_build("fp", build)
+
+        build.assert_called_once_with()
+        self.assertNotIn("marker", self.images)
+
+    def test__lock_lost(self):
+        self._add("marker", age=1, status="queued",
+                  rally_custom_image_building="fp")
+
+        self.assertIsNone(self.cache._lock("fp"))
+        self.assertEqual(["marker"], list(self.images))
+
+    def test_evict(self):
+        hour = 3600
+        self._add("unused", age=2 * hour,
+                  rally_custom_image_fingerprint="old")
+        self._add("used", age=2 * hour, rally_custom_image_fingerprint="old2",
+                  rally_custom_image_used_at=custom_image._format_time(
+                      self.now))
+        self._add("kept", age=2 * hour, rally_custom_image_fingerprint="fp")
+        self._add("new", rally_custom_image_fingerprint="new")
+
+        self.cache.evict(keep=["fp"])
+
+        self.assertEqual(["used", "kept", "new"], list(self.images))
@@ -15,8 +15,10 @@
 
 """Tests for the image customizer using a command execution."""
 
+import hashlib
 from unittest import mock
 
+import fixtures
 from rally import exceptions
 
 from rally_openstack.task.contexts.vm import image_command_customizer
@@ -93,3 +95,27 @@ class ImageCommandCustomizerContextVMTestCase(test.TestCase):
             "foo_ip", 1022, "fedora", "foo_password", pkey="foo_private",
             command={"interpreter": "foo_interpreter",
                      "script_file": "foo_script"})
+
+    def test__get_customization_inputs(self):
+        script = self.useFixture(fixtures.TempDir()).join("script.sh")
+        with open(script, "w") as f:
+            f.write("echo foo")
+        config = self.context["config"]["image_command_customizer"]
+        config["command"]["script_file"] = script
+        customizer = image_command_customizer.ImageCommandCustomizerContext(
+            self.context)
+
+        inputs = customizer._get_customization_inputs()
+
+        self.assertEqual(
+            {"username": "fedora",
+             "command": {"interpreter": "foo_interpreter",
+                         "script_file": hashlib.sha256(
+                             b"echo foo").hexdigest()}},
+            inputs)
+        # the config itself is not changed
+        self.assertEqual(script, config["command"]["script_file"])
+
+        with open(script, "w") as f:
+            f.write("echo bar")
+        self.assertNotEqual(inputs, customizer._get_customization_inputs())
@@ -0,0 +1,56 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from rally import exceptions
+
+from rally_openstack.task.scenarios.elasticsearch import logging
+from tests.unit import test
+
+
+BASE = "rally_openstack.task.scenarios.elasticsearch.logging"
+
+
+class ElasticsearchLogInstanceNameTestCase(test.ScenarioTestCase):
+
+    @mock.patch("%s.utils.get_checker" % BASE)
+    def test__check_server_name(self, mock_get_checker):
+        checker = mock_get_checker.return_value
+        checker.wait.return_value = 1.5
+        scenario = logging.ElasticsearchLogInstanceName(self.context)
+
+        scenario._check_server_name("server-id", "10.0.0.1", 9200, 5, 3,
+                                    additional_query={"should": []})
+
+        mock_get_checker.assert_called_once_with(self.context,
+                                                 "http://10.0.0.1:9200")
+        checker.wait.assert_called_once_with(
+            {"query": {"bool": {
+                "must": [{"match_phrase": {"Payload": "server-id"}}],
+                "should": []}}},
+            timeout=15, max_interval=5)
+        self.assertEqual([["log visible after, ms", 1500.0]],
+                         scenario._output["additive"][0]["data"])
+        self._test_atomic_action_timer(
+            scenario.atomic_actions(),
+            "elasticsearch.check_server_log_indexed")
+
+    @mock.patch("%s.utils.get_checker" % BASE)
+    def test__check_server_name_not_found(self, mock_get_checker):
+        mock_get_checker.return_value.wait.return_value = None
+        scenario = logging.ElasticsearchLogInstanceName(self.context)
+
+        self.assertRaises(exceptions.RallyAssertionError,
+                          scenario._check_server_name,
+                          "server-id", "10.0.0.1", 9200, 5, 3)
+        self.assertFalse(scenario._output["additive"])
@@ -0,0 +1,134 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+
+from rally_openstack.task.scenarios.elasticsearch import utils
+from tests.unit import test
+
+
+UTILS = "rally_openstack.task.scenarios.elasticsearch.utils"
+
+
+class LogIndexCheckerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LogIndexCheckerTestCase, self).setUp()
+        patcher = mock.patch("%s.requests.Session" % UTILS)
+        self.session = patcher.start().return_value
+        self.checker = utils.LogIndexChecker("http://es:9200",
+                                             min_interval=0.01)
+
+    def _respond(self, *totals):
+        self.session.get.return_value.json.return_value = {
+            "responses": [{"hits": {"total": total}} for total in totals]}
+
+    def test_wait(self):
+        self._respond({"value": 1, "relation": "eq"})
+
+        visible_after = self.checker.wait({"query": "foo"}, timeout=10,
+                                          max_interval=1)
+
+        self.assertGreaterEqual(visible_after, 0)
+        self.assertLess(visible_after, 10)
+        self.session.get.assert_called_once_with(
+            "http://es:9200/_msearch", data="{}\n%s\n" % json.dumps(
+                {"query": "foo"}),
+            headers={"Content-Type": "application/x-ndjson"})
+
+    def test_wait_timeout(self):
+        self._respond(0)
+
+        self.assertIsNone(self.checker.wait({"query": "foo"}, timeout=0.2,
+                                            max_interval=0.05))
+        self.assertGreater(self.session.get.call_count, 1)
+
+    def test_wait_wakes_checker_up(self):
+        self._respond(1)
+        # the checker waits for the next check of this query
+        later = utils._Query({"query": "later"}, 100, 100)
+        later.check_at += 100
+        self.checker._queries["later"] = later
+        self.addCleanup(self.checker._wakeup.set)
+        self.addCleanup(self.checker._queries.pop, "later")
+        self.checker.wait({"query": "warm-up"}, timeout=1, max_interval=1)
+
+        visible_after = self.checker.wait({"query": "foo"}, timeout=1,
+                                          max_interval=1)
+
+        self.assertIsNotNone(visible_after)
+        self.assertLess(visible_after, 1)
+        self.assertIsNone(later.found_at)
+
+    def test_wait_search_fails(self):
+        self.session.get.side_effect = ValueError("boom")
+
+        self.assertIsNone(self.checker.wait({"query": "foo"}, timeout=0.1,
+                                            max_interval=0.05))
+
+    def test__search(self):
+        self._respond(1, 0, {"value": 0})
+        queries = [utils._Query({"query": i}, 0.1, 0.5) for i in range(3)]
+
+        self.checker._search(queries)
+
+        self.session.get.assert_called_once_with(
+            "http://es:9200/_msearch",
+            data="".join("{}\n%s\n" % json.dumps({"query": i})
+                         for i in range(3)),
+            headers={"Content-Type": "application/x-ndjson"})
+        self.assertTrue(queries[0].found.is_set())
+        self.assertIsNotNone(queries[0].found_at)
+        for query in queries[1:]:
+            self.assertFalse(query.found.is_set())
+            self.assertEqual(0.2, query.interval)
+            self.assertGreater(query.check_at, query.started_at)
+
+        self._respond(0)
+        for i in range(3):
+            self.checker._search(queries[1:2])
+        self.assertEqual(0.5, queries[1].interval)
+
+    def test__hits_total(self):
+        self.assertEqual(2, utils._hits_total({"hits": {"total": 2}}))
+        self.assertEqual(3, utils._hits_total(
+            {"hits": {"total": {"value": 3, "relation": "eq"}}}))
+        self.assertEqual(0, utils._hits_total({"error": "foo"}))
+        self.assertEqual(0, utils._hits_total(None))
+
+
+class GetCheckerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(GetCheckerTestCase, self).setUp()
+        utils.clear()
+        self.addCleanup(utils.clear)
+
+    def test_get_checker(self):
+        context = {"task": {"uuid": "foo"}}
+        checker = utils.get_checker(context, "http://es:9200")
+
+        self.assertIsInstance(checker, utils.LogIndexChecker)
+        self.assertIs(checker, utils.get_checker(context, "http://es:9200"))
+        self.assertIsNot(checker,
+                         utils.get_checker(context, "http://es2:9200"))
+        self.assertIsNot(checker, utils.get_checker(
+            {"task": {"uuid": "bar"}}, "http://es:9200"))
+        self.assertIsNot(checker, utils.get_checker({}, "http://es:9200"))
+
+    def test_get_checker_drops_old_tasks(self):
+        for i in range(utils._MAX_TASKS + 1):
+            utils.get_checker({"task": {"uuid": "task-%s" % i}}, "url")
+
+        self.assertEqual(utils._MAX_TASKS, len(utils._CHECKERS))
+        self.assertNotIn("task-0", utils._CHECKERS)
@@ -0,0 +1,58 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from rally import exceptions
+
+from rally_openstack.task.scenarios.grafana import metrics
+from tests.unit import test
+
+
+BASE = "rally_openstack.task.scenarios.grafana.metrics"
+
+
+class PushMetricLocalTestCase(test.ScenarioTestCase):
+
+    def _run(self, mock_grafana_service, latencies):
+        grafana_svc = mock_grafana_service.GrafanaService.return_value
+        grafana_svc.check_metrics.side_effect = lambda seeds, **kw: dict(
+            zip(seeds, latencies))
+        scenario = metrics.PushMetricLocal(self.context)
+        scenario.generate_random_name = mock.Mock(
+            side_effect=["seed-%s" % i for i in range(len(latencies))])
+        scenario.run(monitor_vip="10.0.0.1", pushgateway_port=9091,
+                     grafana={"user": "admin", "password": "pass",
+                              "port": 3000},
+                     datasource_id=1, job_name="job", sleep_time=5,
+                     retries_total=3, batch_size=len(latencies))
+        return scenario
+
+    @mock.patch("%s.grafana_service" % BASE)
+    def test_run(self, mock_grafana_service):
+        scenario = self._run(mock_grafana_service, [2.5, 1.5])
+
+        grafana_svc = mock_grafana_service.GrafanaService.return_value
+        grafana_svc.push_metrics.assert_called_once_with(
+            ["seed-0", "seed-1"])
+        grafana_svc.check_metrics.assert_called_once_with(
+            ["seed-0", "seed-1"], since=mock.ANY, sleep_time=5,
+            retries_total=3)
+        self.assertEqual(
+            [["push to visible", 1.5], ["push to visible", 2.5]],
+            scenario._output["additive"][0]["data"])
+
+    @mock.patch("%s.grafana_service" % BASE)
+    def test_run_missed_metrics(self, mock_grafana_service):
+        e = self.assertRaises(exceptions.RallyAssertionError, self._run,
+                              mock_grafana_service, [None, 1.5, None])
+        self.assertIn("seed-0, seed-2", "%s" % e)
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
 from unittest import mock
 
 from rally import exceptions
@@ -28,6 +29,9 @@ CONF = utils.CONF
 class HeatScenarioTestCase(test.ScenarioTestCase):
     def setUp(self):
         super(HeatScenarioTestCase, self).setUp()
+        CONF.set_override("heat_stack_wait_by_events", False, "openstack")
+        self.addCleanup(CONF.clear_override, "heat_stack_wait_by_events",
+                        "openstack")
         self.stack = mock.Mock()
         self.scenario = utils.HeatScenario(self.context)
         self.default_template = "heat_template_version: 2013-05-23"
@@ -315,6 +319,12 @@ class HeatScenarioTestCase(test.ScenarioTestCase):
 class HeatScenarioNegativeTestCase(test.ScenarioTestCase):
     patch_task_utils = False
 
+    def setUp(self):
+        super(HeatScenarioNegativeTestCase, self).setUp()
+        CONF.set_override("heat_stack_wait_by_events", False, "openstack")
+        self.addCleanup(CONF.clear_override, "heat_stack_wait_by_events",
+                        "openstack")
+
     def test_failed_create_stack(self):
         self.clients("heat").stacks.create.return_value = {
             "stack": {"id": "test_id"}
@@ -340,3 +350,149 @@ class HeatScenarioNegativeTestCase(test.ScenarioTestCase):
                                scenario._update_stack, stack,
                                "heat_template_version: 2013-05-23")
         self.assertIn("has UPDATE_FAILED status", str(ex))
+
+
+class HeatScenarioEventsTestCase(test.ScenarioTestCase):
+
+    def setUp(self):
+        super(HeatScenarioEventsTestCase, self).setUp()
+        self.stack = mock.Mock(id="stack-id", stack_status="CREATE_COMPLETE")
+        self.stack.stack_name = "foo"
+        self.heat = self.clients("heat")
+        self.heat.stacks.create.return_value = {"stack": {"id": "stack-id"}}
+        self.heat.stacks.get.return_value = self.stack
+        self.heat.events.list.return_value = []
+        self.heat.resources.list.return_value = [
+            mock.Mock(resource_name="server",
+                      resource_type="OS::Nova::Server"),
+            mock.Mock(resource_name="port", resource_type="OS::Neutron::Port")
+        ]
+        self.scenario = utils.HeatScenario(self.context)
+
+    def _check_out_of_atomic_actions(self, mocked):
+        """Make the mock fail if it is called inside of atomic actions."""
+        results = mocked.side_effect or itertools.repeat(mocked.return_value)
+        results = iter(results)
+
+        def check(*args, **kwargs):
+            self.assertTrue(all("finished_at" in a
+                                for a in self.scenario.atomic_actions()))
+            return next(results)
+
+        mocked.side_effect = check
+
+    def _event(self, resource_name, status, second, stack=False):
+        self._events_count = getattr(self, "_events_count", 0) + 1
+        return mock.Mock(
+            id="event-%s" % self._events_count,
+            resource_name=resource_name,
+            physical_resource_id="stack-id" if stack else "res-id",
+            resource_status=status,
+            resource_status_reason="reason of %s" % status,
+            event_time="2016-02-01T12:00:%02dZ" % second)
+
+    def test_create_stack(self):
+        self.stack.stack_status = "CREATE_IN_PROGRESS"
+        first = [self._event("foo", "CREATE_IN_PROGRESS", 0, stack=True),
+                 self._event("port", "CREATE_IN_PROGRESS", 1),
+                 self._event("server", "CREATE_IN_PROGRESS", 1)]
+        second = [self._event("port", "CREATE_COMPLETE", 3),
+                  self._event("server", "CREATE_COMPLETE", 11),
+                  self._event("foo", "CREATE_COMPLETE", 11, stack=True)]
+        self.heat.events.list.side_effect = [first, [], second]
+        self._check_out_of_atomic_actions(self.heat.resources.list)
+
+        stack = self.scenario._create_stack("template")
+
+        self.assertEqual(self.stack, stack)
+        self.assertEqual(
+            [mock.call("foo/stack-id", marker=None, sort_dir="asc"),
+             mock.call("foo/stack-id", marker="event-3", sort_dir="asc"),
+             mock.call("foo/stack-id", marker="event-3", sort_dir="asc")],
+            self.heat.events.list.call_args_list)
+        self.heat.resources.list.assert_called_once_with("foo/stack-id")
+        self.assertEqual(
+            [{"title": "Heat stack create by resource type",
+              "description": "The longest time (in sec) which resources of "
+                             "every type took to create.",
+              "chart_plugin": "StatsTable",
+              "data": [["OS::Neutron::Port", 2.0],
+                       ["OS::Nova::Server", 10.0]]}],
+            self.scenario._output["additive"])
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "heat.create_stack")
+
+    def test_create_stack_failed(self):
+        self.heat.events.list.return_value = [
+            self._event("foo", "CREATE_FAILED", 1, stack=True)]
+
+        ex = self.assertRaises(exceptions.GetResourceErrorStatus,
+                               self.scenario._create_stack, "template")
+
+        self.assertIn("has CREATE_FAILED status", str(ex))
+        self.assertIn("reason of CREATE_FAILED", str(ex))
+        self.assertFalse(self.scenario._output["additive"])
+
+    @mock.patch("%s.time.time" % HEAT_UTILS)
+    def test_create_stack_timeout(self, mock_time_time):
+        mock_time_time.side_effect = itertools.count(0.0, 1000.0)
+        self.stack.stack_status = "CREATE_IN_PROGRESS"
+
+        self.assertRaises(exceptions.TimeoutException,
+                          self.scenario._create_stack, "template")
+        self.assertEqual(4, self.heat.events.list.call_count)
+
+    def test_update_stack(self):
+        self.heat.events.list.side_effect = [
+            [self._event("foo", "CREATE_COMPLETE", 0, stack=True)],
+            [self._event("server", "UPDATE_IN_PROGRESS", 1),
+             self._event("volume", "CREATE_IN_PROGRESS", 1),
+             self._event("server", "UPDATE_COMPLETE", 5),
+             self._event("volume", "CREATE_COMPLETE", 2),
+             self._event("foo", "UPDATE_COMPLETE", 5, stack=True)]]
+        resources = self.heat.resources.list.return_value
+        self.heat.resources.list.side_effect = [
+            resources,
+            resources + [mock.Mock(resource_name="volume",
+                                   resource_type="OS::Cinder::Volume")]]
+        self._check_out_of_atomic_actions(self.heat.resources.list)
+
+        stack = self.scenario._update_stack(self.stack, "template")
+
+        self.assertEqual(self.stack, stack)
+        self.assertEqual(
+            [mock.call("foo/stack-id", sort_dir="desc", limit=1),
+             mock.call("foo/stack-id", marker="event-1", sort_dir="asc")],
+            self.heat.events.list.call_args_list)
+        self.assertEqual([["OS::Cinder::Volume", 1.0],
+                          ["OS::Nova::Server", 4.0]],
+                         self.scenario._output["additive"][0]["data"])
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "heat.update_stack")
+
+    def test_delete_stack(self):
+        self.heat.events.list.side_effect = [
+            [],
+            [self._event("port", "DELETE_IN_PROGRESS", 0),
+             self._event("port", "DELETE_COMPLETE", 1),
+             self._event("foo", "DELETE_COMPLETE", 1, stack=True)]]
+        self._check_out_of_atomic_actions(self.heat.resources.list)
+
+        self.scenario._delete_stack(self.stack)
+
+        self.stack.delete.assert_called_once_with()
+        self.heat.resources.list.assert_called_once_with("foo/stack-id")
+        self.assertEqual([["OS::Neutron::Port", 1.0]],
+                         self.scenario._output["additive"][0]["data"])
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "heat.delete_stack")
+
+    def test_delete_stack_not_found(self):
+        not_found = Exception("Not found")
+        not_found.code = 404
+        self.heat.events.list.side_effect = [[], not_found]
+
+        self.scenario._delete_stack(self.stack)
+
+        self.assertEqual(2, self.heat.events.list.call_count)
+        self.assertFalse(self.scenario._output["additive"])
@@ -34,6 +34,7 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
         self.cluster = mock.Mock()
         self.pod = mock.Mock()
         self.scenario = utils.MagnumScenario(self.context)
+        self.addCleanup(utils.clear_k8s_clients)
 
     def test_list_cluster_templates(self):
         fake_list = [self.cluster_template]
@@ -223,6 +224,33 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
             mock_api_client.assert_called_once_with(config)
         mock_core_v1_api.assert_called_once_with(_api_client)
 
+    @mock.patch(MAGNUM_UTILS + ".MagnumScenario._make_k8s_api_client")
+    def test_get_k8s_api_client_is_cached(self,
+                                          mock__make_k8s_api_client):
+        mock__make_k8s_api_client.side_effect = lambda uuid: "api-%s" % uuid
+        self.context["tenant"] = {"id": "rally_tenant_id",
+                                  "cluster": "cluster1"}
+        scenario = utils.MagnumScenario(self.context)
+        self.assertEqual("api-cluster1", scenario._get_k8s_api_client())
+        self.assertEqual("api-cluster1", scenario._get_k8s_api_client())
+
+        self.context["tenant"] = {"id": "rally_tenant_id",
+                                  "cluster": "cluster2"}
+        scenario = utils.MagnumScenario(self.context)
+        self.assertEqual("api-cluster2", scenario._get_k8s_api_client())
+        self.assertEqual(
+            [mock.call("cluster1"), mock.call("cluster2")],
+            mock__make_k8s_api_client.call_args_list)
+
+        # clients are not shared between tasks
+        for i in range(utils._MAX_TASKS):
+            self.context["task"] = {"uuid": "task-%s" % i}
+            scenario = utils.MagnumScenario(self.context)
+            scenario._get_k8s_api_client()
+        self.assertEqual(2 + utils._MAX_TASKS,
+                         mock__make_k8s_api_client.call_count)
+        self.assertEqual(utils._MAX_TASKS, len(utils._K8S_CLIENTS))
+
     @mock.patch(MAGNUM_UTILS + ".MagnumScenario._get_k8s_api_client")
     def test_list_v1pods(self, mock__get_k8s_api_client):
         k8s_api = mock__get_k8s_api_client.return_value
@@ -232,10 +260,11 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(
             self.scenario.atomic_actions(), "magnum.k8s_list_v1pods")
 
+    @mock.patch(MAGNUM_UTILS + ".watch.Watch")
     @mock.patch("random.choice")
     @mock.patch(MAGNUM_UTILS + ".MagnumScenario._get_k8s_api_client")
     def test_create_v1pod(self, mock__get_k8s_api_client,
-                          mock_random_choice):
+                          mock_random_choice, mock_watch):
         k8s_api = mock__get_k8s_api_client.return_value
         manifest = (
             {"apiVersion": "v1", "kind": "Pod",
@@ -268,27 +297,43 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
         ready_pod.status = ready_status
         ready_pod.metadata = ready_pod_metadata
         ready_pod.spec = ready_pod_spec
-        k8s_api.read_namespaced_pod = mock.MagicMock(
-            side_effect=[not_ready_pod, almost_ready_pod, ready_pod])
-        self.scenario._create_v1pod(manifest)
+        watcher = mock_watch.return_value
+        watcher.stream.return_value = iter([
+            {"type": "ADDED", "object": not_ready_pod},
+            {"type": "MODIFIED", "object": almost_ready_pod},
+            {"type": "MODIFIED", "object": ready_pod}])
+
+        self.assertEqual(ready_pod, self.scenario._create_v1pod(manifest))
+
         k8s_api.create_namespaced_pod.assert_called_with(
             body=manifest, namespace="default")
-        k8s_api.read_namespaced_pod.assert_called_with(
-            name=podname, namespace="default")
+        watcher.stream.assert_called_once_with(
+            k8s_api.list_namespaced_pod, namespace="default",
+            field_selector="metadata.name=%s" % podname,
+            timeout_seconds=mock.ANY)
+        watcher.stop.assert_called_once_with()
+        self.assertFalse(k8s_api.read_namespaced_pod.called)
         self._test_atomic_action_timer(
             self.scenario.atomic_actions(), "magnum.k8s_create_v1pod")
+        self._test_atomic_action_timer(
+            self.scenario.atomic_actions(),
+            "magnum.k8s_wait_for_v1pod_ready",
+            parent=["magnum.k8s_create_v1pod"])
 
     @mock.patch("time.time")
+    @mock.patch(MAGNUM_UTILS + ".watch.Watch")
     @mock.patch("random.choice")
     @mock.patch(MAGNUM_UTILS + ".MagnumScenario._get_k8s_api_client")
     def test_create_v1pod_timeout(self, mock__get_k8s_api_client,
-                                  mock_random_choice, mock_time):
+                                  mock_random_choice, mock_watch,
+                                  mock_time):
         k8s_api = mock__get_k8s_api_client.return_value
         manifest = (
             {"apiVersion": "v1", "kind": "Pod",
              "metadata": {"name": "nginx"}})
         k8s_api.create_namespaced_pod.return_value = self.pod
-        mock_time.side_effect = [1, 2, 3, 4, 5, 1800, 1801]
+        clock = [1]
+        mock_time.side_effect = lambda: clock[0]
         not_ready_pod = kubernetes_client.models.V1Pod()
         not_ready_status = kubernetes_client.models.V1PodStatus()
         not_ready_status.phase = "not_ready"
@@ -296,13 +341,21 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
         not_ready_pod_metadata.uid = "123456789"
         not_ready_pod.status = not_ready_status
         not_ready_pod.metadata = not_ready_pod_metadata
-        k8s_api.read_namespaced_pod = mock.MagicMock(
-            side_effect=[not_ready_pod
-                         for i in range(4)])
+        events = [[{"type": "ADDED", "object": not_ready_pod}],
+                  [{"type": "ERROR", "object": {"code": 410}}]]
 
-        self.assertRaises(
+        def stream(*args, **kwargs):
+            # the server closes the watch, so it is opened again
+            clock[0] += 1000
+            return iter(events.pop(0))
+
+        mock_watch.return_value.stream.side_effect = stream
+
+        e = self.assertRaises(
             exceptions.TimeoutException,
             self.scenario._create_v1pod, manifest)
+        self.assertIn("123456789", "%s" % e)
+        self.assertEqual(2, mock_watch.return_value.stream.call_count)
 
     @mock.patch(MAGNUM_UTILS + ".MagnumScenario._get_k8s_api_client")
     def test_list_v1rcs(self, mock__get_k8s_api_client):
@@ -313,10 +366,11 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(
             self.scenario.atomic_actions(), "magnum.k8s_list_v1rcs")
 
+    @mock.patch(MAGNUM_UTILS + ".watch.Watch")
     @mock.patch("random.choice")
     @mock.patch(MAGNUM_UTILS + ".MagnumScenario._get_k8s_api_client")
     def test_create_v1rc(self, mock__get_k8s_api_client,
-                         mock_random_choice):
+                         mock_random_choice, mock_watch):
         k8s_api = mock__get_k8s_api_client.return_value
         manifest = (
             {"apiVersion": "v1",
@@ -331,39 +385,35 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
         for i in range(5):
             suffix = suffix + mock_random_choice.return_value
         rcname = manifest["metadata"]["name"] + suffix
-        rc = kubernetes_client.models.V1ReplicationController()
-        rc.spec = kubernetes_client.models.V1ReplicationControllerSpec()
+        rc = mock.Mock()
         rc.spec.replicas = manifest["spec"]["replicas"]
         k8s_api.create_namespaced_replication_controller.return_value = rc
-        not_ready_rc = kubernetes_client.models.V1ReplicationController()
-        not_ready_rc_status = (
-            kubernetes_client.models.V1ReplicationControllerStatus(replicas=0))
-        not_ready_rc.status = not_ready_rc_status
-        ready_rc = kubernetes_client.models.V1ReplicationController()
-        ready_rc_status = (
-            kubernetes_client.models.V1ReplicationControllerStatus(
-                replicas=manifest["spec"]["replicas"])
-        )
-        ready_rc_metadata = kubernetes_client.models.V1ObjectMeta()
-        ready_rc_metadata.uid = "123456789"
-        ready_rc_metadata.name = rcname
-        ready_rc.status = ready_rc_status
-        ready_rc.metadata = ready_rc_metadata
-        k8s_api.read_namespaced_replication_controller = mock.MagicMock(
-            side_effect=[not_ready_rc, ready_rc])
-        self.scenario._create_v1rc(manifest)
+        not_ready_rc = mock.Mock()
+        not_ready_rc.status.replicas = 0
+        ready_rc = mock.Mock()
+        ready_rc.status.replicas = manifest["spec"]["replicas"]
+        watcher = mock_watch.return_value
+        watcher.stream.return_value = iter([
+            {"type": "ADDED", "object": not_ready_rc},
+            {"type": "MODIFIED", "object": ready_rc}])
+
+        self.assertEqual(ready_rc, self.scenario._create_v1rc(manifest))
+
         (k8s_api.create_namespaced_replication_controller
             .assert_called_once_with(body=manifest, namespace="default"))
-        (k8s_api.read_namespaced_replication_controller
-            .assert_called_with(name=rcname, namespace="default"))
+        watcher.stream.assert_called_once_with(
+            k8s_api.list_namespaced_replication_controller,
+            namespace="default", field_selector="metadata.name=%s" % rcname,
+            timeout_seconds=mock.ANY)
         self._test_atomic_action_timer(
             self.scenario.atomic_actions(), "magnum.k8s_create_v1rc")
 
     @mock.patch("time.time")
+    @mock.patch(MAGNUM_UTILS + ".watch.Watch")
     @mock.patch("random.choice")
     @mock.patch(MAGNUM_UTILS + ".MagnumScenario._get_k8s_api_client")
     def test_create_v1rc_timeout(self, mock__get_k8s_api_client,
-                                 mock_random_choice, mock_time):
+                                 mock_random_choice, mock_watch, mock_time):
         k8s_api = mock__get_k8s_api_client.return_value
         manifest = (
             {"apiVersion": "v1",
@@ -374,21 +424,17 @@ class MagnumScenarioTestCase(test.ScenarioTestCase):
                       "template": {"metadata":
                                    {"labels":
                                     {"name": "nginx"}}}}})
-        rc = kubernetes_client.models.V1ReplicationController()
-        rc.spec = kubernetes_client.models.V1ReplicationControllerSpec()
+        rc = mock.Mock()
         rc.spec.replicas = manifest["spec"]["replicas"]
-        mock_time.side_effect = [1, 2, 3, 4, 5, 1800, 1801]
+        clock = [1]
+        mock_time.side_effect = lambda: clock[0]
         k8s_api.create_namespaced_replication_controller.return_value = rc
-        not_ready_rc = kubernetes_client.models.V1ReplicationController()
-        not_ready_rc_status = (
-            kubernetes_client.models.V1ReplicationControllerStatus(replicas=0))
-        not_ready_rc_metadata = kubernetes_client.models.V1ObjectMeta()
-        not_ready_rc_metadata.uid = "123456789"
-        not_ready_rc.status = not_ready_rc_status
-        not_ready_rc.metadata = not_ready_rc_metadata
-        k8s_api.read_namespaced_replication_controller = mock.MagicMock(
-            side_effect=[not_ready_rc
-                         for i in range(4)])
+
+        def stream(*args, **kwargs):
+            clock[0] += 1800
+            return iter([])
+
+        mock_watch.return_value.stream.side_effect = stream
 
         self.assertRaises(
             exceptions.TimeoutException,
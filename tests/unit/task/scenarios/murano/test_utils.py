@@ -13,9 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import shutil
+import tempfile
 from unittest import mock
+import zipfile
 
 from rally.common import cfg
+import yaml
 
 from rally_openstack.task.scenarios.murano import utils
 from tests.unit import test
@@ -24,6 +29,18 @@ MRN_UTILS = "rally_openstack.task.scenarios.murano.utils"
 CONF = cfg.CONF
 
 
+def _make_app_dir(test_case):
+    app_dir = tempfile.mkdtemp()
+    test_case.addCleanup(shutil.rmtree, app_dir)
+    os.mkdir(os.path.join(app_dir, "Classes"))
+    with open(os.path.join(app_dir, "Classes", "app.yaml"), "w") as f:
+        f.write("class")
+    with open(os.path.join(app_dir, "manifest.yaml"), "w") as f:
+        yaml.safe_dump({"FullName": "app.name",
+                        "Classes": {"app.name": "app.yaml"}}, f)
+    return app_dir
+
+
 class MuranoScenarioTestCase(test.ScenarioTestCase):
 
     def test_list_environments(self):
@@ -110,53 +127,57 @@ class MuranoScenarioTestCase(test.ScenarioTestCase):
         expected_data = {"Key": "value"}
         self.assertEqual(expected_data, data)
 
-    @mock.patch(MRN_UTILS + ".MuranoPackageManager._read_from_file")
-    @mock.patch(MRN_UTILS + ".MuranoPackageManager._write_to_file")
-    def test_change_app_fullname(
-            self, mock_murano_package_manager__write_to_file,
-            mock_murano_package_manager__read_from_file):
-        manifest = {"FullName": "app.name_abc",
-                    "Classes": {"app.name_abc": "app_class.yaml"}}
-        mock_murano_package_manager__read_from_file.side_effect = (
-            [manifest])
-        utility = utils.MuranoPackageManager({"uuid": "fake_task_id"})
-        utility._change_app_fullname("tmp/tmpfile/")
-        mock_murano_package_manager__read_from_file.assert_has_calls(
-            [mock.call("tmp/tmpfile/manifest.yaml")]
-        )
-        mock_murano_package_manager__write_to_file.assert_has_calls(
-            [mock.call(manifest, "tmp/tmpfile/manifest.yaml")]
-        )
+    def test_prepare_zip_if_not_zip(self):
+        app_dir = _make_app_dir(self)
+        task = {"uuid": "fake_task_id"}
+        utils.open_archives(task)
+        self.addCleanup(utils.close_archives, task)
+        utility = utils.MuranoPackageManager(task)
 
-    @mock.patch("zipfile.is_zipfile")
-    @mock.patch("tempfile.mkdtemp")
-    @mock.patch("shutil.copytree")
-    @mock.patch(MRN_UTILS + ".MuranoPackageManager._change_app_fullname")
-    @mock.patch("%s.pack_dir" % MRN_UTILS)
-    @mock.patch("shutil.rmtree")
-    def test_prepare_zip_if_not_zip(
-            self, mock_shutil_rmtree, mock_pack_dir,
-            mock_murano_package_manager__change_app_fullname,
-            mock_shutil_copytree, mock_tempfile_mkdtemp,
-            mock_zipfile_is_zipfile):
+        zip_file = utility._prepare_package(app_dir)
+        self.addCleanup(os.remove, zip_file)
+
+        with zipfile.ZipFile(zip_file) as zipf:
+            self.assertEqual(["Classes/app.yaml", "manifest.yaml"],
+                             sorted(zipf.namelist()))
+            self.assertEqual(b"class", zipf.read("Classes/app.yaml"))
+            manifest = yaml.safe_load(zipf.read("manifest.yaml"))
+        self.assertNotEqual("app.name", manifest["FullName"])
+        self.assertEqual({manifest["FullName"]: "app.yaml"},
+                         manifest["Classes"])
+
+        # the next iteration takes the same archive and sets another name
+        with mock.patch("%s.pack_dir" % MRN_UTILS) as mock_pack_dir:
+            another = utility._prepare_package(app_dir)
+        self.addCleanup(os.remove, another)
+        self.assertFalse(mock_pack_dir.called)
+        with zipfile.ZipFile(another) as zipf:
+            self.assertNotEqual(
+                manifest["FullName"],
+                yaml.safe_load(zipf.read("manifest.yaml"))["FullName"])
+
+    def test_prepare_zip_without_archives(self):
+        app_dir = _make_app_dir(self)
         utility = utils.MuranoPackageManager({"uuid": "fake_task_id"})
-        package_path = "tmp/tmpfile"
 
-        mock_zipfile_is_zipfile.return_value = False
-        mock_tempfile_mkdtemp.return_value = "tmp/tmpfile"
-        mock_pack_dir.return_value = "tmp/tmpzipfile"
+        packed = []
+        original_pack_dir = utils.pack_dir
 
-        zip_file = utility._prepare_package(package_path)
+        def pack_dir(source_directory):
+            packed.append(original_pack_dir(source_directory))
+            return packed[-1]
 
-        self.assertEqual("tmp/tmpzipfile", zip_file)
-        mock_tempfile_mkdtemp.assert_called_once_with()
-        mock_shutil_copytree.assert_called_once_with(
-            "tmp/tmpfile",
-            "tmp/tmpfile/package/"
-        )
-        (mock_murano_package_manager__change_app_fullname.
-            assert_called_once_with("tmp/tmpfile/package/"))
-        mock_shutil_rmtree.assert_called_once_with("tmp/tmpfile")
+        with mock.patch("%s.pack_dir" % MRN_UTILS,
+                        side_effect=pack_dir) as mock_pack_dir:
+            zip_file = utility._prepare_package(app_dir)
+        self.addCleanup(os.remove, zip_file)
+
+        mock_pack_dir.assert_called_once_with(app_dir)
+        # the archive without the new name is removed
+        self.assertFalse(os.path.exists(packed[0]))
+        with zipfile.ZipFile(zip_file) as zipf:
+            manifest = yaml.safe_load(zipf.read("manifest.yaml"))
+        self.assertNotEqual("app.name", manifest["FullName"])
 
     @mock.patch("zipfile.is_zipfile")
     def test_prepare_zip_if_zip(self, mock_zipfile_is_zipfile):
@@ -179,12 +200,11 @@ class MuranoScenarioTestCase(test.ScenarioTestCase):
             "created_foo_package"
         )
         scenario = utils.MuranoScenario()
-        mock_open.return_value = "opened_foo_package.zip"
         imp_package = scenario._import_package("foo_package.zip")
         self.assertEqual("created_foo_package", imp_package)
         self.clients("murano").packages.create.assert_called_once_with(
-            {}, {"file": "opened_foo_package.zip"})
-        mock_open.assert_called_once_with("foo_package.zip")
+            {}, {"file": mock_open.return_value.__enter__.return_value})
+        mock_open.assert_called_once_with("foo_package.zip", "rb")
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "murano.import_package")
 
@@ -226,3 +246,92 @@ class MuranoScenarioTestCase(test.ScenarioTestCase):
         )
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "murano.filter_applications")
+
+
+class PackDirTestCase(test.TestCase):
+
+    def test_pack_dir(self):
+        app_dir = _make_app_dir(self)
+        first = utils.pack_dir(app_dir)
+        self.addCleanup(os.remove, first)
+        os.utime(os.path.join(app_dir, "manifest.yaml"), (1, 1))
+        second = utils.pack_dir(app_dir)
+        self.addCleanup(os.remove, second)
+
+        with open(first, "rb") as f1, open(second, "rb") as f2:
+            self.assertEqual(f1.read(), f2.read())
+        with zipfile.ZipFile(first) as zipf:
+            self.assertEqual(["manifest.yaml", "Classes/app.yaml"],
+                             zipf.namelist())
+
+
+class PackageArchivesTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PackageArchivesTestCase, self).setUp()
+        self.archives = utils.PackageArchives()
+        self.addCleanup(self.archives.clear)
+        self.app_dir = _make_app_dir(self)
+
+    def test_get(self):
+        archive = self.archives.get(self.app_dir)
+
+        self.assertTrue(zipfile.is_zipfile(archive))
+        with mock.patch("%s.pack_dir" % MRN_UTILS) as mock_pack_dir:
+            with mock.patch.object(self.archives, "_hash") as mock_hash:
+                self.assertEqual(archive, self.archives.get(self.app_dir))
+        self.assertFalse(mock_pack_dir.called)
+        self.assertFalse(mock_hash.called)
+
+    def test_get_touched(self):
+        archive = self.archives.get(self.app_dir)
+        os.utime(os.path.join(self.app_dir, "manifest.yaml"), (1, 1))
+
+        with mock.patch("%s.pack_dir" % MRN_UTILS) as mock_pack_dir:
+            self.assertEqual(archive, self.archives.get(self.app_dir))
+        self.assertFalse(mock_pack_dir.called)
+
+    def test_get_changed(self):
+        archive = self.archives.get(self.app_dir)
+        with open(os.path.join(self.app_dir, "Classes", "app.yaml"),
+                  "w") as f:
+            f.write("changed class")
+
+        changed = self.archives.get(self.app_dir)
+
+        self.assertNotEqual(archive, changed)
+        with zipfile.ZipFile(changed) as zipf:
+            self.assertEqual(b"changed class", zipf.read("Classes/app.yaml"))
+
+    def test_clear(self):
+        archive = self.archives.get(self.app_dir)
+
+        self.archives.clear()
+
+        self.assertFalse(os.path.exists(os.path.dirname(archive)))
+
+
+class TaskArchivesTestCase(test.TestCase):
+
+    def test_open_archives(self):
+        task = {"uuid": "foo"}
+        archives = utils.open_archives(task)
+        self.addCleanup(utils.close_archives, task)
+
+        self.assertIsInstance(archives, utils.PackageArchives)
+        self.assertIs(archives, utils.open_archives(task))
+        self.assertIs(archives, utils.get_archives(task))
+        self.assertIsNone(utils.get_archives({"uuid": "bar"}))
+        self.assertIsNone(utils.get_archives({}))
+
+    def test_close_archives(self):
+        task = {"uuid": "foo"}
+        archive = utils.open_archives(task).get(_make_app_dir(self))
+
+        utils.close_archives(task)
+
+        self.assertIsNone(utils.get_archives(task))
+        self.assertFalse(os.path.exists(archive))
+        # closing of a task without archives is fine as well
+        utils.close_archives(task)
+        utils.close_archives({})
@@ -578,6 +578,24 @@ class NeutronNetworksTestCase(test.TestCase):
 
         self.nc.list_ports.assert_called_once_with()
 
+    def test_create_and_list_ports_bulk(self):
+        net = {"id": "net-id"}
+        self.nc.create_port.return_value = {"ports": [{"id": "p-1"},
+                                                      {"id": "p-2"}]}
+
+        scenario = network.CreateAndListPorts(self.context)
+        scenario._get_or_create_network = mock.Mock(return_value=net)
+
+        scenario.run(port_create_args={"allocation_pools": []},
+                     ports_per_network=2, bulk=True)
+
+        self.nc.create_port.assert_called_once_with({"ports": [
+            {"network_id": "net-id", "name": mock.ANY,
+             "allocation_pools": []}] * 2})
+        self.nc.list_ports.assert_called_once_with()
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "neutron.create_2_ports")
+
     def test_create_and_update_ports(self):
         port_update_args = {"admin_state_up": False}
         port_create_args = {"allocation_pools": []}
@@ -660,6 +678,37 @@ class NeutronNetworksTestCase(test.TestCase):
             scenario.admin_neutron.update_port.call_args_list
         )
 
+    def test_create_and_bind_ports_bulk(self):
+        self.context.update({
+            "tenants": {"tenant-1": {"id": "tenant-1",
+                                     "networks": [{"id": "net-id"}]}},
+            "networking_agents": [{
+                "host": "fake-host",
+                "alive": True,
+                "admin_state_up": True,
+                "agent_type": "Open vSwitch agent",
+            }],
+        })
+        scenario = network.CreateAndBindPorts(self.context)
+        scenario.admin_neutron = mock.MagicMock()
+        self.nc.create_subnet.return_value = {"subnets": [{"id": "s-4"},
+                                                          {"id": "s-6"}]}
+        self.nc.create_port.return_value = {"ports": [{"id": "p-1"},
+                                                      {"id": "p-2"}]}
+
+        scenario.run(ports_per_network=2, bulk=True)
+
+        self.assertEqual(
+            [4, 6],
+            [s["ip_version"]
+             for s in self.nc.create_subnet.call_args[0][0]["subnets"]])
+        self.nc.create_port.assert_called_once_with({"ports": [
+            {"network_id": "net-id", "name": mock.ANY}] * 2})
+        self.assertEqual(
+            ["p-1", "p-2"],
+            [c[1]["port_id"]
+             for c in scenario.admin_neutron.update_port.call_args_list])
+
     def test_create_and_show_ports(self):
         port_create_args = {"allocation_pools": []}
         ports_per_network = 1
@@ -52,6 +52,15 @@ class NeutronScenarioTestCase(test.ScenarioTestCase):
         self.scenario.generate_random_name = name_generator
         self.scenario.neutron._name_generator = name_generator
 
+    def test_capabilities(self):
+        scenarios = [utils.NeutronScenario(self.context,
+                                           clients=self._clients)
+                     for i in range(2)]
+
+        self.assertIs(scenarios[0].neutron._capabilities,
+                      scenarios[1].neutron._capabilities)
+        self.assertIsNotNone(scenarios[0].neutron._capabilities)
+
     def test__get_network_id(self):
         networks = [{"id": "foo-id", "name": "foo-network"},
                     {"id": "bar-id", "name": "bar-network"}]
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
 from unittest import mock
 
 import ddt
@@ -403,20 +404,12 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.unrescue_server")
 
-    def _test_delete_servers(self, force=False):
+    @mock.patch("%s.NovaScenario._wait_for_servers" % NOVA_UTILS)
+    def _test_delete_servers(self, mock__wait_for_servers, force=False):
         servers = [self.server, self.server1]
         nova_scenario = utils.NovaScenario(context=self.context)
         nova_scenario._delete_servers(servers, force=force)
-        check_interval = CONF.openstack.nova_server_delete_poll_interval
-        expected = []
         for server in servers:
-            expected.append(mock.call(
-                server,
-                ready_statuses=["deleted"],
-                check_deletion=True,
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=check_interval,
-                timeout=CONF.openstack.nova_server_delete_timeout))
             if force:
                 server.force_delete.assert_called_once_with()
                 self.assertFalse(server.delete.called)
@@ -424,7 +417,13 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
                 server.delete.assert_called_once_with()
                 self.assertFalse(server.force_delete.called)
 
-        self.mock_wait_for_status.mock.assert_has_calls(expected)
+        mock__wait_for_servers.assert_called_once_with(
+            servers,
+            ready_statuses=["deleted"],
+            check_deletion=True,
+            check_interval=CONF.openstack.nova_server_delete_poll_interval,
+            timeout=CONF.openstack.nova_server_delete_timeout)
+        self.assertFalse(self.mock_wait_for_status.mock.called)
         timer_name = "nova.%sdelete_servers" % ("force_" if force else "")
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        timer_name)
@@ -465,18 +464,32 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
     def test__boot_servers(self, image_id="image", flavor_id="flavor",
                            requests=1, instances_amount=1,
                            auto_assign_nic=False, **kwargs):
-        servers = [mock.Mock() for i in range(instances_amount)]
-        self.clients("nova").servers.list.return_value = servers
+        reservations = dict(
+            ("r-%d" % i, [mock.Mock(id="s-%d-%d" % (i, j))
+                          for j in range(instances_amount)])
+            for i in range(requests))
+        nova = self.clients("nova")
+        nova.servers.create.side_effect = ["r-%d" % i
+                                           for i in range(requests)]
+        nova.servers.list.side_effect = (
+            lambda detailed, search_opts, limit: reservations[
+                search_opts["reservation_id"]])
         scenario = utils.NovaScenario(context=self.context)
         scenario.generate_random_name = mock.Mock()
         scenario._pick_random_nic = mock.Mock(
             return_value=[{"net-id": "foo"}])
         scenario._get_network_id = mock.Mock(return_value="foo")
+        listed = []
+        scenario._wait_for_servers = mock.Mock(
+            side_effect=lambda servers, list_servers, **kw: listed.extend(
+                list_servers()) or servers)
 
-        scenario._boot_servers(image_id, flavor_id, requests,
-                               instances_amount=instances_amount,
-                               auto_assign_nic=auto_assign_nic,
-                               **kwargs)
+        self.assertEqual(
+            sum(reservations.values(), []),
+            scenario._boot_servers(image_id, flavor_id, requests,
+                                   instances_amount=instances_amount,
+                                   auto_assign_nic=auto_assign_nic,
+                                   **kwargs))
 
         expected_kwargs = dict(kwargs)
         if auto_assign_nic and "nics" not in kwargs:
@@ -487,25 +500,153 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
                 "%s_%d" % (scenario.generate_random_name.return_value, i),
                 image_id, flavor_id,
                 min_count=instances_amount, max_count=instances_amount,
-                **expected_kwargs)
+                reservation_id=True, **expected_kwargs)
             for i in range(requests)]
-        self.clients("nova").servers.create.assert_has_calls(create_calls)
-
-        wait_for_status_calls = [
-            mock.call(
-                servers[i],
-                ready_statuses=["ACTIVE"],
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=CONF.openstack.nova_server_boot_poll_interval,
-                timeout=CONF.openstack.nova_server_boot_timeout)
-            for i in range(instances_amount)]
-        self.mock_wait_for_status.mock.assert_has_calls(wait_for_status_calls)
+        nova.servers.create.assert_has_calls(create_calls)
 
-        self.mock_get_from_manager.mock.assert_has_calls(
-            [mock.call() for i in range(instances_amount)])
+        servers = sum([reservations["r-%d" % i] for i in range(requests)],
+                      [])
+        scenario._wait_for_servers.assert_called_once_with(
+            servers,
+            ready_statuses=["ACTIVE"],
+            check_interval=CONF.openstack.nova_server_boot_poll_interval,
+            timeout=CONF.openstack.nova_server_boot_timeout,
+            list_servers=mock.ANY, on_ready=mock.ANY)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "nova.boot_servers")
 
+        self.assertEqual(servers, listed)
+        for call in nova.servers.list.call_args_list:
+            self.assertIn(call[1]["search_opts"]["reservation_id"],
+                          reservations)
+            self.assertEqual(-1, call[1]["limit"])
+
+    def test__boot_servers_in_batches(self):
+        CONF.set_override("nova_server_boot_batch_size", 2, "openstack")
+        self.addCleanup(CONF.clear_override, "nova_server_boot_batch_size",
+                        "openstack")
+        counts = [2, 2, 1, 2, 2, 1]
+        reservations = dict(
+            ("r-%d" % i, [mock.Mock(id="s-%d-%d" % (i, j))
+                          for j in range(count)])
+            for i, count in enumerate(counts))
+        nova = self.clients("nova")
+        nova.servers.create.side_effect = ["r-%d" % i
+                                           for i in range(len(counts))]
+        nova.servers.list.side_effect = (
+            lambda detailed, search_opts, limit: reservations[
+                search_opts["reservation_id"]])
+        scenario = utils.NovaScenario(context=self.context)
+        scenario.generate_random_name = mock.Mock(return_value="foo")
+        scenario._wait_for_servers = mock.Mock(
+            side_effect=lambda servers, **kw: servers)
+
+        servers = scenario._boot_servers("image", "flavor", 2,
+                                         instances_amount=5)
+
+        self.assertEqual(
+            [reservations["r-%d" % i] for i in range(len(counts))],
+            [servers[sum(counts[:i]):sum(counts[:i + 1])]
+             for i in range(len(counts))])
+        self.assertEqual(
+            [mock.call("foo_%d" % i, "image", "flavor", min_count=count,
+                       max_count=count, reservation_id=True)
+             for i, count in enumerate(counts)],
+            nova.servers.create.call_args_list)
+
+    @mock.patch("%s.time.time" % NOVA_UTILS)
+    def test__boot_servers_lists_reservation_again(self, mock_time):
+        mock_time.return_value = 10
+        servers = [mock.Mock(id="a"), mock.Mock(id="b")]
+        nova = self.clients("nova")
+        nova.servers.create.return_value = "r-1"
+        nova.servers.list.side_effect = [servers[:1], servers]
+        scenario = utils.NovaScenario(context=self.context)
+        scenario.generate_random_name = mock.Mock()
+        scenario._wait_for_servers = mock.Mock(
+            side_effect=lambda servers, **kw: servers)
+
+        self.assertEqual(
+            servers,
+            scenario._boot_servers("image", "flavor", 1, instances_amount=2))
+        self.assertEqual(2, nova.servers.list.call_count)
+
+    @mock.patch("%s.time.time" % NOVA_UTILS)
+    def test__boot_servers_not_all_servers_found(self, mock_time):
+        mock_time.side_effect = itertools.count(
+            step=CONF.openstack.nova_server_boot_timeout)
+        nova = self.clients("nova")
+        nova.servers.create.return_value = "r-1"
+        nova.servers.list.return_value = [mock.Mock(id="a")]
+        scenario = utils.NovaScenario(context=self.context)
+        scenario.generate_random_name = mock.Mock()
+        scenario._wait_for_servers = mock.Mock()
+
+        e = self.assertRaises(rally_exceptions.RallyException,
+                              scenario._boot_servers, "image", "flavor", 1,
+                              instances_amount=2)
+        self.assertEqual("Only 1 of 2 servers of reservation r-1 are found.",
+                         e.format_message())
+        self.assertFalse(scenario._wait_for_servers.called)
+
+    @mock.patch("%s.time.time" % NOVA_UTILS)
+    def test__boot_servers_latencies(self, mock_time):
+        CONF.set_override("nova_server_boot_concurrency", 2, "openstack")
+        self.addCleanup(CONF.clear_override, "nova_server_boot_concurrency",
+                        "openstack")
+        servers = [mock.Mock(id="a"), mock.Mock(id="b")]
+        nova = self.clients("nova")
+        nova.servers.create.return_value = "r-1"
+        nova.servers.list.return_value = servers
+        mock_time.return_value = 10
+        scenario = utils.NovaScenario(context=self.context)
+        scenario.generate_random_name = mock.Mock()
+
+        def wait_for_servers(servers, on_ready, **kwargs):
+            mock_time.return_value = 12.5
+            on_ready(servers[1])
+            mock_time.return_value = 14
+            on_ready(servers[0])
+            return servers
+
+        scenario._wait_for_servers = mock.Mock(side_effect=wait_for_servers)
+
+        scenario._boot_servers("image", "flavor", 1, instances_amount=2)
+
+        self.assertEqual(
+            {"title": "Server boot latency",
+             "description": mock.ANY,
+             "chart_plugin": "StatsTable",
+             "data": [["Time to ACTIVE", 2.5], ["Time to ACTIVE", 4]]},
+            scenario._output["additive"][0])
+
+    @mock.patch("%s.common_utils.wait_for_statuses" % NOVA_UTILS)
+    def test__wait_for_servers(self, mock_wait_for_statuses):
+        servers = [mock.Mock(), mock.Mock()]
+        servers[0].name = "s_rally_foo_1"
+        servers[1].name = "s_rally_foo_2"
+        scenario = utils.NovaScenario(context=self.context)
+
+        self.assertEqual(
+            mock_wait_for_statuses.return_value,
+            scenario._wait_for_servers(servers, ready_statuses=["ACTIVE"],
+                                       timeout=10, check_interval=1))
+
+        mock_wait_for_statuses.assert_called_once_with(
+            servers, ready_statuses=["ACTIVE"], list_resources=mock.ANY,
+            check_deletion=False, timeout=10, check_interval=1,
+            on_ready=None)
+        list_resources = mock_wait_for_statuses.call_args[1]["list_resources"]
+        self.assertEqual(servers[0].manager.list.return_value,
+                         list_resources())
+        servers[0].manager.list.assert_called_once_with(
+            detailed=True, search_opts={"name": "^s_rally_foo_"}, limit=-1)
+
+    def test__wait_for_servers_empty(self):
+        scenario = utils.NovaScenario(context=self.context)
+        self.assertEqual([], scenario._wait_for_servers(
+            [], ready_statuses=["ACTIVE"], timeout=10, check_interval=1))
+
     def test__show_server(self):
         nova_scenario = utils.NovaScenario(context=self.context)
         nova_scenario._show_server(self.server)
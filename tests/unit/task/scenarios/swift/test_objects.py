@@ -53,6 +53,26 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
             [mock.call("BB", "ooobj_%i" % i) for i in range(3)])
         scenario._delete_container.assert_called_once_with("BB")
 
+    def test_create_container_and_object_then_delete_all_large(self):
+        scenario = objects.CreateContainerAndObjectThenDeleteAll(self.context)
+        scenario._create_container = mock.MagicMock(return_value="AA")
+        scenario._upload_large_object = mock.MagicMock(
+            side_effect=[("etaaag", "ooobj_%i" % i) for i in range(2)])
+        scenario._delete_object = mock.MagicMock()
+        scenario._delete_container = mock.MagicMock()
+
+        scenario.run(objects_per_container=2, object_size=100,
+                     segment_size=30, segment_concurrency=2)
+
+        scenario._upload_large_object.assert_has_calls(
+            [mock.call("AA", 100, 30, concurrency=2)] * 2)
+        scenario._delete_object.assert_has_calls(
+            [mock.call("AA", "ooobj_%i" % i,
+                       query_string="multipart-manifest=delete")
+             for i in range(2)])
+        self.assertEqual([mock.call("AA"), mock.call("AA_segments")],
+                         scenario._delete_container.call_args_list)
+
     def test_create_container_and_object_then_download_object(self):
         scenario = objects.CreateContainerAndObjectThenDownloadObject(
             self.context
@@ -69,6 +89,23 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario._download_object.assert_has_calls(
             [mock.call("CC", "obbbj_%i" % i) for i in range(2)])
 
+    def test_create_container_and_object_then_stream_object(self):
+        scenario = objects.CreateContainerAndObjectThenDownloadObject(
+            self.context
+        )
+        scenario._create_container = mock.MagicMock(return_value="CC")
+        scenario._upload_object = mock.MagicMock(
+            return_value=("etaaaag", "obbbj"))
+        scenario._download_object = mock.MagicMock()
+        scenario._stream_object = mock.MagicMock()
+
+        scenario.run(object_size=50, stream=True, segments=4,
+                     verify_checksum=True)
+
+        scenario._stream_object.assert_called_once_with(
+            "CC", "obbbj", chunk_size=65536, segments=4, verify_checksum=True)
+        self.assertFalse(scenario._download_object.called)
+
     @ddt.data(1, 5)
     def test_list_objects_in_containers(self, num_cons):
         con_list = [{"name": "cooon_%s" % i} for i in range(num_cons)]
@@ -106,6 +143,20 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
                 obj_calls.append(mock.call(container["name"], obj["name"]))
         scenario._download_object.assert_has_calls(obj_calls, any_order=True)
 
+    def test_list_and_download_objects_in_containers_skips_segments(self):
+        scenario = objects.ListAndDownloadObjectsInContainers(self.context)
+        scenario._list_containers = mock.MagicMock(
+            return_value=("header", [{"name": "con"},
+                                     {"name": "con_segments"}]))
+        scenario._list_objects = mock.MagicMock(
+            return_value=("header", [{"name": "obj"}]))
+        scenario._download_object = mock.MagicMock()
+
+        scenario.run()
+
+        scenario._list_objects.assert_called_once_with("con")
+        scenario._download_object.assert_called_once_with("con", "obj")
+
     def test_functional_create_container_and_object_then_list_objects(self):
         names_list = ["AA", "BB", "CC", "DD"]
 
@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import json
 from unittest import mock
 
 import ddt
 
+from rally_openstack.common import exceptions
 from rally_openstack.task.scenarios.swift import utils
 from tests.unit import test
 
@@ -141,6 +144,145 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.download_object")
 
+    def test__stream_object(self):
+        self.clients("swift").get_object.return_value = (
+            {"etag": "\"%s\"" % hashlib.md5(b"foobar").hexdigest()},
+            iter([b"foo", b"bar"]))
+        scenario = utils.SwiftScenario(context=self.context)
+
+        result = scenario._stream_object("container", "object",
+                                         chunk_size=3, verify_checksum=True)
+
+        self.assertEqual(6, result["size"])
+        self.clients("swift").get_object.assert_called_once_with(
+            "container", "object", resp_chunk_size=3)
+        self.assertFalse(self.clients("swift").head_object.called)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "swift.stream_object")
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "swift.first_byte",
+                                       parent=["swift.stream_object"])
+        output = scenario._output["additive"][0]
+        self.assertEqual("StatsTable", output["chart_plugin"])
+        self.assertEqual(["Throughput, MiB/s", "Time to first byte, s"],
+                         [row[0] for row in output["data"]])
+
+    def test__stream_object_checksum_mismatch(self):
+        self.clients("swift").get_object.return_value = (
+            {"etag": "bad"}, iter([b"foo"]))
+        scenario = utils.SwiftScenario(context=self.context)
+
+        self.assertRaises(exceptions.ChecksumMismatch,
+                          scenario._stream_object, "container", "object",
+                          verify_checksum=True)
+
+        # MD5 of large objects differs from their ETags
+        self.clients("swift").get_object.return_value = (
+            {"etag": "bad", "x-static-large-object": "True"}, iter([b"foo"]))
+        scenario._stream_object("container", "object", verify_checksum=True)
+
+    @mock.patch("%s.osclients.Clients" % SWIFT_UTILS)
+    def test__stream_object_by_segments(self, mock_clients):
+        self.clients("swift").head_object.return_value = {
+            "content-length": "10"}
+        swift = mock_clients.return_value.swift.return_value
+        swift.get_object.side_effect = lambda *a, **kw: (
+            {}, iter([b"x" * 4]))
+        self.context["user"] = {"credential": mock.Mock()}
+        scenario = utils.SwiftScenario(context=self.context)
+
+        result = scenario._stream_object("container", "object",
+                                         chunk_size=2, segments=3)
+
+        self.assertEqual(12, result["size"])
+        mock_clients.assert_called_with(self.context["user"]["credential"])
+        self.assertEqual(
+            [mock.call("container", "object", resp_chunk_size=2,
+                       headers={"Range": "bytes=%s" % r})
+             for r in ("0-3", "4-7", "8-9")],
+            sorted(swift.get_object.call_args_list,
+                   key=lambda c: c[1]["headers"]["Range"]))
+        self.assertFalse(self.clients("swift").get_object.called)
+        self.assertEqual(
+            ["swift.download_segments"],
+            [a["name"] for a in scenario.atomic_actions()[0]["children"]])
+        self.assertEqual(
+            3, [row[0] for row in scenario._output["additive"][0]["data"]
+                ].count("Segment latency, s"))
+
+    @mock.patch("%s.osclients.Clients" % SWIFT_UTILS)
+    def test__upload_large_object(self, mock_clients):
+        self.context["user"] = {"credential": mock.Mock()}
+        swift = mock_clients.return_value.swift.return_value
+        sizes = {}
+
+        def put_object(container, name, content, content_length):
+            sizes[name] = len(content.read(content_length))
+            return "etag_%s" % name
+
+        swift.put_object.side_effect = put_object
+        self.clients("swift").put_object.return_value = "manifest_etag"
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario.generate_random_name = mock.Mock(
+            side_effect=["obj", "seg_0", "seg_1", "seg_2"])
+
+        self.assertEqual(("manifest_etag", "obj"),
+                         scenario._upload_large_object("container", 10, 4,
+                                                       concurrency=2))
+
+        self.clients("swift").put_container.assert_called_once_with(
+            "container_segments")
+        self.assertEqual({"seg_0": 4, "seg_1": 4, "seg_2": 2}, sizes)
+        self.assertLessEqual(mock_clients.call_count, 2)
+        container, name, manifest = (
+            self.clients("swift").put_object.call_args[0])
+        self.assertEqual(("container", "obj"), (container, name))
+        self.assertEqual(
+            {"query_string": "multipart-manifest=put"},
+            self.clients("swift").put_object.call_args[1])
+        self.assertEqual(
+            [{"path": "/container_segments/seg_%d" % i,
+              "etag": "etag_seg_%d" % i,
+              "size_bytes": size} for i, size in enumerate((4, 4, 2))],
+            sorted(json.loads(manifest), key=lambda s: s["path"]))
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "swift.upload_large_object")
+        self.assertEqual(
+            ["swift.create_segments_container", "swift.upload_segments",
+             "swift.put_manifest"],
+            [a["name"] for a in scenario.atomic_actions()[0]["children"]])
+        self.assertEqual(
+            ["Throughput, MiB/s"] + ["Segment throughput, MiB/s"] * 3,
+            [row[0] for row in scenario._output["additive"][0]["data"]])
+
+    @ddt.data({"object_size": 10},
+              {"object_size": 10, "segment_size": 10},
+              {"object_size": 10, "segment_size": 4, "large": True})
+    @ddt.unpack
+    def test__upload_dummy_object(self, object_size, segment_size=None,
+                                  large=False):
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario._upload_object = mock.Mock()
+        scenario._upload_large_object = mock.Mock()
+
+        result = scenario._upload_dummy_object(
+            "container", object_size, segment_size=segment_size,
+            segment_concurrency=3)
+
+        if large:
+            self.assertEqual(scenario._upload_large_object.return_value,
+                             result)
+            scenario._upload_large_object.assert_called_once_with(
+                "container", object_size, segment_size, concurrency=3)
+            self.assertFalse(scenario._upload_object.called)
+        else:
+            self.assertEqual(scenario._upload_object.return_value, result)
+            scenario._upload_object.assert_called_once_with(
+                "container", mock.ANY, content_length=object_size)
+            content = scenario._upload_object.call_args[0][1]
+            self.assertEqual(b"\0" * object_size, content.read())
+            self.assertFalse(scenario._upload_large_object.called)
+
     def test__delete_object(self):
         container_name = mock.MagicMock()
         object_name = mock.MagicMock()
@@ -153,3 +295,19 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
             **kw)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.delete_object")
+
+
+class DummyContentTestCase(test.TestCase):
+
+    def test_read(self):
+        content = utils.DummyContent(len(utils._ZEROS) + 10)
+
+        self.assertIs(utils._ZEROS, content.read(len(utils._ZEROS) * 2))
+        self.assertEqual(len(utils._ZEROS), content.tell())
+        self.assertEqual(b"\0" * 4, content.read(4))
+        self.assertEqual(b"\0" * 6, content.read())
+        self.assertEqual(b"", content.read(10))
+
+        content.seek(0)
+        self.assertEqual(0, content.tell())
+        self.assertEqual(b"\0" * 3, content.read(3))
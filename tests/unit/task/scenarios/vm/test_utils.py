@@ -13,7 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import subprocess
 from unittest import mock
 
 import netaddr
@@ -77,7 +76,9 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             ["foo", "bar", "arg1", "arg2"],
             stdin=None)
 
-    def test__run_command_over_ssh_remote_path_copy(self):
+    @mock.patch("%s.open" % VMTASKS_UTILS,
+                side_effect=mock.mock_open(), create=True)
+    def test__run_command_over_ssh_remote_path_copy(self, mock_open):
         mock_ssh = mock.MagicMock()
         vm_scenario = utils.VMScenario(self.context)
         vm_scenario._run_command_over_ssh(
@@ -88,12 +89,30 @@ class VMScenarioTestCase(test.ScenarioTestCase):
                 "command_args": ["arg1", "arg2"]
             }
         )
-        mock_ssh.put_file.assert_called_once_with(
-            "/bin/false", "bar", mode=0o755
-        )
+        mock_open.assert_called_once_with("/bin/false", "rb")
+        self.assertFalse(mock_ssh.put_file.called)
         mock_ssh.execute.assert_called_once_with(
-            ["foo", "bar", "arg1", "arg2"],
-            stdin=None)
+            "cat > bar && chmod 0755 bar && foo bar arg1 arg2",
+            stdin=mock_open.side_effect.return_value)
+
+    @mock.patch("%s.open" % VMTASKS_UTILS,
+                side_effect=mock.mock_open(), create=True)
+    def test__run_command_over_ssh_remote_path_copy_with_stdin(
+            self, mock_open):
+        mock_ssh = mock.MagicMock()
+        vm_scenario = utils.VMScenario(self.context)
+        vm_scenario._run_command_over_ssh(
+            mock_ssh,
+            {
+                "remote_path": "bar",
+                "local_path": "/bin/false",
+                "script_inline": "foobar"
+            }
+        )
+        mock_ssh.run.assert_called_once_with(
+            "cat > bar && chmod 0755 bar",
+            stdin=mock_open.side_effect.return_value)
+        mock_ssh.execute.assert_called_once_with(["bar"], stdin=mock.ANY)
 
     def test__wait_for_ssh(self):
         ssh = mock.MagicMock()
@@ -103,7 +122,7 @@ class VMScenarioTestCase(test.ScenarioTestCase):
 
     def test__wait_for_ping(self):
         vm_scenario = utils.VMScenario(self.context)
-        vm_scenario._ping_ip_address = mock.Mock(return_value=True)
+        self.mock_wait_for_status.mock.return_value.rtt = 0.0012345
         vm_scenario._wait_for_ping(netaddr.IPAddress("1.2.3.4"))
         self.mock_wait_for_status.mock.assert_called_once_with(
             utils.Host("1.2.3.4"),
@@ -111,11 +130,48 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             update_resource=utils.Host.update_status,
             timeout=CONF.openstack.vm_ping_timeout,
             check_interval=CONF.openstack.vm_ping_poll_interval)
+        self.assertEqual(
+            [{"title": "Ping RTT",
+              "description": mock.ANY,
+              "chart_plugin": "StatsTable",
+              "data": [["RTT", 1.234]]}],
+            vm_scenario._output["additive"])
+
+    def test__wait_for_ping_without_rtt(self):
+        vm_scenario = utils.VMScenario(self.context)
+        self.mock_wait_for_status.mock.return_value.rtt = None
+        vm_scenario._wait_for_ping(netaddr.IPAddress("1.2.3.4"))
+        self.assertEqual([], vm_scenario._output["additive"])
+
+    @mock.patch(VMTASKS_UTILS + ".VMScenario._run_command_over_ssh")
+    @mock.patch(VMTASKS_UTILS + ".get_ssh_pool")
+    def test__run_command_pooled(self, mock_get_ssh_pool,
+                                 mock_vm_scenario__run_command_over_ssh):
+        vm_scenario = utils.VMScenario(self.context)
+        vm_scenario.context = {"user": {"keypair": {"private": "ssh"}}}
+        vm_scenario._run_command("1.2.3.4", 22, "username", "password",
+                                 command={"script_file": "foo"})
+
+        mock_get_ssh_pool.assert_called_once_with(vm_scenario.context)
+        pool = mock_get_ssh_pool.return_value
+        pool.connection.assert_called_once_with(
+            "username", "1.2.3.4",
+            port=22, pkey="ssh", password="password")
+        ssh = pool.connection.return_value.__enter__.return_value
+        ssh.wait.assert_called_once_with(120, 1)
+        mock_vm_scenario__run_command_over_ssh.assert_called_once_with(
+            ssh, {"script_file": "foo"})
+        pool.connection.return_value.__exit__.assert_called_once_with(
+            None, None, None)
+        self.assertFalse(ssh.close.called)
 
     @mock.patch(VMTASKS_UTILS + ".VMScenario._run_command_over_ssh")
     @mock.patch("rally.utils.sshutils.SSH")
     def test__run_command(self, mock_sshutils_ssh,
                           mock_vm_scenario__run_command_over_ssh):
+        CONF.set_override("vm_ssh_pool_size", 0, "openstack")
+        self.addCleanup(CONF.clear_override, "vm_ssh_pool_size",
+                        "openstack")
         vm_scenario = utils.VMScenario(self.context)
         vm_scenario.context = {"user": {"keypair": {"private": "ssh"}}}
         vm_scenario._run_command("1.2.3.4", 22, "username", "password",
@@ -196,12 +252,16 @@ class VMScenarioTestCase(test.ScenarioTestCase):
         self.assertEqual(scenario._delete_floating_ip.mock_calls, [])
         scenario._delete_server.assert_called_once_with(server, force=True)
 
-    def test__delete_server_with_fip(self):
+    @mock.patch(VMTASKS_UTILS + ".get_ssh_pool")
+    def test__delete_server_with_fip(self, mock_get_ssh_pool):
         fip = {"ip": "foo_ip", "id": "foo_id", "is_floating": True}
         scenario, server = self.get_scenario()
         scenario._delete_floating_ip = mock.Mock()
         scenario._delete_server_with_fip(server, fip, force_delete=True)
 
+        mock_get_ssh_pool.return_value.discard.assert_called_once_with(
+            "foo_ip")
+
         scenario._delete_floating_ip.assert_called_once_with(server, fip)
         scenario._delete_server.assert_called_once_with(server, force=True)
 
@@ -244,64 +304,233 @@ class VMScenarioTestCase(test.ScenarioTestCase):
         nc.delete_floatingip.assert_called_once_with("foo_id")
 
 
-class HostTestCase(test.TestCase):
+class SSHPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SSHPoolTestCase, self).setUp()
+        self.pool = utils.SSHPool()
+        self.addCleanup(self.pool.clear)
+
+    def _get(self, host, **kwargs):
+        ssh = self.pool.checkout("user", host, **kwargs)
+        self.pool.release(ssh)
+        return ssh
+
+    def test_checkout(self):
+        ssh = self._get("1.2.3.4", pkey=None, password="secret")
+
+        self.assertIsInstance(ssh, utils._PooledSSH)
+        self.assertEqual(("user", "1.2.3.4", 22),
+                         (ssh.user, ssh.host, ssh.port))
+        self.assertEqual(CONF.openstack.vm_ssh_keepalive_interval,
+                         ssh.keepalive)
+        self.assertIs(ssh, self._get("1.2.3.4", password="secret"))
+        self.assertIsNot(ssh, self._get("1.2.3.4", password="other"))
+        self.assertIsNot(ssh, self._get("1.2.3.4", port=2222,
+                                        password="secret"))
+        self.assertEqual({"hits": 1, "misses": 3, "size": 3},
+                         self.pool.stats())
+
+    def test_connection(self):
+        with self.pool.connection("user", "1.2.3.4", password="p") as ssh:
+            self.assertEqual(1, ssh.users)
+            with self.pool.connection("user", "1.2.3.4",
+                                      password="p") as ssh2:
+                self.assertIs(ssh, ssh2)
+                self.assertEqual(2, ssh.users)
+        self.assertEqual(0, ssh.users)
 
-    @mock.patch(VMTASKS_UTILS + ".sys")
-    @mock.patch("subprocess.Popen")
-    def test__ping_ip_address_linux(self, mock_popen, mock_sys):
-        mock_popen.return_value.returncode = 0
-        mock_sys.platform = "linux2"
+    def test_make_key_does_not_contain_secrets(self):
+        key = utils.SSHPool.make_key("user", "1.2.3.4", 22, password="pass")
 
-        host = utils.Host("1.2.3.4")
-        self.assertEqual(utils.Host.ICMP_UP_STATUS,
-                         utils.Host.update_status(host).status)
+        self.assertNotIn("pass", key)
 
-        mock_popen.assert_called_once_with(
-            ["ping", "-c1", "-w1", str(host.ip)],
-            stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-        mock_popen.return_value.wait.assert_called_once_with()
+    def test_checkout_evicts_least_recently_used(self):
+        CONF.set_override("vm_ssh_pool_size", 2, "openstack")
+        self.addCleanup(CONF.clear_override, "vm_ssh_pool_size",
+                        "openstack")
+        ssh1 = self._get("1.1.1.1", password="p")
+        ssh2 = self._get("2.2.2.2", password="p")
+        self._get("1.1.1.1", password="p")
+        ssh2.close = mock.Mock()
 
-    @mock.patch(VMTASKS_UTILS + ".sys")
-    @mock.patch("subprocess.Popen")
-    def test__ping_ip_address_linux_ipv6(self, mock_popen, mock_sys):
-        mock_popen.return_value.returncode = 0
-        mock_sys.platform = "linux2"
+        self._get("3.3.3.3", password="p")
 
-        host = utils.Host("1ce:c01d:bee2:15:a5:900d:a5:11fe")
-        self.assertEqual(utils.Host.ICMP_UP_STATUS,
-                         utils.Host.update_status(host).status)
+        ssh2.close.assert_called_once_with()
+        self.assertIs(ssh1, self._get("1.1.1.1", password="p"))
+        self.assertEqual(2, self.pool.stats()["size"])
+
+    def test_checkout_does_not_evict_used_connections(self):
+        CONF.set_override("vm_ssh_pool_size", 1, "openstack")
+        self.addCleanup(CONF.clear_override, "vm_ssh_pool_size",
+                        "openstack")
+        ssh1 = self.pool.checkout("user", "1.1.1.1", password="p")
+        ssh1.close = mock.Mock()
+
+        ssh2 = self.pool.checkout("user", "2.2.2.2", password="p")
+        ssh2.close = mock.Mock()
+
+        self.assertFalse(ssh1.close.called)
+        self.assertEqual(2, self.pool.stats()["size"])
+
+        # the pool is trimmed as soon as a connection is idle
+        self.pool.release(ssh1)
+        ssh1.close.assert_called_once_with()
+        self.pool.release(ssh2)
+        self.assertFalse(ssh2.close.called)
+        self.assertEqual(1, self.pool.stats()["size"])
 
-        mock_popen.assert_called_once_with(
-            ["ping6", "-c1", "-w1", str(host.ip)],
-            stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-        mock_popen.return_value.wait.assert_called_once_with()
+    def test_discard(self):
+        ssh1 = self._get("1.1.1.1", password="p")
+        ssh1.close = mock.Mock()
+        ssh2 = self._get("2.2.2.2", password="p")
 
-    @mock.patch(VMTASKS_UTILS + ".sys")
-    @mock.patch("subprocess.Popen")
-    def test__ping_ip_address_other_os(self, mock_popen, mock_sys):
-        mock_popen.return_value.returncode = 0
-        mock_sys.platform = "freebsd10"
+        self.pool.discard("1.1.1.1")
+
+        ssh1.close.assert_called_once_with()
+        self.assertIsNot(ssh1, self._get("1.1.1.1", password="p"))
+        self.assertIs(ssh2, self._get("2.2.2.2", password="p"))
+
+    def test_discard_used_connection(self):
+        ssh = self.pool.checkout("user", "1.1.1.1", password="p")
+        ssh.close = mock.Mock()
+
+        self.pool.discard("1.1.1.1")
+        self.assertFalse(ssh.close.called)
+
+        self.pool.release(ssh)
+        ssh.close.assert_called_once_with()
+
+
+class SSHPoolsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SSHPoolsTestCase, self).setUp()
+        for i in range(utils._MAX_TASKS + 1):
+            self.addCleanup(utils.close_ssh_pool,
+                            {"task": {"uuid": "task-%s" % i}})
+
+    def test_get_ssh_pool(self):
+        context = {"task": {"uuid": "task-0"}}
+        pool = utils.get_ssh_pool(context)
+
+        self.assertIsInstance(pool, utils.SSHPool)
+        self.assertIsNot(utils.SSH_POOL, pool)
+        self.assertIs(pool, utils.get_ssh_pool(context))
+        self.assertIs(utils.SSH_POOL, utils.get_ssh_pool({}))
+
+    def test_get_ssh_pool_closes_pools_of_old_tasks(self):
+        pool = utils.get_ssh_pool({"task": {"uuid": "task-0"}})
+        pool.clear = mock.Mock()
+
+        for i in range(1, utils._MAX_TASKS + 1):
+            utils.get_ssh_pool({"task": {"uuid": "task-%s" % i}})
+
+        pool.clear.assert_called_once_with()
+
+    def test_close_ssh_pool(self):
+        context = {"task": {"uuid": "task-0"}}
+        pool = utils.get_ssh_pool(context)
+        pool.clear = mock.Mock()
+
+        utils.close_ssh_pool(context)
+        utils.close_ssh_pool({})
+
+        pool.clear.assert_called_once_with()
+        self.assertIsNot(pool, utils.get_ssh_pool(context))
+
+
+class PooledSSHTestCase(test.TestCase):
+
+    @mock.patch("rally.utils.sshutils.paramiko")
+    def test__get_client(self, mock_paramiko):
+        ssh = utils._PooledSSH("user", "1.2.3.4", password="p", keepalive=5)
+        client = mock_paramiko.SSHClient.return_value
+
+        self.assertIs(client, ssh._get_client())
+        self.assertIs(client, ssh._get_client())
+
+        self.assertEqual(1, mock_paramiko.SSHClient.call_count)
+        transport = client.get_transport.return_value
+        transport.set_keepalive.assert_called_once_with(5)
+
+    @mock.patch("rally.utils.sshutils.paramiko")
+    def test__get_client_reconnects(self, mock_paramiko):
+        ssh = utils._PooledSSH("user", "1.2.3.4", password="p")
+        broken = mock.Mock()
+        broken.get_transport.return_value.is_active.return_value = False
+        ssh._client = broken
+
+        self.assertIs(mock_paramiko.SSHClient.return_value,
+                      ssh._get_client())
+        broken.close.assert_called_once_with()
+
+    def test_close(self):
+        ssh = utils._PooledSSH("user", "1.2.3.4", password="p")
+        client = ssh._client = mock.Mock()
+
+        ssh.close()
+        ssh.close()
+
+        client.close.assert_called_once_with()
+        self.assertFalse(ssh.is_alive())
+
+
+class UploadAndRunTestCase(test.TestCase):
+
+    def test_upload_and_run(self):
+        ssh = mock.Mock()
+
+        result = utils.upload_and_run(ssh, "script", "/tmp/my script",
+                                      ["sh", "/tmp/my script", "arg"])
+
+        self.assertEqual(ssh.execute.return_value, result)
+        ssh.execute.assert_called_once_with(
+            "cat > '/tmp/my script' && chmod 0755 '/tmp/my script' && "
+            "sh '/tmp/my script' arg", stdin="script")
+        self.assertFalse(ssh.run.called)
+
+    def test_upload_and_run_with_stdin(self):
+        ssh = mock.Mock()
+
+        result = utils.upload_and_run(ssh, "script", "/tmp/script",
+                                      ["/tmp/script"], stdin="data",
+                                      mode=0o700)
+
+        self.assertEqual(ssh.execute.return_value, result)
+        ssh.run.assert_called_once_with(
+            "cat > /tmp/script && chmod 0700 /tmp/script", stdin="script")
+        ssh.execute.assert_called_once_with(["/tmp/script"], stdin="data")
+
+
+class HostTestCase(test.TestCase):
+
+    @mock.patch(VMTASKS_UTILS + ".prober.PROBER")
+    def test_update_status(self, mock_prober):
+        mock_prober.probe.return_value = 0.002
 
         host = utils.Host("1.2.3.4")
         self.assertEqual(utils.Host.ICMP_UP_STATUS,
                          utils.Host.update_status(host).status)
+        self.assertEqual(0.002, host.rtt)
+        mock_prober.probe.assert_called_once_with("1.2.3.4")
 
-        mock_popen.assert_called_once_with(
-            ["ping", "-c1", str(host.ip)],
-            stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-        mock_popen.return_value.wait.assert_called_once_with()
-
-    @mock.patch(VMTASKS_UTILS + ".sys")
-    @mock.patch("subprocess.Popen")
-    def test__ping_ip_address_other_os_ipv6(self, mock_popen, mock_sys):
-        mock_popen.return_value.returncode = 0
-        mock_sys.platform = "freebsd10"
+    @mock.patch(VMTASKS_UTILS + ".prober.PROBER")
+    def test_update_status_ipv6(self, mock_prober):
+        mock_prober.probe.return_value = 0.002
 
         host = utils.Host("1ce:c01d:bee2:15:a5:900d:a5:11fe")
         self.assertEqual(utils.Host.ICMP_UP_STATUS,
                          utils.Host.update_status(host).status)
+        mock_prober.probe.assert_called_once_with(
+            "1ce:c01d:bee2:15:a5:900d:a5:11fe")
+
+    @mock.patch(VMTASKS_UTILS + ".prober.PROBER")
+    def test_update_status_down(self, mock_prober):
+        mock_prober.probe.return_value = None
 
-        mock_popen.assert_called_once_with(
-            ["ping6", "-c1", str(host.ip)],
-            stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-        mock_popen.return_value.wait.assert_called_once_with()
+        host = utils.Host("1.2.3.4")
+        host.status = utils.Host.ICMP_UP_STATUS
+        self.assertEqual(utils.Host.ICMP_DOWN_STATUS,
+                         utils.Host.update_status(host).status)
+        self.assertIsNone(host.rtt)
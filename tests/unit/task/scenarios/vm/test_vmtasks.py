@@ -289,6 +289,11 @@ class VMTasksTestCase(test.ScenarioTestCase):
                     "description": "Data generated by workload",
                     "title": "Workload summary"}
         scenario.add_output.assert_called_once_with(complete=expected)
+        fake_ssh.run.assert_called_once_with(
+            "cat > /tmp/.rally-workload && chmod +x /tmp/.rally-workload",
+            stdin=mock.ANY)
+        fake_ssh.execute.assert_called_once_with(
+            "/tmp/.rally-workload", stdin=mock.ANY)
 
     def create_env_for_designate(self, zone_config=None):
         scenario = vmtasks.CheckDesignateDNSResolving(self.context)
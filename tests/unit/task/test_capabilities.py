@@ -0,0 +1,148 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from rally.common import cfg
+
+from rally_openstack.common import credential
+from rally_openstack.task import capabilities
+from tests.unit import test
+
+
+CONF = cfg.CONF
+
+
+class CapabilityCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(CapabilityCacheTestCase, self).setUp()
+        self.cache = capabilities.CapabilityCache(ttl=10)
+        self.credential = credential.OpenStackCredential(
+            "http://example.com", "user", "secret", tenant_name="foo",
+            permission="admin")
+
+    def test_make_key(self):
+        key = self.cache.make_key(self.credential, "neutron_extensions",
+                                  "foo")
+
+        self.assertEqual(("http://example.com", None, None, "admin",
+                          "neutron_extensions", ("foo",)), key)
+        # capabilities do not differ for projects, but differ for roles
+        self.assertEqual(key, self.cache.make_key(
+            credential.OpenStackCredential(
+                "http://example.com", "user", "secret", tenant_name="bar",
+                permission="admin"),
+            "neutron_extensions", "foo"))
+        self.assertNotEqual(key, self.cache.make_key(
+            credential.OpenStackCredential(
+                "http://example.com", "user", "secret", tenant_name="foo",
+                permission="user"),
+            "neutron_extensions", "foo"))
+
+    @mock.patch("rally_openstack.task.capabilities.time.time")
+    def test_get(self, mock_time):
+        mock_time.return_value = 100
+        fetch = mock.Mock(return_value=["foo"])
+        key = self.cache.make_key(self.credential, "neutron_extensions")
+
+        self.assertEqual(["foo"], self.cache.get(key, fetch))
+        self.assertEqual(["foo"], self.cache.get(key, fetch))
+        self.assertEqual(["foo"], self.cache.peek(key))
+        fetch.assert_called_once_with()
+
+        fetch.return_value = ["bar"]
+        self.assertEqual(["bar"], self.cache.get(key, fetch, refresh=True))
+
+        mock_time.return_value = 110
+        self.assertIsNone(self.cache.peek(key))
+        self.assertEqual(["bar"], self.cache.get(key, fetch))
+        self.assertEqual(3, fetch.call_count)
+        self.assertEqual({"hits": 1, "misses": 3, "expired": 1, "size": 1},
+                         self.cache.stats())
+
+    def test_invalidate(self):
+        extensions = self.cache.make_key(self.credential,
+                                         "neutron_extensions")
+        networks = self.cache.make_key(self.credential, "external_networks")
+        self.cache.get(extensions, list)
+        self.cache.get(networks, list)
+
+        self.cache.invalidate("external_networks")
+        self.assertIsNone(self.cache.peek(networks))
+        self.assertEqual([], self.cache.peek(extensions))
+
+        self.cache.invalidate()
+        self.assertEqual(0, self.cache.stats()["size"])
+
+
+class GetCacheTestCase(test.TestCase):
+
+    def test_get_cache(self):
+        cache = capabilities.get_cache({"task": {"uuid": "foo"}})
+
+        self.assertIsInstance(cache, capabilities.CapabilityCache)
+        self.assertEqual(CONF.openstack.capability_cache_ttl, cache.ttl)
+        self.assertIs(cache,
+                      capabilities.get_cache({"task": {"uuid": "foo"}}))
+        self.assertIsNot(cache,
+                         capabilities.get_cache({"task": {"uuid": "bar"}}))
+        self.assertIsNone(capabilities.get_cache({}))
+        self.assertIsNone(capabilities.get_cache(None))
+
+    def test_get_cache_disabled(self):
+        CONF.set_override("capability_cache_ttl", 0, "openstack")
+        self.addCleanup(CONF.clear_override, "capability_cache_ttl",
+                        "openstack")
+
+        self.assertIsNone(capabilities.get_cache({"task": {"uuid": "foo"}}))
+
+    def test_get_cache_drops_old_tasks(self):
+        first = capabilities.get_cache({"task": {"uuid": "task-0"}})
+        for i in range(1, capabilities._MAX_TASKS + 1):
+            capabilities.get_cache({"task": {"uuid": "task-%s" % i}})
+
+        self.assertNotIn("task-0", capabilities._CACHES)
+        self.assertIsNot(
+            first, capabilities.get_cache({"task": {"uuid": "task-0"}}))
+
+    def test_invalidate(self):
+        context = {"task": {"uuid": "foo"}}
+        cache = capabilities.get_cache(context)
+        cache.invalidate = mock.Mock()
+
+        capabilities.invalidate(context, "external_networks")
+        capabilities.invalidate({}, "external_networks")
+
+        cache.invalidate.assert_called_once_with("external_networks")
+
+
+class HelpersTestCase(test.TestCase):
+
+    def setUp(self):
+        super(HelpersTestCase, self).setUp()
+        self.cache = capabilities.CapabilityCache(ttl=10)
+        self.clients = mock.Mock(credential=credential.OpenStackCredential(
+            "http://example.com", "user", "secret"))
+
+    def test_get_services(self):
+        self.clients.services.return_value = {"compute": "nova"}
+
+        for i in range(2):
+            self.assertEqual({"compute": "nova"},
+                             capabilities.get_services(self.cache,
+                                                       self.clients))
+        self.clients.services.assert_called_once_with()
+
+        self.assertEqual({"compute": "nova"},
+                         capabilities.get_services(None, self.clients))
+        self.assertEqual(2, self.clients.services.call_count)
@@ -12,6 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
+from rally import exceptions
+
 from rally_openstack.task import context
 from tests.unit import test
 
@@ -45,3 +49,62 @@ class TenantIteratorTestCase(test.TestCase):
             i for i in DummyContext({"users": users})._iterate_per_tenants()]
 
         self.assertEqual(expected_result, real_result)
+
+
+class RunPerTenantsTestCase(test.TestCase):
+
+    class DummyContext(context.OpenStackContext):
+        def __init__(self, ctx, config=None):
+            self.context = ctx
+            self.config = config or {}
+
+        @classmethod
+        def get_name(cls):
+            return "dummy"
+
+        def setup(self):
+            pass
+
+        def cleanup(self):
+            pass
+
+    def setUp(self):
+        super(RunPerTenantsTestCase, self).setUp()
+        self.users = [{"id": "u%s" % i, "tenant_id": "t%s" % (i % 3)}
+                      for i in range(6)]
+
+    def test__run_per_tenants(self):
+        ctx = self.DummyContext({"users": self.users},
+                                {"resource_management_workers": 2})
+        func = mock.Mock(side_effect=lambda user, tenant_id: user["id"])
+
+        self.assertEqual({"t0": "u0", "t1": "u1", "t2": "u2"},
+                         ctx._run_per_tenants(func))
+        self.assertEqual(3, func.call_count)
+        func.assert_has_calls([mock.call(self.users[i], "t%s" % i)
+                               for i in range(3)], any_order=True)
+
+    def test__run_per_tenants_without_users(self):
+        func = mock.Mock()
+        self.assertEqual({}, self.DummyContext({})._run_per_tenants(func))
+        self.assertFalse(func.called)
+
+    def test__run_per_tenants_fails(self):
+        ctx = self.DummyContext({"users": self.users},
+                                {"resource_management_workers": 1})
+
+        processed = []
+
+        def func(user, tenant_id):
+            processed.append(tenant_id)
+            if tenant_id == "t1":
+                raise ValueError("oops")
+            return user["id"]
+
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              ctx._run_per_tenants, func)
+
+        self.assertIn("Failed to process 1 of 3 tenants: t1: [ValueError] "
+                      "oops", "%s" % e)
+        # the processing should be stopped after the first failure
+        self.assertEqual(["t0", "t1"], processed)
@@ -0,0 +1,146 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from rally.common import cfg
+
+from rally_openstack.common import credential
+from rally_openstack.task import discovery
+from tests.unit import fakes
+from tests.unit import test
+
+
+CONF = cfg.CONF
+
+
+class ListingTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ListingTestCase, self).setUp()
+        self.resources = [fakes.FakeResource(name="foo", id="1"),
+                          fakes.FakeResource(name="foo", id="2"),
+                          fakes.FakeResource(name="bar", id="3")]
+        self.resources.append(fakes.FakeResource(id="4"))
+        self.resources[-1].name = None
+        self.listing = discovery.Listing(iter(self.resources))
+
+    def test_iter(self):
+        self.assertEqual(self.resources, list(self.listing))
+        self.assertEqual(4, len(self.listing))
+
+    def test_by_name(self):
+        self.assertEqual(self.resources[:2], self.listing.by_name("foo"))
+        self.assertEqual([], self.listing.by_name("baz"))
+
+    def test_search(self):
+        self.assertEqual([self.resources[2]], self.listing.search("^b"))
+        self.assertEqual(self.resources[:3], self.listing.search("o|a"))
+
+        with mock.patch("%s.re.compile" % discovery.__name__) as mock_c:
+            self.assertEqual([self.resources[2]], self.listing.search("^b"))
+        self.assertFalse(mock_c.called)
+
+
+class DiscoveryCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DiscoveryCacheTestCase, self).setUp()
+        self.cache = discovery.DiscoveryCache()
+        self.credential = credential.OpenStackCredential(
+            "http://example.com", "user", "secret", tenant_name="foo")
+
+    def test_make_key(self):
+        key = self.cache.make_key(self.credential, "images",
+                                  visibility="public", owner="bar")
+
+        self.assertEqual(
+            ("http://example.com", None, "foo", None, "images",
+             (("owner", "'bar'"), ("visibility", "'public'"))),
+            key)
+        self.assertNotEqual(
+            key, self.cache.make_key(
+                credential.OpenStackCredential(
+                    "http://example.com", "user", "secret",
+                    tenant_name="bar"),
+                "images", visibility="public", owner="bar"))
+
+    def test_get(self):
+        list_resources = mock.Mock(return_value=["foo"])
+        key = self.cache.make_key(self.credential, "images")
+
+        listing = self.cache.get(key, list_resources)
+
+        self.assertEqual(["foo"], list(listing))
+        self.assertIs(listing, self.cache.get(key, list_resources))
+        list_resources.assert_called_once_with()
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1},
+                         self.cache.stats())
+
+        list_resources.return_value = ["foo", "bar"]
+        self.assertEqual(["foo", "bar"], list(
+            self.cache.get(key, list_resources, refresh=True)))
+
+    def test_invalidate(self):
+        images = self.cache.make_key(self.credential, "images")
+        flavors = self.cache.make_key(self.credential, "flavors")
+        self.cache.get(images, list)
+        self.cache.get(flavors, list)
+
+        self.cache.invalidate("images")
+        self.assertEqual(1, self.cache.stats()["size"])
+        self.cache.get(flavors, list)
+        self.assertEqual(1, self.cache.stats()["hits"])
+
+        self.cache.invalidate()
+        self.assertEqual(0, self.cache.stats()["size"])
+
+
+class GetCacheTestCase(test.TestCase):
+
+    def test_get_cache(self):
+        cache = discovery.get_cache({"task": {"uuid": "foo"}})
+
+        self.assertIsInstance(cache, discovery.DiscoveryCache)
+        self.assertIs(cache, discovery.get_cache({"task": {"uuid": "foo"}}))
+        self.assertIsNot(cache,
+                         discovery.get_cache({"task": {"uuid": "bar"}}))
+        self.assertIsNone(discovery.get_cache({}))
+        self.assertIsNone(discovery.get_cache({"task": None}))
+
+    def test_get_cache_disabled(self):
+        CONF.set_override("resource_discovery_cache", False, "openstack")
+        self.addCleanup(CONF.clear_override, "resource_discovery_cache",
+                        "openstack")
+
+        self.assertIsNone(discovery.get_cache({"task": {"uuid": "foo"}}))
+
+    def test_get_cache_drops_old_tasks(self):
+        first = discovery.get_cache({"task": {"uuid": "task-0"}})
+        for i in range(1, discovery._MAX_TASKS):
+            discovery.get_cache({"task": {"uuid": "task-%s" % i}})
+        # the first task is used recently, so the second one is dropped
+        self.assertIs(first, discovery.get_cache({"task": {"uuid": "task-0"}}))
+        discovery.get_cache({"task": {"uuid": "new"}})
+
+        self.assertIs(first, discovery.get_cache({"task": {"uuid": "task-0"}}))
+        self.assertNotIn("task-1", discovery._CACHES)
+
+    def test_invalidate(self):
+        context = {"task": {"uuid": "foo"}}
+        cache = discovery.get_cache(context)
+        cache.invalidate = mock.Mock()
+
+        discovery.invalidate(context, "images")
+        discovery.invalidate({}, "images")
+
+        cache.invalidate.assert_called_once_with("images")
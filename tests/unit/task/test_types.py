@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+import os
+import shutil
+import tempfile
 from unittest import mock
 
 from rally import exceptions
@@ -111,6 +115,15 @@ class OpenStackResourceTypeTestCase(test.TestCase):
         self.assertIn("with name 'Fake' is ambiguous, possible matches",
                       e.format_message())
 
+    def test_listed_resource_type_requires__list(self):
+
+        @types.configure(name=self.id())
+        class FooType(types.ListedResourceType):
+            def pre_process(self, resource_spec, config):
+                pass
+
+        self.assertRaises(TypeError, FooType, {})
+
 
 class FlavorTestCase(test.TestCase):
 
@@ -171,6 +184,28 @@ class FlavorTestCase(test.TestCase):
                           self.type_cls.pre_process,
                           resource_spec=resource_spec, config={})
 
+    def test_preprocess_with_task_discovery(self):
+        self.clients.credential = fakes.FakeCredential()
+        flavors = self.clients.nova().flavors
+        flavors.list = mock.Mock(wraps=flavors.list)
+        context = {"admin": {"credential": mock.Mock()},
+                   "task": {"uuid": "foo"}}
+
+        for resource_spec in ({"name": "m1.nano"}, {"regex": "m1.tiny"}):
+            type_cls = types.Flavor(context=context)
+            type_cls._clients = self.clients
+            type_cls.pre_process(resource_spec=resource_spec, config={})
+        flavors.list.assert_called_once_with()
+
+        # a flavor created after the listing is found by the refreshed one
+        flavors._cache(fakes.FakeResource(name="m1.new", id="46"))
+        type_cls = types.Flavor(context=context)
+        type_cls._clients = self.clients
+        self.assertEqual(
+            "46", type_cls.pre_process(resource_spec={"name": "m1.new"},
+                                       config={}))
+        self.assertEqual(2, flavors.list.call_count)
+
 
 class GlanceImageTestCase(test.TestCase):
 
@@ -258,6 +293,40 @@ class GlanceImageArgsTestCase(test.TestCase):
                 config={}, resource_spec={"is_public": False}))
 
 
+class HeatTemplateTestCase(test.TestCase):
+
+    @mock.patch("rally_openstack.task.types.templates.TEMPLATES")
+    def test_preprocess(self, mock_templates):
+        self.assertEqual(
+            mock_templates.read.return_value,
+            types.HeatTemplate({}).pre_process("~/template.yaml", config={}))
+        mock_templates.read.assert_called_once_with("~/template.yaml")
+
+
+class HeatFilesTestCase(test.TestCase):
+
+    @mock.patch("rally_openstack.task.types.templates.TEMPLATES")
+    def test_preprocess(self, mock_templates):
+        self.assertEqual(
+            mock_templates.files.return_value,
+            types.HeatFiles({}).pre_process(["foo.yaml"], config={}))
+        mock_templates.files.assert_called_once_with(["foo.yaml"])
+
+    def test_preprocess_deepcopy(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "foo.yaml")
+        with open(path, "w") as f:
+            f.write("foo")
+        args = {"files": types.HeatFiles({}).pre_process([path], config={})}
+
+        copied = copy.deepcopy(args)
+
+        self.assertEqual({"files": {path: "foo"}}, copied)
+        copied["files"][path] = "bar"
+        self.assertEqual({path: "foo"}, args["files"])
+
+
 class EC2ImageTestCase(test.TestCase):
 
     def setUp(self):
@@ -14,15 +14,37 @@
 
 import copy
 import datetime as dt
+import json
 import os
 from unittest import mock
 
+import fixtures
+
 from rally_openstack.task.ui.charts import osprofilerchart as osp_chart
 from tests.unit import test
 
 
 PATH = "rally_openstack.task.ui.charts.osprofilerchart"
 CHART_PATH = "%s.OSProfilerChart" % PATH
+CONF = osp_chart.CONF
+
+TRACE = {
+    "info": {"name": "total", "started": 0, "finished": 30},
+    "children": [
+        {"info": {"name": "wsgi", "project": "nova", "service": "api",
+                  "started": 0, "finished": 30},
+         "children": [
+             {"info": {"name": "rpc", "project": "nova",
+                       "service": "conductor", "started": 5, "finished": 15,
+                       "meta.raw_payload.rpc-start": {
+                           "info": {"function": {"name": "build"}}}},
+              "children": []},
+             {"info": {"name": "rpc", "project": "nova",
+                       "service": "conductor", "started": 15,
+                       "finished": 17,
+                       "meta.raw_payload.rpc-start": {
+                           "info": {"function": {"name": "build"}}}},
+              "children": []}]}]}
 
 
 class OSProfilerChartTestCase(test.TestCase):
@@ -82,6 +104,80 @@ class OSProfilerChartTestCase(test.TestCase):
                 connection_str, trace_id)
             self.assertIsNone(r)
 
+    @mock.patch("%s._fetch_osprofiler_trace" % CHART_PATH)
+    def test__fetch_osprofiler_data_cached(self,
+                                           mock__fetch_osprofiler_trace):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        CONF.set_override("osprofiler_trace_cache_dir", cache_dir,
+                          "openstack")
+        self.addCleanup(CONF.clear_override, "osprofiler_trace_cache_dir",
+                        "openstack")
+        mock__fetch_osprofiler_trace.return_value = {
+            "ts": dt.datetime(year=2018, month=7, day=3, hour=2)}
+
+        for i in range(2):
+            self.assertEqual(
+                {"ts": "2018-07-03T02:00:00"} if i else
+                mock__fetch_osprofiler_trace.return_value,
+                osp_chart.OSProfilerChart._fetch_osprofiler_data(
+                    "conn", "trace-id"))
+
+        mock__fetch_osprofiler_trace.assert_called_once_with("conn",
+                                                             "trace-id")
+        self.assertEqual(1, len(os.listdir(cache_dir)))
+
+        # failures are not cached
+        mock__fetch_osprofiler_trace.return_value = None
+        self.assertIsNone(osp_chart.OSProfilerChart._fetch_osprofiler_data(
+            "conn", "another-trace-id"))
+        self.assertEqual(1, len(os.listdir(cache_dir)))
+
+    def test__span_name(self):
+        self.assertEqual("nova.api wsgi",
+                         osp_chart._span_name(TRACE["children"][0]["info"]))
+        self.assertEqual(
+            "nova.conductor rpc build",
+            osp_chart._span_name(
+                TRACE["children"][0]["children"][0]["info"]))
+
+    @mock.patch("%s._read_template" % PATH)
+    @mock.patch("%s.SharedTemplateReport" % PATH)
+    @mock.patch("%s._fetch_osprofiler_data" % CHART_PATH)
+    def test_render_complete_data_shared_template(
+            self, mock__fetch_osprofiler_data, mock_shared_template_report,
+            mock__read_template):
+        CONF.set_override("osprofiler_chart_mode", "/path", "openstack")
+        CONF.set_override("osprofiler_chart_shared_template", True,
+                          "openstack")
+        self.addCleanup(CONF.clear_override, "osprofiler_chart_mode",
+                        "openstack")
+        self.addCleanup(CONF.clear_override,
+                        "osprofiler_chart_shared_template", "openstack")
+        self.addCleanup(osp_chart._REPORTS.clear)
+        report = mock_shared_template_report.return_value
+        report.add.return_value = "/path/osprofiler.html#w_W_ID-7.js"
+
+        for i in range(2):
+            r = osp_chart.OSProfilerChart.render_complete_data(
+                {"data": {"trace_id": "trace-id", "conn_str": "conn",
+                          "workload_uuid": "W_ID", "iteration": 7},
+                 "title": "TITLE"})
+
+        self.assertEqual(
+            {"title": "TITLE : trace-id", "widget": "EmbedChart",
+             "data": {"embedded": None,
+                      "source": "/path/osprofiler.html#w_W_ID-7.js"}},
+            r)
+        mock_shared_template_report.assert_called_once_with(
+            "/path", mock__fetch_osprofiler_data, workers=8)
+        report.add.assert_called_with("conn", "trace-id", "w_W_ID-7.js")
+        self.assertEqual(2, report.add.call_count)
+        self.assertFalse(mock__fetch_osprofiler_data.called)
+
+        osp_chart.flush_reports()
+        report.flush.assert_called_once_with()
+        self.assertEqual({}, osp_chart._REPORTS)
+
     @mock.patch("%s.charts.OutputEmbeddedExternalChart" % PATH)
     @mock.patch("%s.charts.OutputEmbeddedChart" % PATH)
     @mock.patch("%s._return_raw_response_for_complete_data" % CHART_PATH)
@@ -164,6 +260,7 @@ class OSProfilerChartTestCase(test.TestCase):
         with mock.patch.object(osp_chart, "open", mock_open):
             with mock.patch("%s.CONF.openstack" % PATH) as mock_cfg_os:
                 mock_cfg_os.osprofiler_chart_mode = "/path"
+                mock_cfg_os.osprofiler_chart_shared_template = False
 
                 r = osp_chart.OSProfilerChart.render_complete_data(
                     copy.deepcopy(pdata))
@@ -178,3 +275,68 @@ class OSProfilerChartTestCase(test.TestCase):
                                      "widget": "EmbeddedChart",
                                      "data": "/path/w_W_ID-777.html"})
         self.assertFalse(mock__return_raw_response_for_complete_data.called)
+
+
+class SharedTemplateReportTestCase(test.TestCase):
+
+    @mock.patch("%s._read_template" % PATH)
+    def setUp(self, mock__read_template):
+        super(SharedTemplateReportTestCase, self).setUp()
+        mock__read_template.return_value = (
+            "<html ng-app=\"app\"><head>"
+            "<script>var local = $LOCAL;</script>\n"
+            "<script>var OSProfilerData = $DATA;</script></head></html>")
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.fetch_trace = mock.Mock(return_value=TRACE)
+        self.report = osp_chart.SharedTemplateReport(
+            self.directory, self.fetch_trace, workers=2)
+
+    def _read(self, file_name):
+        with open(os.path.join(self.directory, file_name)) as f:
+            return f.read()
+
+    def test_page(self):
+        self.assertEqual(
+            "<html><head><script>var local = false;</script>\n"
+            "<script type=\"text/x-osprofiler-report\" id=\"report\">"
+            "var OSProfilerData = window.OSProfilerTrace;</script>\n%s"
+            "</head></html>" % osp_chart.SharedTemplateReport._LOADER,
+            self._read("osprofiler.html"))
+
+    def test_page_loads_only_trace_scripts(self):
+        loader = osp_chart.SharedTemplateReport._LOADER
+        self.assertNotIn("document.write", loader)
+        self.assertIn("document.createElement(\"script\")", loader)
+        self.assertIn("/^w_[\\w.-]+\\.js$/.test(name)", loader)
+
+    def test_add_and_flush(self):
+        self.assertEqual(
+            "%s/osprofiler.html#w_W-1.js" % self.directory,
+            self.report.add("conn", "trace-1", "w_W-1.js"))
+        self.report.add("conn", "trace-2", "w_W-2.js")
+
+        self.report.flush()
+
+        self.assertEqual([mock.call("conn", "trace-1"),
+                          mock.call("conn", "trace-2")],
+                         sorted(self.fetch_trace.call_args_list))
+        script = self._read("w_W-1.js")
+        self.assertTrue(script.startswith("var OSProfilerTrace = {"))
+        self.assertEqual(TRACE, json.loads(script[len(
+            "var OSProfilerTrace = "):-len(";\n")]))
+        self.assertEqual(
+            [["nova.api wsgi", 2, 30, 30, 30, 30, 30],
+             ["nova.conductor rpc build", 4, 2, 6.0, 10, 10, 10]],
+            self.report.span_stats())
+        spans = self._read("osprofiler-spans.html")
+        self.assertIn("<td>nova.conductor rpc build</td><td>4</td>", spans)
+
+    def test_add_failed_fetch(self):
+        self.fetch_trace.return_value = None
+
+        self.report.add("conn", "trace-1", "w_W-1.js")
+        self.report.flush()
+
+        self.assertIn("Failed to fetch trace trace-1",
+                      self._read("w_W-1.js"))
+        self.assertEqual([], self.report.span_stats())
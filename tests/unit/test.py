@@ -24,6 +24,9 @@ from rally.common import cfg
 from rally.common import db
 from rally import plugins
 
+from rally_openstack.common import osclients
+from rally_openstack.task import capabilities
+from rally_openstack.task import discovery
 from tests.unit import fakes
 
 
@@ -47,6 +50,16 @@ class TestCase(testtools.TestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        # keystone sessions are shared process-wide, so mocked sessions
+        # should not leak between tests
+        osclients.SESSION_POOL.clear()
+        self.addCleanup(osclients.SESSION_POOL.clear)
+        # the same applies to listings of resources and capabilities
+        # cached per task
+        discovery.clear()
+        self.addCleanup(discovery.clear)
+        capabilities.clear()
+        self.addCleanup(capabilities.clear)
 
     def _test_atomic_action_timer(self, atomic_actions, name, count=1,
                                   parent=[]):
@@ -56,6 +56,9 @@ class TempestContextTestCase(test.TestCase):
 
         self.mock_isfile = mock.patch("os.path.isfile",
                                       return_value=True).start()
+        self.mock_get_image_cache = mock.patch(
+            "%s.image_cache.get_image_cache" % PATH,
+            return_value=None).start()
 
         self.cred = fakes.FakeCredential(**CRED)
         p_cred = mock.patch(PATH + ".credential.OpenStackCredential",
@@ -74,50 +77,105 @@ class TempestContextTestCase(test.TestCase):
         self.context.conf.add_section("orchestration")
         self.context.conf.add_section("scenario")
 
-    @mock.patch("%s.open" % PATH, side_effect=mock.mock_open(), create=True)
-    def test__download_image_from_glance(self, mock_open):
-        self.mock_isfile.return_value = False
+    @mock.patch("%s.os.rename" % PATH)
+    @mock.patch("%s.download.save" % PATH)
+    def test__download_image_from_glance(self, mock_save, mock_rename):
         img_path = os.path.join(self.context.data_dir, "foo")
-        img = mock.MagicMock()
+        img = mock.Mock(id="img_id", checksum="md5sum",
+                        os_hash_algo="sha512", os_hash_value="sha512sum")
+        img.name = "CirrOS"
         glanceclient = self.context.clients.glance()
-        glanceclient.images.data.return_value = "data"
 
         self.context._download_image_from_source(img_path, img)
-        mock_open.assert_called_once_with(img_path, "wb")
-        glanceclient.images.data.assert_called_once_with(img.id)
-        mock_open().write.assert_has_calls([mock.call("d"),
-                                            mock.call("a"),
-                                            mock.call("t"),
-                                            mock.call("a")])
 
-    @mock.patch("%s.open" % PATH, side_effect=mock.mock_open())
-    @mock.patch("requests.get", return_value=mock.MagicMock(status_code=200))
-    def test__download_image_from_url_success(self, mock_get, mock_open):
-        self.mock_isfile.return_value = False
+        glanceclient.images.data.assert_called_once_with("img_id")
+        mock_save.assert_called_once_with(
+            glanceclient.images.data.return_value, img_path + ".part",
+            source="image 'CirrOS'",
+            checksums={"md5": "md5sum", "sha512": "sha512sum"},
+            hash_algorithms=["sha256"])
+        mock_rename.assert_called_once_with(img_path + ".part", img_path)
+
+    @mock.patch("%s.os.rename" % PATH)
+    @mock.patch("%s.download.save" % PATH)
+    def test__download_image_from_glance_without_checksums(self, mock_save,
+                                                           mock_rename):
+        img = mock.Mock(id="img_id", checksum=None, os_hash_algo=None,
+                        os_hash_value=None)
+
+        self.context._download_image_from_glance(img, "path")
+
+        self.assertEqual({}, mock_save.call_args[1]["checksums"])
+
+    @mock.patch("%s.os.rename" % PATH)
+    @mock.patch("%s.download.download" % PATH)
+    def test__download_image_from_url_success(self, mock_download,
+                                              mock_rename):
         img_path = os.path.join(self.context.data_dir, "foo")
-        mock_get.return_value.iter_content.return_value = "data"
+        mock_download.return_value = {"hashes": {"sha256": "sum"}}
 
         self.context._download_image_from_source(img_path)
-        mock_get.assert_called_once_with(CONF.openstack.img_url, stream=True)
-        mock_open.assert_called_once_with(img_path, "wb")
-        mock_open().write.assert_has_calls([mock.call("d"),
-                                            mock.call("a"),
-                                            mock.call("t"),
-                                            mock.call("a")])
-
-    @mock.patch("requests.get")
+
+        mock_download.assert_called_once_with(
+            CONF.openstack.img_url, img_path + ".part",
+            hash_algorithms=["sha256"])
+        mock_rename.assert_called_once_with(img_path + ".part", img_path)
+
+    @mock.patch("%s.image_cache.copy_image" % PATH)
+    @mock.patch("%s.download.save" % PATH)
+    def test__download_image_from_glance_to_cache(self, mock_save,
+                                                  mock_copy_image):
+        cache = self.mock_get_image_cache.return_value = mock.MagicMock()
+        img_path = os.path.join(self.context.data_dir, "foo")
+        img = mock.Mock(id="img_id", checksum=None, os_hash_algo=None,
+                        os_hash_value=None)
+        glanceclient = self.context.clients.glance()
+        mock_save.return_value = {"hashes": {"sha256": "sum"}}
+
+        self.context._download_image_from_source(img_path, img)
+
+        cache.use.assert_called_once_with("glance://img_id", fetch=mock.ANY)
+        blob = cache.use.return_value.__enter__.return_value
+        mock_copy_image.assert_called_once_with(blob, img_path)
+        self.assertFalse(mock_save.called)
+        self.assertEqual("sum", cache.use.call_args[1]["fetch"]("part"))
+        glanceclient.images.data.assert_called_once_with("img_id")
+        mock_save.assert_called_once_with(
+            glanceclient.images.data.return_value, "part", source=mock.ANY,
+            checksums={}, hash_algorithms=["sha256"])
+
+    @mock.patch("%s.image_cache.copy_image" % PATH)
+    @mock.patch("%s.download.download" % PATH)
+    def test__download_image_from_url_to_cache(self, mock_download,
+                                               mock_copy_image):
+        cache = self.mock_get_image_cache.return_value = mock.MagicMock()
+        img_path = os.path.join(self.context.data_dir, "foo")
+        mock_download.return_value = {"hashes": {"sha256": "sum"}}
+
+        self.context._download_image_from_source(img_path)
+
+        cache.use.assert_called_once_with(CONF.openstack.img_url,
+                                          fetch=mock.ANY)
+        blob = cache.use.return_value.__enter__.return_value
+        mock_copy_image.assert_called_once_with(blob, img_path)
+        self.assertFalse(mock_download.called)
+        self.assertEqual("sum", cache.use.call_args[1]["fetch"]("part"))
+        mock_download.assert_called_once_with(
+            CONF.openstack.img_url, "part", hash_algorithms=["sha256"])
+
+    @mock.patch("%s.download.download" % PATH)
     @ddt.data(404, 500)
-    def test__download_image_from_url_failure(self, status_code, mock_get):
-        self.mock_isfile.return_value = False
-        mock_get.return_value = mock.MagicMock(status_code=status_code)
+    def test__download_image_from_url_failure(self, status_code,
+                                              mock_download):
+        mock_download.side_effect = requests.HTTPError(
+            response=mock.Mock(status_code=status_code))
         self.assertRaises(exceptions.RallyException,
                           self.context._download_image_from_source,
                           os.path.join(self.context.data_dir, "foo"))
 
-    @mock.patch("requests.get", side_effect=requests.ConnectionError())
-    def test__download_image_from_url_connection_error(
-            self, mock_requests_get):
-        self.mock_isfile.return_value = False
+    @mock.patch("%s.download.download" % PATH,
+                side_effect=requests.ConnectionError())
+    def test__download_image_from_url_connection_error(self, mock_download):
         self.assertRaises(exceptions.RallyException,
                           self.context._download_image_from_source,
                           os.path.join(self.context.data_dir, "foo"))
@@ -174,16 +232,18 @@ class TempestContextTestCase(test.TestCase):
         image = self.context._discover_image()
         self.assertEqual("CirrOS", image.name)
 
-    @mock.patch("%s.open" % PATH, side_effect=mock.mock_open(), create=True)
+    @mock.patch("%s.os.rename" % PATH)
+    @mock.patch("%s.download.save" % PATH)
     @mock.patch("rally_openstack.common.services.image.image.Image")
     @mock.patch("os.path.isfile", return_value=False)
-    def test__download_image(self, mock_isfile, mock_image, mock_open):
+    def test__download_image(self, mock_isfile, mock_image, mock_save,
+                             mock_rename):
         img_1 = mock.MagicMock()
         img_1.name = "Foo"
-        img_2 = mock.MagicMock()
+        img_2 = mock.Mock(checksum=None, os_hash_algo=None,
+                          os_hash_value=None)
         img_2.name = "CirrOS"
         glanceclient = self.context.clients.glance()
-        glanceclient.images.data.return_value = "data"
         mock_image.return_value.list_images.return_value = [img_1, img_2]
 
         self.context._download_image()
@@ -191,11 +251,11 @@ class TempestContextTestCase(test.TestCase):
         mock_image.return_value.list_images.assert_called_once_with(
             status="active", visibility="public")
         glanceclient.images.data.assert_called_once_with(img_2.id)
-        mock_open.assert_called_once_with(img_path, "wb")
-        mock_open().write.assert_has_calls([mock.call("d"),
-                                            mock.call("a"),
-                                            mock.call("t"),
-                                            mock.call("a")])
+        mock_save.assert_called_once_with(
+            glanceclient.images.data.return_value, img_path + ".part",
+            source="image 'CirrOS'", checksums={},
+            hash_algorithms=["sha256"])
+        mock_rename.assert_called_once_with(img_path + ".part", img_path)
 
     # We can choose any option to test the '_configure_option' method. So let's
     # configure the 'flavor_ref' option.